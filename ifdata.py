@@ -51,6 +51,21 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument('-c', '--cleaner', action='store_true', help='Clean the downloaded reports.')
     parser.add_argument('-t', '--transformer', action='store_true', help='Transform the downloaded reports.')
     parser.add_argument('-l', '--loader', action='store_true', help='Load the processed reports for silver layer.')
+    parser.add_argument(
+        '--transform-load',
+        action='store_true',
+        help='Transform and load the reports in a single pass, handing the data to DuckDB in memory.',
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Clean, transform and load each report file as soon as the previous stage is done with it.',
+    )
+    parser.add_argument(
+        '--schedule',
+        action='store_true',
+        help='Download the reports while the downloaded files are cleaned, transformed and loaded, then run dbt.',
+    )
     parser.add_argument(
         '-a', '--analytics', action='store_true', help='Run the analytics layer, create the gold layer (dbt).'
     )
@@ -64,6 +79,17 @@ def get_arguments() -> argparse.Namespace:
     parser.add_argument(
         '-r', '--report', type=str, default=None, help='Filter execution by report name (e.g., SUMMARY).'
     )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=None,
+        help='Transform each file in batches of this many rows, bounding memory usage.',
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Load only the new or changed transformed files, replacing their data bases in the silver tables.',
+    )
     parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {version}')
     parser.add_argument(
         '--no-cleanup',
@@ -90,6 +116,18 @@ def run_pipeline(pipeline_manager: PipelineManagerProtocol, args: argparse.Names
         'cleaner': ('Running the cleaner...', pipeline_manager.run_cleaner),
         'transformer': ('Running the transformer...', pipeline_manager.run_transformer),
         'loader': ('Running the loader...', pipeline_manager.run_loader),
+        'transform_load': (
+            'Running the transformer and the loader in a single pass...',
+            pipeline_manager.run_transform_loader,
+        ),
+        'stream': (
+            'Running the cleaner, the transformer and the loader as one stream of files...',
+            pipeline_manager.run_streaming,
+        ),
+        'schedule': (
+            'Running the scraper with the cleaner, the transformer and the loader as a graph of tasks...',
+            pipeline_manager.run_scheduled,
+        ),
         'analytics': ('Running the analytics...', pipeline_manager.run_analytics),
     }
 
@@ -100,6 +138,13 @@ def run_pipeline(pipeline_manager: PipelineManagerProtocol, args: argparse.Names
     if getattr(args, 'report', None):
         kwargs['report'] = args.report
 
+    # Extract stage specific options.
+    stage_kwargs: dict[str, dict] = {'transformer': {}, 'loader': {}}
+    if getattr(args, 'chunk_size', None):
+        stage_kwargs['transformer']['chunk_size'] = args.chunk_size
+    if getattr(args, 'incremental', False):
+        stage_kwargs['loader']['incremental'] = True
+
     # Execute requested actions.
     action_executed = False
     for argument_name, (message, runner) in actions.items():
@@ -108,14 +153,14 @@ def run_pipeline(pipeline_manager: PipelineManagerProtocol, args: argparse.Names
             if argument_name == 'analytics':
                 runner()  # Analytics does not take filter kwargs.
             else:
-                runner(**kwargs)  # pylint: disable=not-callable
+                runner(**kwargs, **stage_kwargs.get(argument_name, {}))  # pylint: disable=not-callable
             action_executed = True
 
     # If no specific action was requested, run the default pipeline.
     if not action_executed:
         logger.info('No specific action requested, running default pipeline (cleaner and transformer)...')
         pipeline_manager.run_cleaner(**kwargs)
-        pipeline_manager.run_transformer(**kwargs)
+        pipeline_manager.run_transformer(**kwargs, **stage_kwargs['transformer'])
 
 
 if __name__ == '__main__':
@@ -7,7 +7,7 @@ def main():
     Normaliza o nome da instituição para a versão mais recente e
     adiciona uma flag de descontinuidade (is_descontinuada).
     """
-    con = duckdb.connect("data/gold_warehouse.duckdb")
+    con = duckdb.connect("data/gold_warehouse.duckdb", read_only=True)
 
     query = """
     WITH base AS (
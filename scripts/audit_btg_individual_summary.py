@@ -1,5 +1,5 @@
 """This script performs a comprehensive audit of the BTG Pactual (Individual) institution's financial summary data
-in the Gold database against the original source CSV files. It checks all key financial accounts for both the first
+in the Gold database against the transformed source files. It checks all key financial accounts for both the first
 and last available dates, ensuring complete parity between Gold and Source.
 """
 
@@ -16,9 +16,11 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.bacen_ifdata.data_transformer.storage import read_transformed_data
 from src.bacen_ifdata.utilities.configurations import Config as Cfg
+from src.bacen_ifdata.utilities.duckdb_settings import duckdb_settings, log_duckdb_settings
 
-# Define the directory where the transformed CSV files are located
+# Define the directory where the transformed files are located
 TRANSFORMED_DIR = Cfg.TRANSFORMED_FILES_DIRECTORY / 'individual_institutions' / 'summary'
 
 # Define the institution details for BTG Pactual (Individual)
@@ -27,7 +29,7 @@ INSTITUTION_ID = 30306294
 
 
 def get_source_data(date_id: int) -> dict | None:
-    """Reads the source CSV for a given date_id (YYYYMMDD) and returns the BTG row.
+    """Reads the transformed source file for a given date_id (YYYYMMDD) and returns the BTG row.
 
     Args:
         date_id (int): The date identifier in the format YYYYMMDD.
@@ -38,7 +40,7 @@ def get_source_data(date_id: int) -> dict | None:
 
     # Convert 20000301 -> 2000-03
     date_str = str(date_id)
-    file_name = f"{date_str[:4]}-{date_str[4:6]}.csv"
+    file_name = f"{date_str[:4]}-{date_str[4:6]}.{Cfg.TRANSFORMED_FILE_FORMAT}"
     file_path = TRANSFORMED_DIR / file_name
 
     if not file_path.exists():
@@ -46,14 +48,14 @@ def get_source_data(date_id: int) -> dict | None:
         return None
 
     try:
-        source_dataframe = pd.read_csv(file_path)
+        source_dataframe = read_transformed_data(file_path)
         # Always use codigo for comparison to handle name changes
         row = source_dataframe[source_dataframe['codigo'] == INSTITUTION_ID]
         if row.empty:
             return None
 
         return row.iloc[0].to_dict()
-    except (FileNotFoundError, pd.errors.ParserError, KeyError) as error:
+    except (FileNotFoundError, pd.errors.ParserError, KeyError, ValueError) as error:
         logger.error(f"Error reading source {file_path}: {error}")
         return None
 
@@ -65,7 +67,8 @@ def main():
         logger.error(f"Gold DB not found at {Cfg.GOLD_DATABASE_FILE}")
         return
 
-    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True)
+    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True, config=duckdb_settings())
+    log_duckdb_settings(gold_db_connection, Cfg.GOLD_DATABASE_FILE.name)
 
     try:
         # 1. Get Institution ID and Dates
@@ -120,8 +123,8 @@ def main():
 
         gold_df = gold_db_connection.execute(report_query).fetch_df()
 
-        # 3. Perform Comparison with Source CSVs
-        logger.info("Comparing Gold results with Source CSVs for all fields (In-Memory)...")
+        # 3. Perform Comparison with Source files
+        logger.info("Comparing Gold results with Source files for all fields (In-Memory)...")
 
         # Mapping Source -> Gold
         field_map = {
@@ -17,6 +17,13 @@ if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from src.bacen_ifdata.utilities.configurations import Config as Cfg
+from src.bacen_ifdata.utilities.duckdb_settings import duckdb_settings, log_duckdb_settings
+
+# Table of the silver database recording each file loaded by the loader, with the rows it added.
+LOAD_LEDGER_TABLE = 'load_ledger'
+
+# Table of the silver database with the rows and institutions of each data_base of each table, profiled by the loader.
+PARTITION_STATISTICS_TABLE = 'partition_statistics'
 
 
 def get_bronze_row_counts() -> Dict[str, int]:
@@ -62,8 +69,60 @@ def get_bronze_row_counts() -> Dict[str, int]:
     return counts
 
 
+def get_ledger_row_counts(silver_db_connection: duckdb.DuckDBPyConnection) -> list[tuple[str, int, int]] | None:
+    """Compares the rows recorded in the load ledger with the rows of each Silver table, in one query.
+
+    Tables with files loaded by an older version of the loader (no row count in
+    the ledger) are left out.
+
+    Args:
+        silver_db_connection (duckdb.DuckDBPyConnection): Connection to the Silver DuckDB database.
+
+    Returns:
+        list[tuple[str, int, int]] | None: The (table, ledger rows, Silver rows) of each recorded table, or None
+                                           if the database has no ledger with row counts (e.g. it was loaded
+                                           by the transform loader).
+    """
+
+    silver_table_names = {row[0] for row in silver_db_connection.execute("SHOW TABLES").fetchall()}
+    if LOAD_LEDGER_TABLE not in silver_table_names:
+        return None
+
+    ledger_columns = {row[0] for row in silver_db_connection.execute(f"DESCRIBE {LOAD_LEDGER_TABLE}").fetchall()}
+    if 'row_count' not in ledger_columns:
+        return None
+
+    counted_tables = []
+    for table_name, uncounted_files in silver_db_connection.execute(
+        f"SELECT table_name, count(*) - count(row_count) FROM {LOAD_LEDGER_TABLE} GROUP BY table_name ORDER BY 1"
+    ).fetchall():
+        if table_name not in silver_table_names:
+            logger.warning(f"[SKIP] Table '{table_name}' found in the load ledger but not in Silver DB.")
+        elif uncounted_files:
+            logger.warning(f"[SKIP] {uncounted_files} file(s) of '{table_name}' have no row count in the ledger.")
+        else:
+            counted_tables.append(table_name)
+
+    if not counted_tables:
+        return None
+
+    silver_counts = ' UNION ALL '.join(
+        f"SELECT '{table_name}' AS table_name, count(*) AS silver_rows FROM {table_name}"
+        for table_name in counted_tables
+    )
+
+    return silver_db_connection.execute(
+        f"SELECT table_name, ledger.ledger_rows, silver.silver_rows "
+        f"FROM (SELECT table_name, sum(row_count) AS ledger_rows FROM {LOAD_LEDGER_TABLE} GROUP BY table_name) ledger "
+        f"JOIN ({silver_counts}) silver USING (table_name) ORDER BY table_name"
+    ).fetchall()
+
+
 def check_bronze_silver_integrity(silver_db_connection: duckdb.DuckDBPyConnection) -> bool:
-    """Compares Bronze CSV row counts with Silver DuckDB table row counts.
+    """Compares Bronze row counts with Silver DuckDB table row counts.
+
+    The rows of each transformed file come from the load ledger written by the
+    loader; the processed CSVs are only read when the database has no ledger.
 
     Logs results and returns True if all counts match, False otherwise.
 
@@ -76,6 +135,23 @@ def check_bronze_silver_integrity(silver_db_connection: duckdb.DuckDBPyConnectio
 
     logger.info(" Starting Bronze vs Silver Integrity Check ")
 
+    ledger_counts = get_ledger_row_counts(silver_db_connection)
+    if ledger_counts is not None:
+        logger.info("Comparing the Silver tables with the row counts of the load ledger...")
+        success = True
+        # The ledger counts the rows of the transformed files, not of the processed (Bronze) CSVs.
+        for table, transformed_count, silver_count in ledger_counts:
+            if transformed_count == silver_count:
+                logger.info(f"[PASS] {table}: Transformed={transformed_count}, Silver={silver_count}")
+            else:
+                logger.error(
+                    f"[FAIL] {table}: Transformed={transformed_count}, Silver={silver_count} "
+                    f"(Diff: {silver_count - transformed_count})"
+                )
+                success = False
+
+        return success
+
     bronze_counts = get_bronze_row_counts()
 
     # Get Silver tables
@@ -210,6 +286,43 @@ def check_silver_gold_integrity(
     return all_passed
 
 
+def check_silver_freshness(silver_db_connection: duckdb.DuckDBPyConnection) -> bool:
+    """Checks that every Silver table holds the latest data_base, from the profile written by the loader.
+
+    The latest data_base, rows and institutions of each table come from the
+    partition statistics, so no table is scanned.
+
+    Args:
+        silver_db_connection (duckdb.DuckDBPyConnection): Connection to the Silver DuckDB database.
+
+    Returns:
+        bool: True if every profiled table holds the latest data_base (or no table was profiled), False otherwise.
+    """
+
+    logger.info("\n Checking Silver Freshness ")
+
+    silver_table_names = {row[0] for row in silver_db_connection.execute("SHOW TABLES").fetchall()}
+    if PARTITION_STATISTICS_TABLE not in silver_table_names:
+        logger.warning("[SKIP] No partition statistics in Silver DB (load with SILVER_PROFILING to write them).")
+        return True
+
+    rows = silver_db_connection.execute(
+        f"SELECT table_name, max(data_base) AS latest, arg_max(row_count, data_base), "
+        f"arg_max(institution_count, data_base), max(max(data_base)) OVER () "
+        f"FROM {PARTITION_STATISTICS_TABLE} GROUP BY table_name ORDER BY table_name"
+    ).fetchall()
+
+    all_fresh = True
+    for table_name, latest, row_count, institution_count, overall_latest in rows:
+        if latest < overall_latest:
+            logger.warning(f"[STALE] {table_name}: latest data_base {latest} (others reach {overall_latest})")
+            all_fresh = False
+        else:
+            logger.info(f"[PASS] {table_name}: {latest} ({row_count} rows, {institution_count} institutions)")
+
+    return all_fresh
+
+
 def check_silver_duplicates(silver_db_connection: duckdb.DuckDBPyConnection) -> bool:
     """Checks for duplicates in Silver tables using PK (codigo, data_base).
 
@@ -429,8 +542,10 @@ def main():
         logger.error(f"Gold DB not found at {Cfg.GOLD_DATABASE_FILE}")
         return
 
-    silver_db_connection = duckdb.connect(str(Cfg.SILVER_DATABASE_FILE), read_only=True)
-    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True)
+    silver_db_connection = duckdb.connect(str(Cfg.SILVER_DATABASE_FILE), read_only=True, config=duckdb_settings())
+    log_duckdb_settings(silver_db_connection, Cfg.SILVER_DATABASE_FILE.name)
+    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True, config=duckdb_settings())
+    log_duckdb_settings(gold_db_connection, Cfg.GOLD_DATABASE_FILE.name)
 
     all_passed = True
 
@@ -438,16 +553,19 @@ def main():
     if not check_bronze_silver_integrity(silver_db_connection):
         all_passed = False
 
-    # 2. Duplicate Checks
+    # 2. Silver Freshness Check (from the profile of the loader)
+    check_silver_freshness(silver_db_connection)  # Warn only
+
+    # 3. Duplicate Checks
     check_silver_duplicates(silver_db_connection)  # Warn only
     if not check_gold_duplicates(gold_db_connection):
         all_passed = False
 
-    # 3. Silver vs Gold Check (Sums)
+    # 4. Silver vs Gold Check (Sums)
     if not check_silver_gold_integrity(silver_db_connection, gold_db_connection):
         all_passed = False
 
-    # 4. Report Generation (Optional)
+    # 5. Report Generation (Optional)
     if args.generate_report:
         generate_institution_report(gold_db_connection, args.generate_report, args.report_type)
 
@@ -1,5 +1,5 @@
 """This script performs a comprehensive audit of the SICOOB Credijequitinhonha institution's financial summary data
-in the Gold database against the original source CSV files. It checks all key financial accounts for both the first
+in the Gold database against the transformed source files. It checks all key financial accounts for both the first
 and last available dates, ensuring complete parity between Gold and Source.
 """
 import sys
@@ -15,9 +15,11 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.bacen_ifdata.data_transformer.storage import read_transformed_data
 from src.bacen_ifdata.utilities.configurations import Config as Cfg
+from src.bacen_ifdata.utilities.duckdb_settings import duckdb_settings, log_duckdb_settings
 
-# Define the directory where the transformed CSV files are located
+# Define the directory where the transformed files are located
 TRANSFORMED_DIR = Cfg.TRANSFORMED_FILES_DIRECTORY / 'individual_institutions' / 'summary'
 
 # SICOOB Credijequitinhonha Metadata
@@ -26,7 +28,7 @@ DATES = [20221201, 20231201, 20241201]
 
 
 def get_source_data(date_id: int) -> dict | None:
-    """Reads the source CSV for a given date_id (YYYYMMDD) and returns the SICOOB row.
+    """Reads the transformed source file for a given date_id (YYYYMMDD) and returns the SICOOB row.
     Scans files to handle naming mismatches in historical data.
 
     Args:
@@ -39,31 +41,31 @@ def get_source_data(date_id: int) -> dict | None:
     target_date_str = f"{str(date_id)[:4]}-{str(date_id)[4:6]}-01"
 
     # Try the most likely file first
-    likely_file = TRANSFORMED_DIR / f"{str(date_id)[:4]}-{str(date_id)[4:6]}.csv"
+    likely_file = TRANSFORMED_DIR / f"{str(date_id)[:4]}-{str(date_id)[4:6]}.{Cfg.TRANSFORMED_FILE_FORMAT}"
     files_to_check = [likely_file] if likely_file.exists() else []
 
     # Add adjacent months to check if not found (historical shifts)
-    all_files = list(TRANSFORMED_DIR.glob("*.csv"))
+    all_files = list(TRANSFORMED_DIR.glob(f"*.{Cfg.TRANSFORMED_FILE_FORMAT}"))
     files_to_check.extend([f for f in all_files if f != likely_file])
 
     for file_path in files_to_check:
         try:
-            # Quick check for date base in the first row
-            df_sample = pd.read_csv(file_path, nrows=1)
+            # Quick check of the date base, reading only that column
+            df_sample = read_transformed_data(file_path, columns=['data_base'])
             if df_sample.empty:
                 continue
 
             file_date = str(df_sample['data_base'].iloc[0])
             if target_date_str in file_date:
-                df = pd.read_csv(file_path)
-                row = df[df['codigo'].astype(float).astype(int) == INSTITUTION_ID]
+                df = read_transformed_data(file_path)
+                row = df[df['codigo'] == INSTITUTION_ID]
                 if not row.empty:
                     logger.info(f"Found {target_date_str} in {file_path.name}")
                     return row.iloc[0].to_dict()
-        except (FileNotFoundError, pd.errors.ParserError, KeyError):
+        except (FileNotFoundError, pd.errors.ParserError, KeyError, ValueError):
             continue
 
-    logger.warning(f"Could not find source data for {target_date_str} in any CSV.")
+    logger.warning(f"Could not find source data for {target_date_str} in any transformed file.")
 
     return None
 
@@ -75,7 +77,8 @@ def main():
         logger.error(f"Gold DB not found at {Cfg.GOLD_DATABASE_FILE}")
         return
 
-    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True)
+    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True, config=duckdb_settings())
+    log_duckdb_settings(gold_db_connection, Cfg.GOLD_DATABASE_FILE.name)
 
     try:
         # 1. Fetch Gold Data
@@ -102,7 +105,7 @@ def main():
             return
 
         # 2. Perform Comparison
-        logger.info("Comparing Gold results with Source CSVs (In-Memory)...")
+        logger.info("Comparing Gold results with Source files (In-Memory)...")
 
         field_map = {
             "capital_principal_para_comparacao_com_rwa": "capital_principal",
@@ -1,5 +1,5 @@
 """This script performs a comprehensive audit of the SICREDI institution's prudential balance sheet data
-in the Gold database against the original source CSV files. It checks all key financial accounts for both the first
+in the Gold database against the transformed source files. It checks all key financial accounts for both the first
 and last available dates, ensuring complete parity between Gold and Source.
 """
 
@@ -16,9 +16,11 @@ project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+from src.bacen_ifdata.data_transformer.storage import read_transformed_data
 from src.bacen_ifdata.utilities.configurations import Config as Cfg
+from src.bacen_ifdata.utilities.duckdb_settings import duckdb_settings, log_duckdb_settings
 
-# Define the directory where the transformed CSV files are located
+# Define the directory where the transformed files are located
 TRANSFORMED_DIR = Cfg.TRANSFORMED_FILES_DIRECTORY / 'prudential_conglomerates'
 
 # Sicredi Prudential Metadata
@@ -27,7 +29,7 @@ DATES = [20101201, 20151201, 20201201]
 
 
 def get_source_data(date_id: int, segment: str) -> dict | None:
-    """Reads the source CSV for a given date_id (YYYYMMDD) and returns the Sicredi row.
+    """Reads the transformed source file for a given date_id (YYYYMMDD) and returns the Sicredi row.
     Scans files to handle naming mismatches in historical data.
 
     Args:
@@ -42,23 +44,23 @@ def get_source_data(date_id: int, segment: str) -> dict | None:
     segment_directory = TRANSFORMED_DIR / segment
 
     # Try the most likely file first
-    likely_file = segment_directory / f"{str(date_id)[:4]}-{str(date_id)[4:6]}.csv"
+    likely_file = segment_directory / f"{str(date_id)[:4]}-{str(date_id)[4:6]}.{Cfg.TRANSFORMED_FILE_FORMAT}"
     files_to_check = [likely_file] if likely_file.exists() else []
 
     # Add all files to check if not found (historical shifts)
-    all_files = list(segment_directory.glob("*.csv"))
+    all_files = list(segment_directory.glob(f"*.{Cfg.TRANSFORMED_FILE_FORMAT}"))
     files_to_check.extend([f for f in all_files if f != likely_file])
 
     for file_path in files_to_check:
         try:
-            df_sample = pd.read_csv(file_path, nrows=1)
+            df_sample = read_transformed_data(file_path, columns=['data_base'])
             if df_sample.empty:
                 continue
 
             file_date = str(df_sample['data_base'].iloc[0])
             if target_date_str in file_date:
-                df = pd.read_csv(file_path)
-                row = df[df['codigo'].astype(float).astype(int) == INST_CODIGO]
+                df = read_transformed_data(file_path)
+                row = df[df['codigo'] == INST_CODIGO]
                 if not row.empty:
                     logger.debug(f"Found {target_date_str} in {segment}/{file_path.name}")
                     return row.iloc[0].to_dict()
@@ -75,7 +77,8 @@ def main():
         logger.error(f"Gold DB not found at {Cfg.GOLD_DATABASE_FILE}")
         return
 
-    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True)
+    gold_db_connection = duckdb.connect(str(Cfg.GOLD_DATABASE_FILE), read_only=True, config=duckdb_settings())
+    log_duckdb_settings(gold_db_connection, Cfg.GOLD_DATABASE_FILE.name)
 
     try:
         logger.info(f"Fetching Gold data for SICREDI (Code: {INST_CODIGO})...")
@@ -102,7 +105,7 @@ def main():
             logger.error(f"No Gold data found for SICREDI in dates {DATES}")
             return
 
-        logger.info("Comparing Gold results with Source CSVs...")
+        logger.info("Comparing Gold results with Source files...")
 
         # Field mapping Source -> Gold
         # Assets
@@ -0,0 +1,93 @@
+"""This script measures the import time of the pipeline entry points in fresh interpreters.
+
+Each target is imported several times in a new ``python`` process (so nothing is cached in
+``sys.modules``), and the median wall time, the number of loaded modules and the heavy
+third-party packages that were pulled in are reported. Run it before and after changing the
+imports of the CLI path to see the effect on short ``ifdata -l -i X -r Y`` invocations.
+
+Usage:
+    python scripts/benchmark_import_time.py [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+# Add the project sources to the import path of the child interpreters.
+SOURCE_DIRECTORY = Path(__file__).resolve().parent.parent / 'src'
+
+# Modules imported by the CLI before a stage runs.
+TARGETS = [
+    'bacen_ifdata.application',
+    'bacen_ifdata.data_transformer.schemas.mapper',
+    'bacen_ifdata.main.loader',
+    'bacen_ifdata.main.transformer',
+]
+
+# Third-party packages that should only be imported by the stage that needs them.
+HEAVY_PACKAGES = ['selenium', 'pandas', 'numpy', 'pyarrow', 'duckdb']
+
+# Code run in the child interpreter; prints the measurements as JSON.
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {target}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': len(sys.modules),
+                  'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def measure_import(target: str, runs: int) -> dict:
+    """Imports a module in fresh interpreters and summarizes the measurements.
+
+    Args:
+        target (str): The dotted name of the module to import.
+        runs (int): The number of fresh interpreters to start.
+
+    Returns:
+        dict: The median time in seconds, the number of modules and the heavy packages loaded.
+    """
+
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', PROBE.format(target=target, heavy=HEAVY_PACKAGES)],
+            env={**os.environ, 'PYTHONPATH': str(SOURCE_DIRECTORY)},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        samples.append(json.loads(result.stdout))
+
+    return {
+        'seconds': statistics.median(sample['seconds'] for sample in samples),
+        'modules': samples[-1]['modules'],
+        'heavy': samples[-1]['heavy'],
+    }
+
+
+def main() -> None:
+    """Runs the benchmark for every target and logs a summary line per target."""
+
+    parser = argparse.ArgumentParser(description='Measure the import time of the pipeline entry points.')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per target (default: 10).')
+    arguments = parser.parse_args()
+
+    for target in TARGETS:
+        measurement = measure_import(target, arguments.runs)
+        heavy = ', '.join(measurement['heavy']) or 'none'
+        logger.info(
+            f"{target}: {measurement['seconds'] * 1000:.0f} ms (median of {arguments.runs}), "
+            f"{measurement['modules']} modules, heavy packages: {heavy}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""This script measures representative gold queries on a silver table before and after clustering it.
+
+A synthetic report table shaped like the silver summaries (one row per ``codigo`` and
+``data_base``, a few dozen amount columns) is loaded with its rows in no particular
+order, as a parallel multi-file scan without insertion order leaves it. The same queries the gold models
+and the audits run (one data_base, the history of one institution, a join of two reports
+on the natural key over the last year) are then timed on the table as loaded, after
+``DatabaseService.cluster_table`` rewrites it in ``(data_base, codigo)`` order, and with
+the optional ART index on the natural key.
+
+Usage:
+    python scripts/benchmark_silver_clustering.py [--institutions 20000] [--quarters 80] [--runs 5]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from loguru import logger
+
+# pylint: disable=wrong-import-position
+# Add the project sources to the import path.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from bacen_ifdata.data_loader.storage import DatabaseService
+
+# Number of amount columns of the synthetic reports.
+AMOUNT_COLUMNS = 30
+
+# Queries run by the benchmark, by name ({data_base} is the latest quarter, {codigo} an institution).
+QUERIES = {
+    'one data_base': "SELECT count(*), sum(valor_0) FROM silver_assets WHERE data_base = DATE '{data_base}'",
+    'one institution': "SELECT data_base, valor_0 FROM silver_assets WHERE codigo = {codigo} ORDER BY data_base",
+    'join last year': (
+        "SELECT a.data_base, sum(a.valor_0 - l.valor_0) FROM silver_assets a "
+        "JOIN silver_liabilities l ON a.codigo = l.codigo AND a.data_base = l.data_base "
+        "WHERE a.data_base > DATE '{data_base}' - INTERVAL 1 YEAR GROUP BY a.data_base"
+    ),
+}
+
+
+def load_table(service: DatabaseService, table_name: str, institutions: int, quarters: int) -> None:
+    """Creates a synthetic report table holding its quarters in no particular order.
+
+    A multi-file scan of every quarter read by several threads, without insertion
+    order, interleaves the rows of the files in the same row groups.
+
+    Args:
+        service (DatabaseService): The service of the benchmark database.
+        table_name (str): The name of the table.
+        institutions (int): The number of institutions (codigo) of each quarter.
+        quarters (int): The number of quarters (data_base).
+    """
+
+    amounts = ', '.join(f'valor_{index} DOUBLE' for index in range(AMOUNT_COLUMNS))
+    service.connection.execute(f'CREATE TABLE {table_name} (codigo BIGINT, data_base DATE, {amounts});')
+
+    amount_values = ', '.join(f'random() * 1e9 AS valor_{index}' for index in range(AMOUNT_COLUMNS))
+    service.connection.execute(
+        f"INSERT INTO {table_name} SELECT codigo, DATE '2000-03-01' + INTERVAL (quarter * 3) MONTH, {amount_values} "
+        f"FROM (SELECT i.range AS codigo, q.range AS quarter FROM range({institutions}) i, range({quarters}) q) "
+        "ORDER BY hash(codigo, quarter);"
+    )
+
+
+def time_queries(service: DatabaseService, runs: int, data_base: str, codigo: int) -> dict[str, float]:
+    """Runs each query several times and returns the median time of each one.
+
+    Args:
+        service (DatabaseService): The service of the benchmark database.
+        runs (int): The number of runs of each query.
+        data_base (str): The latest quarter (ISO date).
+        codigo (int): The institution of the history query.
+
+    Returns:
+        dict[str, float]: The median seconds of each query, by name.
+    """
+
+    timings = {}
+    for name, query in QUERIES.items():
+        sql = query.format(data_base=data_base, codigo=codigo)
+        samples = []
+        for _ in range(runs):
+            start = perf_counter()
+            service.connection.execute(sql).fetchall()
+            samples.append(perf_counter() - start)
+        timings[name] = statistics.median(samples)
+
+    return timings
+
+
+def main() -> None:
+    """Runs the benchmark and logs the median time of each query in each layout."""
+
+    parser = argparse.ArgumentParser(description='Measure gold queries before and after clustering silver.')
+    parser.add_argument('--institutions', type=int, default=20000, help='Institutions per quarter (default: 20000).')
+    parser.add_argument('--quarters', type=int, default=80, help='Quarters per table (default: 80).')
+    parser.add_argument('--runs', type=int, default=5, help='Runs of each query (default: 5).')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        service = DatabaseService(Path(directory) / 'benchmark.duckdb')
+        for table_name in ('silver_assets', 'silver_liabilities'):
+            load_table(service, table_name, args.institutions, args.quarters)
+        service.connection.execute('CHECKPOINT;')
+
+        (data_base,) = service.connection.execute(
+            'SELECT CAST(max(data_base) AS VARCHAR) FROM silver_assets'
+        ).fetchone()
+        codigo = args.institutions // 2
+
+        results = {'as loaded': time_queries(service, args.runs, data_base, codigo)}
+
+        start = perf_counter()
+        for table_name in ('silver_assets', 'silver_liabilities'):
+            service.cluster_table(table_name)
+        service.connection.execute('CHECKPOINT;')
+        logger.info(f'Tables clustered in {perf_counter() - start:.2f}s.')
+        results['clustered'] = time_queries(service, args.runs, data_base, codigo)
+
+        for table_name in ('silver_assets', 'silver_liabilities'):
+            service.connection.execute(f'CREATE INDEX "{table_name}_key" ON {table_name} (codigo, data_base);')
+        results['clustered + ART index'] = time_queries(service, args.runs, data_base, codigo)
+        service.close()
+
+    rows = args.institutions * args.quarters
+    logger.info(f'Median of {args.runs} run(s) per query, {rows:,} rows per table:')
+    for name in QUERIES:
+        before = results['as loaded'][name]
+        timings = ', '.join(f'{layout}: {timing[name] * 1000:.1f} ms' for layout, timing in results.items())
+        logger.info(f'{name:>16} | {timings} | {before / results["clustered"][name]:.1f}x after clustering')
+
+
+if __name__ == '__main__':
+    main()
@@ -28,6 +28,21 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.pipeline import Pipeline
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bacen_ifdata.pipeline import Pipeline
+
+
+def __getattr__(name: str):
+    """Resolves Pipeline on first access, so importing a subpackage stays cheap."""
+
+    if name == 'Pipeline':
+        from bacen_ifdata.pipeline import Pipeline  # pylint: disable=import-outside-toplevel
+
+        return Pipeline
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = ['Pipeline']
@@ -25,19 +25,18 @@ of all dependencies required to run the IF.data pipeline.
 """
 
 from types import TracebackType
+from typing import TYPE_CHECKING
 
 from loguru import logger
 
-from bacen_ifdata.data_transformer.controller import TransformerController
-from bacen_ifdata.data_transformer.transformer_factory import get_transformer
 from bacen_ifdata.interfaces import PipelineManagerProtocol, SessionProtocol
 from bacen_ifdata.manager import PipelineManager
 from bacen_ifdata.pipeline import Pipeline
-from bacen_ifdata.scraper.interfaces.interacting import Browser
-from bacen_ifdata.scraper.session import Session
-from bacen_ifdata.scraper.utils import initialize_webdriver
 from bacen_ifdata.utilities.configurations import Config
 
+if TYPE_CHECKING:
+    from bacen_ifdata.data_transformer.interfaces.controller import TransformerControllerInterface
+
 
 class Application:
     """Application factory that manages the lifecycle of all pipeline dependencies.
@@ -48,6 +47,7 @@ class Application:
 
     The browser/session is initialized lazily - only when the scraper is actually
     used, avoiding unnecessary resource allocation for cleaner/transformer operations.
+    Likewise, selenium, pandas and duckdb are only imported by the stages that use them.
 
     Usage:
         with Application(enable_cleanup=True) as app:
@@ -77,12 +77,11 @@ class Application:
 
         logger.info('Initializing Bacen IF.data Application...')
 
-        # Create transformer controller with factory.
-        transformer_controller = TransformerController(get_transformer)
-
-        # Create pipeline with session factory for lazy initialization.
-        # The session is only created when scraper needs it.
-        pipeline = Pipeline(transformer_controller, session_factory=self._get_session)
+        # Create pipeline with session and transformer controller factories for lazy initialization.
+        # The session is only created when scraper needs it, and the controller when the transformer does.
+        pipeline = Pipeline(
+            session_factory=self._get_session, transformer_controller_factory=self._create_transformer_controller
+        )
 
         self._pipeline_manager = PipelineManager(pipeline)
         self._is_initialized = True
@@ -118,6 +117,27 @@ class Application:
 
         return False  # Don't suppress exceptions
 
+    @staticmethod
+    def _create_transformer_controller() -> 'TransformerControllerInterface':
+        """Create the transformer controller on demand.
+
+        Returns:
+            The TransformerController, with the transformer factory, the shared categorical
+            dictionaries and the disk-cached schema plans.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from bacen_ifdata.data_transformer.controller import TransformerController
+        from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+        from bacen_ifdata.data_transformer.schemas.plan import SchemaPlanRegistry
+        from bacen_ifdata.data_transformer.transformer_factory import get_transformer
+
+        return TransformerController(
+            get_transformer,
+            CategoricalDictionaryRegistry(Config.CATEGORICAL_DICTIONARY_FILE),
+            SchemaPlanRegistry(Config.SCHEMA_PLAN_DIRECTORY),
+        )
+
     def _initialize_session(self) -> SessionProtocol:
         """Initialize the browser and session on demand.
 
@@ -127,6 +147,11 @@ class Application:
 
         logger.info('Initializing browser session...')
 
+        # pylint: disable=import-outside-toplevel
+        from bacen_ifdata.scraper.interfaces.interacting import Browser
+        from bacen_ifdata.scraper.session import Session
+        from bacen_ifdata.scraper.utils import initialize_webdriver
+
         # Create browser components.
         driver = initialize_webdriver()
         browser = Browser(driver)
@@ -4,38 +4,20 @@ WITH unpivoted AS (
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_portfolio_legal_person_economic_activity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_carteira_pessoa_juridica, total_nao_individualizado_pessoa_juridica, total_exterior_pessoa_juridica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_portfolio_legal_person_economic_activity_long') }}
 
     UNION ALL
 
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro (SCR)' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_legal_person_economic_activity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_da_carteira_de_pessoa_juridica, total_exterior_pessoa_juridica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_legal_person_economic_activity_long') }}
 ),
 mapped AS (
     SELECT
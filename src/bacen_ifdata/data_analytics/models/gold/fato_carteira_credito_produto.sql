@@ -4,38 +4,20 @@ WITH unpivoted_pf AS (
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_portfolio_individuals_type_maturity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_carteira_pessoa_fisica, total_exterior_pessoa_fisica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_portfolio_individuals_type_maturity_long') }}
 
     UNION ALL
 
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro (SCR)' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_individuals_type_maturity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_da_carteira_de_pessoa_fisica, total_exterior_pessoa_fisica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_individuals_type_maturity_long') }}
 ),
 pf_mapped AS (
     SELECT
@@ -54,38 +36,20 @@ unpivoted_pj AS (
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_portfolio_legal_person_type_maturity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_carteira_pessoa_juridica, total_exterior_pessoa_juridica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_portfolio_legal_person_type_maturity_long') }}
 
     UNION ALL
 
     SELECT 
         codigo, 
         data_base, 
-        nome_coluna, 
+        nome_coluna::VARCHAR as nome_coluna, 
         valor,
         'Conglomerado Financeiro (SCR)' as tipo_instituicao
-    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_legal_person_type_maturity') }}
-    UNPIVOT (
-        valor FOR nome_coluna IN (
-            COLUMNS(* EXCLUDE (
-                instituicao, codigo, consolidado_bancario, tipo_de_consolidacao, tipo_de_controle,
-                segmento_resolucao, segmento, cidade, uf, regiao, data_base,
-                total_da_carteira_de_pessoa_juridica, total_exterior_pessoa_juridica
-            ))
-        )
-    )
+    FROM {{ source('silver', 'financial_conglomerates_scr_portfolio_legal_person_type_maturity_long') }}
 ),
 pj_mapped AS (
     SELECT
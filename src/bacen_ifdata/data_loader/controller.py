@@ -1,15 +1,50 @@
 """Controller for loading data from reports into the database."""
 
+import dataclasses
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
+from time import perf_counter
 
 import duckdb as db
+import pyarrow as pa
 from loguru import logger
 
+from bacen_ifdata.data_loader.incremental import (
+    IncrementalLoadPlan,
+    LoadedFile,
+    LoadLedger,
+    changed_files,
+    describe_file,
+    file_digest,
+    file_digests,
+    is_unmodified,
+    plan_incremental_load,
+)
+from bacen_ifdata.data_loader.layouts import FileLayout, LayoutRegistry, LayoutStatus
+from bacen_ifdata.data_loader.profiling import TableProfiler
 from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.long_format import LONG_TABLE_SUFFIX, is_long_format, long_file_path
 from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.plan import schema_fingerprint
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 
+# Identifier of the run of this process, shared by its controllers so the stage timings of a run can be grouped.
+RUN_ID = uuid.uuid4().hex
+
+
+@dataclasses.dataclass
+class StageTiming:
+    """The time spent in a stage of the load of a table."""
+
+    stage: str
+    started_at: datetime
+    seconds: float = 0.0
+
 
 # pylint: disable=too-few-public-methods
 class LoaderController:
@@ -19,41 +54,457 @@ class LoaderController:
     into the database.
     """
 
-    def __init__(self, database_service: DatabaseService | None = None) -> None:
+    def __init__(self, database_service: DatabaseService | None = None, run_id: str = RUN_ID) -> None:
         """Initializes a new instance of the LoaderController class.
 
         Args:
             database_service (DatabaseService, optional): The database service instance.
                                                           Defaults to a new instance.
+            run_id (str): The identifier of the run in the stage timings. Defaults to the run of this process.
         """
 
         self._database_service = database_service or DatabaseService()
+        self._ledger = LoadLedger(self._database_service)
+        self._layout_registry = LayoutRegistry(self._database_service)
+        self._profiler = TableProfiler(self._database_service)
+        self.run_id = run_id
+
+    def cursor(self) -> 'LoaderController':
+        """Return a controller over a new cursor of the same database connection, for another thread."""
+
+        return LoaderController(self._database_service.cursor(), self.run_id)
+
+    def close(self) -> None:
+        """Close the database connection (or cursor) of the controller."""
+
+        self._database_service.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Load the enclosed reports in one transaction, so a failing file leaves no half-populated table."""
+
+        with self._database_service.transaction():
+            yield
+
+    @contextmanager
+    def timed_stage(self, institution: Institutions, report: StrEnum, stage: str) -> Iterator[StageTiming]:
+        """Time a stage of the load of a report, recorded in the stage timings table if it succeeds.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            stage (str): The name of the stage (e.g. sync, load, cluster, profile, ledger).
+
+        Yields:
+            StageTiming: The timing of the stage; its seconds are set when the block ends.
+        """
+
+        timing = StageTiming(stage, datetime.now())
+        start = perf_counter()
+        yield timing
+        timing.seconds = perf_counter() - start
+
+        self._ledger.record_stage_timing(
+            self.run_id, self._table_name(institution, report), stage, timing.started_at, timing.seconds
+        )
+
+    @staticmethod
+    def _table_name(institution: Institutions, report: StrEnum) -> str:
+        """Return the table name of a report.
+
+        Format: institution_report (e.g., financial_conglomerates_summary).
+        """
+
+        return f'{institution.name.lower()}_{report.name.lower()}'
+
+    def set_dictionary_registry(self, dictionary_registry: CategoricalDictionaryRegistry | None) -> None:
+        """Replace the categorical dictionaries the ENUM types of the next loads are built from.
+
+        Args:
+            dictionary_registry (CategoricalDictionaryRegistry | None): The dictionaries of the next loads.
+        """
+
+        self._database_service.set_dictionary_registry(dictionary_registry)
+
+    def resolve_column_types(self, input_files: list[Path | pa.Table], schema: BaseSchema) -> dict[str, str]:
+        """Resolve the narrow DuckDB types that hold every transformed file of a report.
+
+        Args:
+            input_files (list[Path | pa.Table]): The transformed files of the report, or their Arrow tables.
+            schema (BaseSchema): The schema to be used for the table.
+
+        Returns:
+            dict[str, str]: The narrow DuckDB type of each column that can use one.
+        """
+
+        return self._database_service.resolve_column_types(input_files, schema)
+
+    def check_report_layouts(
+        self, institution: Institutions, report: StrEnum, input_files: list[Path], schema: BaseSchema
+    ) -> list[Path]:
+        """Classify the header of each transformed file of a report, and return the files that can be loaded.
+
+        Files with a new layout are loaded (the columns the table lacks are left
+        out, the ones the file lacks are NULL); incompatible files are skipped. Both
+        are registered in the header registry and reported at the end of the run.
 
-    def load_report(self, institution: Institutions, report: StrEnum, input_data: Path, schema: BaseSchema) -> None:
-        """Load data from the source CSV file into the database.
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_files (list[Path]): The transformed files of the report.
+            schema (BaseSchema): The schema of the report.
+
+        Returns:
+            list[Path]: The files with a known or new layout, in the order of ``input_files``.
+        """
+
+        table_name = self._table_name(institution, report)
+        layouts = self._layout_registry.classify_files(table_name, input_files, schema, self.run_id)
+
+        drifted = sum(layout.status != LayoutStatus.KNOWN for layout in layouts)
+        if drifted:
+            logger.warning(f"{drifted} file(s) of '{table_name}' have a new or incompatible header layout.")
+
+        return [file for file, layout in zip(input_files, layouts) if layout.status != LayoutStatus.INCOMPATIBLE]
+
+    def layout_drift(self) -> dict[str, list[FileLayout]]:
+        """Return the new and incompatible header layouts found by the run of this controller, by table name."""
+
+        return self._layout_registry.layout_drift(self.run_id)
+
+    def sync_report_tables(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+    ) -> None:
+        """Create the tables of a report (wide, and long in long format), or sync them with the schema.
+
+        The DDL is applied once, in its own transaction, before the rows are
+        loaded; the later ``create_table`` calls of the load find the tables synced.
 
         Args:
             institution (Institutions): The institution of the report.
             report (StrEnum): The report type.
-            input_data (Path): The path to the CSV file to be loaded.
             schema (BaseSchema): The schema to be used for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types for the table columns. Defaults to None.
         """
 
-        # Determine table name
-        # Format: institution_report (e.g., financial_conglomerates_summary)
-        table_name = f'{institution.name.lower()}_{report.name.lower()}'
+        table_name = self._table_name(institution, report)
+        self._database_service.create_table(table_name, schema, column_types)
+        if is_long_format(schema):
+            self._database_service.create_long_table(table_name, schema)
+
+    def load_report(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        input_data: Path | pa.Table,
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+        source_name: str | None = None,
+    ) -> None:
+        """Load data from the transformed file (Parquet or CSV), or its in-memory Arrow table, into the database.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_data (Path | pa.Table): The path to the transformed file, or the transformed Arrow table.
+            schema (BaseSchema): The schema to be used for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types for the table columns. Defaults to None.
+            source_name (str | None): The name of the source file of an Arrow table, used in the logs.
+                                      Defaults to None.
+        """
 
-        logger.info(f'Preparing to load {input_data.name} into table {table_name}...')
+        table_name = self._table_name(institution, report)
+        source_name = source_name or (input_data.name if isinstance(input_data, Path) else 'arrow table')
+
+        logger.info(f'Preparing to load {source_name} into table {table_name}...')
 
         try:
             # Ensure the table exists and has the correct schema/comments
-            self._database_service.create_table(table_name, schema)
+            self._database_service.create_table(table_name, schema, column_types)
+
+            # Insert the data, scanning Arrow tables in place instead of going through a file.
+            if isinstance(input_data, pa.Table):
+                self._database_service.insert_arrow(table_name, input_data, schema, column_types, source_name)
+            else:
+                self._database_service.insert_data(table_name, input_data, schema, column_types)
+
+            logger.info(f'Successfully loaded {institution.name} - {report.name}.')
+
+        except db.Error as error:
+            logger.error(f'Failed to load {institution.name} - {report.name}: {error}')
+            raise
+
+    def load_report_files(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        input_files: list[Path],
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+    ) -> None:
+        """Load every transformed file of a report at once, creating the table a single time.
 
-            # Insert the data
-            self._database_service.insert_data(table_name, input_data, schema)
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_files (list[Path]): The transformed files (Parquet or CSV) of the report.
+            schema (BaseSchema): The schema to be used for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types for the table columns. Defaults to None.
+        """
+
+        table_name = self._table_name(institution, report)
+
+        logger.info(f'Preparing to bulk load {len(input_files)} file(s) into table {table_name}...')
+
+        try:
+            self._database_service.create_table(table_name, schema, column_types)
+            self._database_service.insert_files(table_name, input_files, schema, column_types)
 
             logger.info(f'Successfully loaded {institution.name} - {report.name}.')
 
         except db.Error as error:
             logger.error(f'Failed to load {institution.name} - {report.name}: {error}')
             raise
+
+    def record_report_files(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        input_files: list[Path],
+        schema: BaseSchema,
+        load_seconds: float | None = None,
+    ) -> None:
+        """Record every transformed file of a fully loaded report in the load ledger.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_files (list[Path]): The transformed files loaded into the table.
+            schema (BaseSchema): The schema the files were loaded with.
+            load_seconds (float | None): The seconds of the load that inserted the files. Defaults to None.
+        """
+
+        statistics = self._database_service.read_file_statistics(input_files)
+        schema_version = schema_fingerprint(schema)
+
+        entries = []
+        for file in input_files:
+            partitions, row_count = statistics[file.name]
+            entries.append(
+                describe_file(
+                    file,
+                    LoadedFile(file.name, file_digest(file), partitions),
+                    row_count=row_count,
+                    load_seconds=load_seconds,
+                    schema_version=schema_version,
+                )
+            )
+
+        self._ledger.record_loaded_files(self._table_name(institution, report), entries, replace=True)
+
+    def load_report_incremental(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        input_files: list[Path],
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+        complete: bool = True,
+    ) -> IncrementalLoadPlan:
+        """Load only the new or changed transformed files of a report, replacing their data_base partitions.
+
+        Files are compared with the load ledger by the hash of their content (read
+        only when their size or modification time changed). The partitions of the
+        changed files are deleted from the table (and from the long table, in long
+        format) and the files are inserted again, in one transaction. Tables that no
+        longer match the schema are loaded from scratch.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_files (list[Path]): The transformed files (Parquet or CSV) of the report.
+            schema (BaseSchema): The schema to be used for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types for the table columns. Defaults to None.
+            complete (bool): Whether ``input_files`` are every transformed file of the report. Defaults to True
+                             (see ``plan_incremental_load``).
+
+        Returns:
+            IncrementalLoadPlan: The files and partitions that were reloaded, with their ledger entries.
+        """
+
+        table_name = self._table_name(institution, report)
+        ledger = self._ledger.loaded_files(table_name)
+
+        try:
+            with self.timed_stage(institution, report, 'plan'):
+                if not self._database_service.align_report_tables(table_name, schema, column_types):
+                    logger.info(
+                        f"Table '{table_name}' does not match the schema (or is missing); loading it from scratch."
+                    )
+                    self._database_service.drop_table(f'{table_name}{LONG_TABLE_SUFFIX}')
+                    self._database_service.drop_table(table_name)
+                    self._ledger.forget_table(table_name)
+                    ledger = {}
+
+                digests = file_digests(input_files, ledger)
+                changed = changed_files(input_files, digests, ledger)
+                statistics = self._database_service.read_file_statistics(changed) if changed else {}
+                load_plan = plan_incremental_load(
+                    input_files,
+                    digests,
+                    ledger,
+                    {file_name: partitions for file_name, (partitions, _) in statistics.items()},
+                    complete,
+                )
+
+                # Files rewritten with the same content are recorded as they are now, so they are not hashed again.
+                reloaded = {file.name for file in load_plan.files}
+                self._ledger.refresh_loaded_files(
+                    table_name,
+                    [
+                        describe_file(file, ledger[file.name])
+                        for file in input_files
+                        if file.name in ledger
+                        and file.name not in reloaded
+                        and not is_unmodified(file, ledger[file.name])
+                    ],
+                )
+
+            if not load_plan.files:
+                logger.info(f"Table '{table_name}' is up to date ({load_plan.unchanged} file(s) unchanged).")
+                return load_plan
+
+            logger.info(
+                f"Reloading {len(load_plan.files)} file(s) of '{table_name}' ({len(load_plan.partitions)} "
+                f"partition(s)); {load_plan.unchanged} file(s) unchanged."
+            )
+            self.sync_report_tables(institution, report, schema, column_types)
+            # The wide and long partitions are replaced together, in one transaction.
+            with self.timed_stage(institution, report, 'load') as load_timing, self._database_service.transaction():
+                self._database_service.replace_partitions(
+                    table_name, load_plan.files, load_plan.partitions, schema, column_types
+                )
+
+                if is_long_format(schema):
+                    long_files = [long_file_path(file.parent, file.name) for file in load_plan.files]
+                    self._database_service.replace_long_partitions(
+                        table_name, [file for file in long_files if file.exists()], load_plan.partitions, schema
+                    )
+
+            # The unchanged files reloaded with the changed ones keep the row count of their entry.
+            uncounted = [
+                file
+                for file, entry in zip(load_plan.files, load_plan.entries)
+                if file.name not in statistics and entry.row_count is None
+            ]
+            if uncounted:
+                statistics.update(self._database_service.read_file_statistics(uncounted))
+
+            schema_version = schema_fingerprint(schema)
+            entries = [
+                describe_file(
+                    file,
+                    entry,
+                    row_count=statistics[file.name][1] if file.name in statistics else entry.row_count,
+                    load_seconds=load_timing.seconds,
+                    schema_version=schema_version,
+                )
+                for file, entry in zip(load_plan.files, load_plan.entries)
+            ]
+
+            # The ledger is written last: a failed load is simply redone by the next run.
+            with self.timed_stage(institution, report, 'ledger'):
+                self._ledger.record_loaded_files(table_name, entries, load_plan.forgotten)
+
+        except db.Error as error:
+            logger.error(f'Failed to load {institution.name} - {report.name} incrementally: {error}')
+            raise
+
+        return dataclasses.replace(load_plan, entries=entries)
+
+    def cluster_report_tables(self, institution: Institutions, report: StrEnum, schema: BaseSchema) -> None:
+        """Keep the tables of a report (wide, and long in long format) in ``(data_base, codigo)`` order.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            schema (BaseSchema): The schema of the report.
+        """
+
+        table_name = self._table_name(institution, report)
+        self._database_service.cluster_table(table_name)
+        if is_long_format(schema):
+            self._database_service.cluster_table(f'{table_name}{LONG_TABLE_SUFFIX}')
+
+    def profile_report_tables(self, institution: Institutions, report: StrEnum, schema: BaseSchema) -> None:
+        """Profile the tables of a report (wide, and long in long format) and refresh their optimizer statistics.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            schema (BaseSchema): The schema of the report.
+        """
+
+        table_name = self._table_name(institution, report)
+        self._profiler.profile_table(table_name)
+        if is_long_format(schema):
+            self._profiler.profile_table(f'{table_name}{LONG_TABLE_SUFFIX}')
+
+    def create_long_table(self, institution: Institutions, report: StrEnum, schema: BaseSchema) -> None:
+        """Create the long table of a report stored in long format, even if it gets no rows.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            schema (BaseSchema): The schema of the report.
+        """
+
+        self._database_service.create_long_table(self._table_name(institution, report), schema)
+
+    def load_long_report(
+        self,
+        institution: Institutions,
+        report: StrEnum,
+        input_data: Path | list[Path] | pa.Table,
+        schema: BaseSchema,
+        source_name: str | None = None,
+    ) -> None:
+        """Load the long part of transformed files (Parquet), or of an Arrow table, into the long table.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            input_data (Path | list[Path] | pa.Table): The path to the long file, the long files of the report
+                                                       (loaded by one scan), or the long Arrow table.
+            schema (BaseSchema): The schema of the report.
+            source_name (str | None): The name of the source file of an Arrow table, used in the logs.
+                                      Defaults to None.
+        """
+
+        table_name = self._table_name(institution, report)
+        if isinstance(input_data, list):
+            source_name = source_name or f'{len(input_data)} long file(s)'
+        source_name = source_name or (input_data.name if isinstance(input_data, Path) else 'arrow table')
+
+        try:
+            self._database_service.create_long_table(table_name, schema)
+            self._database_service.insert_long_data(table_name, input_data, schema, source_name)
+
+        except db.Error as error:
+            logger.error(f'Failed to load {institution.name} - {report.name} in long format: {error}')
+            raise
+
+    def create_long_view(self, institution: Institutions, report: StrEnum, schema: BaseSchema) -> None:
+        """Expose the wide table of a report in long format through a view.
+
+        Args:
+            institution (Institutions): The institution of the report.
+            report (StrEnum): The report type.
+            schema (BaseSchema): The schema of the report.
+        """
+
+        self._database_service.create_long_view(self._table_name(institution, report), schema)
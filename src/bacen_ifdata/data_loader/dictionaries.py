@@ -0,0 +1,120 @@
+"""Dictionary tables of the silver database.
+
+The ``categorical_dictionary`` table holds the code, value and description of
+every category of the shared categorical dictionaries, so the ENUM columns of
+the silver tables can be read by their descriptions. The ``column_dictionary``
+table does the same for the ``nome_coluna`` ENUM of the long tables: the code
+and description of each amount column.
+"""
+
+from typing import TYPE_CHECKING
+
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan
+
+if TYPE_CHECKING:
+    from bacen_ifdata.data_loader.storage import DatabaseService
+
+
+def create_enum_type(database: 'DatabaseService', type_name: str, values: list[str]) -> str:
+    """Creates an ENUM type with the given values, unless the database already has it.
+
+    The values are SQL string literals, so their quotes are escaped (a column name
+    or category may hold an apostrophe).
+
+    Args:
+        database (DatabaseService): The service (or cursor) whose connection and DDL lock are used.
+        type_name (str): The name of the type.
+        values (list[str]): The values of the type, in code order.
+
+    Returns:
+        str: The quoted type name.
+    """
+
+    with database.ddl_lock:
+        exists = database.connection.execute(
+            "SELECT 1 FROM duckdb_types() WHERE type_name = ? AND database_name = current_database()", [type_name]
+        ).fetchone()
+
+        if not exists:
+            safe_values = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+            database.connection.execute(f'CREATE TYPE "{type_name}" AS ENUM ({safe_values});')
+
+    return f'"{type_name}"'
+
+
+class CategoricalDictionaryTable:
+    """The categorical dictionaries, with their descriptions, stored in the database of a service."""
+
+    # Table holding the categorical dictionaries (codes and schema mapping descriptions).
+    DICTIONARY_TABLE_NAME = 'categorical_dictionary'
+
+    def __init__(self, database: 'DatabaseService') -> None:
+        """Initialize the CategoricalDictionaryTable.
+
+        Args:
+            database (DatabaseService): The service (or cursor) whose connection and transactions are used.
+        """
+
+        self._database = database
+
+    def write(self, dictionary_registry: CategoricalDictionaryRegistry) -> None:
+        """Writes the shared categorical dictionaries, with their descriptions, replacing the previous ones.
+
+        Args:
+            dictionary_registry (CategoricalDictionaryRegistry): The dictionaries to write.
+        """
+
+        rows = [
+            (column, code, value, dictionary_registry.description(column, value))
+            for column in dictionary_registry.columns
+            for code, value in enumerate(dictionary_registry.categories(column))
+        ]
+
+        connection = self._database.connection
+        with self._database.transaction():
+            connection.execute(
+                f"CREATE OR REPLACE TABLE {self.DICTIONARY_TABLE_NAME} "
+                "(column_name VARCHAR, code INTEGER, value VARCHAR, description VARCHAR);"
+            )
+            if rows:
+                connection.executemany(f"INSERT INTO {self.DICTIONARY_TABLE_NAME} VALUES (?, ?, ?, ?);", rows)
+
+
+class ColumnDictionaryTable:
+    """The amount columns of the long tables (and views), with their descriptions, stored in the database."""
+
+    # Table describing the amount columns of the long tables (code of each nome_coluna value and description).
+    COLUMN_DICTIONARY_TABLE_NAME = 'column_dictionary'
+
+    def __init__(self, database: 'DatabaseService') -> None:
+        """Initialize the ColumnDictionaryTable.
+
+        Args:
+            database (DatabaseService): The service (or cursor) whose connection is used.
+        """
+
+        self._database = database
+
+    def write(self, long_table_name: str, plan: SchemaPlan, value_columns: list[str]) -> None:
+        """Writes the amount columns of a long table, replacing its previous entries, in the current transaction.
+
+        Args:
+            long_table_name (str): The name of the long table (or view).
+            plan (SchemaPlan): The compiled schema plan of the report.
+            value_columns (list[str]): The amount columns, in code order.
+        """
+
+        connection = self._database.connection
+        connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.COLUMN_DICTIONARY_TABLE_NAME} "
+            "(table_name VARCHAR, code INTEGER, column_name VARCHAR, description VARCHAR);"
+        )
+        connection.execute(f"DELETE FROM {self.COLUMN_DICTIONARY_TABLE_NAME} WHERE table_name = ?;", [long_table_name])
+        connection.executemany(
+            f"INSERT INTO {self.COLUMN_DICTIONARY_TABLE_NAME} VALUES (?, ?, ?, ?);",
+            [
+                (long_table_name, code, column, plan.get_description(column))
+                for code, column in enumerate(value_columns)
+            ],
+        )
@@ -0,0 +1,37 @@
+"""Database Service Factory for Bacen IF.data
+
+This module provides a factory function to build the database service of the
+silver backend selected in the configuration.
+"""
+
+from bacen_ifdata.data_loader.lake import ParquetLakeService
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+# Mapping of the silver backends to their database service classes.
+SILVER_BACKEND_MAP: dict[str, type[DatabaseService]] = {
+    'duckdb': DatabaseService,
+    'parquet': ParquetLakeService,
+}
+
+
+def get_database_service(**kwargs) -> DatabaseService:
+    """Returns the database service of the configured silver backend (Config.SILVER_BACKEND).
+
+    Args:
+        **kwargs: The arguments of the service (registries, connection, ...).
+
+    Returns:
+        DatabaseService: The DuckDB tables service, or the Parquet lake service.
+
+    Raises:
+        ValueError: If the configured backend is unknown.
+    """
+
+    service_class = SILVER_BACKEND_MAP.get(Cfg.SILVER_BACKEND)
+    if service_class is None:
+        raise ValueError(
+            f"Unknown silver backend: '{Cfg.SILVER_BACKEND}'. Expected one of {', '.join(SILVER_BACKEND_MAP)}."
+        )
+
+    return service_class(**kwargs)
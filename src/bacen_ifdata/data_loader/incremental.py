@@ -0,0 +1,429 @@
+"""Incremental loading of the transformed files.
+
+Every loaded file is recorded in the load ledger with the hash of its content,
+the ``data_base`` partitions it holds, its size and modification time, and the
+rows it added. An incremental load only reloads the new or changed files: the
+partitions they hold (before and after the change) are deleted from the table
+and the files are inserted again, so a quarterly refresh touches a single
+quarter instead of the whole history. Files whose size and modification time
+match the ledger are not even read to be hashed. ``LoadLedger`` keeps the
+ledger, and the seconds spent in each stage of the loads, in the database.
+"""
+
+import hashlib
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import duckdb as db
+from loguru import logger
+
+if TYPE_CHECKING:
+    from bacen_ifdata.data_loader.storage import DatabaseService
+
+# The column that partitions the report tables; rows are replaced a whole partition at a time.
+PARTITION_COLUMN = 'data_base'
+
+# Columns of the load ledger; the ones after ``loaded_at`` are added to the ledgers of older versions.
+LOAD_LEDGER_COLUMNS: dict[str, str] = {
+    'table_name': 'VARCHAR',
+    'file_name': 'VARCHAR',
+    'file_hash': 'VARCHAR',
+    'partitions': 'VARCHAR[]',
+    'loaded_at': 'TIMESTAMP DEFAULT current_timestamp',
+    'file_path': 'VARCHAR',
+    'byte_size': 'BIGINT',
+    'modified_ns': 'BIGINT',
+    'row_count': 'BIGINT',
+    'load_seconds': 'DOUBLE',
+    'schema_version': 'VARCHAR',
+}
+
+# Ledger columns written from the fields of the LoadedFile of the same name.
+LOAD_LEDGER_ENTRY_COLUMNS: tuple[str, ...] = tuple(
+    column for column in LOAD_LEDGER_COLUMNS if column not in ('table_name', 'loaded_at')
+)
+
+
+@dataclass(frozen=True)
+class LoadedFile:
+    """A transformed file recorded in the load ledger."""
+
+    file_name: str
+    file_hash: str
+    partitions: tuple[str, ...]
+    # Where the file was read from, with its size and modification time (nanoseconds) when it was loaded.
+    file_path: str = ''
+    byte_size: int | None = None
+    modified_ns: int | None = None
+    # The rows the file added to the table, and the seconds of the load that inserted it (shared by a bulk scan).
+    row_count: int | None = None
+    load_seconds: float | None = None
+    # The fingerprint of the schema definition the file was loaded with.
+    schema_version: str | None = None
+
+
+@dataclass(frozen=True)
+class IncrementalLoadPlan:
+    """The files and partitions reloaded by an incremental load of a table."""
+
+    # The files to insert again, in load order.
+    files: list[Path] = field(default_factory=list)
+    # The partitions deleted from the table before the files are inserted (ISO dates).
+    partitions: list[str] = field(default_factory=list)
+    # The ledger entries of the reloaded files.
+    entries: list[LoadedFile] = field(default_factory=list)
+    # The ledger entries dropped because their file is gone and its partitions were replaced.
+    forgotten: list[str] = field(default_factory=list)
+    # The number of files skipped because they did not change since they were loaded.
+    unchanged: int = 0
+
+
+def file_digest(file_path: Path) -> str:
+    """Return the SHA-256 digest of the content of a file.
+
+    Args:
+        file_path (Path): The transformed file.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+
+    with file_path.open('rb') as file:
+        return hashlib.file_digest(file, 'sha256').hexdigest()
+
+
+def is_unmodified(file_path: Path, entry: LoadedFile | None) -> bool:
+    """Return whether a file has the size and modification time recorded in its ledger entry.
+
+    Args:
+        file_path (Path): The transformed file.
+        entry (LoadedFile | None): The ledger entry of the file, if it was loaded.
+
+    Returns:
+        bool: True if the file can keep the recorded hash without being read.
+    """
+
+    if entry is None or entry.byte_size is None or entry.modified_ns is None:
+        return False
+
+    stat = file_path.stat()
+
+    return stat.st_size == entry.byte_size and stat.st_mtime_ns == entry.modified_ns
+
+
+def file_digests(input_files: list[Path], ledger: dict[str, LoadedFile]) -> dict[str, str]:
+    """Return the digest of each file, reading only the files not recorded with their current size and time.
+
+    Args:
+        input_files (list[Path]): The transformed files of the report.
+        ledger (dict[str, LoadedFile]): The files already loaded into the table, by file name.
+
+    Returns:
+        dict[str, str]: The digest of each file, by file name.
+    """
+
+    return {
+        file.name: ledger[file.name].file_hash if is_unmodified(file, ledger.get(file.name)) else file_digest(file)
+        for file in input_files
+    }
+
+
+def describe_file(file_path: Path, entry: LoadedFile, **values) -> LoadedFile:
+    """Return a ledger entry completed with the path, size and modification time of its file.
+
+    Args:
+        file_path (Path): The transformed file.
+        entry (LoadedFile): The ledger entry of the file.
+        **values: Other fields of the entry to set (e.g. row_count, load_seconds, schema_version).
+
+    Returns:
+        LoadedFile: The completed ledger entry.
+    """
+
+    stat = file_path.stat()
+
+    return replace(entry, file_path=str(file_path), byte_size=stat.st_size, modified_ns=stat.st_mtime_ns, **values)
+
+
+def changed_files(input_files: list[Path], digests: dict[str, str], ledger: dict[str, LoadedFile]) -> list[Path]:
+    """Return the files that are not in the ledger, or whose content changed since they were loaded.
+
+    Args:
+        input_files (list[Path]): The transformed files of the report.
+        digests (dict[str, str]): The current digest of each file, by file name.
+        ledger (dict[str, LoadedFile]): The files already loaded into the table, by file name.
+
+    Returns:
+        list[Path]: The new or changed files, in the order of ``input_files``.
+    """
+
+    return [
+        file for file in input_files if file.name not in ledger or ledger[file.name].file_hash != digests[file.name]
+    ]
+
+
+def plan_incremental_load(
+    input_files: list[Path],
+    digests: dict[str, str],
+    ledger: dict[str, LoadedFile],
+    changed_partitions: dict[str, tuple[str, ...]],
+    complete: bool = True,
+) -> IncrementalLoadPlan:
+    """Plan the partitions to replace and the files to reload in a table.
+
+    The partitions held by a changed file, now or when it was loaded, are
+    replaced. An unchanged file that shares one of these partitions is reloaded
+    too (and its partitions join the set), so deleting a partition never loses
+    the rows of another file.
+
+    Args:
+        input_files (list[Path]): The transformed files of the report.
+        digests (dict[str, str]): The current digest of each file, by file name.
+        ledger (dict[str, LoadedFile]): The files already loaded into the table, by file name.
+        changed_partitions (dict[str, tuple[str, ...]]): The partitions held by each new or changed file.
+        complete (bool): Whether ``input_files`` are every transformed file of the report. Defaults to True;
+                         otherwise the files left out are still to be loaded (e.g. by a later task of the
+                         stage scheduler), so they are not reported as gone.
+
+    Returns:
+        IncrementalLoadPlan: The files and partitions to reload.
+    """
+
+    reloaded = set(changed_partitions)
+    partitions: set[str] = set()
+    for file_name, file_partitions in changed_partitions.items():
+        partitions.update(file_partitions)
+        if file_name in ledger:
+            partitions.update(ledger[file_name].partitions)
+
+    # Grow the set until no unchanged file shares a partition with it.
+    is_growing = bool(reloaded)
+    while is_growing:
+        is_growing = False
+        for file in input_files:
+            entry = ledger.get(file.name)
+            if file.name in reloaded or entry is None or partitions.isdisjoint(entry.partitions):
+                continue
+
+            reloaded.add(file.name)
+            partitions.update(entry.partitions)
+            is_growing = True
+
+    # Rows of files that are gone survive, unless their partitions are replaced now.
+    present = {file.name for file in input_files}
+    forgotten = []
+    for file_name, entry in ledger.items():
+        if file_name in present:
+            continue
+
+        if not partitions.isdisjoint(entry.partitions):
+            forgotten.append(file_name)
+        elif complete:
+            logger.warning(f"'{file_name}' was loaded but is no longer in the transformed files; its rows are kept.")
+
+    files = [file for file in input_files if file.name in reloaded]
+    entries = [
+        (
+            LoadedFile(file.name, digests[file.name], changed_partitions[file.name])
+            if file.name in changed_partitions
+            else ledger[file.name]
+        )
+        for file in files
+    ]
+
+    return IncrementalLoadPlan(
+        files=files,
+        partitions=sorted(partitions),
+        entries=entries,
+        forgotten=forgotten,
+        unchanged=len(input_files) - len(files),
+    )
+
+
+class LoadLedger:
+    """The load ledger and the stage timings of the loads, stored in the database of a service."""
+
+    # Table recording the files loaded into each table (content hash, data_base partitions, size, rows, duration).
+    LOAD_LEDGER_TABLE_NAME = 'load_ledger'
+
+    # Table recording the seconds spent in each stage of the load of each table, by run; kept by a reset.
+    STAGE_TIMINGS_TABLE_NAME = 'load_stage_timings'
+
+    def __init__(self, database: 'DatabaseService') -> None:
+        """Initialize the LoadLedger.
+
+        Args:
+            database (DatabaseService): The service (or cursor) whose connection, transactions and DDL lock are used.
+        """
+
+        self._database = database
+
+    def _ensure_table(self) -> None:
+        """Creates the load ledger table, or adds the columns missing from the ledger of an older version."""
+
+        if set(LOAD_LEDGER_COLUMNS) <= set(self._database.catalog_columns(self.LOAD_LEDGER_TABLE_NAME)):
+            return
+
+        connection = self._database.connection
+        with self._database.ddl_lock:
+            definition = ', '.join(f'{column} {column_type}' for column, column_type in LOAD_LEDGER_COLUMNS.items())
+            connection.execute(f"CREATE TABLE IF NOT EXISTS {self.LOAD_LEDGER_TABLE_NAME} ({definition});")
+            for column in set(LOAD_LEDGER_COLUMNS) - set(self._database.catalog_columns(self.LOAD_LEDGER_TABLE_NAME)):
+                connection.execute(
+                    f"ALTER TABLE {self.LOAD_LEDGER_TABLE_NAME} ADD COLUMN {column} {LOAD_LEDGER_COLUMNS[column]};"
+                )
+
+    def loaded_files(self, table_name: str) -> dict[str, LoadedFile]:
+        """Return the files recorded in the load ledger for a table.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            dict[str, LoadedFile]: The loaded files, by file name.
+        """
+
+        self._ensure_table()
+        rows = self._database.connection.execute(
+            f"SELECT {', '.join(LOAD_LEDGER_ENTRY_COLUMNS)} FROM {self.LOAD_LEDGER_TABLE_NAME} WHERE table_name = ?;",
+            [table_name],
+        ).fetchall()
+
+        entries = {}
+        for row in rows:
+            values = dict(zip(LOAD_LEDGER_ENTRY_COLUMNS, row))
+            values['partitions'] = tuple(values['partitions'])
+            values['file_path'] = values['file_path'] or ''
+            entries[values['file_name']] = LoadedFile(**values)
+
+        return entries
+
+    def record_loaded_files(
+        self, table_name: str, entries: list[LoadedFile], forgotten: list[str] | None = None, replace: bool = False
+    ) -> None:
+        """Records the loaded files of a table in the load ledger.
+
+        Args:
+            table_name (str): The name of the table.
+            entries (list[LoadedFile]): The files loaded into the table (or whose entry changed).
+            forgotten (list[str] | None): Names of files to remove from the ledger. Defaults to None.
+            replace (bool): Whether the entries replace every file of the table (after a full load).
+                            Defaults to False.
+        """
+
+        self._ensure_table()
+        connection = self._database.connection
+        stale_files = [entry.file_name for entry in entries] + list(forgotten or [])
+
+        try:
+            with self._database.transaction():
+                if replace:
+                    connection.execute(f"DELETE FROM {self.LOAD_LEDGER_TABLE_NAME} WHERE table_name = ?;", [table_name])
+                elif stale_files:
+                    connection.execute(
+                        f"DELETE FROM {self.LOAD_LEDGER_TABLE_NAME} "
+                        "WHERE table_name = ? AND list_contains(?, file_name);",
+                        [table_name, stale_files],
+                    )
+
+                if entries:
+                    placeholders = ', '.join('?' for _ in LOAD_LEDGER_ENTRY_COLUMNS)
+                    connection.executemany(
+                        f"INSERT INTO {self.LOAD_LEDGER_TABLE_NAME} "
+                        f"(table_name, {', '.join(LOAD_LEDGER_ENTRY_COLUMNS)}) VALUES (?, {placeholders});",
+                        [
+                            [table_name]
+                            + [
+                                list(entry.partitions) if column == 'partitions' else getattr(entry, column)
+                                for column in LOAD_LEDGER_ENTRY_COLUMNS
+                            ]
+                            for entry in entries
+                        ],
+                    )
+
+        except db.Error as error:
+            logger.error(f"Error recording the loaded files of '{table_name}': {error}")
+            raise
+
+    def forget_table(self, table_name: str) -> None:
+        """Removes every file of a table from the load ledger, when the table is dropped to be reloaded.
+
+        A table reloaded by a mode that writes no ledger (the transform loader and
+        the streaming pipeline) would otherwise keep the entries of its old rows, and
+        the audits and the next incremental load would trust them.
+
+        Args:
+            table_name (str): The name of the table.
+        """
+
+        if not self._database.table_exists(self.LOAD_LEDGER_TABLE_NAME):
+            return
+
+        try:
+            self._database.connection.execute(
+                f"DELETE FROM {self.LOAD_LEDGER_TABLE_NAME} WHERE table_name = ?;", [table_name]
+            )
+
+        except db.Error as error:
+            logger.error(f"Error forgetting the loaded files of '{table_name}': {error}")
+            raise
+
+    def refresh_loaded_files(self, table_name: str, entries: list[LoadedFile]) -> None:
+        """Updates the path, size and modification time of files whose content did not change since they were loaded.
+
+        A file rewritten with the same content (e.g. transformed again) is hashed
+        once; the next incremental load finds it unmodified without reading it.
+
+        Args:
+            table_name (str): The name of the table.
+            entries (list[LoadedFile]): The ledger entries, with the current path, size and modification time.
+        """
+
+        if not entries:
+            return
+
+        self._ensure_table()
+        try:
+            self._database.connection.executemany(
+                f"UPDATE {self.LOAD_LEDGER_TABLE_NAME} SET file_path = ?, byte_size = ?, modified_ns = ? "
+                "WHERE table_name = ? AND file_name = ?;",
+                [
+                    [entry.file_path, entry.byte_size, entry.modified_ns, table_name, entry.file_name]
+                    for entry in entries
+                ],
+            )
+
+        except db.Error as error:
+            logger.error(f"Error refreshing the loaded files of '{table_name}': {error}")
+            raise
+
+    def record_stage_timing(
+        self, run_id: str, table_name: str, stage: str, started_at: datetime, seconds: float
+    ) -> None:
+        """Records the seconds spent in a stage of the load of a table.
+
+        Args:
+            run_id (str): The identifier of the run.
+            table_name (str): The name of the loaded table.
+            stage (str): The stage of the load (e.g. sync, load, cluster, ledger).
+            started_at (datetime): When the stage started.
+            seconds (float): The seconds spent in the stage.
+        """
+
+        connection = self._database.connection
+        try:
+            with self._database.ddl_lock:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.STAGE_TIMINGS_TABLE_NAME} "
+                    "(run_id VARCHAR, table_name VARCHAR, stage VARCHAR, started_at TIMESTAMP, seconds DOUBLE);"
+                )
+            connection.execute(
+                f"INSERT INTO {self.STAGE_TIMINGS_TABLE_NAME} VALUES (?, ?, ?, ?, ?);",
+                [run_id, table_name, stage, started_at, seconds],
+            )
+
+        except db.Error as error:
+            logger.error(f"Error recording the {stage} timing of '{table_name}': {error}")
+            raise
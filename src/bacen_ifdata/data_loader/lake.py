@@ -0,0 +1,317 @@
+"""Parquet lake backend of the silver layer.
+
+The rows of each silver table are stored as Parquet files partitioned by
+``institution/report/data_base=...`` under ``Config.SILVER_LAKE_DIRECTORY``, and
+the DuckDB database only holds a thin catalog: one view per table over its files
+(read with Hive partitioning, so filters on ``data_base`` prune whole
+directories), plus the dictionaries and the load ledger. Loads become file
+drops, and any number of processes can read the files while the pipeline writes.
+"""
+
+import shutil
+import uuid
+from pathlib import Path
+
+import duckdb as db
+from loguru import logger
+
+from bacen_ifdata.data_loader.incremental import PARTITION_COLUMN
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan, SchemaPlanRegistry
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.utilities.configurations import Config
+
+# Directory of the lake where the files of a write wait until it is published.
+STAGING_DIRECTORY_NAME = '.staging'
+
+
+def lake_table_directory(lake_directory: Path, table_name: str) -> Path:
+    """Return the directory of the files of a silver table (``institution/report``).
+
+    Args:
+        lake_directory (Path): The root directory of the lake.
+        table_name (str): The name of the table (``institution_report``, e.g. financial_conglomerates_assets).
+
+    Returns:
+        Path: The directory of the table; tables of no known institution get a directory of their own.
+    """
+
+    # The longest prefix wins, so financial_conglomerates_scr is not taken for financial_conglomerates.
+    institution = max(
+        (
+            institution.name.lower()
+            for institution in Institutions
+            if table_name.startswith(f'{institution.name.lower()}_')
+        ),
+        key=len,
+        default=None,
+    )
+    if institution is None:
+        return lake_directory / table_name
+
+    return lake_directory / institution / table_name[len(institution) + 1 :]
+
+
+class ParquetLakeService(DatabaseService):
+    """Silver layer stored as Hive-partitioned Parquet files, with a DuckDB catalog of views over them."""
+
+    def __init__(
+        self,
+        database_path: Path = Config.SILVER_DATABASE_FILE,
+        connection: db.DuckDBPyConnection | None = None,
+        dictionary_registry: CategoricalDictionaryRegistry | None = None,
+        plan_registry: SchemaPlanRegistry | None = None,
+        lake_directory: Path = Config.SILVER_LAKE_DIRECTORY,
+    ) -> None:
+        """Initialize the ParquetLakeService.
+
+        Args:
+            database_path (Path): Path to the DuckDB catalog of views. Defaults to Config.SILVER_DATABASE_FILE.
+            connection (duckdb.DuckDBPyConnection | None): An existing database connection. Defaults to None.
+            dictionary_registry (CategoricalDictionaryRegistry | None): The shared categorical dictionaries.
+                                                                        Defaults to None (VARCHAR).
+            plan_registry (SchemaPlanRegistry | None): The compiled schema plans. Defaults to None.
+            lake_directory (Path): The root directory of the Parquet files. Defaults to Config.SILVER_LAKE_DIRECTORY.
+        """
+
+        super().__init__(database_path, connection, dictionary_registry, plan_registry)
+        self._lake_directory = lake_directory
+        # Column types of each table (the types its view casts the files to), shared by the cursors.
+        self._table_types: dict[str, dict[str, str]] = {}
+        # Column comments of each table, applied again whenever its view is replaced.
+        self._table_comments: dict[str, dict[str, str]] = {}
+        self._reset_pending_changes()
+
+    def _reset_pending_changes(self) -> None:
+        """Forget the changes of the running transaction."""
+
+        # Partition directories removed when the transaction commits.
+        self._pending_deletions: list[Path] = []
+        # Staged files (staging directory, table directory) published when the transaction commits.
+        self._pending_files: list[tuple[Path, Path]] = []
+        self._pending_tables: set[str] = set()
+
+    def cursor(self) -> 'ParquetLakeService':
+        """Return a service over a new cursor of this connection, with its own pending changes."""
+
+        service = super().cursor()
+        service._reset_pending_changes()
+
+        return service
+
+    def table_directory(self, table_name: str) -> Path:
+        """Return the directory of the files of a table.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            Path: The ``institution/report`` directory inside the lake.
+        """
+
+        return lake_table_directory(self._lake_directory, table_name)
+
+    def _before_commit(self) -> None:
+        """Publishes the files staged by the transaction before it commits.
+
+        The replaced partitions are removed and the staged files moved into place
+        only after every statement succeeded, so a failing load leaves the files as
+        they were. Moving a file is atomic, but a reader may briefly see a replaced
+        partition missing.
+        """
+
+        self._publish_pending_changes()
+
+    def _end_transaction(self) -> None:
+        """Removes the staged files left by the transaction and forgets its changes."""
+
+        for staging_directory, _ in self._pending_files:
+            shutil.rmtree(staging_directory, ignore_errors=True)
+        self._reset_pending_changes()
+
+    def _publish_pending_changes(self) -> None:
+        """Removes the replaced partitions, moves the staged files into place and refreshes the views."""
+
+        for partition_directory in self._pending_deletions:
+            shutil.rmtree(partition_directory, ignore_errors=True)
+
+        for staging_directory, table_directory in self._pending_files:
+            for staged_file in sorted(staging_directory.rglob('*.parquet')):
+                target_file = table_directory / staged_file.relative_to(staging_directory)
+                target_file.parent.mkdir(parents=True, exist_ok=True)
+                staged_file.replace(target_file)
+
+        for table_name in sorted(self._pending_tables):
+            self._refresh_view(table_name)
+
+    def _column_types(self, table_name: str) -> dict[str, str]:
+        """Return the column types of a table, from the catalog if it was created by another process.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            dict[str, str]: The type of each column, in table order.
+        """
+
+        if table_name not in self._table_types:
+            self._table_types[table_name] = dict(
+                self.connection.execute(
+                    "SELECT column_name, data_type FROM duckdb_columns() "
+                    "WHERE database_name = current_database() AND schema_name = 'main' AND table_name = ? "
+                    "ORDER BY column_index",
+                    [table_name],
+                ).fetchall()
+            )
+
+        return self._table_types[table_name]
+
+    def _refresh_view(self, table_name: str) -> None:
+        """Creates (or replaces) the view of a table over its files.
+
+        Columns that no file holds yet are NULL, and a table without files is an
+        empty view with the same columns, so readers always see the full table.
+
+        Args:
+            table_name (str): The name of the table.
+        """
+
+        column_types = self._column_types(table_name)
+        table_directory = self.table_directory(table_name)
+
+        present_columns: set[str] = set()
+        source = ''
+        if any(table_directory.rglob('*.parquet')):
+            source = (
+                f"read_parquet('{(table_directory / '**' / '*.parquet').as_posix()}', hive_partitioning=True, "
+                f"hive_types={{'{PARTITION_COLUMN}': 'DATE'}}, union_by_name=True)"
+            )
+            present_columns = {row[0] for row in self.connection.execute(f'DESCRIBE SELECT * FROM {source}').fetchall()}
+
+        column_expressions = []
+        for column, duckdb_type in column_types.items():
+            value = f'"{column}"' if column in present_columns else 'NULL'
+            column_expressions.append(f'CAST({value} AS {duckdb_type}) AS "{column}"')
+
+        select_columns = ', '.join(column_expressions)
+        query = f'SELECT {select_columns} FROM {source}' if source else f'SELECT {select_columns} WHERE false'
+
+        with self._ddl_lock:
+            self.connection.execute(f'CREATE OR REPLACE VIEW {table_name} AS {query};')
+            # Replacing the view drops its comments.
+            for column, description in self._table_comments.get(table_name, {}).items():
+                self.connection.execute(self._comment_statement(table_name, column, description))
+
+    def _sync_relation(self, table_name: str, column_types: dict[str, str], comments: dict[str, str]) -> int:
+        """Creates (or replaces) the view of a table over its files with the given columns and comments.
+
+        The files keep the types they were written with; the view casts them to the
+        given ones, so the whole definition is applied by replacing the view.
+
+        Args:
+            table_name (str): The name of the table.
+            column_types (dict[str, str]): The DuckDB type of each column, in table order.
+            comments (dict[str, str]): The comment of each described column.
+
+        Returns:
+            int: The number of DDL statements run.
+        """
+
+        self._table_types[table_name] = dict(column_types)
+        self._table_comments[table_name] = dict(comments)
+        self._refresh_view(table_name)
+
+        return 1 + len(comments)
+
+    def _insert_select(self, table_name: str, columns: list[str], select_query: str) -> None:
+        """Writes the rows of a SELECT query as new Parquet files of a table, one directory per data_base.
+
+        Args:
+            table_name (str): The name of the target table.
+            columns (list[str]): The columns of the query.
+            select_query (str): The query producing the rows.
+        """
+
+        staging_directory = self._lake_directory / STAGING_DIRECTORY_NAME / uuid.uuid4().hex
+        staging_directory.mkdir(parents=True)
+        options = f"FORMAT PARQUET, COMPRESSION '{Config.PARQUET_COMPRESSION}'"
+
+        if PARTITION_COLUMN in columns:
+            target = staging_directory
+            options += f", PARTITION_BY (\"{PARTITION_COLUMN}\"), FILENAME_PATTERN 'part_{{uuid}}'"
+        else:
+            target = staging_directory / f'part_{uuid.uuid4()}.parquet'
+
+        self.connection.execute(
+            f"COPY ({self._clustered_query(select_query, columns)}) TO '{target.as_posix()}' ({options});"
+        )
+        self._pending_files.append((staging_directory, self.table_directory(table_name)))
+        self._pending_tables.add(table_name)
+
+        # Outside a transaction the files are published right away.
+        if not self._transaction_depth:
+            try:
+                self._publish_pending_changes()
+            finally:
+                shutil.rmtree(staging_directory, ignore_errors=True)
+                self._reset_pending_changes()
+
+    def _delete_partitions(self, table_name: str, partitions: list[str], plan: SchemaPlan) -> None:
+        """Marks the ``data_base`` directories of a table for removal when the transaction commits.
+
+        Args:
+            table_name (str): The name of the table.
+            partitions (list[str]): The partitions (ISO dates).
+            plan (SchemaPlan): The compiled schema plan of the report.
+        """
+
+        table_directory = self.table_directory(table_name)
+        self._pending_deletions.extend(table_directory / f'{PARTITION_COLUMN}={partition}' for partition in partitions)
+        self._pending_tables.add(table_name)
+
+    def cluster_table(self, table_name: str) -> bool:
+        """Leave the files of a table as they are: they are clustered when written.
+
+        Each ``data_base`` has its own directories and every file is written sorted by
+        ``codigo``, so a new or replaced quarter never breaks the order of the others.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            bool: Always False (no file is rewritten).
+        """
+
+        return False
+
+    def analyze_table(self, table_name: str) -> None:
+        """Leave the statistics of a table as they are: its view has none to refresh.
+
+        DuckDB only analyzes base tables; the scans of the view prune the files by
+        their ``data_base`` directories and by the min and max of their row groups.
+
+        Args:
+            table_name (str): The name of the table.
+        """
+
+    def drop_table(self, table_name: str) -> None:
+        """Drop the view of a table and delete its files.
+
+        Args:
+            table_name (str): The name of the table to drop.
+        """
+
+        super().drop_table(table_name)
+        self._table_types.pop(table_name, None)
+        self._table_comments.pop(table_name, None)
+        shutil.rmtree(self.table_directory(table_name), ignore_errors=True)
+
+    def reset_database(self) -> None:
+        """Drop every view and table of the catalog and delete the files of the lake."""
+
+        super().reset_database()
+        self._table_types.clear()
+        self._table_comments.clear()
+        shutil.rmtree(self._lake_directory, ignore_errors=True)
+        logger.info(f"Silver lake reset: '{self._lake_directory}' removed.")
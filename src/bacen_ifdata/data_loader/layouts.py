@@ -0,0 +1,293 @@
+"""Header layouts of the transformed files.
+
+The header of each file (the Parquet schema, or the first line of a CSV parsed
+as CSV, so quoted commas stay inside their column) is compared with the columns
+of its table and with the layouts already seen for the table, kept in the
+header registry of the database. A file has a known layout, a new layout (with
+the columns it adds to and removes from the table), or an incompatible one that
+cannot be loaded. The drift found by a run is reported once, at its end.
+"""
+
+import csv
+import hashlib
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import duckdb as db
+import pyarrow.parquet as pq
+from loguru import logger
+
+from bacen_ifdata.data_loader.incremental import PARTITION_COLUMN
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+
+if TYPE_CHECKING:
+    from bacen_ifdata.data_loader.storage import DatabaseService
+
+# Columns a file must hold when its table has them: the natural key of the rows.
+KEY_COLUMNS: tuple[str, ...] = (PARTITION_COLUMN, 'codigo')
+
+
+class LayoutStatus(StrEnum):
+    """How the header of a file compares with its table."""
+
+    KNOWN = 'known'
+    NEW = 'new'
+    INCOMPATIBLE = 'incompatible'
+
+
+@dataclass(frozen=True)
+class FileLayout:
+    """The header layout of a transformed file."""
+
+    file_name: str
+    signature: str
+    columns: tuple[str, ...]
+    status: LayoutStatus
+    # Columns of the file the table does not have (not loaded), and columns of the table the file lacks (NULL).
+    added: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+    # Why an incompatible file cannot be loaded.
+    reason: str = ''
+
+
+def read_file_header(file_path: Path) -> tuple[str, ...]:
+    """Read the column names of a transformed file without reading its rows.
+
+    Args:
+        file_path (Path): The Parquet or CSV file.
+
+    Returns:
+        tuple[str, ...]: The columns of the file, in file order.
+    """
+
+    if file_path.suffix == '.parquet':
+        return tuple(pq.read_schema(file_path).names)
+
+    # utf-8-sig drops the byte order mark, and the csv module keeps quoted commas inside their column.
+    with file_path.open('r', encoding='utf-8-sig', newline='') as file:
+        header = next(csv.reader(file), [])
+
+    return tuple(column.strip() for column in header)
+
+
+def header_signature(columns: tuple[str, ...]) -> str:
+    """Return the signature of a header: the SHA-1 of its columns, in order.
+
+    Args:
+        columns (tuple[str, ...]): The columns of the header.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+
+    return hashlib.sha1('\x1f'.join(columns).encode('utf-8')).hexdigest()
+
+
+def classify_header(
+    file_name: str, columns: tuple[str, ...], table_columns: list[str], known_signatures: set[str]
+) -> FileLayout:
+    """Classify the header of a file against the columns of its table and the layouts already seen.
+
+    A header is incompatible if it repeats a column, shares no column with the
+    table or lacks a key column of the table. Otherwise it is known if it was
+    seen before or holds exactly the table columns, and new if it does not. The
+    reports of IF.data lack some columns in some quarters, so while no layout of
+    the table is known yet, every header without columns the table lacks is the
+    baseline (known).
+
+    Args:
+        file_name (str): The name of the file.
+        columns (tuple[str, ...]): The columns of the file, in file order.
+        table_columns (list[str]): The columns of the table, in table order.
+        known_signatures (set[str]): The signatures of the compatible layouts already seen for the table.
+
+    Returns:
+        FileLayout: The layout of the file.
+    """
+
+    signature = header_signature(columns)
+    header = set(columns)
+    added = tuple(column for column in columns if column not in table_columns)
+    removed = tuple(column for column in table_columns if column not in header)
+
+    reason = ''
+    if len(header) < len(columns):
+        reason = 'repeated columns'
+    elif not header.intersection(table_columns):
+        reason = 'no column of the table'
+    elif missing_keys := [column for column in KEY_COLUMNS if column in table_columns and column not in header]:
+        reason = f"no {', '.join(missing_keys)} column"
+
+    if reason:
+        status = LayoutStatus.INCOMPATIBLE
+    elif signature in known_signatures or (not added and not (removed and known_signatures)):
+        status = LayoutStatus.KNOWN
+    else:
+        status = LayoutStatus.NEW
+
+    return FileLayout(file_name, signature, columns, status, added, removed, reason)
+
+
+def format_layout_report(layouts_by_table: dict[str, list[FileLayout]]) -> str:
+    """Format the new and incompatible layouts found in the files of each table as one report.
+
+    Args:
+        layouts_by_table (dict[str, list[FileLayout]]): The drifted layouts of each table, by table name.
+
+    Returns:
+        str: The report, one line per layout (empty if no table drifted).
+    """
+
+    lines = []
+    drifted_tables = set()
+    for table_name, layouts in sorted(layouts_by_table.items()):
+        for layout in layouts:
+            if layout.status == LayoutStatus.KNOWN:
+                continue
+
+            drifted_tables.add(table_name)
+            details = []
+            if layout.reason:
+                details.append(layout.reason)
+            if layout.added:
+                details.append(f"added: {', '.join(layout.added)}")
+            if layout.removed:
+                details.append(f"removed: {', '.join(layout.removed)}")
+            lines.append(f"{table_name}: {layout.status} layout in '{layout.file_name}' ({'; '.join(details)})")
+
+    if not lines:
+        return ''
+
+    return f'Header drift in {len(drifted_tables)} table(s):\n' + '\n'.join(lines)
+
+
+class LayoutRegistry:
+    """The header registry: the layouts seen in the files of each table, stored in the database of a service."""
+
+    # Header registry: the layouts (header signatures) seen in the files of each table; kept by a reset.
+    HEADER_LAYOUTS_TABLE_NAME = 'header_layouts'
+
+    def __init__(self, database: 'DatabaseService') -> None:
+        """Initialize the LayoutRegistry.
+
+        Args:
+            database (DatabaseService): The service (or cursor) whose connection, file headers and DDL lock are used.
+        """
+
+        self._database = database
+
+    def _ensure_table(self) -> None:
+        """Creates the header registry table, if it does not exist."""
+
+        with self._database.ddl_lock:
+            self._database.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.HEADER_LAYOUTS_TABLE_NAME} "
+                "(table_name VARCHAR, signature VARCHAR, columns VARCHAR[], status VARCHAR, added VARCHAR[], "
+                "removed VARCHAR[], reason VARCHAR, file_name VARCHAR, run_id VARCHAR, "
+                "first_seen_at TIMESTAMP DEFAULT current_timestamp, last_seen_at TIMESTAMP DEFAULT current_timestamp);"
+            )
+
+    def classify_files(
+        self, table_name: str, file_paths: list[Path], schema: BaseSchema, run_id: str = ''
+    ) -> list[FileLayout]:
+        """Classify the header of each file against the table columns and the layouts registered for the table.
+
+        The layouts seen for the first time are registered, so a new layout is
+        reported once and is known from then on. Incompatible layouts are never
+        known: they are stamped with the run each time they are found.
+
+        Args:
+            table_name (str): The name of the table.
+            file_paths (list[Path]): The Parquet or CSV files of the report.
+            schema (BaseSchema): The schema of the report.
+            run_id (str): The identifier of the run that found the layouts. Defaults to ''.
+
+        Returns:
+            list[FileLayout]: The layout of each file, in the order of ``file_paths``.
+        """
+
+        table_columns = self._database.file_columns(schema)
+        connection = self._database.connection
+
+        self._ensure_table()
+        registered = dict(
+            connection.execute(
+                f"SELECT signature, status FROM {self.HEADER_LAYOUTS_TABLE_NAME} WHERE table_name = ?;", [table_name]
+            ).fetchall()
+        )
+        known_signatures = {
+            signature for signature, status in registered.items() if status != LayoutStatus.INCOMPATIBLE
+        }
+
+        layouts = [
+            classify_header(file_path.name, self._database.file_header(file_path), table_columns, known_signatures)
+            for file_path in file_paths
+        ]
+
+        first_layouts: dict[str, FileLayout] = {}
+        for layout in layouts:
+            first_layouts.setdefault(layout.signature, layout)
+
+        try:
+            for layout in first_layouts.values():
+                if layout.signature not in registered:
+                    connection.execute(
+                        f"INSERT INTO {self.HEADER_LAYOUTS_TABLE_NAME} "
+                        "(table_name, signature, columns, status, added, removed, reason, file_name, run_id) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);",
+                        [
+                            table_name,
+                            layout.signature,
+                            list(layout.columns),
+                            str(layout.status),
+                            list(layout.added),
+                            list(layout.removed),
+                            layout.reason,
+                            layout.file_name,
+                            run_id,
+                        ],
+                    )
+                elif layout.status == LayoutStatus.INCOMPATIBLE:
+                    connection.execute(
+                        f"UPDATE {self.HEADER_LAYOUTS_TABLE_NAME} SET file_name = ?, run_id = ?, "
+                        "last_seen_at = current_timestamp WHERE table_name = ? AND signature = ?;",
+                        [layout.file_name, run_id, table_name, layout.signature],
+                    )
+
+        except db.Error as error:
+            logger.error(f"Error registering the header layouts of '{table_name}': {error}")
+            raise
+
+        return layouts
+
+    def layout_drift(self, run_id: str) -> dict[str, list[FileLayout]]:
+        """Return the new and incompatible layouts found by a run, from the header registry.
+
+        Args:
+            run_id (str): The identifier of the run.
+
+        Returns:
+            dict[str, list[FileLayout]]: The drifted layouts of each table, by table name.
+        """
+
+        if not self._database.table_exists(self.HEADER_LAYOUTS_TABLE_NAME):
+            return {}
+
+        rows = self._database.connection.execute(
+            f"SELECT table_name, file_name, signature, columns, status, added, removed, reason "
+            f"FROM {self.HEADER_LAYOUTS_TABLE_NAME} WHERE run_id = ? AND status <> ? "
+            "ORDER BY table_name, first_seen_at;",
+            [run_id, str(LayoutStatus.KNOWN)],
+        ).fetchall()
+
+        drift: dict[str, list[FileLayout]] = {}
+        for table_name, file_name, signature, columns, status, added, removed, reason in rows:
+            drift.setdefault(table_name, []).append(
+                FileLayout(
+                    file_name, signature, tuple(columns), LayoutStatus(status), tuple(added), tuple(removed), reason
+                )
+            )
+
+        return drift
@@ -0,0 +1,131 @@
+"""Column and ``data_base`` statistics of the silver tables, written after each load."""
+
+from typing import TYPE_CHECKING
+
+import duckdb as db
+from loguru import logger
+
+from bacen_ifdata.data_loader.incremental import PARTITION_COLUMN
+
+if TYPE_CHECKING:
+    from bacen_ifdata.data_loader.storage import DatabaseService
+
+
+class TableProfiler:
+    """Writes the column and ``data_base`` statistics of the tables to the database of a service."""
+
+    # Profile of each column of each table (rows, NULLs, distinct estimate, min and max), written after a load.
+    COLUMN_STATISTICS_TABLE_NAME = 'column_statistics'
+
+    # Rows and institutions (distinct codigo) of each data_base of each table, written after a load.
+    PARTITION_STATISTICS_TABLE_NAME = 'partition_statistics'
+
+    def __init__(self, database: 'DatabaseService') -> None:
+        """Initialize the TableProfiler.
+
+        Args:
+            database (DatabaseService): The service (or cursor) whose connection, transactions and DDL lock are used.
+        """
+
+        self._database = database
+
+    def profile_table(self, table_name: str) -> int:
+        """Profiles the columns and the ``data_base`` partitions of a table and refreshes its optimizer statistics.
+
+        The profile of every column (rows, NULLs, approximate distinct values, and
+        min and max as text) comes from one aggregate scan of the table, and the rows
+        and institutions of each ``data_base`` from one more scan that only reads
+        ``data_base`` and ``codigo``. The previous profile of the table is replaced
+        in one transaction, so the audits and dashboards read the bounds, NULL rates
+        and freshness of the tables without scanning them.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            int: The number of rows of the table.
+        """
+
+        current_columns = self._database.catalog_columns(table_name)
+        if not current_columns:
+            return 0
+
+        connection = self._database.connection
+
+        aggregates = ['count(*)']
+        for column in current_columns:
+            aggregates.extend(
+                [
+                    f'count("{column}")',
+                    f'approx_count_distinct("{column}")',
+                    f'CAST(min("{column}") AS VARCHAR)',
+                    f'CAST(max("{column}") AS VARCHAR)',
+                ]
+            )
+
+        try:
+            row_count, *values = connection.execute(f"SELECT {', '.join(aggregates)} FROM {table_name};").fetchone()
+
+            column_rows = []
+            for index, (column, (column_type, _)) in enumerate(current_columns.items()):
+                non_null, distinct, min_value, max_value = values[index * 4 : index * 4 + 4]
+                column_rows.append(
+                    [table_name, column, column_type, row_count, row_count - non_null, distinct, min_value, max_value]
+                )
+
+            partition_rows = []
+            if PARTITION_COLUMN in current_columns:
+                institutions = 'count(DISTINCT codigo)' if 'codigo' in current_columns else 'NULL'
+                partition_rows = [
+                    [table_name, *row]
+                    for row in connection.execute(
+                        f'SELECT "{PARTITION_COLUMN}", count(*), {institutions} FROM {table_name} '
+                        f'GROUP BY "{PARTITION_COLUMN}" ORDER BY "{PARTITION_COLUMN}";'
+                    ).fetchall()
+                ]
+
+            with self._database.ddl_lock:
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.COLUMN_STATISTICS_TABLE_NAME} "
+                    "(table_name VARCHAR, column_name VARCHAR, column_type VARCHAR, row_count BIGINT, "
+                    "null_count BIGINT, distinct_count BIGINT, min_value VARCHAR, max_value VARCHAR, "
+                    "profiled_at TIMESTAMP DEFAULT current_timestamp);"
+                )
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.PARTITION_STATISTICS_TABLE_NAME} "
+                    f"(table_name VARCHAR, {PARTITION_COLUMN} DATE, row_count BIGINT, institution_count BIGINT, "
+                    "profiled_at TIMESTAMP DEFAULT current_timestamp);"
+                )
+
+            with self._database.transaction():
+                for statistics_table, rows, columns in (
+                    (
+                        self.COLUMN_STATISTICS_TABLE_NAME,
+                        column_rows,
+                        'table_name, column_name, column_type, row_count, null_count, distinct_count, '
+                        'min_value, max_value',
+                    ),
+                    (
+                        self.PARTITION_STATISTICS_TABLE_NAME,
+                        partition_rows,
+                        f'table_name, {PARTITION_COLUMN}, row_count, institution_count',
+                    ),
+                ):
+                    connection.execute(f"DELETE FROM {statistics_table} WHERE table_name = ?;", [table_name])
+                    if rows:
+                        placeholders = ', '.join('?' for _ in rows[0])
+                        connection.executemany(
+                            f"INSERT INTO {statistics_table} ({columns}) VALUES ({placeholders});", rows
+                        )
+
+            self._database.analyze_table(table_name)
+
+        except db.Error as error:
+            logger.error(f"Error profiling table '{table_name}': {error}")
+            raise
+
+        logger.info(
+            f"Table '{table_name}' profiled: {row_count} row(s), {len(column_rows)} column(s), "
+            f"{len(partition_rows)} data_base partition(s)."
+        )
+        return row_count
@@ -2,23 +2,65 @@
 
 This module provides the DatabaseService class, which is responsible for
 managing connections to the DuckDB database, creating tables based on schemas,
-and loading data from CSV files.
+and loading data from transformed Parquet or CSV files.
 """
 
+import copy
+import hashlib
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import duckdb as db
+import pyarrow as pa
+import pyarrow.parquet as pq
 from loguru import logger
 
+from bacen_ifdata.data_loader.dictionaries import (
+    CategoricalDictionaryTable,
+    ColumnDictionaryTable,
+    create_enum_type,
+)
+from bacen_ifdata.data_loader.incremental import PARTITION_COLUMN, LoadLedger
+from bacen_ifdata.data_loader.layouts import LayoutRegistry, read_file_header
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.long_format import (
+    LONG_KEY_COLUMNS,
+    LONG_NAME_COLUMN,
+    LONG_TABLE_SUFFIX,
+    LONG_VALUE_COLUMN,
+    is_long_format,
+    long_value_columns,
+)
 from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan, SchemaPlanRegistry, map_type_to_duckdb
 from bacen_ifdata.utilities.configurations import Config
+from bacen_ifdata.utilities.duckdb_settings import duckdb_settings, log_duckdb_settings
+
+# DuckDB type for each narrow Arrow type written by the dtype downcasting of the transformer.
+NARROW_DUCKDB_TYPE_BY_ARROW_TYPE: dict[pa.DataType, str] = {
+    pa.int16(): 'SMALLINT',
+    pa.int32(): 'INTEGER',
+    pa.float32(): 'FLOAT',
+}
+
+# Narrow DuckDB types, from the narrowest; a column takes the widest type found across files.
+NARROW_DUCKDB_TYPE_ORDER: tuple[str, ...] = ('SMALLINT', 'INTEGER', 'FLOAT')
+
+# Physical order of the silver tables: the gold models and audits filter on data_base and join on codigo.
+CLUSTER_COLUMNS: tuple[str, ...] = (PARTITION_COLUMN, 'codigo')
 
 
 class DatabaseService:
     """Manages DuckDB database operations."""
 
     def __init__(
-        self, database_path: Path = Config.SILVER_DATABASE_FILE, connection: db.DuckDBPyConnection | None = None
+        self,
+        database_path: Path = Config.SILVER_DATABASE_FILE,
+        connection: db.DuckDBPyConnection | None = None,
+        dictionary_registry: CategoricalDictionaryRegistry | None = None,
+        plan_registry: SchemaPlanRegistry | None = None,
     ) -> None:
         """Initialize the DatabaseService.
 
@@ -27,10 +69,27 @@ class DatabaseService:
             connection (duckdb.DuckDBPyConnection | None): An existing database connection.
                                                            Defaults to None, in which case a new connection will
                                                            be established when needed.
+            dictionary_registry (CategoricalDictionaryRegistry | None): The shared categorical dictionaries.
+                                                           When given, categorical columns are created as ENUM
+                                                           types. Defaults to None (VARCHAR).
+            plan_registry (SchemaPlanRegistry | None): The compiled schema plans, shared with the transformer
+                                                       so both stages make the same type decisions.
+                                                       Defaults to a registry that only caches in memory.
         """
 
         self._database_path = database_path
         self._connection = connection
+        self._dictionary_registry = dictionary_registry
+        self._is_dictionary_table_synced = False
+        self._plan_registry = plan_registry or SchemaPlanRegistry()
+        # Serialises the catalog changes (tables, ENUM types, dictionaries) of the cursors sharing the connection.
+        self._ddl_lock = threading.RLock()
+        # Definition (column types and comments) each table was last synced to, shared by the cursors.
+        self._synced_definitions: dict[str, tuple] = {}
+        # Number of open ``transaction`` blocks; the nested ones join the outermost transaction.
+        self._transaction_depth = 0
+        # Header of each file read so far, by (path, size, modification time), shared by the cursors.
+        self._file_headers: dict[tuple[str, int, int], tuple[str, ...]] = {}
 
     def _map_type_to_duckdb(self, schema_type: str | None) -> str:
         """Map internal schema types to DuckDB types.
@@ -42,65 +101,125 @@ class DatabaseService:
             str: The corresponding DuckDB type.
         """
 
-        if schema_type in ('numeric', 'percentage', 'currency'):
-            return 'DOUBLE'
+        return map_type_to_duckdb(schema_type)
+
+    def file_header(self, file_path: Path) -> tuple[str, ...]:
+        """Return the columns of a transformed file, reading its header only once while the file is unchanged.
+
+        Args:
+            file_path (Path): The path to the Parquet or CSV file.
 
-        if schema_type == 'integer':
-            return 'BIGINT'  # Use BIGINT to be safe with large numbers
+        Returns:
+            tuple[str, ...]: The columns of the file, in file order.
+        """
 
-        if schema_type == 'date':
-            return 'DATE'
+        stat = file_path.stat()
+        key = (str(file_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._file_headers:
+            self._file_headers[key] = read_file_header(file_path)
 
-        if schema_type == 'boolean':
-            return 'BOOLEAN'
+        return self._file_headers[key]
 
-        # Default to VARCHAR for text, categorical, and unknown types
-        return 'VARCHAR'
+    def _build_typed_select_query(
+        self,
+        source: str,
+        columns: list[str],
+        plan: SchemaPlan,
+        column_types: dict[str, str] | None = None,
+    ) -> str:
+        """Builds the DuckDB SELECT query for an already typed source (Parquet file or Arrow table).
 
-    def _get_raw_csv_header(self, csv_path: Path) -> list[str]:
-        """Reads the CSV header to identify present columns.
+        The source keeps the transformer dtypes, so the columns are only cast to
+        the table types (e.g. timestamp to DATE, Int64 to DOUBLE).
 
         Args:
-            csv_path (Path): The path to the CSV file.
+            source (str): The relation to select from (a table function call or a registered name).
+            columns (list[str]): The list of columns to import.
+            plan (SchemaPlan): The compiled schema plan defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types overriding the plan types. Defaults to None.
 
         Returns:
-            list[str]: A list of column names found in the CSV header.
+            str: The SQL query string.
         """
 
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            header_line = file.readline().strip()
-            # Handle potential BOM
-            if header_line.startswith('\ufeff'):
-                header_line = header_line[1:]
+        column_types = column_types or {}
+        select_columns = [
+            f'CAST("{column_name}" AS {column_types.get(column_name, plan.get_duckdb_type(column_name))}) '
+            f'AS "{column_name}"'
+            for column_name in columns
+        ]
 
-            # Simple CSV split assuming standard comma delimiter and quotes
-            return [column.strip().strip('"') for column in header_line.split(',')]
+        return f"SELECT {', '.join(select_columns)} FROM {source}"
 
-    def _build_insert_query(self, table_name: str, csv_path: Path, columns: list[str], schema: BaseSchema) -> str:
-        """Builds the DuckDB INSERT query with explicit column types.
+    def _file_list_literal(self, file_paths: Path | list[Path]) -> str:
+        """Builds the DuckDB literal of a file path, or of a list of file paths for a multi-file scan.
 
         Args:
-            table_name (str): The name of the target table.
-            csv_path (Path): The path to the CSV file.
+            file_paths (Path | list[Path]): The file path or paths.
+
+        Returns:
+            str: A quoted path, or a list of quoted paths.
+        """
+
+        if isinstance(file_paths, Path):
+            return f"'{file_paths.as_posix()}'"
+
+        return '[' + ', '.join(f"'{path.as_posix()}'" for path in file_paths) + ']'
+
+    def _build_parquet_select_query(
+        self,
+        parquet_path: Path | list[Path],
+        columns: list[str],
+        plan: SchemaPlan,
+        column_types: dict[str, str] | None = None,
+    ) -> str:
+        """Builds the DuckDB SELECT query for a Parquet file, or a list of files scanned at once.
+
+        Args:
+            parquet_path (Path | list[Path]): The path to the Parquet file, or the paths of the files.
             columns (list[str]): The list of columns to import.
-            schema (BaseSchema): The schema defining column types.
+            plan (SchemaPlan): The compiled schema plan defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types overriding the plan types. Defaults to None.
 
         Returns:
             str: The SQL query string.
         """
 
-        columns_struct = []
-        for column_name in columns:
-            column_type = schema.get_type(column_name)
-            duckdb_type = self._map_type_to_duckdb(column_type)
-            columns_struct.append(f"'{column_name}': '{duckdb_type}'")
+        # The files of a report may narrow a column differently, so a multi-file scan unifies them by name.
+        options = '' if isinstance(parquet_path, Path) else ', union_by_name=True'
+
+        return self._build_typed_select_query(
+            f"read_parquet({self._file_list_literal(parquet_path)}{options})", columns, plan, column_types
+        )
+
+    def _build_csv_select_query(
+        self, csv_path: Path | list[Path], columns: list[str], plan: SchemaPlan, header: tuple[str, ...] | None = None
+    ) -> str:
+        """Builds the DuckDB SELECT query of a CSV file with explicit column types.
+
+        The explicit columns of ``read_csv`` are matched by position, so they are
+        the whole header of the file; the columns to import are then selected by name.
+
+        Args:
+            csv_path (Path | list[Path]): The path to the CSV file, or the paths of files sharing the same header.
+            columns (list[str]): The list of columns to import.
+            plan (SchemaPlan): The compiled schema plan defining column types.
+            header (tuple[str, ...] | None): The columns of the files, in file order. Defaults to ``columns``.
+
+        Returns:
+            str: The SQL query string.
+        """
+
+        columns_struct = [
+            f"'{column_name}': '{plan.get_duckdb_type(column_name)}'" for column_name in (header or columns)
+        ]
 
         columns_str = ", ".join(columns_struct)
-        column_names_str = ", ".join([f'"{col}"' for col in columns])
+        select_columns = ", ".join(f'"{column_name}"' for column_name in columns)
 
         return (
-            f"INSERT INTO {table_name} ({column_names_str}) SELECT * FROM read_csv("
-            f"'{csv_path.as_posix()}', "
+            f"SELECT {select_columns} FROM read_csv("
+            f"{self._file_list_literal(csv_path)}, "
             f"header=True, "
             f"delim=',', "
             f"quote='\"', "
@@ -111,9 +230,42 @@ class DatabaseService:
             f"nullstr=['', 'NULL', 'NA', 'N/A', '-'], "
             f"ignore_errors=False, "
             f"auto_detect=False"
-            f");"
+            f")"
         )
 
+    def _insert_select(self, table_name: str, columns: list[str], select_query: str) -> None:
+        """Inserts the rows of a SELECT query into the given columns of a table.
+
+        Args:
+            table_name (str): The name of the target table.
+            columns (list[str]): The target columns, in the order of the query.
+            select_query (str): The query producing the rows.
+        """
+
+        column_names_str = ", ".join([f'"{col}"' for col in columns])
+        self.connection.execute(
+            f"INSERT INTO {table_name} ({column_names_str}) {self._clustered_query(select_query, columns)};"
+        )
+
+    def _clustered_query(self, select_query: str, columns: list[str]) -> str:
+        """Orders the rows of a SELECT query by the cluster columns, so each load writes them already clustered.
+
+        Args:
+            select_query (str): The query producing the rows.
+            columns (list[str]): The columns of the query.
+
+        Returns:
+            str: The query, ordered by the cluster columns it has (unchanged if it has none).
+        """
+
+        order_columns = [column for column in CLUSTER_COLUMNS if column in columns]
+        if not Config.SILVER_CLUSTERING or not order_columns:
+            return select_query
+
+        order_by = ', '.join(f'"{column}"' for column in order_columns)
+
+        return f"{select_query} ORDER BY {order_by}"
+
     @property
     def connection(self) -> db.DuckDBPyConnection:
         """Get the active database connection.
@@ -123,10 +275,80 @@ class DatabaseService:
         """
 
         if self._connection is None:
-            self._connection = db.connect(str(self._database_path))
+            self._connection = db.connect(str(self._database_path), config=duckdb_settings())
+            log_duckdb_settings(self._connection, self._database_path.name)
 
         return self._connection
 
+    @property
+    def ddl_lock(self) -> threading.RLock:
+        """Get the lock serialising the catalog changes of the cursors sharing the connection.
+
+        Returns:
+            threading.RLock: The lock, shared by the cursors of the service.
+        """
+
+        return self._ddl_lock
+
+    def cursor(self) -> 'DatabaseService':
+        """Return a service over a new cursor of this connection, to be used by another thread.
+
+        DuckDB cursors of the same connection can write to different tables at the
+        same time. The cursors share the registries and the DDL lock, and the
+        categorical dictionary table is synced once, before any cursor is created.
+
+        Returns:
+            DatabaseService: The service bound to the new cursor; close it when the thread is done.
+        """
+
+        with self._ddl_lock:
+            self._sync_dictionary_table()
+
+        # A shallow copy keeps the subclass (e.g. the Parquet lake) and shares the registries and the lock.
+        service = copy.copy(self)
+        service._connection = self.connection.cursor()
+        service._transaction_depth = 0
+
+        return service
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed statements in one transaction, rolled back if any of them fails.
+
+        A nested block joins the outermost transaction, so a table load made of
+        several inserts (e.g. one per file) still commits, or rolls back, once.
+        """
+
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        self.connection.execute('BEGIN TRANSACTION;')
+        self._transaction_depth = 1
+        try:
+            yield
+            self._before_commit()
+        except Exception:
+            self.connection.execute('ROLLBACK;')
+            # The tables synced in the transaction are gone; check them again on the next load.
+            self._synced_definitions.clear()
+            raise
+        else:
+            self.connection.execute('COMMIT;')
+        finally:
+            self._transaction_depth = 0
+            self._end_transaction()
+
+    def _before_commit(self) -> None:
+        """Hook run when the outermost transaction is about to commit."""
+
+    def _end_transaction(self) -> None:
+        """Hook run when the outermost transaction ends, committed or rolled back."""
+
     def close(self) -> None:
         """Close the database connection."""
 
@@ -144,14 +366,33 @@ class DatabaseService:
         """
 
         try:
-            tables = self.connection.execute(
-                "SELECT table_name FROM information_schema.tables WHERE table_schema = 'main'"
-            ).fetchall()
+            # Everything is dropped in one transaction, so a failed reset leaves the database as it was.
+            with self._ddl_lock, self.transaction():
+                # Views (the long views of the wide portfolio reports) are dropped before the tables they read.
+                # The stage timings and the header registry are the history of the runs, not data of the tables.
+                tables = self.connection.execute(
+                    "SELECT table_name, table_type FROM information_schema.tables "
+                    "WHERE table_schema = 'main' AND NOT list_contains(?, table_name) "
+                    "ORDER BY table_type = 'VIEW' DESC",
+                    [[LoadLedger.STAGE_TIMINGS_TABLE_NAME, LayoutRegistry.HEADER_LAYOUTS_TABLE_NAME]],
+                ).fetchall()
+
+                for table_name, table_type in tables:
+                    relation_kind = 'VIEW' if table_type == 'VIEW' else 'TABLE'
+                    self.connection.execute(f'DROP {relation_kind} IF EXISTS "{table_name}";')
+
+                # ENUM types are rebuilt from the categorical dictionaries on the next load.
+                enum_types = self.connection.execute(
+                    "SELECT type_name FROM duckdb_types() "
+                    "WHERE logical_type = 'ENUM' AND NOT internal AND database_name = current_database()"
+                ).fetchall()
 
-            for (table_name,) in tables:
-                self.connection.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+                for (type_name,) in enum_types:
+                    self.connection.execute(f'DROP TYPE IF EXISTS "{type_name}";')
 
-            logger.info(f"Database reset: {len(tables)} table(s) dropped.")
+            self._synced_definitions.clear()
+            self._is_dictionary_table_synced = False
+            logger.info(f"Database reset: {len(tables)} table(s) and {len(enum_types)} type(s) dropped.")
 
         except db.Error as error:
             logger.error(f"Error resetting database: {error}")
@@ -165,79 +406,872 @@ class DatabaseService:
         """
 
         try:
-            self.connection.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+            is_view = self.connection.execute(
+                "SELECT 1 FROM information_schema.tables "
+                "WHERE table_schema = 'main' AND table_name = ? AND table_type = 'VIEW'",
+                [table_name],
+            ).fetchone()
+            self.connection.execute(f'DROP {"VIEW" if is_view else "TABLE"} IF EXISTS "{table_name}";')
+            self._synced_definitions.pop(table_name, None)
             logger.info(f"Table '{table_name}' dropped specifically.")
         except db.Error as error:
             logger.error(f"Error dropping table '{table_name}': {error}")
             raise
 
-    def create_table(self, table_name: str, schema: BaseSchema) -> None:
-        """Create a table in the database if it does not exist.
+    def _ensure_enum_type(self, column_name: str) -> str | None:
+        """Creates the ENUM type of a categorical column from the shared dictionaries.
+
+        Args:
+            column_name (str): The name of the categorical column.
+
+        Returns:
+            str | None: The ENUM type name, or None if the column has no dictionary.
+        """
+
+        if self._dictionary_registry is None:
+            return None
+
+        values = self._dictionary_registry.categories(column_name)
+        if not values:
+            return None
+
+        return create_enum_type(self, self._dictionary_registry.enum_type_name(column_name), values)
+
+    def _sync_dictionary_table(self) -> None:
+        """Writes the shared categorical dictionaries to the database, once per registry (and after a reset)."""
+
+        if self._dictionary_registry is None or self._is_dictionary_table_synced:
+            return
+
+        CategoricalDictionaryTable(self).write(self._dictionary_registry)
+        self._is_dictionary_table_synced = True
+
+    def set_dictionary_registry(self, dictionary_registry: CategoricalDictionaryRegistry | None) -> None:
+        """Replace the categorical dictionaries the next tables are synced with.
+
+        The dictionaries only grow, so a table synced after the replacement gets
+        the ENUM types of the new values. The dictionary table is written again.
+
+        Args:
+            dictionary_registry (CategoricalDictionaryRegistry | None): The dictionaries (e.g. a snapshot of the
+                                                                        ones extended by the transformer).
+        """
+
+        with self._ddl_lock:
+            self._dictionary_registry = dictionary_registry
+            self._is_dictionary_table_synced = False
+            self._sync_dictionary_table()
+
+    def resolve_column_types(self, sources: list[Path | pa.Table], schema: BaseSchema) -> dict[str, str]:
+        """Resolves the narrow DuckDB types that hold the data of every file of a report.
+
+        The transformer may narrow a column differently in each file (e.g. Int16 in
+        one quarter and Int32 in another), so the widest narrow type is chosen. A
+        column keeps its schema plan type if any file stores it with a wide type.
+
+        Args:
+            sources (list[Path | pa.Table]): The transformed files of the report, or their in-memory Arrow tables.
+            schema (BaseSchema): The schema for the report.
+
+        Returns:
+            dict[str, str]: The narrow DuckDB type of each column that can use one.
+        """
+
+        # Only Parquet files and Arrow tables carry the narrowed types; CSV files are loaded with the plan types.
+        if not sources or any(isinstance(source, Path) and source.suffix != '.parquet' for source in sources):
+            return {}
+
+        plan = self._plan_registry.get(schema)
+        narrow_types_by_column: dict[str, set[str | None]] = {}
+        for source in sources:
+            arrow_schema = source.schema if isinstance(source, pa.Table) else pq.read_schema(source)
+            for arrow_field in arrow_schema:
+                narrow_types_by_column.setdefault(arrow_field.name, set()).add(
+                    NARROW_DUCKDB_TYPE_BY_ARROW_TYPE.get(arrow_field.type)
+                )
+
+        return {
+            column_name: max(narrow_types, key=NARROW_DUCKDB_TYPE_ORDER.index)
+            for column_name, narrow_types in narrow_types_by_column.items()
+            if plan.column(column_name) is not None and None not in narrow_types
+        }
+
+    def file_columns(self, schema: BaseSchema) -> list[str]:
+        """Return the columns the wide transformed files of a report are expected to hold, in table order.
+
+        Args:
+            schema (BaseSchema): The schema of the report.
+
+        Returns:
+            list[str]: The schema columns; in long format, without the sparse amounts of the long table.
+        """
+
+        plan = self._plan_registry.get(schema)
+        # In long format the sparse amounts are not in the wide files (see ``create_long_table``).
+        long_columns = set(long_value_columns(plan, schema)) if is_long_format(schema) else set()
+
+        return [column for column in plan.column_names if column not in long_columns]
+
+    def table_column_types(self, schema: BaseSchema, column_types: dict[str, str] | None = None) -> dict[str, str]:
+        """Return the DuckDB type of each column of the table of a report, in table order.
 
         Args:
-            table_name (str): The name of the table to create.
             schema (BaseSchema): The schema definition for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types overriding the plan types
+                                                  (see ``resolve_column_types``). Defaults to None.
+
+        Returns:
+            dict[str, str]: The type of each column; categorical columns get the ENUM of their dictionary.
+        """
+
+        column_types = column_types or {}
+        plan = self._plan_registry.get(schema)
+        # In long format the sparse amounts live in the long table (see ``create_long_table``).
+        long_columns = set(long_value_columns(plan, schema)) if is_long_format(schema) else set()
+
+        table_types = {}
+        for column in plan.columns:
+            if column.name in long_columns:
+                continue
+
+            duckdb_type = column_types.get(column.name, column.duckdb_type)
+
+            # Categorical columns use the ENUM built from the shared dictionaries, when available.
+            if column.schema_type == 'categorical':
+                duckdb_type = self._ensure_enum_type(column.name) or duckdb_type
+
+            table_types[column.name] = duckdb_type
+
+        return table_types
+
+    def catalog_columns(self, table_name: str) -> dict[str, tuple[str, str | None]]:
+        """Return the columns of a table (or view) as the catalog holds them.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            dict[str, tuple[str, str | None]]: The type and comment of each column, in table order
+                                               (empty if the table does not exist).
+        """
+
+        rows = self.connection.execute(
+            "SELECT column_name, data_type, comment FROM duckdb_columns() "
+            "WHERE database_name = current_database() AND schema_name = 'main' AND table_name = ? "
+            "ORDER BY column_index",
+            [table_name],
+        ).fetchall()
+
+        return {column_name: (data_type, comment) for column_name, data_type, comment in rows}
+
+    @staticmethod
+    def _comment_statement(table_name: str, column: str, description: str) -> str:
+        """Return the COMMENT ON COLUMN statement of a column.
+
+        Args:
+            table_name (str): The name of the table (or view).
+            column (str): The name of the column.
+            description (str): The comment.
+
+        Returns:
+            str: The statement, with the single quotes of the comment escaped.
+        """
+
+        safe_description = description.replace("'", "''")
+
+        return f"COMMENT ON COLUMN {table_name}.\"{column}\" IS '{safe_description}';"
+
+    def _drop_index_statements(self, table_name: str) -> list[str]:
+        """Return the statements that drop the indexes of a table.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            list[str]: One DROP INDEX statement per index.
         """
 
-        columns_definitions = []
-        comments = []
+        index_names = self.connection.execute(
+            "SELECT index_name FROM duckdb_indexes() WHERE database_name = current_database() AND table_name = ?",
+            [table_name],
+        ).fetchall()
+
+        return [f'DROP INDEX IF EXISTS "{index_name}";' for (index_name,) in index_names]
+
+    def _sync_relation(self, table_name: str, column_types: dict[str, str], comments: dict[str, str]) -> int:
+        """Brings the relation holding the rows of a table to the given definition, in the current transaction.
+
+        A missing table is created; otherwise only the differences with the catalog
+        are applied: new columns are added, columns of another type are altered and
+        comments are written when they changed. Columns that are no longer in the
+        definition are kept, with their rows.
+
+        Args:
+            table_name (str): The name of the table.
+            column_types (dict[str, str]): The DuckDB type of each column, in table order.
+            comments (dict[str, str]): The comment of each described column.
+
+        Returns:
+            int: The number of DDL statements run.
+        """
 
-        for column_name in schema.column_names:
-            column_type = schema.get_type(column_name)
-            duckdb_type = self._map_type_to_duckdb(column_type)
+        current_columns = self.catalog_columns(table_name)
+        statements = []
+
+        if not current_columns:
+            columns_definitions = ', '.join(f'"{column}" {duckdb_type}' for column, duckdb_type in column_types.items())
+            statements.append(f"CREATE TABLE {table_name} ({columns_definitions});")
+        else:
+            # DuckDB spells each expected type the way the catalog does (e.g. an ENUM by its values).
+            expected_types = self.connection.execute(
+                'SELECT ' + ', '.join(f'typeof(CAST(NULL AS {duckdb_type}))' for duckdb_type in column_types.values())
+            ).fetchone()
+            for (column, duckdb_type), expected_type in zip(column_types.items(), expected_types):
+                if column not in current_columns:
+                    statements.append(f'ALTER TABLE {table_name} ADD COLUMN "{column}" {duckdb_type};')
+                elif current_columns[column][0] != expected_type:
+                    statements.append(f'ALTER TABLE {table_name} ALTER COLUMN "{column}" TYPE {duckdb_type};')
+
+        # Columns may not be altered while an index depends on their table; ``cluster_table`` creates it again.
+        if current_columns and statements:
+            statements[:0] = self._drop_index_statements(table_name)
+
+        for column, description in comments.items():
+            if current_columns.get(column, (None, None))[1] != description:
+                statements.append(self._comment_statement(table_name, column, description))
+
+        for statement in statements:
+            self.connection.execute(statement)
+
+        return len(statements)
+
+    def create_table(self, table_name: str, schema: BaseSchema, column_types: dict[str, str] | None = None) -> None:
+        """Create a table in the database, or bring an existing one to the schema definition.
+
+        The column types and comments are computed once and compared with the
+        catalog, and only the differences are applied, in one transaction. A table
+        already synced to the same definition (e.g. by the previous file of the
+        report) is not checked again.
+
+        Args:
+            table_name (str): The name of the table to create.
+            schema (BaseSchema): The schema definition for the table.
+            column_types (dict[str, str] | None): Narrow DuckDB types overriding the plan types
+                                                  (see ``resolve_column_types``). Defaults to None.
+        """
 
-            # Sanitize column name to avoid SQL injection or syntax errors
-            # Assuming column names are already relatively safe, but quoting is good practice.
-            safe_column_name = f'"{column_name}"'
-            columns_definitions.append(f'{safe_column_name} {duckdb_type}')
+        plan = self._plan_registry.get(schema)
 
-            description = schema.get_description(column_name)
-            if description:
-                # Escape single quotes in description
-                safe_description = description.replace("'", "''")
-                comments.append(f"COMMENT ON COLUMN {table_name}.{safe_column_name} IS '{safe_description}';")
+        table_types = self.table_column_types(schema, column_types)
+        comments = {
+            column_name: plan.get_description(column_name)
+            for column_name in table_types
+            if plan.get_description(column_name)
+        }
 
-        create_query = f"CREATE TABLE IF NOT EXISTS {table_name} ({', '.join(columns_definitions)});"
+        definition = (tuple(table_types.items()), tuple(comments.items()))
+        if self._synced_definitions.get(table_name) == definition:
+            return
 
         try:
-            self.connection.execute(create_query)
-            logger.info(f"Table '{table_name}' checked/created successfully.")
+            with self._ddl_lock, self.transaction():
+                changes = self._sync_relation(table_name, table_types, comments)
+                self._sync_dictionary_table()
 
-            # Apply comments
-            for comment in comments:
-                self.connection.execute(comment)
+            self._synced_definitions[table_name] = definition
+            logger.info(f"Table '{table_name}' checked/created successfully ({changes} DDL change(s)).")
 
         except db.Error as error:
             logger.error(f"Error creating table '{table_name}': {error}")
             raise
 
-    def insert_data(self, table_name: str, csv_path: Path, schema: BaseSchema) -> None:
-        """Insert data from a CSV file into the specified table.
+    def insert_data(
+        self, table_name: str, file_path: Path, schema: BaseSchema, column_types: dict[str, str] | None = None
+    ) -> None:
+        """Insert data from a transformed file into the specified table.
 
-        Uses DuckDB's read_csv with explicit column types to avoid sniffing errors.
+        Parquet files are read natively with read_parquet. CSV files use DuckDB's
+        read_csv with explicit column types to avoid sniffing errors.
 
         Args:
             table_name (str): The name of the target table.
-            csv_path (Path): The path to the CSV file.
+            file_path (Path): The path to the Parquet or CSV file.
             schema (BaseSchema): The schema defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table (see ``resolve_column_types``).
+                                                  Defaults to None.
         """
 
+        is_parquet = file_path.suffix == '.parquet'
+        plan = self._plan_registry.get(schema)
+
         try:
-            # Read CSV header to identify present columns
-            raw_columns = self._get_raw_csv_header(csv_path)
+            # Read the file header to identify present columns
+            raw_columns = self.file_header(file_path)
 
-            # Intersect schema columns with CSV columns to maintain order and validity
-            common_columns = [column for column in schema.column_names if column in raw_columns]
+            # Intersect schema columns with file columns to maintain order and validity
+            common_columns = [column for column in plan.column_names if column in raw_columns]
 
             if not common_columns:
-                logger.warning(f"No matching columns found between schema and '{csv_path.name}'. Skipping.")
+                logger.warning(f"No matching columns found between schema and '{file_path.name}'. Skipping.")
                 return
 
             # Build and execute the query
-            query = self._build_insert_query(table_name, csv_path, common_columns, schema)
-            self.connection.execute(query)
-            logger.info(f"Data from '{csv_path.name}' loaded into '{table_name}' ({len(common_columns)} columns).")
+            if is_parquet:
+                query = self._build_parquet_select_query(file_path, common_columns, plan, column_types)
+            else:
+                query = self._build_csv_select_query(file_path, common_columns, plan, raw_columns)
+            self._insert_select(table_name, common_columns, query)
+            logger.info(f"Data from '{file_path.name}' loaded into '{table_name}' ({len(common_columns)} columns).")
 
         except (OSError, db.Error) as error:
-            logger.error(f"Error loading data from '{csv_path}' into '{table_name}': {error}")
+            logger.error(f"Error loading data from '{file_path}' into '{table_name}': {error}")
+            raise
+
+    def insert_files(
+        self, table_name: str, file_paths: list[Path], schema: BaseSchema, column_types: dict[str, str] | None = None
+    ) -> None:
+        """Insert every transformed file of a report with one multi-file scan per group of compatible headers.
+
+        Files with the same format and the same schema columns are read by a single
+        ``read_parquet``/``read_csv`` over the list of files, which DuckDB scans in
+        parallel. All the groups are inserted in one transaction, so a failing file
+        leaves the table as it was.
+
+        Args:
+            table_name (str): The name of the target table.
+            file_paths (list[Path]): The Parquet or CSV files of the report.
+            schema (BaseSchema): The schema defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table (see ``resolve_column_types``).
+                                                  Defaults to None.
+        """
+
+        plan = self._plan_registry.get(schema)
+        file_groups = self._group_files(file_paths, plan)
+        if not file_groups:
+            return
+
+        try:
+            with self.transaction():
+                self._insert_file_groups(table_name, file_groups, plan, column_types)
+
+        except db.Error as error:
+            logger.error(f"Error bulk loading {len(file_paths)} file(s) into '{table_name}': {error}")
+            raise
+
+    def _group_files(
+        self, file_paths: list[Path], plan: SchemaPlan
+    ) -> dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[Path]]:
+        """Group the files by format and layout, keeping the order of the files.
+
+        Parquet files are scanned by column name, so the files with the same schema
+        columns share a scan; the columns of a CSV scan are positional, so CSV files
+        share a scan only with the files of the same header.
+
+        Args:
+            file_paths (list[Path]): The Parquet or CSV files of the report.
+            plan (SchemaPlan): The compiled schema plan of the report.
+
+        Returns:
+            dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[Path]]: The files of each
+                (suffix, common columns, CSV header) group.
+        """
+
+        file_groups: dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[Path]] = {}
+        for file_path in file_paths:
+            try:
+                raw_columns = self.file_header(file_path)
+            except OSError as error:
+                logger.error(f"Error reading the header of '{file_path}': {error}")
+                raise
+
+            common_columns = tuple(column for column in plan.column_names if column in raw_columns)
+            if not common_columns:
+                logger.warning(f"No matching columns found between schema and '{file_path.name}'. Skipping.")
+                continue
+
+            header = () if file_path.suffix == '.parquet' else raw_columns
+            file_groups.setdefault((file_path.suffix, common_columns, header), []).append(file_path)
+
+        return file_groups
+
+    def _insert_file_groups(
+        self,
+        table_name: str,
+        file_groups: dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[Path]],
+        plan: SchemaPlan,
+        column_types: dict[str, str] | None = None,
+    ) -> None:
+        """Insert each group of compatible files with one multi-file scan, in the current transaction.
+
+        Args:
+            table_name (str): The name of the target table.
+            file_groups (dict[tuple[str, tuple[str, ...], tuple[str, ...]], list[Path]]): The groups built by
+                                                                                         ``_group_files``.
+            plan (SchemaPlan): The compiled schema plan of the report.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table. Defaults to None.
+        """
+
+        for (suffix, common_columns, header), group_paths in file_groups.items():
+            if suffix == '.parquet':
+                query = self._build_parquet_select_query(group_paths, list(common_columns), plan, column_types)
+            else:
+                query = self._build_csv_select_query(group_paths, list(common_columns), plan, header)
+            self._insert_select(table_name, list(common_columns), query)
+            logger.info(
+                f"{len(group_paths)} file(s) loaded into '{table_name}' in one scan ({len(common_columns)} columns)."
+            )
+
+    def insert_arrow(
+        self,
+        table_name: str,
+        arrow_table: pa.Table,
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+        source_name: str = 'arrow table',
+    ) -> None:
+        """Insert an in-memory Arrow table into the specified table.
+
+        The table is registered in the connection and scanned by DuckDB in
+        place, so the transformed data is never serialised to a file.
+
+        Args:
+            table_name (str): The name of the target table.
+            arrow_table (pa.Table): The transformed data.
+            schema (BaseSchema): The schema defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table (see ``resolve_column_types``).
+                                                  Defaults to None.
+            source_name (str): The name of the source file, used in the logs. Defaults to 'arrow table'.
+        """
+
+        plan = self._plan_registry.get(schema)
+        common_columns = [column for column in plan.column_names if column in arrow_table.column_names]
+
+        if not common_columns:
+            logger.warning(f"No matching columns found between schema and '{source_name}'. Skipping.")
+            return
+
+        view_name = f'arrow_{table_name}'
+        try:
+            self.connection.register(view_name, arrow_table)
+            self._insert_select(
+                table_name,
+                common_columns,
+                self._build_typed_select_query(view_name, common_columns, plan, column_types),
+            )
+            logger.info(f"Data from '{source_name}' loaded into '{table_name}' ({len(common_columns)} columns).")
+
+        except db.Error as error:
+            logger.error(f"Error loading data from '{source_name}' into '{table_name}': {error}")
             raise
+
+        finally:
+            self.connection.unregister(view_name)
+
+    def _ensure_column_name_enum(self, long_table_name: str, value_columns: list[str]) -> str:
+        """Creates the ENUM type of the column names of a long table.
+
+        Args:
+            long_table_name (str): The name of the long table.
+            value_columns (list[str]): The amount columns, in code order.
+
+        Returns:
+            str: The quoted ENUM type name.
+        """
+
+        digest = hashlib.sha1('\x1f'.join(value_columns).encode('utf-8')).hexdigest()[:8]
+
+        return create_enum_type(self, f'enum_{long_table_name}_{digest}', value_columns)
+
+    def _long_column_types(self, long_table_name: str, plan: SchemaPlan, value_columns: list[str]) -> dict[str, str]:
+        """Return the DuckDB types of the columns of a long table.
+
+        Args:
+            long_table_name (str): The name of the long table.
+            plan (SchemaPlan): The compiled schema plan of the report.
+            value_columns (list[str]): The amount columns, in code order.
+
+        Returns:
+            dict[str, str]: The type of each column, in table order.
+        """
+
+        return {
+            **{column: plan.get_duckdb_type(column) for column in LONG_KEY_COLUMNS},
+            LONG_NAME_COLUMN: self._ensure_column_name_enum(long_table_name, value_columns),
+            LONG_VALUE_COLUMN: 'DOUBLE',
+        }
+
+    def create_long_table(self, table_name: str, schema: BaseSchema) -> None:
+        """Create the long table of a report stored in long format, if it does not exist.
+
+        The table holds one row per non-empty amount, keyed by ``(codigo, data_base)``;
+        ``nome_coluna`` is an ENUM of the amount columns, described in the column dictionary.
+
+        Args:
+            table_name (str): The name of the wide table of the report.
+            schema (BaseSchema): The schema definition for the report.
+        """
+
+        plan = self._plan_registry.get(schema)
+        value_columns = long_value_columns(plan, schema)
+        long_table_name = f'{table_name}{LONG_TABLE_SUFFIX}'
+
+        column_types = self._long_column_types(long_table_name, plan, value_columns)
+        comments = {column: plan.get_description(column) for column in LONG_KEY_COLUMNS if plan.get_description(column)}
+        comments[LONG_NAME_COLUMN] = f'Coluna do relatório (ver {ColumnDictionaryTable.COLUMN_DICTIONARY_TABLE_NAME})'
+
+        definition = (tuple(column_types.items()), tuple(comments.items()))
+        if self._synced_definitions.get(long_table_name) == definition:
+            return
+
+        try:
+            with self._ddl_lock, self.transaction():
+                changes = self._sync_relation(long_table_name, column_types, comments)
+                ColumnDictionaryTable(self).write(long_table_name, plan, value_columns)
+
+            self._synced_definitions[long_table_name] = definition
+            logger.info(f"Table '{long_table_name}' checked/created successfully ({changes} DDL change(s)).")
+
+        except db.Error as error:
+            logger.error(f"Error creating table '{long_table_name}': {error}")
+            raise
+
+    def insert_long_data(
+        self,
+        table_name: str,
+        input_data: Path | list[Path] | pa.Table,
+        schema: BaseSchema,
+        source_name: str = 'arrow table',
+    ) -> None:
+        """Insert the long part of transformed files (Parquet) or of an Arrow table into the long table.
+
+        Args:
+            table_name (str): The name of the wide table of the report.
+            input_data (Path | list[Path] | pa.Table): The long Parquet file, the long files scanned at once,
+                                                       or the long Arrow table.
+            schema (BaseSchema): The schema definition for the report.
+            source_name (str): The name of the source file, used in the logs. Defaults to 'arrow table'.
+        """
+
+        plan = self._plan_registry.get(schema)
+        long_table_name = f'{table_name}{LONG_TABLE_SUFFIX}'
+        column_types = self._long_column_types(long_table_name, plan, long_value_columns(plan, schema))
+        columns = list(column_types)
+
+        view_name = f'arrow_{long_table_name}'
+        is_arrow = isinstance(input_data, pa.Table)
+        source = view_name if is_arrow else f"read_parquet({self._file_list_literal(input_data)})"
+
+        try:
+            if is_arrow:
+                self.connection.register(view_name, input_data)
+            self._insert_select(
+                long_table_name, columns, self._build_typed_select_query(source, columns, plan, column_types)
+            )
+            logger.info(f"Data from '{source_name}' loaded into '{long_table_name}'.")
+
+        except db.Error as error:
+            logger.error(f"Error loading data from '{source_name}' into '{long_table_name}': {error}")
+            raise
+
+        finally:
+            if is_arrow:
+                self.connection.unregister(view_name)
+
+    def create_long_view(self, table_name: str, schema: BaseSchema) -> None:
+        """Expose a wide table in long format through a view, as if it had been stored long.
+
+        UNPIVOT drops the empty cells, so the view has the rows the long table would hold.
+
+        Args:
+            table_name (str): The name of the wide table of the report.
+            schema (BaseSchema): The schema definition for the report.
+        """
+
+        plan = self._plan_registry.get(schema)
+        value_columns = long_value_columns(plan, schema)
+        long_table_name = f'{table_name}{LONG_TABLE_SUFFIX}'
+        key_columns = ', '.join(f'"{column}"' for column in LONG_KEY_COLUMNS)
+        unpivot_columns = ', '.join(f'"{column}"' for column in value_columns)
+
+        try:
+            with self._ddl_lock, self.transaction():
+                self.connection.execute(
+                    f"CREATE OR REPLACE VIEW {long_table_name} AS "
+                    f"SELECT {key_columns}, {LONG_NAME_COLUMN}, "
+                    f"CAST({LONG_VALUE_COLUMN} AS DOUBLE) AS {LONG_VALUE_COLUMN} "
+                    f"FROM (SELECT {key_columns}, {unpivot_columns} FROM {table_name}) "
+                    f"UNPIVOT ({LONG_VALUE_COLUMN} FOR {LONG_NAME_COLUMN} IN ({unpivot_columns}));"
+                )
+                ColumnDictionaryTable(self).write(long_table_name, plan, value_columns)
+                logger.info(f"View '{long_table_name}' created over '{table_name}'.")
+
+        except db.Error as error:
+            logger.error(f"Error creating view '{long_table_name}': {error}")
+            raise
+
+    def table_exists(self, table_name: str) -> bool:
+        """Return whether a table (or view) exists in the database.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            bool: True if the table exists.
+        """
+
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM information_schema.tables WHERE table_schema = 'main' AND table_name = ?", [table_name]
+            ).fetchone()
+            is not None
+        )
+
+    def align_table(self, table_name: str, column_types: dict[str, str]) -> bool:
+        """Change the column types of an existing table to the given ones, keeping its rows.
+
+        An incremental load appends to tables created by earlier runs, whose ENUM
+        types may miss the values added to the dictionaries since, and whose
+        narrow types may be too small for the new files.
+
+        Args:
+            table_name (str): The name of the table.
+            column_types (dict[str, str]): The expected type of each column, in table order.
+
+        Returns:
+            bool: False if the table has other columns, or a type could not be changed (reload it instead).
+        """
+
+        current_columns = self.catalog_columns(table_name)
+        if list(current_columns) != list(column_types):
+            return False
+
+        # Only the types are changed here; the comments are kept as they are.
+        comments = {column: comment for column, (_, comment) in current_columns.items() if comment}
+        self._synced_definitions.pop(table_name, None)
+        try:
+            with self._ddl_lock, self.transaction():
+                changes = self._sync_relation(table_name, column_types, comments)
+
+        except db.Error as error:
+            logger.warning(f"Could not change the column types of '{table_name}': {error}")
+            return False
+
+        if changes:
+            logger.info(f"Table '{table_name}' aligned with the schema ({changes} DDL change(s)).")
+        return True
+
+    def _is_clustered(self, table_name: str, order_columns: list[str]) -> bool:
+        """Return whether the rows of a table are stored in the order of the given columns.
+
+        Args:
+            table_name (str): The name of the table.
+            order_columns (list[str]): The cluster columns of the table.
+
+        Returns:
+            bool: True if no row follows a row with a greater key (``rowid`` is the storage order).
+        """
+
+        key = 'row(' + ', '.join(f'"{column}"' for column in order_columns) + ')'
+        out_of_order = self.connection.execute(
+            f"SELECT count(*) FROM (SELECT {key} AS row_key, lag({key}) OVER (ORDER BY rowid) AS previous_key "
+            f"FROM {table_name}) WHERE previous_key > row_key;"
+        ).fetchone()[0]
+
+        return out_of_order == 0
+
+    def cluster_table(self, table_name: str) -> bool:
+        """Rewrites a table in ``(data_base, codigo)`` order if its rows are out of that order.
+
+        Every load inserts its rows already sorted, so a table loaded at once, or
+        extended with a newer quarter, is found clustered and left as is. Replacing
+        an older quarter appends its rows after the newer ones, and the table is then
+        rewritten once, keeping its comments. With ``SILVER_KEY_INDEXES`` an ART index
+        is also created on the natural key (``codigo``, ``data_base`` and, in a long
+        table, ``nome_coluna``).
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            bool: True if the table was rewritten.
+        """
+
+        current_columns = self.catalog_columns(table_name)
+        order_columns = [column for column in CLUSTER_COLUMNS if column in current_columns]
+        is_rewritten = False
+
+        try:
+            if Config.SILVER_CLUSTERING and order_columns and not self._is_clustered(table_name, order_columns):
+                order_by = ', '.join(f'"{column}"' for column in order_columns)
+                with self._ddl_lock, self.transaction():
+                    for statement in self._drop_index_statements(table_name):
+                        self.connection.execute(statement)
+                    self.connection.execute(
+                        f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM {table_name} ORDER BY {order_by};"
+                    )
+                    # The new table has no comments; the old ones are written again.
+                    for column, (_, comment) in current_columns.items():
+                        if comment:
+                            self.connection.execute(self._comment_statement(table_name, column, comment))
+
+                is_rewritten = True
+                logger.info(f"Table '{table_name}' rewritten in ({', '.join(order_columns)}) order.")
+
+            key_columns = [column for column in (*LONG_KEY_COLUMNS, LONG_NAME_COLUMN) if column in current_columns]
+            if Config.SILVER_KEY_INDEXES and key_columns:
+                index_columns = ', '.join(f'"{column}"' for column in key_columns)
+                with self._ddl_lock:
+                    self.connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS "{table_name}_key" ON {table_name} ({index_columns});'
+                    )
+
+        except db.Error as error:
+            logger.error(f"Error clustering table '{table_name}': {error}")
+            raise
+
+        return is_rewritten
+
+    def analyze_table(self, table_name: str) -> None:
+        """Refreshes the optimizer statistics of a table.
+
+        Args:
+            table_name (str): The name of the table.
+        """
+
+        self.connection.execute(f'ANALYZE {table_name};')
+
+    def read_file_statistics(self, file_paths: list[Path]) -> dict[str, tuple[tuple[str, ...], int]]:
+        """Read the ``data_base`` partitions and the rows of each transformed file, with one scan per format.
+
+        Args:
+            file_paths (list[Path]): The Parquet or CSV files of a report.
+
+        Returns:
+            dict[str, tuple[tuple[str, ...], int]]: The sorted partitions (ISO dates) and the number of rows of
+                                                    each file, by file name.
+        """
+
+        statistics: dict[str, tuple[tuple[str, ...], int]] = {file_path.name: ((), 0) for file_path in file_paths}
+        for suffix in sorted({file_path.suffix for file_path in file_paths}):
+            paths = [file_path for file_path in file_paths if file_path.suffix == suffix]
+            if suffix == '.parquet':
+                source = f'read_parquet({self._file_list_literal(paths)}, union_by_name=True, filename=True)'
+            else:
+                source = (
+                    f"read_csv({self._file_list_literal(paths)}, header=True, delim=',', all_varchar=True, "
+                    "union_by_name=True, filename=True)"
+                )
+
+            rows = self.connection.execute(
+                f'SELECT filename, list(DISTINCT CAST(CAST("{PARTITION_COLUMN}" AS DATE) AS VARCHAR)) '
+                f'FILTER (WHERE "{PARTITION_COLUMN}" IS NOT NULL), count(*) FROM {source} GROUP BY filename;'
+            ).fetchall()
+            for file_name, file_partitions, row_count in rows:
+                # A file without any data_base gets no partitions (the filtered list is NULL).
+                statistics[Path(file_name).name] = (tuple(sorted(file_partitions or [])), row_count)
+
+        return statistics
+
+    def _delete_partitions(self, table_name: str, partitions: list[str], plan: SchemaPlan) -> None:
+        """Deletes the rows of the given ``data_base`` partitions, in the current transaction.
+
+        Args:
+            table_name (str): The name of the table.
+            partitions (list[str]): The partitions (ISO dates).
+            plan (SchemaPlan): The compiled schema plan of the report.
+        """
+
+        partition_type = plan.get_duckdb_type(PARTITION_COLUMN)
+        self.connection.execute(
+            f'DELETE FROM {table_name} WHERE "{PARTITION_COLUMN}" IN '
+            f'(SELECT CAST(UNNEST(CAST(? AS VARCHAR[])) AS {partition_type}));',
+            [partitions],
+        )
+
+    def replace_partitions(
+        self,
+        table_name: str,
+        file_paths: list[Path],
+        partitions: list[str],
+        schema: BaseSchema,
+        column_types: dict[str, str] | None = None,
+    ) -> None:
+        """Replace the rows of the given ``data_base`` partitions by the rows of the files, in one transaction.
+
+        Args:
+            table_name (str): The name of the target table.
+            file_paths (list[Path]): The Parquet or CSV files holding the new rows of the partitions.
+            partitions (list[str]): The partitions (ISO dates) to delete before the insert.
+            schema (BaseSchema): The schema defining column types.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table (see ``resolve_column_types``).
+                                                  Defaults to None.
+        """
+
+        plan = self._plan_registry.get(schema)
+        file_groups = self._group_files(file_paths, plan)
+
+        try:
+            with self.transaction():
+                self._delete_partitions(table_name, partitions, plan)
+                self._insert_file_groups(table_name, file_groups, plan, column_types)
+
+            logger.info(f"{len(partitions)} partition(s) of '{table_name}' replaced from {len(file_paths)} file(s).")
+
+        except db.Error as error:
+            logger.error(f"Error replacing the partitions of '{table_name}': {error}")
+            raise
+
+    def replace_long_partitions(
+        self, table_name: str, file_paths: list[Path], partitions: list[str], schema: BaseSchema
+    ) -> None:
+        """Replace the rows of the given ``data_base`` partitions of a long table, in one transaction.
+
+        Args:
+            table_name (str): The name of the wide table of the report.
+            file_paths (list[Path]): The long Parquet files holding the new rows of the partitions.
+            partitions (list[str]): The partitions (ISO dates) to delete before the insert.
+            schema (BaseSchema): The schema definition for the report.
+        """
+
+        plan = self._plan_registry.get(schema)
+        long_table_name = f'{table_name}{LONG_TABLE_SUFFIX}'
+
+        try:
+            with self.transaction():
+                self._delete_partitions(long_table_name, partitions, plan)
+                if file_paths:
+                    self.insert_long_data(table_name, file_paths, schema, f'{len(file_paths)} long file(s)')
+
+        except db.Error as error:
+            logger.error(f"Error replacing the partitions of '{long_table_name}': {error}")
+            raise
+
+    def align_report_tables(
+        self, table_name: str, schema: BaseSchema, column_types: dict[str, str] | None = None
+    ) -> bool:
+        """Align the existing tables of a report (wide and long) with the current schema plan and dictionaries.
+
+        Args:
+            table_name (str): The name of the wide table of the report.
+            schema (BaseSchema): The schema definition for the report.
+            column_types (dict[str, str] | None): Narrow DuckDB types of the table (see ``resolve_column_types``).
+                                                  Defaults to None.
+
+        Returns:
+            bool: False if a table is missing or cannot be aligned, so the report must be loaded from scratch.
+        """
+
+        if not self.table_exists(table_name) or not self.align_table(
+            table_name, self.table_column_types(schema, column_types)
+        ):
+            return False
+
+        if not is_long_format(schema):
+            return True
+
+        plan = self._plan_registry.get(schema)
+        long_table_name = f'{table_name}{LONG_TABLE_SUFFIX}'
+
+        return self.table_exists(long_table_name) and self.align_table(
+            long_table_name, self._long_column_types(long_table_name, plan, long_value_columns(plan, schema))
+        )
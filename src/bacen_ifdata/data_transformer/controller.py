@@ -28,18 +28,26 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
+from collections import deque
 from enum import StrEnum
 from pathlib import Path
-from typing import Any, Callable
+from time import perf_counter
+from typing import Any, Callable, Iterator
 
 import pandas as pd
+from loguru import logger
 
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.enrichment import state_region
+from bacen_ifdata.data_transformer.profiling import StepProfile, TransformProfile
 from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan, SchemaPlanRegistry
 from bacen_ifdata.data_transformer.transformers.base import BaseTransformer
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.utilities.configurations import Config as Cfg
 from bacen_ifdata.utilities.csv_loader import load_csv_data
-from bacen_ifdata.utilities.geographic_regions import STATE_TO_REGION as REGION
-from bacen_ifdata.utilities.string_utils import slugify
+from bacen_ifdata.utilities.normalization import map_unique_values
+from bacen_ifdata.utilities.string_utils import SLUGS
 
 
 class TransformationType(StrEnum):
@@ -55,6 +63,10 @@ class TransformationType(StrEnum):
 # Type alias for transformer factory function.
 TransformerFactory = Callable[[Institutions], BaseTransformer]
 
+# Configurations for correctly loading the data from CSV file.
+# Processed CSVs now include the normalized header as the first line.
+CSV_LOAD_OPTIONS: dict[str, Any] = {'sep': ';', 'header': 0, 'dtype': str}
+
 
 # pylint: disable=too-few-public-methods, missing-function-docstring
 class TransformerController:
@@ -63,18 +75,71 @@ class TransformerController:
     This class is responsible for controlling the transformation of data from reports.
     """
 
-    def __init__(self, transformer_factory: TransformerFactory) -> None:
+    def __init__(
+        self,
+        transformer_factory: TransformerFactory,
+        dictionary_registry: CategoricalDictionaryRegistry | None = None,
+        plan_registry: SchemaPlanRegistry | None = None,
+        profile_memory: bool = Cfg.TRANSFORM_PROFILING,
+    ) -> None:
         """Initializes a new instance of the TransformerController class.
 
         Args:
             transformer_factory (TransformerFactory): A factory function that returns
                 the appropriate transformer for a given institution type.
+            dictionary_registry (CategoricalDictionaryRegistry | None): The shared dictionaries used
+                to encode categorical columns with stable codes. Defaults to None (per-file categories).
+            plan_registry (SchemaPlanRegistry | None): The compiled schema plans. Defaults to a
+                registry that only caches the plans in memory.
+            profile_memory (bool): Whether the step profiles also measure the DataFrame memory,
+                which is slower. Defaults to Config.TRANSFORM_PROFILING.
         """
 
         # Initializing the transformer factory.
         self.transformer_factory = transformer_factory
+        # Shared dictionaries of the categorical columns.
+        self.dictionary_registry = dictionary_registry
+        # Compiled schema plans (column order, types, header aliases), built once per schema.
+        self.plan_registry = plan_registry or SchemaPlanRegistry()
         # Cache for transformer instances.
         self._transformer_cache: dict[Institutions, BaseTransformer] = {}
+        # Wall time and rows of each transformation step, one profile per transformed file (the latest ones only).
+        self.profile_memory = profile_memory
+        self.profiles: deque[TransformProfile] = deque(maxlen=Cfg.TRANSFORM_PROFILE_HISTORY)
+        # Number of profiles recorded so far, including the ones already dropped from ``profiles``.
+        self.profile_count = 0
+
+    def _start_profile(self, file_path: Path) -> TransformProfile:
+        """Creates the step profile of a file being transformed.
+
+        Args:
+            file_path (Path): The path to the CSV file being transformed.
+
+        Returns:
+            TransformProfile: The empty profile, already recorded in ``profiles``.
+        """
+
+        profile = TransformProfile(Path(file_path).name, self.profile_memory)
+        self.profiles.append(profile)
+        self.profile_count += 1
+
+        return profile
+
+    def profiles_since(self, profile_count: int) -> list[TransformProfile]:
+        """Returns the profiles recorded after a given count, as far as they are still kept.
+
+        Args:
+            profile_count (int): The value of ``profile_count`` before the run.
+
+        Returns:
+            list[TransformProfile]: The profiles of the files transformed since then, in order.
+        """
+
+        recorded = self.profile_count - profile_count
+        if recorded <= 0:
+            return []
+
+        return list(self.profiles)[-recorded:]
 
     def _get_transformer(self, institution: Institutions) -> BaseTransformer:
         """Gets or creates a transformer for the given institution.
@@ -115,6 +180,7 @@ class TransformerController:
         """Loads the data for transformation.
 
         This method is responsible for loading the data that will be transformed.
+        When ``options`` contains ``chunksize``, a reader yielding row batches is returned.
 
         Args:
             file_path (Path): The path to the CSV file to be loaded.
@@ -135,34 +201,23 @@ class TransformerController:
             pd.DataFrame: The modified DataFrame with the region column.
         """
 
-        # Create the region column based on the state column.
+        # Create the region column based on the state column, mapping each distinct state once.
         uf_column_index = data.columns.get_loc('uf') + 1
-        data.insert(uf_column_index, 'regiao', data['uf'].map(REGION))
+        data.insert(uf_column_index, 'regiao', map_unique_values(data['uf'], state_region))
 
         return data
 
-    def _generate_lookup_keys(self, schema: SchemaProtocol, field_name: str) -> list[str]:
-        """Generates potential lookup keys (slugs) for a schema field.
+    def get_schema_plan(self, schema: SchemaProtocol) -> SchemaPlan:
+        """Returns the compiled plan of a schema.
 
         Args:
-            schema (SchemaProtocol): The schema definition.
-            field_name (str): The name of the field in the schema.
+            schema (SchemaProtocol): The schema for the report.
 
         Returns:
-            list[str]: A list of slugified keys to search for in the CSV.
+            SchemaPlan: The plan, compiled on the first request for the schema.
         """
 
-        # Check if schema defines an explicit CSV header for this field
-        csv_header = schema.get_raw_csv_header(field_name) if hasattr(schema, 'get_raw_csv_header') else None
-
-        if isinstance(csv_header, list):
-            # If multiple headers are possible (e.g. historical name changes).
-            return [slugify(header) for header in csv_header]
-        if csv_header:
-            return [slugify(csv_header)]
-
-        # Use schema field name if no explicit header.
-        return [slugify(field_name)]
+        return self.plan_registry.get(schema)
 
     def _handle_special_mappings(self, field_name: str, csv_slug_map: dict[str, str]) -> tuple[str, str] | None:
         """Handles hardcoded edge cases for column mapping when standard matching fails.
@@ -186,7 +241,7 @@ class TransformerController:
 
         return None
 
-    def _build_column_rename_map(self, data: pd.DataFrame, schema: SchemaProtocol) -> dict[str, str]:
+    def _build_column_rename_map(self, data: pd.DataFrame, plan: SchemaPlan) -> dict[str, str]:
         """Builds a mapping from CSV header column names to schema column names.
 
         Uses Name-Based Mapping (Slugification) to find the correct column.
@@ -195,6 +250,7 @@ class TransformerController:
 
         For schemas with explicit csv_header metadata (used for hierarchical/grouped
         CSV headers), the csv_header value is slugified and used as the lookup key.
+        The slugified keys of every field are precompiled in the schema plan.
 
         Algorithm:
         1. Slugify all CSV column names to create a lookup map.
@@ -205,7 +261,7 @@ class TransformerController:
 
         Args:
             data (pd.DataFrame): The loaded DataFrame (with original CSV header).
-            schema (SchemaProtocol): The schema definition.
+            plan (SchemaPlan): The compiled schema plan for the report.
 
         Returns:
             dict[str, str]: Mapping of CSV column names to schema column names.
@@ -213,15 +269,13 @@ class TransformerController:
 
         # Create a lookup map: {slugified_col_name: original_col_name}.
         # We use a dictionary to map the normalized name back to the original CSV header.
-        csv_slug_map = {slugify(column): column for column in data.columns}
+        csv_slug_map = dict(zip(SLUGS.normalize_many(data.columns), data.columns))
 
         rename_map: dict[str, str] = {}
-        for schema_field in schema.input_column_names:
-            lookup_keys = self._generate_lookup_keys(schema, schema_field)
-
+        for schema_field in plan.input_column_names:
             # Try to match lookup keys against CSV columns.
             match_found = False
-            for key in lookup_keys:
+            for key in plan.column(schema_field).lookup_keys:
                 if key in csv_slug_map:
                     original_csv_col = csv_slug_map[key]
                     # Only map if the names are different (Pandas rename optimization).
@@ -238,6 +292,81 @@ class TransformerController:
 
         return rename_map
 
+    def _transform_frame(
+        self,
+        data: pd.DataFrame,
+        schema: SchemaProtocol,
+        transformer: BaseTransformer,
+        profile: TransformProfile,
+    ) -> pd.DataFrame:
+        """Applies the schema plan to a loaded DataFrame (or to a batch of rows).
+
+        This covers every step of the transformation except deduplication,
+        which needs to see the whole file.
+
+        Args:
+            data (pd.DataFrame): The loaded data, with the original CSV header.
+            schema (SchemaProtocol): The schema for the report.
+            transformer (BaseTransformer): The transformer for the institution.
+            profile (TransformProfile): The step profile of the file.
+
+        Returns:
+            pd.DataFrame: The transformed DataFrame.
+        """
+
+        # Build the transformation map for this transformer.
+        transformation_map = self._build_transformation_map(transformer)
+        plan = self.get_schema_plan(schema)
+
+        # Rename CSV header columns to match schema names (positional mapping).
+        # Extra columns in the CSV (not covered by the schema) are dropped.
+        data = profile.measure('rename_columns', self._rename_columns, data, plan)
+
+        # Apply business rules, if any.
+        data = profile.measure('apply_business_rules', transformer.apply_business_rules, data)
+
+        # Iterate over the column types precompiled in the plan and apply the correct transformation
+        # to the columns present in this file.
+        present_columns = set(data.columns)
+        for column_type, columns in plan.columns_by_type.items():
+            transform_function = transformation_map.get(column_type)
+            columns = [column for column in columns if column in present_columns]
+
+            # Call the transformation function, passing the relevant columns
+            if transform_function and columns:
+                data = profile.measure(f'transform_{column_type}_columns', transform_function, data, columns)
+
+        # Create the region column based on the state column and insert it after the "uf" column.
+        if 'cidade' in data.columns:
+            data = profile.measure('create_region_column', self._create_region_column, data)
+
+        # Encode the categorical columns (including the calculated region) against the shared dictionaries.
+        if self.dictionary_registry is not None:
+            data = profile.measure('encode_categorical_columns', self.dictionary_registry.encode_columns, data, plan)
+
+        return data
+
+    def _rename_columns(self, data: pd.DataFrame, plan: SchemaPlan) -> pd.DataFrame:
+        """Renames the CSV header columns to the schema names and drops the extra columns.
+
+        Args:
+            data (pd.DataFrame): The loaded data, with the original CSV header.
+            plan (SchemaPlan): The compiled schema plan for the report.
+
+        Returns:
+            pd.DataFrame: The DataFrame with only the schema columns, in plan order.
+        """
+
+        rename_map = self._build_column_rename_map(data, plan)
+        if rename_map:
+            data = data.rename(columns=rename_map)
+
+        # Keep only columns defined in the schema (drop extras),
+        # ensuring we have the correct columns for transformation.
+        schema_columns = [column for column in plan.input_column_names if column in data.columns]
+
+        return data[schema_columns]
+
     def transform(self, file_path: Path, schema: SchemaProtocol, institution: Institutions) -> pd.DataFrame:
         """Transforms data from reports.
 
@@ -254,53 +383,63 @@ class TransformerController:
 
         # Get the appropriate transformer for this institution.
         transformer = self._get_transformer(institution)
+        profile = self._start_profile(file_path)
 
-        # Build the transformation map for this transformer.
-        transformation_map = self._build_transformation_map(transformer)
+        # Load the data.
+        data = profile.measure('load', self._load_data, file_path, CSV_LOAD_OPTIONS)
 
-        # Configurations for correctly loading the data from CSV file.
-        # Processed CSVs now include the normalized header as the first line.
-        options = {'sep': ';', 'header': 0, 'dtype': str}
+        # Apply the schema plan to the whole file.
+        data = self._transform_frame(data, schema, transformer, profile)
 
-        # Load the data.
-        data = self._load_data(file_path, options)
+        # Apply deduplication as the final step to ensure clean data for Silver layer.
+        data = profile.measure('deduplicate_dataset', transformer.deduplicate_dataset, data)
 
-        # Rename CSV header columns to match schema names (positional mapping).
-        # Extra columns in the CSV (not covered by the schema) are dropped.
-        rename_map = self._build_column_rename_map(data, schema)
-        if rename_map:
-            data = data.rename(columns=rename_map)
+        stats = transformer.deduplication_stats
+        logger.debug(
+            f'Deduplication of {Path(file_path).name} removed {stats.exact_duplicates} exact duplicate(s) '
+            f'and {stats.redundant_empty_rows} redundant empty row(s).'
+        )
 
-        # Keep only columns defined in the schema (drop extras),
-        # ensuring we have the correct columns for transformation.
-        schema_columns = [column for column in schema.input_column_names if column in data.columns]
-        data = data[schema_columns]
+        return data
 
-        # Apply business rules, if any.
-        data = transformer.apply_business_rules(data)
+    def save_dictionaries(self) -> None:
+        """Persists the categorical dictionaries extended by the transformed files, if any."""
 
-        # Group dataframe columns by type, consulting the schema.
-        columns_by_type: dict[TransformationType, list[str]] = {}
-        for column_name in data.columns:
-            column_type = schema.get_type(column_name)
+        if self.dictionary_registry is not None:
+            self.dictionary_registry.save()
 
-            # Map column types to their corresponding transformation functions.
-            if column_type:
-                columns_by_type.setdefault(column_type, []).append(column_name)
+    def transform_in_chunks(
+        self, file_path: Path, schema: SchemaProtocol, institution: Institutions, chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Transforms data from reports in fixed-size row batches.
 
-        # Iterate over the grouped column types and apply the correct transformation.
-        for column_type, columns in columns_by_type.items():
-            transform_function = transformation_map.get(column_type)
+        Each batch goes through the same schema plan as ``transform``, so only
+        one batch is held in memory at a time. Deduplication is NOT applied
+        here: it must run as a separate pass over all batches of the file
+        (see ``ChunkedDeduplicator``).
 
-            # Call the transformation function, passing the relevant columns
-            if transform_function:
-                data = transform_function(data, columns)
+        Args:
+            file_path (Path): The path to the CSV file to be transformed.
+            schema (SchemaProtocol): The schema for the report.
+            institution (Institutions): The institution type.
+            chunk_size (int): The number of rows per batch.
 
-        # Create the region column based on the state column and insert it after the "uf" column.
-        if 'cidade' in data.columns:
-            data = self._create_region_column(data)
+        Yields:
+            pd.DataFrame: The transformed batches, in file order.
+        """
 
-        # Apply deduplication as the final step to ensure clean data for Silver layer.
-        data = transformer.deduplicate_dataset(data)
+        # Get the appropriate transformer for this institution.
+        transformer = self._get_transformer(institution)
+        profile = self._start_profile(file_path)
+
+        with self._load_data(file_path, {**CSV_LOAD_OPTIONS, 'chunksize': chunk_size}) as reader:
+            batches = iter(reader)
+            while True:
+                # Reading a batch is the load step of chunked mode.
+                start = perf_counter()
+                chunk = next(batches, None)
+                if chunk is None:
+                    break
+                profile.record(StepProfile('load', 1, perf_counter() - start, 0, len(chunk)))
 
-        return data
+                yield self._transform_frame(chunk, schema, transformer, profile)
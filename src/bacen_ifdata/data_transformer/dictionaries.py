@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: dictionaries.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Categorical dictionary registry for Bacen IF.data
+
+Each categorical column (uf, regiao, consolidado_bancario, ...) has a single,
+persistent list of values shared by every file and report. Values are only
+ever appended, so the position of a value (its code) never changes, and every
+file is encoded against the same categories. The registry also keeps the
+descriptions declared in the schema ``mapping`` metadata, and the loader
+builds the DuckDB ENUM types and the dictionary table from it.
+"""
+
+import copy
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
+
+
+class CategoricalDictionaryRegistry:
+    """Persistent, append-only dictionaries of the categorical columns."""
+
+    def __init__(self, registry_path: Path) -> None:
+        """Loads the registry from disk, if it exists.
+
+        Args:
+            registry_path (Path): The JSON file where the dictionaries are persisted.
+        """
+
+        self.registry_path = registry_path
+        self._values: dict[str, list[str]] = {}
+        self._descriptions: dict[str, dict[str, str]] = {}
+        self._is_dirty = False
+
+        if registry_path.exists():
+            content = json.loads(registry_path.read_text(encoding='utf-8'))
+            for column, dictionary in content.items():
+                self._values[column] = list(dictionary.get('values', []))
+                self._descriptions[column] = dict(dictionary.get('descriptions', {}))
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the columns with a dictionary."""
+
+        return sorted(self._values)
+
+    def categories(self, column: str) -> list[str]:
+        """Return the values of a column, in code order.
+
+        Args:
+            column (str): The name of the categorical column.
+
+        Returns:
+            list[str]: The known values; the index of each value is its code.
+        """
+
+        return list(self._values.get(column, []))
+
+    def description(self, column: str, value: str) -> str | None:
+        """Return the description of a value, as declared in the schema mapping.
+
+        Args:
+            column (str): The name of the categorical column.
+            value (str): The categorical value.
+
+        Returns:
+            str | None: The description, if the schema declares one.
+        """
+
+        descriptions = self._descriptions.get(column, {})
+
+        return descriptions.get(value, descriptions.get(value.lower()))
+
+    def enum_type_name(self, column: str) -> str:
+        """Return the name of the DuckDB ENUM type for the current values of a column.
+
+        The name carries a digest of the values, so a dictionary that grew gets
+        a new type while the tables created earlier keep theirs.
+
+        Args:
+            column (str): The name of the categorical column.
+
+        Returns:
+            str: The ENUM type name.
+        """
+
+        digest = hashlib.sha1('\x1f'.join(self._values.get(column, [])).encode('utf-8')).hexdigest()[:8]
+
+        return f'enum_{column}_{digest}'
+
+    def snapshot(self) -> 'CategoricalDictionaryRegistry':
+        """Return a copy of the dictionaries as they are now, which later encodings do not change.
+
+        The streaming pipeline hands a snapshot to the loader with each transformed
+        file, so the ENUM types of the file are built while the transformer goes on
+        extending the dictionaries in another thread.
+
+        Returns:
+            CategoricalDictionaryRegistry: The copy, persisted to the same file.
+        """
+
+        registry = copy.copy(self)
+        registry._values = {column: list(values) for column, values in self._values.items()}
+        registry._descriptions = {column: dict(descriptions) for column, descriptions in self._descriptions.items()}
+
+        return registry
+
+    def register_mapping(self, column: str, mapping: dict | None) -> None:
+        """Attaches the descriptions of a schema mapping to a column.
+
+        Args:
+            column (str): The name of the categorical column.
+            mapping (dict | None): The schema mapping of value to description.
+        """
+
+        if not mapping:
+            return
+
+        descriptions = self._descriptions.setdefault(column, {})
+        for value, text in mapping.items():
+            if descriptions.get(str(value)) != text:
+                descriptions[str(value)] = text
+                self._is_dirty = True
+
+    def encode(self, series: pd.Series, column: str) -> pd.Series:
+        """Encodes a series against the dictionary of its column.
+
+        New values are appended to the dictionary (in sorted order, so the
+        result does not depend on the row order of the file).
+
+        Args:
+            series (pd.Series): The raw or categorical values.
+            column (str): The name of the categorical column.
+
+        Returns:
+            pd.Series: A categorical series whose categories are the full dictionary.
+        """
+
+        values = self._values.setdefault(column, [])
+        known_values = set(values)
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Only the distinct values are converted; the rows are recoded through their codes.
+            codes = series.cat.codes.to_numpy()
+            labels = [str(value) for value in series.cat.categories]
+            observed = [labels[code] for code in np.unique(codes[codes >= 0])]
+        else:
+            observed = pd.unique(series.dropna().astype(str))
+
+        new_values = sorted(value for value in observed if value not in known_values)
+        if new_values:
+            values.extend(new_values)
+            self._is_dirty = True
+
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            position = {value: index for index, value in enumerate(values)}
+            # The extra trailing entry maps the missing code (-1) to itself.
+            lookup = np.array([position.get(label, -1) for label in labels] + [-1], dtype=np.int32)
+            categorical = pd.Categorical.from_codes(lookup[codes], categories=values)
+        else:
+            categorical = pd.Categorical(series.astype('string'), categories=values)
+
+        return pd.Series(categorical, index=series.index, name=series.name)
+
+    def encode_columns(self, data_frame: pd.DataFrame, schema: SchemaProtocol) -> pd.DataFrame:
+        """Encodes every categorical column of a DataFrame and registers its schema mapping.
+
+        Args:
+            data_frame (pd.DataFrame): The transformed DataFrame.
+            schema (SchemaProtocol): The schema for the report.
+
+        Returns:
+            pd.DataFrame: The DataFrame with stable categorical codes.
+        """
+
+        for column in data_frame.columns:
+            if schema.get_type(column) != 'categorical':
+                continue
+
+            if hasattr(schema, 'get_mapping'):
+                self.register_mapping(column, schema.get_mapping(column))
+            data_frame[column] = self.encode(data_frame[column], column)
+
+        return data_frame
+
+    def save(self) -> None:
+        """Persists the registry if it changed since it was loaded."""
+
+        if not self._is_dirty:
+            return
+
+        content = {
+            column: {'values': self._values.get(column, []), 'descriptions': self._descriptions.get(column, {})}
+            for column in sorted(set(self._values) | set(self._descriptions))
+        }
+
+        self.registry_path.parent.mkdir(parents=True, exist_ok=True)
+        self.registry_path.write_text(json.dumps(content, ensure_ascii=False, indent=2), encoding='utf-8')
+        self._is_dirty = False
@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: downcasting.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Dtype downcasting for the transformed layer of Bacen IF.data
+
+The transformer produces nullable Int64 for every numeric column, float64 for
+the percentages and pandas strings for the text columns. Many of them are small
+counts (agencies, service points, clients) or low-cardinality labels, so this
+module narrows each column to the smallest type that holds its observed values
+without loss: Int16/Int32, float32 and dictionary-encoded (category) strings.
+A schema column can opt out with ``'downcast': False`` in its definition.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from loguru import logger
+
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+# Narrower integer dtypes, tried from the smallest.
+INTEGER_DOWNCAST_DTYPES: tuple[str, ...] = ('Int16', 'Int32')
+
+# Arrow type of each narrowed dtype, used to write a file whose batches are narrowed one at a time.
+ARROW_TYPE_BY_DOWNCAST_DTYPE: dict[str, pa.DataType] = {
+    'Int16': pa.int16(),
+    'Int32': pa.int32(),
+    'float32': pa.float32(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+class DowncastStatistics:
+    """Observed ranges, precision and cardinality that decide the narrowed dtype of each column.
+
+    The whole file must be observed before any dtype is chosen: ``downcast_dtypes``
+    observes a whole DataFrame, while the chunked transformation observes every batch
+    of a file before narrowing them, so both pick the same dtypes for the same rows.
+    """
+
+    def __init__(
+        self,
+        plan: SchemaPlan,
+        float_decimals: int = Cfg.DOWNCAST_FLOAT_DECIMALS,
+        category_max_ratio: float = Cfg.DOWNCAST_CATEGORY_MAX_RATIO,
+    ) -> None:
+        """Initializes empty statistics.
+
+        Args:
+            plan (SchemaPlan): The compiled schema plan for the report.
+            float_decimals (int): Decimals preserved when narrowing percentages. Defaults to
+                Config.DOWNCAST_FLOAT_DECIMALS.
+            category_max_ratio (float): Maximum distinct/rows ratio to dictionary-encode text. Defaults to
+                Config.DOWNCAST_CATEGORY_MAX_RATIO.
+        """
+
+        self.plan = plan
+        self.float_decimals = float_decimals
+        self.category_max_ratio = category_max_ratio
+        self.rows = 0
+        self._integer_ranges: dict[str, tuple[int, int] | None] = {}
+        self._lossless_floats: dict[str, bool] = {}
+        self._distinct_texts: dict[str, set[str]] = {}
+
+    def observe(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """Adds the values of a DataFrame (or batch) to the statistics.
+
+        Only columns still holding the transformer's wide dtypes are considered:
+        numeric (Int64), percentage (float64) and text (string, or object when read back
+        from a Parquet batch).
+
+        Args:
+            data_frame (pd.DataFrame): The transformed DataFrame (or batch).
+
+        Returns:
+            pd.DataFrame: The same DataFrame, so batches can be observed as they stream.
+        """
+
+        self.rows += len(data_frame)
+
+        for column_name in data_frame.columns:
+            column = self.plan.column(column_name)
+            if column is None or not column.downcast:
+                continue
+
+            series = data_frame[column_name]
+            if column.schema_type == 'numeric' and series.dtype == 'Int64':
+                self._observe_integer(column_name, series)
+            elif column.schema_type == 'percentage' and series.dtype == 'float64':
+                self._observe_float(column_name, series)
+            elif column.schema_type == 'text' and (isinstance(series.dtype, pd.StringDtype) or series.dtype == object):
+                self._distinct_texts.setdefault(column_name, set()).update(series.dropna().unique())
+
+        return data_frame
+
+    def _observe_integer(self, column_name: str, series: pd.Series) -> None:
+        """Widens the observed range of an Int64 column.
+
+        Args:
+            column_name (str): The column name.
+            series (pd.Series): The Int64 values.
+        """
+
+        values = series.dropna()
+        observed = self._integer_ranges.get(column_name)
+        if not values.empty:
+            minimum, maximum = int(values.min()), int(values.max())
+            observed = (
+                (minimum, maximum) if observed is None else (min(observed[0], minimum), max(observed[1], maximum))
+            )
+
+        self._integer_ranges[column_name] = observed
+
+    def _observe_float(self, column_name: str, series: pd.Series) -> None:
+        """Checks whether every value of a float64 column survives the round trip to float32.
+
+        The values come from text with a fixed number of decimals, so the round trip
+        is compared at that precision.
+
+        Args:
+            column_name (str): The column name.
+            series (pd.Series): The float64 values.
+        """
+
+        if not self._lossless_floats.get(column_name, True):
+            return
+
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+        with np.errstate(over='ignore'):
+            narrowed = values.astype('float32').astype('float64')
+
+        self._lossless_floats[column_name] = np.array_equal(
+            np.round(narrowed, self.float_decimals), np.round(values, self.float_decimals), equal_nan=True
+        )
+
+    def narrowed_dtypes(self) -> dict[str, str]:
+        """Returns the narrowest lossless dtype of each column that can use one.
+
+        Returns:
+            dict[str, str]: The narrowed dtype of each column (Int16/Int32, float32 or category).
+        """
+
+        dtypes = {}
+
+        for column_name, observed in self._integer_ranges.items():
+            minimum, maximum = observed or (0, 0)
+            for dtype in INTEGER_DOWNCAST_DTYPES:
+                limits = np.iinfo(dtype.lower())
+                if limits.min <= minimum and maximum <= limits.max:
+                    dtypes[column_name] = dtype
+                    break
+
+        dtypes.update({column_name: 'float32' for column_name, lossless in self._lossless_floats.items() if lossless})
+
+        if self.rows:
+            dtypes.update(
+                {
+                    column_name: 'category'
+                    for column_name, distinct in self._distinct_texts.items()
+                    if len(distinct) <= self.category_max_ratio * self.rows
+                }
+            )
+
+        return dtypes
+
+    def arrow_types(self) -> dict[str, pa.DataType]:
+        """Returns the Arrow type of each narrowed column, overriding the schema plan types.
+
+        Returns:
+            dict[str, pa.DataType]: The Arrow type of each column that can use a narrower one.
+        """
+
+        return {
+            column_name: ARROW_TYPE_BY_DOWNCAST_DTYPE[dtype] for column_name, dtype in self.narrowed_dtypes().items()
+        }
+
+    def narrow(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+        """Narrows the dtypes of a DataFrame (or batch) to the ones chosen from the statistics.
+
+        Args:
+            data_frame (pd.DataFrame): The transformed DataFrame (or batch).
+
+        Returns:
+            pd.DataFrame: The DataFrame with narrowed dtypes.
+        """
+
+        for column_name, dtype in self.narrowed_dtypes().items():
+            if column_name in data_frame.columns:
+                data_frame[column_name] = data_frame[column_name].astype(dtype)
+
+        return data_frame
+
+
+def downcast_dtypes(
+    data_frame: pd.DataFrame,
+    plan: SchemaPlan,
+    float_decimals: int = Cfg.DOWNCAST_FLOAT_DECIMALS,
+    category_max_ratio: float = Cfg.DOWNCAST_CATEGORY_MAX_RATIO,
+) -> pd.DataFrame:
+    """Narrows the dtypes of a transformed DataFrame without losing information.
+
+    Only columns still holding the transformer's wide dtypes are considered:
+    numeric (Int64), percentage (float64) and text (string).
+
+    Args:
+        data_frame (pd.DataFrame): The transformed DataFrame.
+        plan (SchemaPlan): The compiled schema plan for the report.
+        float_decimals (int): Decimals preserved when narrowing percentages. Defaults to
+            Config.DOWNCAST_FLOAT_DECIMALS.
+        category_max_ratio (float): Maximum distinct/rows ratio to dictionary-encode text. Defaults to
+            Config.DOWNCAST_CATEGORY_MAX_RATIO.
+
+    Returns:
+        pd.DataFrame: The DataFrame with narrowed dtypes.
+    """
+
+    memory_before = data_frame.memory_usage(deep=True).sum()
+
+    statistics = DowncastStatistics(plan, float_decimals, category_max_ratio)
+    data_frame = statistics.narrow(statistics.observe(data_frame))
+
+    memory_after = data_frame.memory_usage(deep=True).sum()
+    logger.debug(f'Downcasting reduced the transformed data from {memory_before:,} to {memory_after:,} bytes.')
+
+    return data_frame
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: enrichment.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Categorical-aware enrichment for Bacen IF.data
+
+Columns such as ``uf`` (27 states) and ``cidade`` (a few thousand cities) have
+very few distinct values compared with the number of rows. The functions here
+factorize a column once, normalise or map each distinct value, and broadcast
+the results back to the rows through the category codes (see
+``utilities/normalization.py``), so the Python work is proportional to the
+number of distinct values.
+"""
+
+from typing import Any
+
+from bacen_ifdata.utilities.geographic_regions import STATE_TO_REGION
+from bacen_ifdata.utilities.normalization import MemoizedNormalizer
+
+
+def normalize_city_name(value: str) -> str:
+    """Normalises a city name to title case without surrounding spaces.
+
+    Args:
+        value (str): The raw city name.
+
+    Returns:
+        str: The normalised city name.
+    """
+
+    return value.strip().title()
+
+
+def state_region(state: Any) -> str | None:
+    """Returns the geographic region of a state (UF).
+
+    Args:
+        state (Any): The state abbreviation.
+
+    Returns:
+        str | None: The region name, or None for an unknown state.
+    """
+
+    region = STATE_TO_REGION.get(state)
+
+    return str(region) if region is not None else None
+
+
+# Normalised city names shared by every file transformed in the process.
+CITY_NAMES = MemoizedNormalizer(normalize_city_name)
@@ -19,11 +19,15 @@
 
 """Bacen IF.data AutoScraper & Data Manager"""
 
+from collections import deque
 from pathlib import Path
-from typing import Protocol
+from typing import Iterator, Protocol
 
 import pandas as pd
 
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.profiling import TransformProfile
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 
 
@@ -31,6 +35,13 @@ from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 class TransformerControllerInterface(Protocol):
     """Represents the interface for the Transformer Controller."""
 
+    # Step profile of each transformed file, in transformation order (the latest ones only).
+    profiles: deque[TransformProfile]
+    # Number of profiles recorded so far, including the ones already dropped from ``profiles``.
+    profile_count: int
+    # Shared dictionaries of the categorical columns, if the categorical columns get stable codes.
+    dictionary_registry: CategoricalDictionaryRegistry | None
+
     def transform(self, file_path: Path, schema, institution: Institutions) -> pd.DataFrame:
         """Transforms the data from the given file path according to the specified schema.
 
@@ -42,3 +53,41 @@ class TransformerControllerInterface(Protocol):
         Returns:
             pd.DataFrame: The transformed DataFrame.
         """
+
+    def transform_in_chunks(
+        self, file_path: Path, schema, institution: Institutions, chunk_size: int
+    ) -> Iterator[pd.DataFrame]:
+        """Transforms the data from the given file path in fixed-size row batches.
+
+        Args:
+            file_path (Path): The path to the file to be transformed.
+            schema: The schema to be used for transformation.
+            institution (Institutions): The institution type.
+            chunk_size (int): The number of rows per batch.
+
+        Returns:
+            Iterator[pd.DataFrame]: The transformed (not yet deduplicated) batches.
+        """
+
+    def get_schema_plan(self, schema) -> SchemaPlan:
+        """Returns the compiled plan of a schema.
+
+        Args:
+            schema: The schema for the report.
+
+        Returns:
+            SchemaPlan: The plan shared by the transformation and the storage steps.
+        """
+
+    def save_dictionaries(self) -> None:
+        """Persists the categorical dictionaries extended by the transformed files."""
+
+    def profiles_since(self, profile_count: int) -> list[TransformProfile]:
+        """Returns the profiles recorded after a given count, as far as they are still kept.
+
+        Args:
+            profile_count (int): The value of ``profile_count`` before the run.
+
+        Returns:
+            list[TransformProfile]: The profiles of the files transformed since then, in order.
+        """
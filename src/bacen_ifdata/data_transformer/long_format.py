@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: long_format.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Long (tidy) storage format for the wide portfolio reports of Bacen IF.data
+
+The portfolio reports by economic activity and by type and maturity define
+hundreds of sparse amount columns, and the gold models unpivot them back to
+``(codigo, data_base, nome_coluna, valor)``. A schema that declares
+``LONG_FORMAT_WIDE_COLUMNS`` can be stored in that shape instead: the wide
+table keeps the identifiers and the declared totals, and every other amount
+goes to ``<table>_long`` with one row per non-empty cell. The position of a
+column in ``long_value_columns`` is its code in the column dictionary.
+
+The mode is enabled by ``Config.LONG_STORAGE_FORMAT`` and only applies to
+Parquet output. When it is off, the loader exposes ``<table>_long`` as a view
+that unpivots the wide table, so the gold models read the same relation in
+both modes.
+"""
+
+import os
+from pathlib import Path
+from types import TracebackType
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan
+from bacen_ifdata.data_transformer.storage import temporary_file_path
+from bacen_ifdata.data_transformer.transformers.base import IDENTIFIER_COLUMNS
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+# Sub-directory of the transformed files of a report holding its long files (the loader does not scan it).
+LONG_FORMAT_DIRECTORY_NAME = 'long'
+
+# Suffix of the long table (or view) of a report.
+LONG_TABLE_SUFFIX = '_long'
+
+# Columns of the long layout: the natural key, the original column name and its amount.
+LONG_KEY_COLUMNS: tuple[str, str] = ('codigo', 'data_base')
+LONG_NAME_COLUMN = 'nome_coluna'
+LONG_VALUE_COLUMN = 'valor'
+
+# Schema types of the amounts that can be stored long.
+LONG_VALUE_TYPES: tuple[str, ...] = ('numeric', 'percentage')
+
+
+def has_long_layout(schema: SchemaProtocol) -> bool:
+    """Return whether the report declares a long layout."""
+
+    return getattr(schema, 'LONG_FORMAT_WIDE_COLUMNS', None) is not None
+
+
+def is_long_format(schema: SchemaProtocol) -> bool:
+    """Return whether the report is stored in long format in this run."""
+
+    return Cfg.LONG_STORAGE_FORMAT and Cfg.TRANSFORMED_FILE_FORMAT == 'parquet' and has_long_layout(schema)
+
+
+def long_value_columns(plan: SchemaPlan, schema: SchemaProtocol) -> list[str]:
+    """Returns the amount columns stored long, in plan order.
+
+    Args:
+        plan (SchemaPlan): The compiled schema plan for the report.
+        schema (SchemaProtocol): The schema for the report.
+
+    Returns:
+        list[str]: The columns whose position is their code in the column dictionary.
+    """
+
+    wide_columns = set(IDENTIFIER_COLUMNS) | set(getattr(schema, 'LONG_FORMAT_WIDE_COLUMNS', None) or ())
+
+    return [
+        column.name
+        for column in plan.columns
+        if column.schema_type in LONG_VALUE_TYPES and column.name not in wide_columns
+    ]
+
+
+def split_long_format(
+    data_frame: pd.DataFrame, plan: SchemaPlan, schema: SchemaProtocol
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Splits a transformed DataFrame into its wide and long parts.
+
+    Args:
+        data_frame (pd.DataFrame): The transformed DataFrame (or batch).
+        plan (SchemaPlan): The compiled schema plan for the report.
+        schema (SchemaProtocol): The schema for the report.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The wide part (without the long amounts) and the long part,
+            with one row per non-empty amount.
+    """
+
+    value_columns = long_value_columns(plan, schema)
+    present_columns = [column for column in value_columns if column in data_frame.columns]
+    column_codes = np.array([value_columns.index(column) for column in present_columns], dtype=np.int16)
+
+    values = data_frame[present_columns].to_numpy(dtype='float64', na_value=np.nan)
+    row_positions, column_positions = np.nonzero(~np.isnan(values))
+
+    long_data = pd.DataFrame(
+        {column: data_frame[column].iloc[row_positions].reset_index(drop=True) for column in LONG_KEY_COLUMNS}
+    )
+    long_data[LONG_NAME_COLUMN] = pd.Categorical.from_codes(column_codes[column_positions], categories=value_columns)
+    long_data[LONG_VALUE_COLUMN] = values[row_positions, column_positions]
+
+    return data_frame.drop(columns=present_columns), long_data
+
+
+class LongFormatWriter:
+    """Writes the long parts of a transformed file incrementally to a single Parquet file."""
+
+    def __init__(self, file_path: Path, compression: str = Cfg.PARQUET_COMPRESSION) -> None:
+        """Prepares the writer; the file is only created with the first non-empty part.
+
+        The parts are written to a temporary file, which replaces the file of a
+        previous run when the writer is closed, so a concurrent load never reads
+        a partial file.
+
+        Args:
+            file_path (Path): The destination file path.
+            compression (str): The Parquet compression codec. Defaults to Config.PARQUET_COMPRESSION.
+        """
+
+        self.file_path = file_path
+        self.compression = compression
+        self.rows_written = 0
+        self._temporary_path = temporary_file_path(file_path)
+        self._writer: pq.ParquetWriter | None = None
+        self._closed = False
+
+        self._temporary_path.unlink(missing_ok=True)
+
+    def write(self, long_data: pd.DataFrame) -> None:
+        """Appends a long part as a new row group.
+
+        Args:
+            long_data (pd.DataFrame): The long part returned by ``split_long_format``.
+        """
+
+        if long_data.empty:
+            return
+
+        if self._writer is None:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            table = pa.Table.from_pandas(long_data, preserve_index=False)
+            self._writer = pq.ParquetWriter(self._temporary_path, table.schema, compression=self.compression)
+        else:
+            table = pa.Table.from_pandas(long_data, schema=self._writer.schema, preserve_index=False)
+
+        self._writer.write_table(table)
+        self.rows_written += len(long_data)
+
+    def close(self, discard: bool = False) -> None:
+        """Closes the Parquet file and moves it over the file of a previous run.
+
+        Without any non-empty part, the file of a previous run is removed.
+
+        Args:
+            discard (bool): Drop the parts written so far and keep the previous file (e.g. the
+                            transformation failed). Defaults to False.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        if discard:
+            self._temporary_path.unlink(missing_ok=True)
+        elif self._temporary_path.exists():
+            os.replace(self._temporary_path, self.file_path)
+        else:
+            self.file_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'LongFormatWriter':
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close(discard=exc_type is not None)
+
+
+def long_file_path(output_directory: Path, file_name: str) -> Path:
+    """Returns the path of the long file of a transformed file.
+
+    Args:
+        output_directory (Path): The directory of the transformed files of the report.
+        file_name (str): The name of the source file.
+
+    Returns:
+        Path: The Parquet file inside the long sub-directory.
+    """
+
+    return output_directory / LONG_FORMAT_DIRECTORY_NAME / Path(file_name).with_suffix('.parquet').name
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: profiling.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Per-step profiling of the transformation of Bacen IF.data
+
+Each transformed file gets a ``TransformProfile`` recording, for every step
+(load, column rename, business rules, each column type group, region column,
+categorical encoding, deduplication, ...), the wall time, the rows in and out
+and, optionally, the change in the DataFrame memory. Steps that run more than
+once for a file (one per batch in chunked mode) are accumulated.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Iterable, TypeVar
+
+import pandas as pd
+
+# Name of the structured report written next to the transformed files of a report.
+PROFILE_REPORT_FILE_NAME = 'transform_profile.json'
+
+T = TypeVar('T')
+
+
+@dataclass
+class StepProfile:
+    """Accumulated measurements of one transformation step."""
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    rows_in: int = 0
+    rows_out: int = 0
+    memory_delta: int = 0
+
+    def add(self, other: 'StepProfile') -> None:
+        """Accumulates the measurements of another run of the same step.
+
+        Args:
+            other (StepProfile): The measurements to be added.
+        """
+
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.rows_in += other.rows_in
+        self.rows_out += other.rows_out
+        self.memory_delta += other.memory_delta
+
+
+def _frame_rows(value: Any) -> int:
+    """Returns the number of rows of a DataFrame, or 0 for anything else."""
+
+    return len(value) if isinstance(value, pd.DataFrame) else 0
+
+
+def _frame_memory(value: Any) -> int:
+    """Returns the memory used by a DataFrame (including the strings), or 0 for anything else."""
+
+    return int(value.memory_usage(deep=True).sum()) if isinstance(value, pd.DataFrame) else 0
+
+
+@dataclass
+class TransformProfile:
+    """Measurements of the transformation steps of one file."""
+
+    file_name: str
+    measure_memory: bool = False
+    steps: dict[str, StepProfile] = field(default_factory=dict)
+
+    @property
+    def total_seconds(self) -> float:
+        """Return the wall time of every measured step."""
+
+        return sum(step.seconds for step in self.steps.values())
+
+    def measure(self, name: str, function: Callable[..., T], *args: Any) -> T:
+        """Runs a step and records its measurements.
+
+        The rows (and memory) in are taken from the first argument when it is a
+        DataFrame, and the rows out from the result.
+
+        Args:
+            name (str): The name of the step.
+            function (Callable[..., T]): The step to be run.
+            *args (Any): The arguments of the step.
+
+        Returns:
+            T: The result of the step.
+        """
+
+        data_in = args[0] if args else None
+        memory_in = _frame_memory(data_in) if self.measure_memory else 0
+
+        start = perf_counter()
+        result = function(*args)
+        seconds = perf_counter() - start
+
+        memory_delta = _frame_memory(result) - memory_in if self.measure_memory else 0
+        self.record(StepProfile(name, 1, seconds, _frame_rows(data_in), _frame_rows(result), memory_delta))
+
+        return result
+
+    def record(self, step: StepProfile) -> None:
+        """Adds the measurements of a step run outside ``measure``.
+
+        Args:
+            step (StepProfile): The measurements of the step.
+        """
+
+        self.steps.setdefault(step.name, StepProfile(step.name)).add(step)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile as a JSON-serialisable dictionary."""
+
+        return {
+            'file_name': self.file_name,
+            'total_seconds': self.total_seconds,
+            'steps': [asdict(step) for step in self.steps.values()],
+        }
+
+
+def summarize_profiles(profiles: Iterable[TransformProfile]) -> list[StepProfile]:
+    """Accumulates the steps of several files, slowest step first.
+
+    Args:
+        profiles (Iterable[TransformProfile]): The profiles of the transformed files.
+
+    Returns:
+        list[StepProfile]: The accumulated measurements of each step.
+    """
+
+    steps: dict[str, StepProfile] = {}
+    for profile in profiles:
+        for step in profile.steps.values():
+            steps.setdefault(step.name, StepProfile(step.name)).add(step)
+
+    return sorted(steps.values(), key=lambda step: step.seconds, reverse=True)
+
+
+def format_profile_summary(profiles: list[TransformProfile]) -> str:
+    """Formats the accumulated steps of several files as a text table.
+
+    Args:
+        profiles (list[TransformProfile]): The profiles of the transformed files.
+
+    Returns:
+        str: One line per step with its wall time, share of the total and rows.
+    """
+
+    steps = summarize_profiles(profiles)
+    total_seconds = sum(step.seconds for step in steps) or 1.0
+
+    lines = [f'Transformation profile of {len(profiles)} file(s):']
+    for step in steps:
+        lines.append(
+            f'  {step.name:<36} {step.seconds:>9.3f}s {step.seconds / total_seconds:>6.1%} '
+            f'{step.rows_in:>12,} -> {step.rows_out:<12,} calls={step.calls}'
+        )
+
+    return '\n'.join(lines)
+
+
+def write_profile_report(profiles: list[TransformProfile], file_path: Path) -> None:
+    """Writes the profiles of the files of a report as JSON.
+
+    Args:
+        profiles (list[TransformProfile]): The profiles of the transformed files.
+        file_path (Path): The destination file path.
+    """
+
+    content = {
+        'files': [profile.to_dict() for profile in profiles],
+        'summary': [asdict(step) for step in summarize_profiles(profiles)],
+    }
+
+    file_path.write_text(json.dumps(content, ensure_ascii=False, indent=2), encoding='utf-8')
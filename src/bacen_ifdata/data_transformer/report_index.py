@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: report_index.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Report-level deduplication index for Bacen IF.data
+
+BaseTransformer.deduplicate_dataset only sees one file (one quarter) at a time.
+When the same quarter is downloaded twice, or two downloads overlap, the same
+rows reach the transformed layer from different files. This module keeps a
+compact index of (codigo, data_base, row hash) for every file already
+transformed for a report, so each new file is checked against the history
+without reloading it. Rows already present are rejected before the load.
+"""
+
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from loguru import logger
+
+from bacen_ifdata.data_transformer.transformers.base import GROUP_KEY_COLUMNS, hash_rows
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+# Arrow schema of the persisted index.
+INDEX_SCHEMA: pa.Schema = pa.schema(
+    [
+        ('source_file', pa.dictionary(pa.int32(), pa.string())),
+        ('codigo', pa.int64()),
+        ('data_base', pa.timestamp('ns')),
+        ('row_hash', pa.uint64()),
+    ]
+)
+
+
+class ReportDeduplicationIndex:
+    """Index of the rows already transformed for a single report.
+
+    Entries are grouped by source file, so re-transforming a file replaces its
+    own entries instead of rejecting every row as a duplicate of itself.
+    """
+
+    def __init__(self, index_path: Path) -> None:
+        """Loads the index from disk, if it exists.
+
+        Args:
+            index_path (Path): The Parquet file where the index is persisted.
+        """
+
+        self.index_path = index_path
+        self.rejected_rows = 0
+        self._entries = self._read_entries(index_path)
+
+        # Entries of the files indexed in this run, concatenated into _entries only when needed.
+        self._pending: list[pd.DataFrame] = []
+
+        # Sorted runs of the indexed hashes, merged as they grow (None until the first lookup).
+        self._hash_runs: list[np.ndarray] | None = None
+
+    @staticmethod
+    def _read_entries(index_path: Path) -> pd.DataFrame:
+        """Reads the persisted index, or returns an empty one.
+
+        Args:
+            index_path (Path): The Parquet file where the index is persisted.
+
+        Returns:
+            pd.DataFrame: The index entries.
+        """
+
+        table = pq.read_table(index_path, schema=INDEX_SCHEMA) if index_path.exists() else INDEX_SCHEMA.empty_table()
+
+        return table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+
+    @staticmethod
+    def _build_entries(data_frame: pd.DataFrame, source_file: str) -> pd.DataFrame:
+        """Builds the index entries for the rows of a DataFrame.
+
+        Args:
+            data_frame (pd.DataFrame): The transformed rows.
+            source_file (str): The name of the file the rows come from.
+
+        Returns:
+            pd.DataFrame: One entry per row.
+        """
+
+        return pd.DataFrame(
+            {
+                'source_file': pd.Categorical([source_file] * len(data_frame)),
+                'codigo': pd.to_numeric(data_frame['codigo'], errors='coerce').astype('Int64').array,
+                'data_base': pd.to_datetime(data_frame['data_base']).to_numpy(),
+                'row_hash': hash_rows(data_frame),
+            }
+        )
+
+    @staticmethod
+    def _as_keys(entries: pd.DataFrame) -> pd.MultiIndex:
+        """Returns the (codigo, data_base, row hash) keys of the entries."""
+
+        return pd.MultiIndex.from_arrays([entries['codigo'], entries['data_base'], entries['row_hash']])
+
+    def _all_entries(self) -> pd.DataFrame:
+        """Returns every entry, concatenating the pending ones first."""
+
+        if self._pending:
+            frames = [frame for frame in (self._entries, *self._pending) if not frame.empty]
+            self._entries = pd.concat(frames, ignore_index=True) if frames else self._entries
+            self._pending = []
+
+        return self._entries
+
+    def _keep_entries(self, keep: pd.Series) -> int:
+        """Keeps only the selected entries.
+
+        Args:
+            keep (pd.Series): A boolean mask aligned with the entries.
+
+        Returns:
+            int: The number of entries removed.
+        """
+
+        removed = int((~keep).sum())
+        if removed:
+            self._entries = self._entries[keep]
+            self._hash_runs = None
+
+        return removed
+
+    def _hash_is_known(self, hashes: np.ndarray) -> np.ndarray:
+        """Checks which hashes are already indexed.
+
+        Args:
+            hashes (np.ndarray): The row hashes to look up.
+
+        Returns:
+            np.ndarray: A boolean mask, True where the hash is indexed.
+        """
+
+        if self._hash_runs is None:
+            self._hash_runs = [np.sort(self._all_entries()['row_hash'].to_numpy())]
+
+        is_known = np.zeros(len(hashes), dtype=bool)
+        for run in self._hash_runs:
+            if len(run):
+                positions = np.searchsorted(run, hashes).clip(max=len(run) - 1)
+                is_known |= run[positions] == hashes
+
+        return is_known
+
+    def _add_hashes(self, hashes: np.ndarray) -> None:
+        """Adds hashes to the sorted runs, merging runs of similar size.
+
+        Each hash is merged O(log n) times, so indexing a file batch by batch
+        costs about the same as indexing it at once.
+
+        Args:
+            hashes (np.ndarray): The row hashes of the new entries.
+        """
+
+        if self._hash_runs is None:
+            return
+
+        runs = self._hash_runs
+        runs.append(np.sort(hashes))
+        while len(runs) > 1 and len(runs[-2]) <= len(runs[-1]):
+            last = runs.pop()
+            runs[-1] = np.sort(np.concatenate([runs[-1], last]))
+
+    def discard(self, source_file: str) -> None:
+        """Removes the entries of a file that is about to be transformed again.
+
+        Args:
+            source_file (str): The name of the source file.
+        """
+
+        entries = self._all_entries()
+        self._keep_entries(entries['source_file'] != source_file)
+
+    def retain(self, source_files: Iterable[str]) -> int:
+        """Removes the entries of the files that are no longer part of the report.
+
+        A processed file that was deleted (or renamed) would otherwise keep
+        rejecting its rows when they show up in another file.
+
+        Args:
+            source_files (Iterable[str]): The names of the current files of the report.
+
+        Returns:
+            int: The number of entries removed.
+        """
+
+        entries = self._all_entries()
+        removed = self._keep_entries(entries['source_file'].astype(str).isin(set(source_files)))
+        if removed:
+            logger.info(f'Removed {removed} deduplication index entries of files no longer in {self.index_path.stem}.')
+
+        return removed
+
+    def filter_new_rows(self, data_frame: pd.DataFrame, source_file: str) -> pd.DataFrame:
+        """Rejects the rows already indexed for another file and indexes the rest.
+
+        Call ``discard`` once before the first batch of a file. The file must
+        already be deduplicated on its own (see BaseTransformer.deduplicate_dataset).
+
+        Args:
+            data_frame (pd.DataFrame): The transformed rows (a whole file or one batch).
+            source_file (str): The name of the file the rows come from.
+
+        Returns:
+            pd.DataFrame: The rows not present in any other file of the report.
+        """
+
+        if data_frame.empty or not all(column in data_frame.columns for column in GROUP_KEY_COLUMNS):
+            return data_frame
+
+        entries = self._build_entries(data_frame, source_file)
+
+        # The hash alone is a cheap pre-filter; only its matches are compared on the full key.
+        is_known = self._hash_is_known(entries['row_hash'].to_numpy())
+        if is_known.any():
+            hashes = entries.loc[is_known, 'row_hash']
+            matches = [frame[frame['row_hash'].isin(hashes)] for frame in (self._entries, *self._pending)]
+            candidates = pd.concat([frame for frame in matches if not frame.empty], ignore_index=True)
+            is_known &= self._as_keys(entries).isin(self._as_keys(candidates))
+
+        if is_known.any():
+            overlapping = candidates[self._as_keys(candidates).isin(self._as_keys(entries[is_known]))]
+            files = ', '.join(sorted(map(str, overlapping['source_file'].unique())))
+            dates = ', '.join(sorted({date.strftime('%Y-%m') for date in overlapping['data_base'].dropna()}))
+            logger.warning(
+                f'{int(is_known.sum())} row(s) of {source_file} were already transformed from {files} '
+                f'(data_base: {dates}). Rejecting them.'
+            )
+
+            self.rejected_rows += int(is_known.sum())
+            data_frame = data_frame[~is_known]
+            entries = entries[~is_known]
+
+        if not entries.empty:
+            self._pending.append(entries)
+            self._add_hashes(entries['row_hash'].to_numpy())
+
+        return data_frame
+
+    def save(self) -> None:
+        """Persists the index."""
+
+        entries = self._all_entries()
+        entries = entries.assign(source_file=entries['source_file'].astype(str).astype('category'))
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            pa.Table.from_pandas(entries, schema=INDEX_SCHEMA, preserve_index=False),
+            self.index_path,
+            compression=Cfg.PARQUET_COMPRESSION,
+        )
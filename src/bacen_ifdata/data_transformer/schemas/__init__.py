@@ -28,211 +28,212 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.assets import (
-    FinancialConglomeratesAssetsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.capital_information import (
-    FinancialConglomerateCapitalInformationSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.income_statement import (
-    FinancialConglomerateIncomeStatementSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.liabilities import (
-    FinancialConglomerateLiabilitiesSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_geographic_region import (
-    FinancialConglomeratePortfolioGeographicRegionSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_indexer import (
-    FinancialConglomeratePortfolioIndexerSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_individuals_type_maturity import (
-    FinancialConglomeratePortfolioIndividualsTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_legal_person_business_size import (
-    FinancialConglomeratePortfolioLegalPersonBusinessSizeSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_legal_person_economic_activity import (
-    FinancialConglomeratePortfolioLegalPersonEconomicActivitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_legal_person_type_maturity import (
-    FinancialConglomeratePortfolioLegalPersonTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_number_clients_operations import (
-    FinancialConglomeratePortfolioNumberClientsOperationsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.portfolio_risk_level import (
-    FinancialConglomeratePortfolioRiskLevelSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.summary import (
-    FinancialConglomerateSummarySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_geographic_region import (
-    FinancialConglomerateSCRPortfolioGeographicRegionSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_indexer import (
-    FinancialConglomerateSCRPortfolioIndexerSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_individuals_type_maturity import (
-    FinancialConglomerateSCRPortfolioIndividualsTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_business_size import (
-    FinancialConglomerateSCRPortfolioLegalPersonBusinessSizeSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_economic_activity import (
-    FinancialConglomerateSCRPortfolioLegalPersonEconomicActivitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_type_maturity import (
-    FinancialConglomerateSCRPortfolioLegalPersonTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_number_clients_operations import (
-    FinancialConglomerateSCRPortfolioNumberClientsOperationsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_risk_level import (
-    FinancialConglomerateSCRPortfolioRiskLevelSchema,
-)
-from bacen_ifdata.data_transformer.schemas.foreign_exchange.quarterly_foreign_currency_flow import (
-    ForeignExchangeQuarterlyForeignCurrencyFlowSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.assets import (
-    IndividualInstitutionAssetsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.income_statement import (
-    IndividualInstitutionIncomeStatementSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.liabilities import (
-    IndividualInstitutionLiabilitiesSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.summary import (
-    IndividualInstitutionSummarySchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.assets import (
-    PrudentialConglomeratesAssetsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.capital_information import (
-    PrudentialConglomerateCapitalInformationSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.income_statement import (
-    PrudentialConglomerateIncomeStatementSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.liabilities import (
-    PrudentialConglomerateLiabilitiesSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_geographic_region import (
-    PrudentialConglomeratePortfolioGeographicRegionSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_indexer import (
-    PrudentialConglomeratePortfolioIndexerSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_individuals_type_maturity import (
-    PrudentialConglomeratePortfolioIndividualsTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_legal_person_business_size import (
-    PrudentialConglomeratePortfolioLegalPersonBusinessSizeSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_legal_person_economic_activity import (
-    PrudentialConglomeratePortfolioLegalPersonEconomicActivitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_legal_person_type_maturity import (
-    PrudentialConglomeratePortfolioLegalPersonTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_number_clients_operations import (
-    PrudentialConglomeratePortfolioNumberClientsOperationsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.portfolio_risk_level import (
-    PrudentialConglomeratePortfolioRiskLevelSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.segmentation import (
-    PrudentialConglomerateSegmentationSchema,
-)
-from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.summary import (
-    PrudentialConglomerateSummarySchema,
-)
+from functools import cache
+from importlib import import_module
+from typing import Final
 
-# Prudential Conglomerate schemas
-PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA = PrudentialConglomerateSummarySchema()
-PRUDENTIAL_CONGLOMERATE_ASSETS_SCHEMA = PrudentialConglomeratesAssetsSchema()
-PRUDENTIAL_CONGLOMERATE_LIABILITIES_SCHEMA = PrudentialConglomerateLiabilitiesSchema()
-PRUDENTIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA = PrudentialConglomerateIncomeStatementSchema()
-PRUDENTIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA = PrudentialConglomerateCapitalInformationSchema()
-PRUDENTIAL_CONGLOMERATE_SEGMENTATION_SCHEMA = PrudentialConglomerateSegmentationSchema()
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA = (
-    PrudentialConglomeratePortfolioIndividualsTypeMaturitySchema()
-)
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA = PrudentialConglomeratePortfolioGeographicRegionSchema()
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA = PrudentialConglomeratePortfolioIndexerSchema()
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA = (
-    PrudentialConglomeratePortfolioLegalPersonTypeMaturitySchema()
-)
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA = (
-    PrudentialConglomeratePortfolioLegalPersonBusinessSizeSchema()
-)
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA = (
-    PrudentialConglomeratePortfolioLegalPersonEconomicActivitySchema()
-)
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA = (
-    PrudentialConglomeratePortfolioNumberClientsOperationsSchema()
-)
-PRUDENTIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA = PrudentialConglomeratePortfolioRiskLevelSchema()
+from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
 
-# Financial Conglomerates schemas
-FINANCIAL_CONGLOMERATE_SUMMARY_SCHEMA = FinancialConglomerateSummarySchema()
-FINANCIAL_CONGLOMERATE_ASSETS_SCHEMA = FinancialConglomeratesAssetsSchema()
-FINANCIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA = FinancialConglomerateCapitalInformationSchema()
-FINANCIAL_CONGLOMERATE_LIABILITIES_SCHEMA = FinancialConglomerateLiabilitiesSchema()
-FINANCIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA = FinancialConglomerateIncomeStatementSchema()
-FINANCIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA = (
-    FinancialConglomeratePortfolioIndividualsTypeMaturitySchema()
-)
-FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA = (
-    FinancialConglomeratePortfolioLegalPersonTypeMaturitySchema()
-)
-FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA = (
-    FinancialConglomeratePortfolioLegalPersonEconomicActivitySchema()
-)
-FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA = (
-    FinancialConglomeratePortfolioLegalPersonBusinessSizeSchema()
-)
-FINANCIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA = (
-    FinancialConglomeratePortfolioNumberClientsOperationsSchema()
-)
-FINANCIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA = FinancialConglomeratePortfolioRiskLevelSchema()
-FINANCIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA = FinancialConglomeratePortfolioIndexerSchema()
-FINANCIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA = FinancialConglomeratePortfolioGeographicRegionSchema()
+# Schema instances exposed by this package, as (module relative to the package, class name).
+# The schema modules (and their large SCHEMA_DEFINITION literals) are only imported when a
+# schema is first requested, through load_schema or attribute access on this package.
+_SCHEMA_CLASSES: Final[dict[str, tuple[str, str]]] = {
+    # Prudential Conglomerate schemas
+    'PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA': (
+        'prudential_conglomerate.summary',
+        'PrudentialConglomerateSummarySchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_ASSETS_SCHEMA': ('prudential_conglomerate.assets', 'PrudentialConglomeratesAssetsSchema'),
+    'PRUDENTIAL_CONGLOMERATE_LIABILITIES_SCHEMA': (
+        'prudential_conglomerate.liabilities',
+        'PrudentialConglomerateLiabilitiesSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA': (
+        'prudential_conglomerate.income_statement',
+        'PrudentialConglomerateIncomeStatementSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA': (
+        'prudential_conglomerate.capital_information',
+        'PrudentialConglomerateCapitalInformationSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_SEGMENTATION_SCHEMA': (
+        'prudential_conglomerate.segmentation',
+        'PrudentialConglomerateSegmentationSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA': (
+        'prudential_conglomerate.portfolio_individuals_type_maturity',
+        'PrudentialConglomeratePortfolioIndividualsTypeMaturitySchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA': (
+        'prudential_conglomerate.portfolio_geographic_region',
+        'PrudentialConglomeratePortfolioGeographicRegionSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA': (
+        'prudential_conglomerate.portfolio_indexer',
+        'PrudentialConglomeratePortfolioIndexerSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA': (
+        'prudential_conglomerate.portfolio_legal_person_type_maturity',
+        'PrudentialConglomeratePortfolioLegalPersonTypeMaturitySchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA': (
+        'prudential_conglomerate.portfolio_legal_person_business_size',
+        'PrudentialConglomeratePortfolioLegalPersonBusinessSizeSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA': (
+        'prudential_conglomerate.portfolio_legal_person_economic_activity',
+        'PrudentialConglomeratePortfolioLegalPersonEconomicActivitySchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA': (
+        'prudential_conglomerate.portfolio_number_clients_operations',
+        'PrudentialConglomeratePortfolioNumberClientsOperationsSchema',
+    ),
+    'PRUDENTIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA': (
+        'prudential_conglomerate.portfolio_risk_level',
+        'PrudentialConglomeratePortfolioRiskLevelSchema',
+    ),
+    # Financial Conglomerates schemas
+    'FINANCIAL_CONGLOMERATE_SUMMARY_SCHEMA': ('financial_conglomerates.summary', 'FinancialConglomerateSummarySchema'),
+    'FINANCIAL_CONGLOMERATE_ASSETS_SCHEMA': ('financial_conglomerates.assets', 'FinancialConglomeratesAssetsSchema'),
+    'FINANCIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA': (
+        'financial_conglomerates.capital_information',
+        'FinancialConglomerateCapitalInformationSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_LIABILITIES_SCHEMA': (
+        'financial_conglomerates.liabilities',
+        'FinancialConglomerateLiabilitiesSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA': (
+        'financial_conglomerates.income_statement',
+        'FinancialConglomerateIncomeStatementSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA': (
+        'financial_conglomerates.portfolio_individuals_type_maturity',
+        'FinancialConglomeratePortfolioIndividualsTypeMaturitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA': (
+        'financial_conglomerates.portfolio_legal_person_type_maturity',
+        'FinancialConglomeratePortfolioLegalPersonTypeMaturitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA': (
+        'financial_conglomerates.portfolio_legal_person_economic_activity',
+        'FinancialConglomeratePortfolioLegalPersonEconomicActivitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA': (
+        'financial_conglomerates.portfolio_legal_person_business_size',
+        'FinancialConglomeratePortfolioLegalPersonBusinessSizeSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA': (
+        'financial_conglomerates.portfolio_number_clients_operations',
+        'FinancialConglomeratePortfolioNumberClientsOperationsSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA': (
+        'financial_conglomerates.portfolio_risk_level',
+        'FinancialConglomeratePortfolioRiskLevelSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA': (
+        'financial_conglomerates.portfolio_indexer',
+        'FinancialConglomeratePortfolioIndexerSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA': (
+        'financial_conglomerates.portfolio_geographic_region',
+        'FinancialConglomeratePortfolioGeographicRegionSchema',
+    ),
+    # Financial Conglomerates SCR schemas
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_individuals_type_maturity',
+        'FinancialConglomerateSCRPortfolioIndividualsTypeMaturitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_legal_person_type_maturity',
+        'FinancialConglomerateSCRPortfolioLegalPersonTypeMaturitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_legal_person_economic_activity',
+        'FinancialConglomerateSCRPortfolioLegalPersonEconomicActivitySchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_legal_person_business_size',
+        'FinancialConglomerateSCRPortfolioLegalPersonBusinessSizeSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_number_clients_operations',
+        'FinancialConglomerateSCRPortfolioNumberClientsOperationsSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_RISK_LEVEL_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_risk_level',
+        'FinancialConglomerateSCRPortfolioRiskLevelSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDEXER_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_indexer',
+        'FinancialConglomerateSCRPortfolioIndexerSchema',
+    ),
+    'FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA': (
+        'financial_conglomerates_scr.portfolio_geographic_region',
+        'FinancialConglomerateSCRPortfolioGeographicRegionSchema',
+    ),
+    # Individual Institutions schemas
+    'INDIVIDUAL_INSTITUTION_SUMMARY_SCHEMA': ('individual_institutions.summary', 'IndividualInstitutionSummarySchema'),
+    'INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA': ('individual_institutions.assets', 'IndividualInstitutionAssetsSchema'),
+    'INDIVIDUAL_INSTITUTION_LIABILITIES_SCHEMA': (
+        'individual_institutions.liabilities',
+        'IndividualInstitutionLiabilitiesSchema',
+    ),
+    'INDIVIDUAL_INSTITUTION_INCOME_STATEMENT_SCHEMA': (
+        'individual_institutions.income_statement',
+        'IndividualInstitutionIncomeStatementSchema',
+    ),
+    # Foreign Exchange schemas
+    'FOREIGN_EXCHANGE_QUARTERLY_FOREIGN_CURRENCY_FLOW_SCHEMA': (
+        'foreign_exchange.quarterly_foreign_currency_flow',
+        'ForeignExchangeQuarterlyForeignCurrencyFlowSchema',
+    ),
+}
+
+# The same schemas as "module.ClassName" paths relative to the package.
+SCHEMA_CLASS_PATHS: Final[dict[str, str]] = {
+    name: f'{module_path}.{class_name}' for name, (module_path, class_name) in _SCHEMA_CLASSES.items()
+}
+
+
+@cache
+def load_schema(name: str) -> SchemaProtocol:
+    """Imports the module of a schema and returns its (shared) instance.
+
+    Args:
+        name (str): The schema constant name (e.g. 'PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA').
+
+    Returns:
+        SchemaProtocol: The schema instance. The same instance is returned on every call.
+
+    Raises:
+        KeyError: If the schema name is unknown.
+    """
+
+    module_path, class_name = _SCHEMA_CLASSES[name]
+    module = import_module(f'{__name__}.{module_path}')
+
+    return getattr(module, class_name)()
+
+
+def __getattr__(name: str) -> SchemaProtocol:
+    """Resolves the schema constants on first access (PEP 562)."""
+
+    if name in SCHEMA_CLASS_PATHS:
+        return load_schema(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
-# Financial Conglomerates SCR schemas
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA = (
-    FinancialConglomerateSCRPortfolioIndividualsTypeMaturitySchema()
-)
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA = (
-    FinancialConglomerateSCRPortfolioLegalPersonTypeMaturitySchema()
-)
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA = (
-    FinancialConglomerateSCRPortfolioLegalPersonEconomicActivitySchema()
-)
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA = (
-    FinancialConglomerateSCRPortfolioLegalPersonBusinessSizeSchema()
-)
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA = (
-    FinancialConglomerateSCRPortfolioNumberClientsOperationsSchema()
-)
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_RISK_LEVEL_SCHEMA = FinancialConglomerateSCRPortfolioRiskLevelSchema()
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDEXER_SCHEMA = FinancialConglomerateSCRPortfolioIndexerSchema()
-FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA = (
-    FinancialConglomerateSCRPortfolioGeographicRegionSchema()
-)
 
-# Individual Institutions schemas
-INDIVIDUAL_INSTITUTION_SUMMARY_SCHEMA = IndividualInstitutionSummarySchema()
-INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA = IndividualInstitutionAssetsSchema()
-INDIVIDUAL_INSTITUTION_LIABILITIES_SCHEMA = IndividualInstitutionLiabilitiesSchema()
-INDIVIDUAL_INSTITUTION_INCOME_STATEMENT_SCHEMA = IndividualInstitutionIncomeStatementSchema()
+def __dir__() -> list[str]:
+    """Lists the lazily resolved schema constants along with the module attributes."""
 
-# Foreign Exchange schemas
-FOREIGN_EXCHANGE_QUARTERLY_FOREIGN_CURRENCY_FLOW_SCHEMA = ForeignExchangeQuarterlyForeignCurrencyFlowSchema()
+    return sorted({*globals(), *SCHEMA_CLASS_PATHS})
 
 
 __all__ = [
+    'SCHEMA_CLASS_PATHS',
+    'load_schema',
     # Prudential Conglomerate
     'PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA',
     'PRUDENTIAL_CONGLOMERATE_ASSETS_SCHEMA',
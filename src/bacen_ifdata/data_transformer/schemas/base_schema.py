@@ -46,6 +46,10 @@ class BaseSchema:
     # Columns that are calculated during transformation and thus not present in the input CSV.
     CALCULATED_COLUMNS: list[str] = ['regiao']
 
+    # Amounts kept in the wide table when the report may be stored in long format
+    # (see ``data_transformer/long_format.py``). None means the report is always stored wide.
+    LONG_FORMAT_WIDE_COLUMNS: tuple[str, ...] | None = None
+
     def _get_columns_by_type(self, column_type: str) -> list[str]:
         """Helper method to get columns by their type.
 
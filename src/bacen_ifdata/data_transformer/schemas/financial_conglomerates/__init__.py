@@ -28,26 +28,16 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.assets import FinancialConglomeratesAssetsSchema
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.income_statement import (
-    FinancialConglomerateIncomeStatementSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.liabilities import (
-    FinancialConglomerateLiabilitiesSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates.summary import FinancialConglomerateSummarySchema
-
-# Instance a schema for report summary of financial conglomerates.
-FINANCIAL_CONGLOMERATE_SUMMARY_SCHEMA = FinancialConglomerateSummarySchema()
-
-# Instance a schema for report assets of financial conglomerates.
-FINANCIAL_CONGLOMERATE_ASSETS_SCHEMA = FinancialConglomeratesAssetsSchema()
-
-# Instance a schema for report liabilities of financial conglomerates.
-FINANCIAL_CONGLOMERATE_LIABILITIES_SCHEMA = FinancialConglomerateLiabilitiesSchema()
-
-# Instance a schema for report income statement of financial conglomerates.
-FINANCIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA = FinancialConglomerateIncomeStatementSchema()
+from bacen_ifdata.data_transformer.schemas import load_schema
+
+
+def __getattr__(name: str):
+    """Resolves the schema instances on first access (see schemas.SCHEMA_CLASS_PATHS)."""
+
+    if name in __all__:
+        return load_schema(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 __all__ = [
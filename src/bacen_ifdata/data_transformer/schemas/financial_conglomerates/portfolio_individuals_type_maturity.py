@@ -40,6 +40,12 @@ class FinancialConglomeratePortfolioIndividualsTypeMaturitySchema(BaseSchema):
     conglomerados financeiros, enriquecido com metadados do dicionário de dados.
     """
 
+    # Totals kept in the wide table when the report is stored in long format; the other amounts go long.
+    LONG_FORMAT_WIDE_COLUMNS: Final[tuple[str, ...]] = (
+        'total_carteira_pessoa_fisica',
+        'total_exterior_pessoa_fisica',
+    )
+
     SCHEMA_DEFINITION: Final[dict[str, dict[str, Any]]] = {
         'instituicao': {
             'description': 'Nome da instituição.',
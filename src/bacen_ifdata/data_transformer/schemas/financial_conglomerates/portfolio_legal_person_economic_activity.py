@@ -40,6 +40,13 @@ class FinancialConglomeratePortfolioLegalPersonEconomicActivitySchema(BaseSchema
     conglomerados financeiros, enriquecido com metadados do dicionário de dados.
     """
 
+    # Totals kept in the wide table when the report is stored in long format; the other amounts go long.
+    LONG_FORMAT_WIDE_COLUMNS: Final[tuple[str, ...]] = (
+        'total_carteira_pessoa_juridica',
+        'total_nao_individualizado_pessoa_juridica',
+        'total_exterior_pessoa_juridica',
+    )
+
     SCHEMA_DEFINITION: Final[dict[str, dict[str, Any]]] = {
         'instituicao': {
             'description': 'Nome da instituição.',
@@ -43,6 +43,12 @@ class FinancialConglomeratePortfolioLegalPersonTypeMaturitySchema(BaseSchema):
                (9 tipos de crédito × 8 prazos) + 1 total exterior = 84 colunas
     """
 
+    # Totals kept in the wide table when the report is stored in long format; the other amounts go long.
+    LONG_FORMAT_WIDE_COLUMNS: Final[tuple[str, ...]] = (
+        'total_carteira_pessoa_juridica',
+        'total_exterior_pessoa_juridica',
+    )
+
     SCHEMA_DEFINITION: Final[dict[str, dict[str, Any]]] = {
         'instituicao': {
             'description': 'Nome da instituição.',
@@ -28,30 +28,22 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_geographic_region import (
-    FinancialConglomerateSCRPortfolioGeographicRegionSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_indexer import (
-    FinancialConglomerateSCRPortfolioIndexerSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_individuals_type_maturity import (
-    FinancialConglomerateSCRPortfolioIndividualsTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_business_size import (
-    FinancialConglomerateSCRPortfolioLegalPersonBusinessSizeSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_economic_activity import (
-    FinancialConglomerateSCRPortfolioLegalPersonEconomicActivitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_legal_person_type_maturity import (
-    FinancialConglomerateSCRPortfolioLegalPersonTypeMaturitySchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_number_clients_operations import (
-    FinancialConglomerateSCRPortfolioNumberClientsOperationsSchema,
-)
-from bacen_ifdata.data_transformer.schemas.financial_conglomerates_scr.portfolio_risk_level import (
-    FinancialConglomerateSCRPortfolioRiskLevelSchema,
-)
+from importlib import import_module
+
+from bacen_ifdata.data_transformer.schemas import SCHEMA_CLASS_PATHS
+
+
+def __getattr__(name: str):
+    """Imports the schema classes on first access (see schemas.SCHEMA_CLASS_PATHS)."""
+
+    if name in __all__:
+        for class_path in SCHEMA_CLASS_PATHS.values():
+            module_path, _, class_name = class_path.rpartition('.')
+            if class_name == name:
+                return getattr(import_module(f'bacen_ifdata.data_transformer.schemas.{module_path}'), name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'FinancialConglomerateSCRPortfolioIndividualsTypeMaturitySchema',
@@ -40,6 +40,12 @@ class FinancialConglomerateSCRPortfolioLegalPersonTypeMaturitySchema(BaseSchema)
     instituições financeiras independentes (SCR), enriquecido com metadados do dicionário de dados.
     """
 
+    # Totals kept in the wide table when the report is stored in long format; the other amounts go long.
+    LONG_FORMAT_WIDE_COLUMNS: Final[tuple[str, ...]] = (
+        'total_da_carteira_de_pessoa_juridica',
+        'total_exterior_pessoa_juridica',
+    )
+
     SCHEMA_DEFINITION: Final[dict[str, dict[str, Any]]] = {
         'instituicao': {
             'description': 'Nome da instituição.',
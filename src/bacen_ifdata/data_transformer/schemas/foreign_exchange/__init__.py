@@ -28,9 +28,22 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.data_transformer.schemas.foreign_exchange.quarterly_foreign_currency_flow import (
-    ForeignExchangeQuarterlyForeignCurrencyFlowSchema,
-)
+from importlib import import_module
+
+from bacen_ifdata.data_transformer.schemas import SCHEMA_CLASS_PATHS
+
+
+def __getattr__(name: str):
+    """Imports the schema classes on first access (see schemas.SCHEMA_CLASS_PATHS)."""
+
+    if name in __all__:
+        for class_path in SCHEMA_CLASS_PATHS.values():
+            module_path, _, class_name = class_path.rpartition('.')
+            if class_name == name:
+                return getattr(import_module(f'bacen_ifdata.data_transformer.schemas.{module_path}'), name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 __all__ = [
     'ForeignExchangeQuarterlyForeignCurrencyFlowSchema',
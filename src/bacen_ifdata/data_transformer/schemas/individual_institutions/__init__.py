@@ -28,26 +28,16 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
-from bacen_ifdata.data_transformer.schemas.individual_institutions.assets import IndividualInstitutionAssetsSchema
-from bacen_ifdata.data_transformer.schemas.individual_institutions.income_statement import (
-    IndividualInstitutionIncomeStatementSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.liabilities import (
-    IndividualInstitutionLiabilitiesSchema,
-)
-from bacen_ifdata.data_transformer.schemas.individual_institutions.summary import IndividualInstitutionSummarySchema
-
-# Instance a schema for report summary of individual institutions.
-INDIVIDUAL_INSTITUTION_SUMMARY_SCHEMA = IndividualInstitutionSummarySchema()
-
-# Instance a schema for report assets of individual institutions.
-INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA = IndividualInstitutionAssetsSchema()
-
-# Instance a schema for report liabilities of individual institutions.
-INDIVIDUAL_INSTITUTION_LIABILITIES_SCHEMA = IndividualInstitutionLiabilitiesSchema()
-
-# Instance a schema for report income statement of individual institutions.
-INDIVIDUAL_INSTITUTION_INCOME_STATEMENT_SCHEMA = IndividualInstitutionIncomeStatementSchema()
+from bacen_ifdata.data_transformer.schemas import load_schema
+
+
+def __getattr__(name: str):
+    """Resolves the schema instances on first access (see schemas.SCHEMA_CLASS_PATHS)."""
+
+    if name in __all__:
+        return load_schema(name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 __all__ = [
@@ -28,43 +28,11 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
+from collections.abc import Iterator, Mapping
 from enum import StrEnum
 from typing import Final
 
-from bacen_ifdata.data_transformer.schemas import (
-    FINANCIAL_CONGLOMERATE_ASSETS_SCHEMA,
-    FINANCIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA,
-    FINANCIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA,
-    FINANCIAL_CONGLOMERATE_LIABILITIES_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA,
-    FINANCIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDEXER_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_RISK_LEVEL_SCHEMA,
-    FINANCIAL_CONGLOMERATE_SUMMARY_SCHEMA,
-    FOREIGN_EXCHANGE_QUARTERLY_FOREIGN_CURRENCY_FLOW_SCHEMA,
-    INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA,
-    INDIVIDUAL_INSTITUTION_INCOME_STATEMENT_SCHEMA,
-    INDIVIDUAL_INSTITUTION_LIABILITIES_SCHEMA,
-    INDIVIDUAL_INSTITUTION_SUMMARY_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_ASSETS_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_LIABILITIES_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_SEGMENTATION_SCHEMA,
-    PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA,
-)
+from bacen_ifdata.data_transformer.schemas import load_schema
 from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 from bacen_ifdata.scraper.reports import (
@@ -75,57 +43,84 @@ from bacen_ifdata.scraper.reports import (
     ReportsPrudentialConglomerates,
 )
 
-# Schema mapping by institution and report type.
-SCHEMA_BY_INSTITUTION_AND_REPORT: Final[dict[Institutions, dict[StrEnum, SchemaProtocol]]] = {
-    # Prudential Conglomerates schemas.
-    Institutions.PRUDENTIAL_CONGLOMERATES: {
-        ReportsPrudentialConglomerates.SUMMARY: PRUDENTIAL_CONGLOMERATE_SUMMARY_SCHEMA,
-        ReportsPrudentialConglomerates.ASSETS: PRUDENTIAL_CONGLOMERATE_ASSETS_SCHEMA,
-        ReportsPrudentialConglomerates.LIABILITIES: PRUDENTIAL_CONGLOMERATE_LIABILITIES_SCHEMA,
-        ReportsPrudentialConglomerates.INCOME_STATEMENT: PRUDENTIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA,
-        ReportsPrudentialConglomerates.CAPITAL_INFORMATION: PRUDENTIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA,
-        ReportsPrudentialConglomerates.SEGMENTATION: PRUDENTIAL_CONGLOMERATE_SEGMENTATION_SCHEMA,
-    },
-    # Financial Conglomerates schemas.
-    Institutions.FINANCIAL_CONGLOMERATES: {
-        ReportsFinancialConglomerates.SUMMARY: FINANCIAL_CONGLOMERATE_SUMMARY_SCHEMA,
-        ReportsFinancialConglomerates.ASSETS: FINANCIAL_CONGLOMERATE_ASSETS_SCHEMA,
-        ReportsFinancialConglomerates.CAPITAL_INFORMATION: FINANCIAL_CONGLOMERATE_CAPITAL_INFORMATION_SCHEMA,
-        ReportsFinancialConglomerates.LIABILITIES: FINANCIAL_CONGLOMERATE_LIABILITIES_SCHEMA,
-        ReportsFinancialConglomerates.INCOME_STATEMENT: FINANCIAL_CONGLOMERATE_INCOME_STATEMENT_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_INDIVIDUALS_TYPE_MATURITY: FINANCIAL_CONGLOMERATE_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY: FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY: FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE: FINANCIAL_CONGLOMERATE_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_NUMBER_CLIENTS_OPERATIONS: FINANCIAL_CONGLOMERATE_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_RISK_LEVEL: FINANCIAL_CONGLOMERATE_PORTFOLIO_RISK_LEVEL_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_INDEXER: FINANCIAL_CONGLOMERATE_PORTFOLIO_INDEXER_SCHEMA,
-        ReportsFinancialConglomerates.PORTFOLIO_GEOGRAPHIC_REGION: FINANCIAL_CONGLOMERATE_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA,
-    },
-    # Financial Conglomerates SCR schemas.
-    Institutions.FINANCIAL_CONGLOMERATES_SCR: {
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_INDIVIDUALS_TYPE_MATURITY: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDIVIDUALS_TYPE_MATURITY_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_TYPE_MATURITY_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_ECONOMIC_ACTIVITY_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_LEGAL_PERSON_BUSINESS_SIZE_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_NUMBER_CLIENTS_OPERATIONS: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_NUMBER_CLIENTS_OPERATIONS_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_RISK_LEVEL: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_RISK_LEVEL_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_INDEXER: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_INDEXER_SCHEMA,
-        ReportsFinancialConglomeratesSCR.PORTFOLIO_GEOGRAPHIC_REGION: FINANCIAL_CONGLOMERATE_SCR_PORTFOLIO_GEOGRAPHIC_REGION_SCHEMA,
-    },
-    # Individual Institutions schemas.
-    Institutions.INDIVIDUAL_INSTITUTIONS: {
-        ReportsIndividualInstitutions.SUMMARY: INDIVIDUAL_INSTITUTION_SUMMARY_SCHEMA,
-        ReportsIndividualInstitutions.ASSETS: INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA,
-        ReportsIndividualInstitutions.LIABILITIES: INDIVIDUAL_INSTITUTION_LIABILITIES_SCHEMA,
-        ReportsIndividualInstitutions.INCOME_STATEMENT: INDIVIDUAL_INSTITUTION_INCOME_STATEMENT_SCHEMA,
-    },
-    # Foreign Exchange schemas.
-    Institutions.FOREIGN_EXCHANGE: {
-        ReportsForeignExchange.QUARTERLY_FOREIGN_CURRENCY_FLOW: FOREIGN_EXCHANGE_QUARTERLY_FOREIGN_CURRENCY_FLOW_SCHEMA,
-    },
+
+def _schema_names(prefix: str, reports: type[StrEnum]) -> dict[StrEnum, str]:
+    """Names the schema of every report of an institution as ``<prefix>_<REPORT>_SCHEMA``.
+
+    Args:
+        prefix (str): The schema name prefix of the institution.
+        reports (type[StrEnum]): The reports enum of the institution.
+
+    Returns:
+        dict[StrEnum, str]: The schema name of each report.
+    """
+    return {report: f'{prefix}_{report.name}_SCHEMA' for report in reports}
+
+
+# Schema names by institution and report type (see SCHEMA_CLASS_PATHS in the schemas package).
+SCHEMA_NAME_BY_INSTITUTION_AND_REPORT: Final[dict[Institutions, dict[StrEnum, str]]] = {
+    Institutions.PRUDENTIAL_CONGLOMERATES: _schema_names('PRUDENTIAL_CONGLOMERATE', ReportsPrudentialConglomerates),
+    Institutions.FINANCIAL_CONGLOMERATES: _schema_names('FINANCIAL_CONGLOMERATE', ReportsFinancialConglomerates),
+    Institutions.FINANCIAL_CONGLOMERATES_SCR: _schema_names(
+        'FINANCIAL_CONGLOMERATE_SCR', ReportsFinancialConglomeratesSCR
+    ),
+    Institutions.INDIVIDUAL_INSTITUTIONS: _schema_names('INDIVIDUAL_INSTITUTION', ReportsIndividualInstitutions),
+    Institutions.FOREIGN_EXCHANGE: _schema_names('FOREIGN_EXCHANGE', ReportsForeignExchange),
 }
 
+
+class LazySchemaMapping(Mapping[StrEnum, SchemaProtocol]):
+    """Read-only mapping of report to schema that imports each schema on first access.
+
+    It behaves like the plain dict it replaces (``in``, ``[]``, ``get``, iteration),
+    but only the schemas actually requested are ever imported.
+    """
+
+    def __init__(self, schema_name_by_report: dict[StrEnum, str]) -> None:
+        """Initializes the mapping.
+
+        Args:
+            schema_name_by_report (dict[StrEnum, str]): The schema name of each report.
+        """
+
+        self._schema_name_by_report = schema_name_by_report
+
+    def __getitem__(self, report: StrEnum) -> SchemaProtocol:
+        return load_schema(self._schema_name_by_report[report])
+
+    def __iter__(self) -> Iterator[StrEnum]:
+        return iter(self._schema_name_by_report)
+
+    def __len__(self) -> int:
+        return len(self._schema_name_by_report)
+
+
+# Schema mapping by institution and report type, resolved lazily.
+SCHEMA_BY_INSTITUTION_AND_REPORT: Final[dict[Institutions, Mapping[StrEnum, SchemaProtocol]]] = {
+    institution: LazySchemaMapping(schema_name_by_report)
+    for institution, schema_name_by_report in SCHEMA_NAME_BY_INSTITUTION_AND_REPORT.items()
+}
+
+
+def get_schema(institution: Institutions, report: StrEnum) -> SchemaProtocol | None:
+    """Returns the schema of a report, importing only that schema.
+
+    Args:
+        institution (Institutions): The institution type.
+        report (StrEnum): The report type.
+
+    Returns:
+        SchemaProtocol | None: The schema, or None if the report has no schema.
+    """
+
+    schema_by_report = SCHEMA_BY_INSTITUTION_AND_REPORT.get(institution)
+
+    return schema_by_report.get(report) if schema_by_report is not None else None
+
+
 __all__ = [
     'SCHEMA_BY_INSTITUTION_AND_REPORT',
+    'SCHEMA_NAME_BY_INSTITUTION_AND_REPORT',
+    'LazySchemaMapping',
+    'get_schema',
 ]
@@ -0,0 +1,402 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: plan.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Compiled schema plans for Bacen IF.data
+
+A SchemaPlan is the result of walking a schema once: the ordered columns with
+their pandas, Arrow and DuckDB types, the slugified CSV header aliases, the
+descriptions and the categorical mappings. The transformer and the loader read
+every type decision from the plan, so both stages always agree, and the schema
+definition is not walked again for every file. Plans are cached in memory and,
+optionally, as JSON files keyed by a fingerprint of the schema definition.
+"""
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Iterable
+
+import pyarrow as pa
+from loguru import logger
+
+from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
+from bacen_ifdata.utilities.string_utils import slugify
+
+# Bump when the layout of the compiled plan (or a type mapping below) changes, to invalidate the disk cache.
+PLAN_FORMAT_VERSION = 2
+
+# pandas dtype produced by the transformer for each schema type.
+PANDAS_DTYPE_BY_SCHEMA_TYPE: dict[str, str] = {
+    'numeric': 'Int64',
+    'percentage': 'float64',
+    'date': 'datetime64[ns]',
+    'categorical': 'category',
+    'text': 'string',
+}
+
+# Arrow type for each schema type. Untyped columns are stored as strings.
+ARROW_TYPE_BY_SCHEMA_TYPE: dict[str, pa.DataType] = {
+    'numeric': pa.int64(),
+    'percentage': pa.float64(),
+    'date': pa.timestamp('ns'),
+    'categorical': pa.dictionary(pa.int32(), pa.string()),
+    'text': pa.string(),
+}
+
+# DuckDB type for each schema type. Text, categorical and unknown types are VARCHAR.
+DUCKDB_TYPE_BY_SCHEMA_TYPE: dict[str, str] = {
+    'numeric': 'DOUBLE',
+    'percentage': 'DOUBLE',
+    'currency': 'DOUBLE',
+    # Use BIGINT to be safe with large numbers.
+    'integer': 'BIGINT',
+    'date': 'DATE',
+    'boolean': 'BOOLEAN',
+}
+
+
+def map_type_to_duckdb(schema_type: str | None) -> str:
+    """Map an internal schema type to its DuckDB type.
+
+    Args:
+        schema_type (str | None): The schema type to map.
+
+    Returns:
+        str: The corresponding DuckDB type.
+    """
+
+    return DUCKDB_TYPE_BY_SCHEMA_TYPE.get(schema_type or '', 'VARCHAR')
+
+
+@dataclass(frozen=True)
+class ColumnPlan:
+    """Compiled metadata of a single schema column."""
+
+    name: str
+    schema_type: str | None
+    pandas_dtype: str
+    duckdb_type: str
+    raw_csv_headers: tuple[str, ...]
+    lookup_keys: tuple[str, ...]
+    description: str | None = None
+    mapping: dict[str, str] | None = None
+    is_calculated: bool = False
+    # Whether the column may be narrowed to a smaller dtype (schema hint 'downcast', default True).
+    downcast: bool = True
+
+    @property
+    def arrow_type(self) -> pa.DataType:
+        """Return the Arrow type of the column."""
+
+        return ARROW_TYPE_BY_SCHEMA_TYPE.get(self.schema_type or '', pa.string())
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """Compiled, serialisable view of a schema.
+
+    The plan exposes the same read methods as the schemas (``column_names``,
+    ``get_type``, ``get_description``, ...), so it can be passed anywhere a
+    ``SchemaProtocol`` is expected.
+    """
+
+    schema_name: str
+    fingerprint: str
+    columns: tuple[ColumnPlan, ...]
+    _column_by_name: dict[str, ColumnPlan] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, '_column_by_name', {column.name: column for column in self.columns})
+
+    @cached_property
+    def column_names(self) -> list[str]:
+        """Return all column names, in schema order."""
+
+        return [column.name for column in self.columns]
+
+    @cached_property
+    def input_column_names(self) -> list[str]:
+        """Return the columns expected in the input CSV (excluding calculated columns)."""
+
+        return [column.name for column in self.columns if not column.is_calculated]
+
+    @cached_property
+    def columns_by_type(self) -> dict[str, list[str]]:
+        """Return the column names grouped by schema type, in schema order."""
+
+        columns_by_type: dict[str, list[str]] = {}
+        for column in self.columns:
+            if column.schema_type:
+                columns_by_type.setdefault(column.schema_type, []).append(column.name)
+
+        return columns_by_type
+
+    def column(self, column_name: str) -> ColumnPlan | None:
+        """Return the compiled metadata of a column, if it is part of the schema."""
+
+        return self._column_by_name.get(column_name)
+
+    def get_type(self, column_name: str) -> str | None:
+        """Return the schema type of a column."""
+
+        column = self._column_by_name.get(column_name)
+
+        return column.schema_type if column else None
+
+    def get_description(self, column_name: str) -> str | None:
+        """Return the description of a column."""
+
+        column = self._column_by_name.get(column_name)
+
+        return column.description if column else None
+
+    def get_mapping(self, column_name: str) -> dict[str, str] | None:
+        """Return the categorical mapping of a column."""
+
+        column = self._column_by_name.get(column_name)
+
+        return column.mapping if column else None
+
+    def get_duckdb_type(self, column_name: str) -> str:
+        """Return the DuckDB type of a column (VARCHAR for unknown columns)."""
+
+        column = self._column_by_name.get(column_name)
+
+        return column.duckdb_type if column else map_type_to_duckdb(None)
+
+    def arrow_schema(self, column_names: Iterable[str]) -> pa.Schema:
+        """Build the Arrow schema of the given columns, in the given order.
+
+        Args:
+            column_names (Iterable[str]): The column names, in output order.
+
+        Returns:
+            pa.Schema: The Arrow schema. Columns outside the plan are strings.
+        """
+
+        return pa.schema(
+            [
+                (name, column.arrow_type if (column := self._column_by_name.get(name)) else pa.string())
+                for name in column_names
+            ]
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the plan as a JSON-serialisable dictionary."""
+
+        return {
+            'format_version': PLAN_FORMAT_VERSION,
+            'schema_name': self.schema_name,
+            'fingerprint': self.fingerprint,
+            'columns': [{**asdict(column), 'arrow_type': str(column.arrow_type)} for column in self.columns],
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict[str, Any]) -> 'SchemaPlan':
+        """Rebuild a plan from its dictionary form.
+
+        Args:
+            content (dict[str, Any]): The output of ``to_dict``.
+
+        Returns:
+            SchemaPlan: The plan.
+        """
+
+        columns = tuple(
+            ColumnPlan(
+                name=column['name'],
+                schema_type=column['schema_type'],
+                pandas_dtype=column['pandas_dtype'],
+                duckdb_type=column['duckdb_type'],
+                raw_csv_headers=tuple(column['raw_csv_headers']),
+                lookup_keys=tuple(column['lookup_keys']),
+                description=column['description'],
+                mapping=column['mapping'],
+                is_calculated=column['is_calculated'],
+                downcast=column.get('downcast', True),
+            )
+            for column in content['columns']
+        )
+
+        return cls(schema_name=content['schema_name'], fingerprint=content['fingerprint'], columns=columns)
+
+
+def _schema_name(schema: SchemaProtocol) -> str:
+    """Return the qualified class name of a schema."""
+
+    return f'{type(schema).__module__}.{type(schema).__qualname__}'
+
+
+def schema_fingerprint(schema: SchemaProtocol) -> str | None:
+    """Return a digest of a schema definition, or None if the schema has no static definition.
+
+    Args:
+        schema (SchemaProtocol): The schema.
+
+    Returns:
+        str | None: The SHA-1 of the definition, the calculated columns and the plan format version.
+    """
+
+    definition = getattr(schema, 'SCHEMA_DEFINITION', None)
+    if definition is None:
+        return None
+
+    content = json.dumps(
+        [PLAN_FORMAT_VERSION, definition, list(getattr(schema, 'CALCULATED_COLUMNS', []))],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def compile_schema_plan(schema: SchemaProtocol) -> SchemaPlan:
+    """Walk a schema once and compile its plan.
+
+    Args:
+        schema (SchemaProtocol): The schema.
+
+    Returns:
+        SchemaPlan: The compiled plan.
+    """
+
+    column_names = list(getattr(schema, 'column_names', None) or [])
+    declared_input_columns = getattr(schema, 'input_column_names', None)
+    if declared_input_columns is None:
+        declared_input_columns = column_names
+
+    # Schemas that only declare their input columns (e.g. test doubles) still get a complete plan.
+    column_names += [column for column in declared_input_columns if column not in column_names]
+    input_column_names = set(declared_input_columns)
+    definition = getattr(schema, 'SCHEMA_DEFINITION', {})
+
+    columns = []
+    for column_name in column_names:
+        schema_type = schema.get_type(column_name)
+        schema_type = str(schema_type) if schema_type else None
+
+        raw_csv_header = schema.get_raw_csv_header(column_name) if hasattr(schema, 'get_raw_csv_header') else None
+        if isinstance(raw_csv_header, list):
+            # Multiple headers are possible (e.g. historical name changes).
+            raw_csv_headers = tuple(raw_csv_header)
+        else:
+            raw_csv_headers = (raw_csv_header,) if raw_csv_header else ()
+
+        mapping = schema.get_mapping(column_name) if hasattr(schema, 'get_mapping') else None
+
+        columns.append(
+            ColumnPlan(
+                name=column_name,
+                schema_type=schema_type,
+                pandas_dtype=PANDAS_DTYPE_BY_SCHEMA_TYPE.get(schema_type or '', 'object'),
+                duckdb_type=map_type_to_duckdb(schema_type),
+                raw_csv_headers=raw_csv_headers,
+                # Without an explicit header, the schema field name itself is matched.
+                lookup_keys=tuple(slugify(header) for header in raw_csv_headers) or (slugify(column_name),),
+                description=schema.get_description(column_name) if hasattr(schema, 'get_description') else None,
+                mapping={str(key): value for key, value in mapping.items()} if mapping else None,
+                is_calculated=column_name not in input_column_names,
+                downcast=bool(definition.get(column_name, {}).get('downcast', True)),
+            )
+        )
+
+    return SchemaPlan(
+        schema_name=_schema_name(schema), fingerprint=schema_fingerprint(schema) or '', columns=tuple(columns)
+    )
+
+
+class SchemaPlanRegistry:
+    """Compiles each schema once and keeps its plan in memory and, optionally, on disk."""
+
+    def __init__(self, cache_directory: Path | None = None) -> None:
+        """Initializes the registry.
+
+        Args:
+            cache_directory (Path | None): The directory of the JSON plan files.
+                Defaults to None (plans are only cached in memory).
+        """
+
+        self.cache_directory = cache_directory
+        self._plans: dict[type, SchemaPlan] = {}
+
+    def _cache_path(self, schema: SchemaProtocol) -> Path | None:
+        """Return the JSON file of a schema plan, if the disk cache is enabled."""
+
+        if self.cache_directory is None:
+            return None
+
+        return self.cache_directory / f'{_schema_name(schema)}.json'
+
+    def _read_cached_plan(self, cache_path: Path, fingerprint: str) -> SchemaPlan | None:
+        """Read a plan from disk, if it was compiled from the same schema definition."""
+
+        if not cache_path.exists():
+            return None
+
+        try:
+            content = json.loads(cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            logger.warning(f'Ignoring unreadable schema plan {cache_path.name}: {error}')
+            return None
+
+        if content.get('format_version') != PLAN_FORMAT_VERSION or content.get('fingerprint') != fingerprint:
+            return None
+
+        return SchemaPlan.from_dict(content)
+
+    def get(self, schema: SchemaProtocol) -> SchemaPlan:
+        """Return the plan of a schema, compiling it only if no cached plan matches.
+
+        Args:
+            schema (SchemaProtocol): The schema, or an already compiled plan.
+
+        Returns:
+            SchemaPlan: The plan.
+        """
+
+        if isinstance(schema, SchemaPlan):
+            return schema
+
+        # Schema definitions are class attributes, so a plan is compiled (or read) once per class.
+        schema_class = type(schema)
+        if schema_class in self._plans:
+            return self._plans[schema_class]
+
+        fingerprint = schema_fingerprint(schema)
+        if fingerprint is None:
+            # Schemas without a static definition (e.g. test doubles) are compiled on every call.
+            return compile_schema_plan(schema)
+
+        cache_path = self._cache_path(schema)
+        plan = self._read_cached_plan(cache_path, fingerprint) if cache_path else None
+
+        if plan is None:
+            plan = compile_schema_plan(schema)
+            if cache_path:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(json.dumps(plan.to_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+                logger.debug(f'Compiled schema plan {cache_path.name}.')
+
+        self._plans[schema_class] = plan
+
+        return plan
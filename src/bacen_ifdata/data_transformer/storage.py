@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: storage.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Storage for the transformed layer of Bacen IF.data
+
+This module persists the DataFrames produced by the transformer. The default
+format is Parquet, which keeps the Int64/category/datetime dtypes computed
+during the transformation, so the loader does not need to re-parse text.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+
+def _get_dictionary_columns(data_frame: pd.DataFrame) -> list[str]:
+    """Returns the columns that benefit from Parquet dictionary encoding.
+
+    Categorical and text columns have low cardinality in the IF.data reports
+    (institution names, cities, states, segments), so they are dictionary encoded.
+
+    Args:
+        data_frame (pd.DataFrame): The DataFrame to be written.
+
+    Returns:
+        list[str]: The names of the categorical and text columns.
+    """
+
+    return [
+        str(column)
+        for column, dtype in data_frame.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype)
+    ]
+
+
+def to_arrow_table(data_frame: pd.DataFrame) -> pa.Table:
+    """Converts a transformed DataFrame to an Arrow table.
+
+    Numeric columns share their buffers with the DataFrame and categorical
+    columns become dictionary arrays, so the conversion copies only the text.
+
+    Args:
+        data_frame (pd.DataFrame): The transformed DataFrame.
+
+    Returns:
+        pa.Table: The Arrow table, with the DataFrame dtypes.
+    """
+
+    return pa.Table.from_pandas(data_frame, preserve_index=False)
+
+
+def temporary_file_path(file_path: Path) -> Path:
+    """Returns the hidden path a file is written to before it replaces the file.
+
+    The name does not end in the storage format, so the loader never lists it.
+
+    Args:
+        file_path (Path): The destination file path.
+
+    Returns:
+        Path: The temporary path, in the same directory.
+    """
+
+    return file_path.with_name(f'.{file_path.name}.tmp')
+
+
+@contextmanager
+def atomic_write(file_path: Path) -> Iterator[Path]:
+    """Yields a temporary path to write a file to, and moves it over the file once written.
+
+    A load running while the next file is transformed reads either the previous
+    or the new content, never a partial file. If the writing fails, the previous
+    file is kept.
+
+    Args:
+        file_path (Path): The destination file path.
+
+    Yields:
+        Path: The temporary path. If nothing is written to it, the file is left as is.
+    """
+
+    temporary_path = temporary_file_path(file_path)
+    temporary_path.unlink(missing_ok=True)
+    try:
+        yield temporary_path
+        if temporary_path.exists():
+            os.replace(temporary_path, file_path)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
+def write_parquet(data_frame: pd.DataFrame, file_path: Path, compression: str = Cfg.PARQUET_COMPRESSION) -> None:
+    """Writes a transformed DataFrame to a Parquet file.
+
+    Args:
+        data_frame (pd.DataFrame): The transformed DataFrame.
+        file_path (Path): The destination file path.
+        compression (str): The Parquet compression codec. Defaults to Config.PARQUET_COMPRESSION.
+    """
+
+    table = to_arrow_table(data_frame)
+
+    with atomic_write(file_path) as temporary_path:
+        pq.write_table(
+            table,
+            temporary_path,
+            compression=compression,
+            use_dictionary=_get_dictionary_columns(data_frame),
+        )
+
+
+def transformed_file_path(
+    output_directory: Path, file_name: str, file_format: str = Cfg.TRANSFORMED_FILE_FORMAT
+) -> Path:
+    """Returns the path of the transformed file of a source file.
+
+    Args:
+        output_directory (Path): The directory of the transformed files of the report.
+        file_name (str): The name of the source file; its suffix is replaced by the format.
+        file_format (str): Either 'parquet' or 'csv'. Defaults to Config.TRANSFORMED_FILE_FORMAT.
+
+    Returns:
+        Path: The path of the transformed file.
+    """
+
+    return output_directory / Path(file_name).with_suffix(f'.{file_format}').name
+
+
+def write_transformed_data(
+    data_frame: pd.DataFrame, output_directory: Path, file_name: str, file_format: str = Cfg.TRANSFORMED_FILE_FORMAT
+) -> Path:
+    """Writes a transformed DataFrame in the configured storage format.
+
+    Args:
+        data_frame (pd.DataFrame): The transformed DataFrame.
+        output_directory (Path): The directory where the data should be saved.
+        file_name (str): The name of the source file; its suffix is replaced by the format.
+        file_format (str): Either 'parquet' or 'csv'. Defaults to Config.TRANSFORMED_FILE_FORMAT.
+
+    Returns:
+        Path: The path of the written file.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+
+    output_path = transformed_file_path(output_directory, file_name, file_format)
+
+    if file_format == 'parquet':
+        write_parquet(data_frame, output_path)
+    elif file_format == 'csv':
+        with atomic_write(output_path) as temporary_path:
+            data_frame.to_csv(temporary_path, index=False)
+    else:
+        raise ValueError(f'Unsupported transformed file format: {file_format}')
+
+    return output_path
+
+
+def read_transformed_data(file_path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Reads a transformed file back as a DataFrame, in the format given by its suffix.
+
+    Args:
+        file_path (Path): The transformed file, as written by write_transformed_data.
+        columns (list[str] | None): The columns to be read. Defaults to all columns.
+
+    Returns:
+        pd.DataFrame: The transformed data.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+
+    file_format = file_path.suffix.lstrip('.')
+
+    if file_format == 'parquet':
+        return pd.read_parquet(file_path, columns=columns)
+    if file_format == 'csv':
+        return pd.read_csv(file_path, usecols=columns)
+
+    raise ValueError(f'Unsupported transformed file format: {file_format}')
+
+
+def build_arrow_schema(
+    columns: Iterable[str], plan: SchemaPlan, column_types: dict[str, pa.DataType] | None = None
+) -> pa.Schema:
+    """Builds a fixed Arrow schema for the transformed columns of a report.
+
+    Batches of the same file may infer different Arrow types (e.g. an all-null
+    column or a different number of categories), so batched writes use the
+    types compiled in the schema plan instead.
+
+    Args:
+        columns (Iterable[str]): The transformed column names, in output order.
+        plan (SchemaPlan): The compiled schema plan for the report.
+        column_types (dict[str, pa.DataType] | None): Narrowed Arrow types overriding the plan types
+                                                      (see ``DowncastStatistics``). Defaults to None.
+
+    Returns:
+        pa.Schema: The Arrow schema.
+    """
+
+    arrow_schema = plan.arrow_schema(columns)
+
+    for column_name, arrow_type in (column_types or {}).items():
+        if (index := arrow_schema.get_field_index(column_name)) >= 0:
+            arrow_schema = arrow_schema.set(index, pa.field(column_name, arrow_type))
+
+    return arrow_schema
+
+
+def write_parquet_batches(
+    batches: Iterable[pd.DataFrame],
+    file_path: Path,
+    plan: SchemaPlan,
+    compression: str = Cfg.PARQUET_COMPRESSION,
+    column_types: dict[str, pa.DataType] | None = None,
+) -> int:
+    """Writes DataFrame batches incrementally to a single Parquet file.
+
+    Each batch becomes one row group, so only one batch is held in memory.
+
+    Args:
+        batches (Iterable[pd.DataFrame]): The batches to be written.
+        file_path (Path): The destination file path.
+        plan (SchemaPlan): The compiled schema plan for the report, used to fix the Arrow types.
+        compression (str): The Parquet compression codec. Defaults to Config.PARQUET_COMPRESSION.
+        column_types (dict[str, pa.DataType] | None): Narrowed Arrow types overriding the plan types.
+                                                      Defaults to None.
+
+    Returns:
+        int: The number of rows written.
+    """
+
+    writer: pq.ParquetWriter | None = None
+    arrow_schema: pa.Schema | None = None
+    rows_written = 0
+
+    with atomic_write(file_path) as temporary_path:
+        try:
+            for batch in batches:
+                if writer is None:
+                    arrow_schema = build_arrow_schema(batch.columns, plan, column_types)
+                    writer = pq.ParquetWriter(
+                        temporary_path,
+                        arrow_schema,
+                        compression=compression,
+                        use_dictionary=_get_dictionary_columns(batch),
+                    )
+
+                writer.write_table(pa.Table.from_pandas(batch, schema=arrow_schema, preserve_index=False))
+                rows_written += len(batch)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    return rows_written
+
+
+def iter_parquet_batches(file_path: Path, batch_size: int) -> Iterator[pd.DataFrame]:
+    """Reads a Parquet file back as DataFrame batches.
+
+    Integer columns are restored as nullable Int64, matching the transformer output.
+    A file without rows yields one empty batch with its columns, so the steps
+    reading it still write their (empty) output.
+
+    Args:
+        file_path (Path): The Parquet file to be read.
+        batch_size (int): The maximum number of rows per batch.
+
+    Yields:
+        pd.DataFrame: The batches, in file order.
+    """
+
+    types_mapper = {pa.int64(): pd.Int64Dtype()}.get
+    parquet_file = pq.ParquetFile(file_path)
+    try:
+        if parquet_file.metadata.num_rows == 0:
+            yield parquet_file.schema_arrow.empty_table().to_pandas(types_mapper=types_mapper)
+            return
+
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield record_batch.to_pandas(types_mapper=types_mapper)
+    finally:
+        parquet_file.close()
+
+
+def write_transformed_batches(
+    batches: Iterable[pd.DataFrame],
+    output_directory: Path,
+    file_name: str,
+    plan: SchemaPlan,
+    file_format: str = Cfg.TRANSFORMED_FILE_FORMAT,
+    column_types: dict[str, pa.DataType] | None = None,
+) -> Path:
+    """Writes transformed batches incrementally in the configured storage format.
+
+    Args:
+        batches (Iterable[pd.DataFrame]): The transformed batches.
+        output_directory (Path): The directory where the data should be saved.
+        file_name (str): The name of the source file; its suffix is replaced by the format.
+        plan (SchemaPlan): The compiled schema plan for the report.
+        file_format (str): Either 'parquet' or 'csv'. Defaults to Config.TRANSFORMED_FILE_FORMAT.
+        column_types (dict[str, pa.DataType] | None): Narrowed Arrow types overriding the plan types.
+                                                      Defaults to None.
+
+    Returns:
+        Path: The path of the written file.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+
+    output_path = transformed_file_path(output_directory, file_name, file_format)
+
+    if file_format == 'parquet':
+        write_parquet_batches(batches, output_path, plan, column_types=column_types)
+    elif file_format == 'csv':
+        # Write the header with the first batch only, then append.
+        with atomic_write(output_path) as temporary_path:
+            for index, batch in enumerate(batches):
+                batch.to_csv(temporary_path, mode='a', header=index == 0, index=False)
+    else:
+        raise ValueError(f'Unsupported transformed file format: {file_format}')
+
+    return output_path
@@ -24,12 +24,88 @@ This module defines the BaseTransformer class, which provides common data transf
 methods used across different report types.
 """
 
+from dataclasses import dataclass
+from typing import Final
+
+import numpy as np
 import pandas as pd
 
+from bacen_ifdata.utilities.configurations import Config as Cfg
+from bacen_ifdata.utilities.normalization import map_unique_values
+
+# Columns that identify an institution on a given date rather than carrying financial data.
+IDENTIFIER_COLUMNS: Final[list[str]] = [
+    'codigo',
+    'instituicao',
+    'data_base',
+    'tcb',
+    'segmento_resolucao',
+    'tipo_de_consolidacao',
+    'tipo_de_controle',
+    'cidade',
+    'uf',
+    'regiao',
+]
+
+# Natural key used by the redundant empty row rule.
+GROUP_KEY_COLUMNS: Final[tuple[str, str]] = ('codigo', 'data_base')
+
+
+@dataclass
+class DeduplicationStats:
+    """Number of rows removed by each deduplication rule."""
+
+    exact_duplicates: int = 0
+    redundant_empty_rows: int = 0
+    # Rows whose hash matched an earlier row but whose values did not (only counted when verifying).
+    hash_collisions: int = 0
+
+
+def hash_rows(data_frame: pd.DataFrame) -> np.ndarray:
+    """Computes a 64-bit hash for every row of the DataFrame.
+
+    The hash depends only on the row values, so equal rows in different
+    batches (even with different category codes) produce the same hash.
+
+    Args:
+        data_frame (pd.DataFrame): The DataFrame to be hashed.
+
+    Returns:
+        np.ndarray: An array of uint64 hashes, one per row.
+    """
+
+    return pd.util.hash_pandas_object(data_frame, index=False).to_numpy()
+
+
+def rows_equal(left: pd.DataFrame, right: pd.DataFrame) -> np.ndarray:
+    """Compares two aligned DataFrames row by row, treating NA as equal to NA.
+
+    Args:
+        left (pd.DataFrame): The first DataFrame.
+        right (pd.DataFrame): The second DataFrame, with the same columns and length.
+
+    Returns:
+        np.ndarray: A boolean array, True where every value of the row matches.
+    """
+
+    equal = np.ones(len(left), dtype=bool)
+    for column in left.columns:
+        left_values, right_values = left[column], right[column]
+        both_na = left_values.isna().to_numpy() & right_values.isna().to_numpy()
+        same_value = left_values.eq(right_values).fillna(False).to_numpy(dtype=bool)
+        equal &= both_na | same_value
+
+    return equal
+
 
 class BaseTransformer:
     """Base class for data transformers, providing common normalization and transformation methods."""
 
+    def __init__(self) -> None:
+        """Initializes the counters of the last deduplication."""
+
+        self.deduplication_stats = DeduplicationStats()
+
     def _normalize_percentage_series(self, series: pd.Series) -> pd.Series:
         """Removes the '%' sign from a pandas Series and converts it to float.
 
@@ -65,17 +141,50 @@ class BaseTransformer:
 
         return numeric_series.round().astype('Int64')
 
-    def _remove_exact_duplicates(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+    def _remove_exact_duplicates(self, data_frame: pd.DataFrame, verify_collisions: bool = False) -> pd.DataFrame:
         """Removes exact duplicates (character by character replication).
 
+        Rows are compared through their 64-bit hashes, so wide text columns are
+        never compared value by value. The first occurrence is kept.
+
         Args:
             data_frame (pd.DataFrame): The DataFrame to be processed.
+            verify_collisions (bool): If True, rows flagged as duplicates are compared
+                with their first occurrence and kept when the values differ.
 
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
 
-        return data_frame.drop_duplicates(keep='first').copy()
+        hashes = hash_rows(data_frame)
+
+        # Position of the first row with the same hash, for every row.
+        hash_codes, _ = pd.factorize(hashes)
+        _, first_by_code = np.unique(hash_codes, return_index=True)
+        first_positions = first_by_code[hash_codes]
+
+        duplicate_positions = np.flatnonzero(first_positions != np.arange(len(data_frame)))
+        if duplicate_positions.size == 0:
+            return data_frame
+
+        if verify_collisions:
+            is_same_row = rows_equal(
+                data_frame.iloc[duplicate_positions].reset_index(drop=True),
+                data_frame.iloc[first_positions[duplicate_positions]].reset_index(drop=True),
+            )
+            self.deduplication_stats.hash_collisions += int((~is_same_row).sum())
+            duplicate_positions = duplicate_positions[is_same_row]
+
+        self.deduplication_stats.exact_duplicates += len(duplicate_positions)
+        if duplicate_positions.size == 0:
+            return data_frame
+
+        keep_mask = np.ones(len(data_frame), dtype=bool)
+        keep_mask[duplicate_positions] = False
+
+        # take builds the new frame once, without flagging it as a slice of the input (no SettingWithCopyWarning
+        # when the next steps narrow its columns).
+        return data_frame.take(np.flatnonzero(keep_mask))
 
     def _get_identifier_columns(self, data_frame: pd.DataFrame) -> list[str]:
         """Identifies columns that act as identifiers.
@@ -89,19 +198,7 @@ class BaseTransformer:
             list[str]: A list of column names that act as identifiers.
         """
 
-        candidate_identifier_columns = [
-            'codigo',
-            'instituicao',
-            'data_base',
-            'tcb',
-            'segmento_resolucao',
-            'tipo_de_consolidacao',
-            'tipo_de_controle',
-            'cidade',
-            'uf',
-            'regiao',
-        ]
-        return [column for column in candidate_identifier_columns if column in data_frame.columns]
+        return [column for column in IDENTIFIER_COLUMNS if column in data_frame.columns]
 
     def _get_financial_columns(self, data_frame: pd.DataFrame, identifier_columns: list[str]) -> list[str]:
         """Identifies columns that contain financial data.
@@ -126,6 +223,10 @@ class BaseTransformer:
         and checks if there are other rows with the same 'codigo' and 'data_base' that contain financial data.
         If such rows exist, the empty row is considered redundant and is removed.
 
+        The group sizes are computed in a single pass over integer keys built from
+        the factorized 'codigo' and 'data_base' columns. Rows with a missing key
+        are never removed.
+
         Args:
             data_frame (pd.DataFrame): The DataFrame to be processed.
         Returns:
@@ -135,7 +236,7 @@ class BaseTransformer:
         identifier_columns = self._get_identifier_columns(data_frame)
 
         # We need at least 'codigo' and 'data_base' to determine redundancy.
-        if 'codigo' not in identifier_columns or 'data_base' not in identifier_columns:
+        if not all(column in identifier_columns for column in GROUP_KEY_COLUMNS):
             return data_frame
 
         financial_columns = self._get_financial_columns(data_frame, identifier_columns)
@@ -144,39 +245,55 @@ class BaseTransformer:
             return data_frame
 
         # A row is "empty of financial data" if all financial columns are NA.
-        is_financial_empty = data_frame[financial_columns].isna().all(axis=1)
-
-        # If no empty rows, return early.
-        if not is_financial_empty.any():
-            return data_frame
-
-        # Work on a copy to avoid SettingWithCopy warnings.
-        df_processed = data_frame.copy()
-        df_processed['__is_financial_empty'] = is_financial_empty
+        # Accumulate column by column to avoid a (rows x columns) boolean frame.
+        is_financial_empty = np.ones(len(data_frame), dtype=bool)
+        for column in financial_columns:
+            is_financial_empty &= data_frame[column].isna().to_numpy()
+            if not is_financial_empty.any():
+                # If no empty rows, return early.
+                return data_frame
+
+        # Combine both key columns into one integer group key.
+        code_keys, code_values = pd.factorize(data_frame['codigo'])
+        date_keys, date_values = pd.factorize(data_frame['data_base'])
+        has_key = (code_keys >= 0) & (date_keys >= 0)
+        group_keys = code_keys.astype(np.int64) * max(len(date_values), 1) + date_keys
 
         # Count total rows per institution per date.
-        df_processed['__group_count'] = df_processed.groupby(['codigo', 'data_base'])['codigo'].transform('count')
+        group_counts = np.bincount(group_keys[has_key], minlength=len(code_values) * max(len(date_values), 1))
+        row_group_count = np.zeros(len(data_frame), dtype=np.int64)
+        row_group_count[has_key] = group_counts[group_keys[has_key]]
 
         # Drop rule: If financial data is empty AND group count > 1, drop it.
-        rows_to_remove_mask = df_processed['__is_financial_empty'] & (df_processed['__group_count'] > 1)
+        rows_to_remove_mask = is_financial_empty & (row_group_count > 1)
+        self.deduplication_stats.redundant_empty_rows += int(rows_to_remove_mask.sum())
 
-        return df_processed[~rows_to_remove_mask].drop(columns=['__is_financial_empty', '__group_count'])
+        return data_frame[~rows_to_remove_mask]
 
-    def deduplicate_dataset(self, data_frame: pd.DataFrame) -> pd.DataFrame:
+    def deduplicate_dataset(
+        self, data_frame: pd.DataFrame, verify_collisions: bool = Cfg.DEDUPLICATION_VERIFY_COLLISIONS
+    ) -> pd.DataFrame:
         """Removes exact duplicates and empty rows that have a populated counterpart.
 
+        The number of rows removed by each rule is available in ``deduplication_stats``
+        after the call.
+
         Args:
             data_frame (pd.DataFrame): The DataFrame to be deduplicated.
+            verify_collisions (bool): If True, hash matches are confirmed by comparing
+                the row values. Defaults to Config.DEDUPLICATION_VERIFY_COLLISIONS.
 
         Returns:
             pd.DataFrame: The deduplicated DataFrame.
         """
 
+        self.deduplication_stats = DeduplicationStats()
+
         if data_frame.empty:
             return data_frame
 
         # Remove exact duplicates first to ensure we are working with a clean dataset.
-        clean_df = self._remove_exact_duplicates(data_frame)
+        clean_df = self._remove_exact_duplicates(data_frame, verify_collisions)
 
         # Remove redundant empty rows based on the presence of valid rows for the same institution and date.
         clean_df = self._remove_redundant_empty_rows(clean_df)
@@ -263,8 +380,15 @@ class BaseTransformer:
         """
 
         for column in columns:
-            if column in data_frame.columns:
-                data_frame[column] = data_frame[column].astype('string').str.strip()
+            if column not in data_frame.columns:
+                continue
+
+            series = data_frame[column]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Strip each distinct value once and broadcast it through the category codes.
+                data_frame[column] = map_unique_values(series, lambda value: str(value).strip()).astype('string')
+            else:
+                data_frame[column] = series.astype('string').str.strip()
 
         return data_frame
 
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: deduplication.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Chunked deduplication for Bacen IF.data
+
+This module applies the same rules as BaseTransformer.deduplicate_dataset to a
+file that is processed in row batches, without ever holding the whole file in
+memory. Rows are compared through 64-bit hashes instead of their values.
+
+Collision verification (Config.DEDUPLICATION_VERIFY_COLLISIONS) only covers
+duplicates inside a batch: the rows of earlier batches are not kept, so a row
+whose hash matches one of them is always dropped on the hash alone.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from bacen_ifdata.data_transformer.transformers.base import (
+    GROUP_KEY_COLUMNS,
+    IDENTIFIER_COLUMNS,
+    DeduplicationStats,
+    hash_rows,
+    rows_equal,
+)
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+
+class ChunkedDeduplicator:
+    """Deduplicates the batches of a single file in two passes.
+
+    The first pass (``drop_exact_duplicates``) must see every batch before the
+    second pass (``drop_redundant_empty_rows``) starts, because an empty row can
+    only be dropped once all rows of its (codigo, data_base) group are known.
+    """
+
+    def __init__(self, verify_collisions: bool = Cfg.DEDUPLICATION_VERIFY_COLLISIONS) -> None:
+        """Initializes the hash set and the group counters.
+
+        Args:
+            verify_collisions (bool): If True, duplicates inside a batch are compared with
+                their first occurrence and kept when the values differ. Duplicates of an
+                earlier batch are never verified. Defaults to Config.DEDUPLICATION_VERIFY_COLLISIONS.
+        """
+
+        self.verify_collisions = verify_collisions
+        self._seen_hashes: set[int] = set()
+        self._group_counts: Counter = Counter()
+        self._warned_unverified = False
+        self.stats = DeduplicationStats()
+
+    def drop_exact_duplicates(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Removes rows already seen in this or in a previous batch.
+
+        The first occurrence is kept, as in ``drop_duplicates(keep='first')``.
+        With ``verify_collisions``, rows flagged inside the batch are compared by
+        value; rows matching an earlier batch are dropped unverified, and a
+        warning is logged once per file. The remaining rows are counted per
+        (codigo, data_base) for the second pass.
+
+        Args:
+            batch (pd.DataFrame): A transformed batch.
+
+        Returns:
+            pd.DataFrame: The batch without exact duplicates.
+        """
+
+        if batch.empty:
+            return batch
+
+        hashes = hash_rows(batch)
+        first_in_batch = ~pd.Series(hashes).duplicated().to_numpy()
+        not_seen = np.fromiter((row_hash not in self._seen_hashes for row_hash in hashes), bool, len(hashes))
+
+        if self.verify_collisions and not not_seen.all() and not self._warned_unverified:
+            logger.warning(
+                'Rows matching an earlier batch are dropped on their hash alone: '
+                'chunked deduplication only verifies collisions inside a batch.'
+            )
+            self._warned_unverified = True
+
+        duplicate_positions = np.flatnonzero(~first_in_batch & not_seen)
+        if self.verify_collisions and duplicate_positions.size:
+            # Position of the first row with the same hash, for every row.
+            hash_codes, _ = pd.factorize(hashes)
+            _, first_by_code = np.unique(hash_codes, return_index=True)
+            is_same_row = rows_equal(
+                batch.iloc[duplicate_positions].reset_index(drop=True),
+                batch.iloc[first_by_code[hash_codes[duplicate_positions]]].reset_index(drop=True),
+            )
+            self.stats.hash_collisions += int((~is_same_row).sum())
+            first_in_batch[duplicate_positions[~is_same_row]] = True
+
+        keep_mask = first_in_batch & not_seen
+
+        self._seen_hashes.update(hashes[keep_mask].tolist())
+        self.stats.exact_duplicates += int((~keep_mask).sum())
+        unique_batch = batch[keep_mask]
+
+        if all(column in unique_batch.columns for column in GROUP_KEY_COLUMNS):
+            group_sizes = unique_batch.groupby(list(GROUP_KEY_COLUMNS), observed=True).size()
+            self._group_counts.update(group_sizes.to_dict())
+
+        return unique_batch
+
+    def drop_redundant_empty_rows(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Removes empty rows whose (codigo, data_base) group has other rows.
+
+        Args:
+            batch (pd.DataFrame): A batch already processed by ``drop_exact_duplicates``.
+
+        Returns:
+            pd.DataFrame: The batch without redundant empty rows.
+        """
+
+        if batch.empty or not all(column in batch.columns for column in GROUP_KEY_COLUMNS):
+            return batch
+
+        financial_columns = [column for column in batch.columns if column not in IDENTIFIER_COLUMNS]
+        if not financial_columns:
+            return batch
+
+        is_financial_empty = batch[financial_columns].isna().all(axis=1).to_numpy()
+        if not is_financial_empty.any():
+            return batch
+
+        # Only the empty rows need a group lookup.
+        empty_rows = batch.loc[is_financial_empty, list(GROUP_KEY_COLUMNS)]
+        redundant = np.zeros(len(batch), dtype=bool)
+        redundant[is_financial_empty] = [
+            self._group_counts.get(key, 0) > 1 for key in empty_rows.itertuples(index=False, name=None)
+        ]
+
+        self.stats.redundant_empty_rows += int(redundant.sum())
+
+        return batch[~redundant]
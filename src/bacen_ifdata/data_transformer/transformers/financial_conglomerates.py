@@ -30,6 +30,7 @@ License: MIT
 
 import pandas as pd
 
+from bacen_ifdata.data_transformer.enrichment import CITY_NAMES
 from bacen_ifdata.data_transformer.transformers.base import BaseTransformer
 
 
@@ -49,9 +50,9 @@ class FinancialConglomeratesTransformer(BaseTransformer):
             pd.DataFrame: The processed DataFrame.
         """
 
-        # Capitalizes the city name
+        # Capitalizes the city name, once per distinct city.
         if 'cidade' in data_frame.columns:
-            data_frame['cidade'] = data_frame['cidade'].str.title()
+            data_frame['cidade'] = CITY_NAMES.normalize_series(data_frame['cidade'])
 
         # Fills null values in the segment column
         if 'segmento' in data_frame.columns:
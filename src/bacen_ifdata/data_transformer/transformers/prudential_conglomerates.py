@@ -30,7 +30,9 @@ License: MIT
 
 import pandas as pd
 
+from bacen_ifdata.data_transformer.enrichment import CITY_NAMES
 from bacen_ifdata.data_transformer.transformers.base import BaseTransformer
+from bacen_ifdata.utilities.normalization import map_unique_values
 
 
 # pylint: disable=too-few-public-methods
@@ -49,13 +51,13 @@ class PrudentialConglomeratesTransformer(BaseTransformer):
             pd.DataFrame: The processed DataFrame.
         """
 
-        # Capitalizes the city name
+        # Capitalizes the city name, once per distinct city.
         if 'cidade' in data_frame.columns:
-            data_frame['cidade'] = data_frame['cidade'].str.title()
+            data_frame['cidade'] = CITY_NAMES.normalize_series(data_frame['cidade'])
 
         # Normalize 'consolidado_bancario' to lowercase to match seeds
         if 'consolidado_bancario' in data_frame.columns:
-            data_frame['consolidado_bancario'] = data_frame['consolidado_bancario'].str.lower()
+            data_frame['consolidado_bancario'] = map_unique_values(data_frame['consolidado_bancario'], str.lower)
 
         # Ensure 'segmento_resolucao' is categorical or string, but do NOT fillna with "Não informado"
         # because the seed only contains s1-s5. Nulls are better for RI.
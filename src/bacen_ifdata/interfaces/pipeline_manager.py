@@ -41,11 +41,24 @@ class PipelineManagerProtocol(Protocol):
     def run_cleaner(self, institution: str | None = None, report: str | None = None) -> None:
         """Execute the cleaning stage of the pipeline."""
 
-    def run_transformer(self, institution: str | None = None, report: str | None = None) -> None:
+    def run_transformer(
+        self, institution: str | None = None, report: str | None = None, chunk_size: int | None = None
+    ) -> None:
         """Execute the transformation stage of the pipeline."""
 
-    def run_loader(self, institution: str | None = None, report: str | None = None) -> None:
+    def run_loader(
+        self, institution: str | None = None, report: str | None = None, incremental: bool | None = None
+    ) -> None:
         """Execute the loading stage of the pipeline."""
 
+    def run_transform_loader(self, institution: str | None = None, report: str | None = None) -> None:
+        """Execute the transformation and loading stages in a single pass."""
+
+    def run_streaming(self, institution: str | None = None, report: str | None = None) -> None:
+        """Execute the cleaning, transformation and loading stages as one stream of files."""
+
+    def run_scheduled(self, institution: str | None = None, report: str | None = None) -> None:
+        """Execute the scraping stage while the downloaded files are cleaned, transformed and loaded."""
+
     def run_analytics(self) -> None:
         """Execute the analytics stage of the pipeline (dbt)."""
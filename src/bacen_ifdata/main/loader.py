@@ -29,18 +29,80 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import StrEnum
+from pathlib import Path
+from time import perf_counter
 
 from loguru import logger
 
 from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_loader.factory import get_database_service
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.long_format import (
+    LONG_FORMAT_DIRECTORY_NAME,
+    has_long_layout,
+    is_long_format,
+)
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
 from bacen_ifdata.data_transformer.schemas.mapper import SCHEMA_BY_INSTITUTION_AND_REPORT
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlanRegistry
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 from bacen_ifdata.scraper.storage.processing import build_directory_path
 from bacen_ifdata.utilities.configurations import Config as Cfg
 
 
-def main(institution: Institutions, report: StrEnum) -> None:
+def build_loader_controller() -> LoaderController:
+    """Create the loader controller for a report.
+
+    Categorical columns become ENUMs of the shared dictionaries, and the column
+    types come from the same compiled schema plan used by the transformer. The
+    service writes to the configured silver backend (DuckDB tables or Parquet lake).
+
+    Returns:
+        LoaderController: The loader controller.
+    """
+
+    return LoaderController(
+        get_database_service(
+            dictionary_registry=CategoricalDictionaryRegistry(Cfg.CATEGORICAL_DICTIONARY_FILE),
+            plan_registry=SchemaPlanRegistry(Cfg.SCHEMA_PLAN_DIRECTORY),
+        )
+    )
+
+
+def finish_report_tables(
+    controller: LoaderController, institution: Institutions, report: StrEnum, schema: BaseSchema
+) -> None:
+    """Cluster and profile the tables of a loaded report, and create its long view.
+
+    Args:
+        controller (LoaderController): The loader controller.
+        institution (Institutions): The institution of the report.
+        report (StrEnum): The report type.
+        schema (BaseSchema): The schema of the report.
+    """
+
+    with controller.timed_stage(institution, report, 'cluster'):
+        controller.cluster_report_tables(institution, report, schema)
+
+    if Cfg.SILVER_PROFILING:
+        with controller.timed_stage(institution, report, 'profile'):
+            controller.profile_report_tables(institution, report, schema)
+
+    # Without a long table, the wide table is exposed in the same shape through a view.
+    if has_long_layout(schema) and not is_long_format(schema):
+        controller.create_long_view(institution, report, schema)
+
+
+def main(
+    institution: Institutions,
+    report: StrEnum,
+    controller: LoaderController | None = None,
+    incremental: bool = False,
+    finish: bool = True,
+    input_files: list[Path] | None = None,
+) -> int:
     """Main function for the transformer.
 
     This function orchestrates the loading process for the reports
@@ -49,29 +111,168 @@ def main(institution: Institutions, report: StrEnum) -> None:
     Args:
         institution (Institutions): The institution for which the reports will be loaded.
         report (StrEnum): The report that will be loaded.
+        controller (LoaderController | None): The loader controller to use (e.g. bound to a worker cursor).
+                                              Defaults to None, in which case a new one is built.
+        incremental (bool): Only load the new or changed files, replacing their data_base partitions.
+                            Defaults to False (the table was cleared and every file is loaded).
+        finish (bool): Cluster and profile the tables after an incremental load. Defaults to True; the
+                       stage scheduler finishes them once, after the last file of the report.
+        input_files (list[Path] | None): The transformed files to load incrementally, when only some files of
+                                         the report are ready (the stage scheduler passes the files no task
+                                         is still writing). Defaults to None (every transformed file).
+
+    Returns:
+        int: The number of files loaded.
     """
 
     # Check if we have schemas for this institution.
     if institution not in SCHEMA_BY_INSTITUTION_AND_REPORT:
         logger.warning(f'No schema mapping found for institution: {institution.name}. Skipping loading.')
-        return
+        return 0
 
     # Get the schema for the report.
     schema_by_report = SCHEMA_BY_INSTITUTION_AND_REPORT[institution]
     report_schema = schema_by_report.get(report)
     if report_schema is None:
         logger.warning(f'No schema found for report: {report.name} in {institution.name}. Skipping.')
-        return
+        return 0
 
     # Build the path to the input data directory.
     input_data_path = build_directory_path(
         Cfg.TRANSFORMED_FILES_DIRECTORY, institution.name.lower(), report.name.lower()
     )
     # Create the controller object.
-    controller = LoaderController()
+    controller = controller or build_loader_controller()
+
+    # List all transformed files (in the configured storage format) in the input data directory.
+    complete = input_files is None
+    if complete:
+        input_files = sorted(input_data_path.glob(f'*.{Cfg.TRANSFORMED_FILE_FORMAT}'))
+    if input_files:
+        # Files with an incompatible header are left out; the header drift is reported at the end of the run.
+        with controller.timed_stage(institution, report, 'layouts'):
+            input_files = controller.check_report_layouts(institution, report, input_files, report_schema)
+    # Columns narrowed by the transformer in every file get the matching narrow DuckDB type.
+    column_types = controller.resolve_column_types(input_files, report_schema)
+
+    if incremental:
+        loaded_files = 0
+        if input_files:
+            load_plan = controller.load_report_incremental(
+                institution, report, input_files, report_schema, column_types, complete
+            )
+            loaded_files = len(load_plan.files)
+            # Only a replaced older quarter can break the (data_base, codigo) order of the tables.
+            if load_plan.files and finish:
+                with controller.timed_stage(institution, report, 'cluster'):
+                    controller.cluster_report_tables(institution, report, report_schema)
+            # The profile of the tables only changes when some file was loaded.
+            if load_plan.files and finish and Cfg.SILVER_PROFILING:
+                with controller.timed_stage(institution, report, 'profile'):
+                    controller.profile_report_tables(institution, report, report_schema)
+        if input_files and finish and has_long_layout(report_schema) and not is_long_format(report_schema):
+            controller.create_long_view(institution, report, report_schema)
+        return loaded_files
+
+    if not input_files:
+        return 0
+
+    # The tables are created (or synced with the schema) once, before any row is loaded.
+    with controller.timed_stage(institution, report, 'sync'):
+        controller.sync_report_tables(institution, report, report_schema, column_types)
+
+    # Every file of the report, wide and long, is loaded in one transaction: a failing file leaves the tables empty.
+    with controller.timed_stage(institution, report, 'load') as load_timing, controller.transaction():
+        if Cfg.BULK_LOAD:
+            # One multi-file scan per group of compatible files.
+            logger.info(f'Loading {len(input_files)} file(s) of {report.name} from {institution.name}.')
+            controller.load_report_files(institution, report, input_files, report_schema, column_types)
+        else:
+            for file in input_files:
+                logger.info(f'Loading {report.name} ({file.name}) from {institution.name}.')
+                # Load the data into the database.
+                controller.load_report(institution, report, file, report_schema, column_types)
+
+        if is_long_format(report_schema):
+            # The sparse amounts were written by the transformer to the long sub-directory.
+            long_files = sorted((input_data_path / LONG_FORMAT_DIRECTORY_NAME).glob('*.parquet'))
+            if Cfg.BULK_LOAD and long_files:
+                logger.info(
+                    f'Loading {len(long_files)} file(s) of {report.name} in long format from {institution.name}.'
+                )
+                controller.load_long_report(institution, report, long_files, report_schema)
+            else:
+                for file in long_files:
+                    logger.info(f'Loading {report.name} ({file.name}) in long format from {institution.name}.')
+                    controller.load_long_report(institution, report, file, report_schema)
+
+    # The rows are stored in (data_base, codigo) order, so the zonemaps prune the scans of the gold models.
+    with controller.timed_stage(institution, report, 'cluster'):
+        controller.cluster_report_tables(institution, report, report_schema)
+
+    # The column and data_base statistics are read by the audits and dashboards instead of scanning the tables.
+    if Cfg.SILVER_PROFILING:
+        with controller.timed_stage(institution, report, 'profile'):
+            controller.profile_report_tables(institution, report, report_schema)
+
+    # The ledger lets the next incremental load skip the files that do not change, and the audits count rows.
+    with controller.timed_stage(institution, report, 'ledger'):
+        controller.record_report_files(institution, report, input_files, report_schema, load_timing.seconds)
+
+    # Without a long table, the wide table is exposed in the same shape through a view.
+    if has_long_layout(report_schema) and not is_long_format(report_schema):
+        controller.create_long_view(institution, report, report_schema)
+
+    return len(input_files)
+
+
+def load_reports(
+    targets: list[tuple[Institutions, StrEnum]], workers: int = Cfg.LOADER_WORKERS, incremental: bool = False
+) -> dict[str, float]:
+    """Load independent report tables at the same time, one DuckDB cursor per worker thread.
+
+    All the workers share one connection (and so one database instance), and each
+    one loads whole tables, so two workers never write to the same table.
+
+    Args:
+        targets (list[tuple[Institutions, StrEnum]]): The (institution, report) pairs to load.
+        workers (int): The number of tables loaded at the same time. Defaults to Config.LOADER_WORKERS.
+        incremental (bool): Only load the new or changed files of each table. Defaults to False.
+
+    Returns:
+        dict[str, float]: The seconds spent loading each table, by table name.
+    """
+
+    controller = build_loader_controller()
+
+    def load_table(institution: Institutions, report: StrEnum) -> float:
+        worker_controller = controller.cursor()
+        start = perf_counter()
+        try:
+            main(institution, report, worker_controller, incremental)
+        finally:
+            worker_controller.close()
+
+        return perf_counter() - start
+
+    timings: dict[str, float] = {}
+    start = perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='loader') as executor:
+            futures = {
+                executor.submit(load_table, institution, report): f'{institution.name.lower()}_{report.name.lower()}'
+                for institution, report in targets
+            }
+            for future in as_completed(futures):
+                timings[futures[future]] = future.result()
+    finally:
+        controller.close()
+
+    elapsed = perf_counter() - start
+    lines = [f'{table_name}: {seconds:.2f}s' for table_name, seconds in sorted(timings.items(), key=lambda x: -x[1])]
+    logger.info(
+        f'Loaded {len(timings)} table(s) with {workers} worker(s) in {elapsed:.2f}s '
+        f'({sum(timings.values()):.2f}s of table time):\n' + '\n'.join(lines)
+    )
 
-    # List all CSV files in the input data directory.
-    for file in input_data_path.glob('*.csv'):
-        logger.info(f'Loading {report.name} ({file.name}) from {institution.name}.')
-        # Load the data into the database.
-        controller.load_report(institution, report, file, report_schema)
+    return timings
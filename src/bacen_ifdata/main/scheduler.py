@@ -0,0 +1,518 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: scheduler.py
+#  Version: 0.0.1
+#
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""
+Bacen IF.data AutoScraper & Data Manager
+
+This script is designed to automate the download of reports from the Banco Central do Brasil's
+IF.data tool. It facilitates the integration with automated data analysis and visualization tools,
+ensuring easy and timely access to data.
+
+Author: Alexsander Lopes Camargos
+License: MIT
+"""
+
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+
+from loguru import logger
+
+from bacen_ifdata.data_cleaner.processing import normalize_csv
+from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.interfaces.controller import (
+    TransformerControllerInterface,
+)
+from bacen_ifdata.data_transformer.report_index import ReportDeduplicationIndex
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.mapper import (
+    SCHEMA_BY_INSTITUTION_AND_REPORT,
+)
+from bacen_ifdata.interfaces import SessionProtocol
+from bacen_ifdata.main.loader import build_loader_controller, finish_report_tables
+from bacen_ifdata.main.loader import main as main_loader
+from bacen_ifdata.main.scraper import main as main_scraper
+from bacen_ifdata.main.transformer import (
+    build_report_index,
+    save_report_state,
+    transform_report_file,
+)
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.storage.processing import build_directory_path, ensure_directory
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+
+class Stage(StrEnum):
+    """Stages of the scheduler, in dispatch order, so a free scraping slot is filled first."""
+
+    SCRAPE = 'scrape'
+    CLEAN = 'clean'
+    TRANSFORM = 'transform'
+    LOAD = 'load'
+
+
+class TaskState(StrEnum):
+    """State of a task of the scheduler."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    SKIPPED = 'skipped'
+
+
+@dataclass(eq=False)
+class Task:
+    """A unit of work of one stage and the tasks it waits for."""
+
+    stage: Stage
+    name: str
+    action: Callable[[], object]
+    # Tasks that must succeed first: a failed (or skipped) requirement skips the task.
+    requires: tuple['Task', ...] = ()
+    # Tasks that must only be finished first, whatever their state: they set an order, not a precondition.
+    after: tuple['Task', ...] = ()
+    state: TaskState = TaskState.PENDING
+    error: BaseException | None = None
+
+
+class StageScheduler:
+    """Runs a graph of tasks on a pool of threads, each task as soon as the tasks it waits for are finished.
+
+    Each stage has a limit of tasks running at the same time, and the pool has one
+    thread per slot, so the tasks of a slow stage never hold the slots of the others.
+    """
+
+    def __init__(self, stage_limits: dict[Stage, int]) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            stage_limits (dict[Stage, int]): The tasks of each stage that may run at the same time (1 if missing).
+        """
+
+        self.stage_limits = {stage: max(1, stage_limits.get(stage, 1)) for stage in Stage}
+        self.tasks: list[Task] = []
+        self._dependents: dict[Task, list[Task]] = {}
+        self._waiting: dict[Task, int] = {}
+
+    def add(
+        self,
+        stage: Stage,
+        name: str,
+        action: Callable[[], object],
+        requires: tuple[Task, ...] = (),
+        after: tuple[Task, ...] = (),
+    ) -> Task:
+        """Add a task. The tasks it waits for must have been added before, so the graph has no cycle.
+
+        Args:
+            stage (Stage): The stage of the task.
+            name (str): The name of the task, for the logs.
+            action (Callable[[], object]): The work of the task.
+            requires (tuple[Task, ...]): The tasks that must succeed first. Defaults to none.
+            after (tuple[Task, ...]): The tasks that must only be finished first. Defaults to none.
+
+        Returns:
+            Task: The task.
+        """
+
+        task = Task(stage, name, action, requires, after)
+        for dependency in (*requires, *after):
+            self._dependents[dependency].append(task)
+
+        self.tasks.append(task)
+        self._dependents[task] = []
+        self._waiting[task] = len(requires) + len(after)
+
+        return task
+
+    def _release(self, task: Task, ready: dict[Stage, deque[Task]]) -> None:
+        """Hand a finished task to the tasks waiting for it, skipping the ones that required its success.
+
+        Args:
+            task (Task): The finished task.
+            ready (dict[Stage, deque[Task]]): The tasks ready to run, by stage.
+        """
+
+        finished = [task]
+        while finished:
+            current = finished.pop()
+            for dependent in self._dependents[current]:
+                if dependent.state != TaskState.PENDING:
+                    continue
+
+                if current.state != TaskState.DONE and any(current is required for required in dependent.requires):
+                    dependent.state = TaskState.SKIPPED
+                    finished.append(dependent)
+                    continue
+
+                self._waiting[dependent] -= 1
+                if not self._waiting[dependent]:
+                    ready[dependent.stage].append(dependent)
+
+    def run(self) -> None:
+        """Run every task, each one as soon as it is ready and its stage has a free slot.
+
+        A failing task does not stop the others: only the tasks that require it are
+        skipped. Once nothing is left to run, the error of the first failed task is raised.
+        """
+
+        ready: dict[Stage, deque[Task]] = {stage: deque() for stage in Stage}
+        for task in self.tasks:
+            if not self._waiting[task]:
+                ready[task.stage].append(task)
+
+        running: dict[Future, Task] = {}
+        running_by_stage = dict.fromkeys(Stage, 0)
+        with ThreadPoolExecutor(max_workers=sum(self.stage_limits.values()), thread_name_prefix='stage') as executor:
+            while True:
+                for stage in Stage:
+                    while ready[stage] and running_by_stage[stage] < self.stage_limits[stage]:
+                        task = ready[stage].popleft()
+                        task.state = TaskState.RUNNING
+                        running_by_stage[stage] += 1
+                        running[executor.submit(task.action)] = task
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    running_by_stage[task.stage] -= 1
+                    try:
+                        future.result()
+                        task.state = TaskState.DONE
+                    except Exception as error:  # pylint: disable=broad-except
+                        task.state = TaskState.FAILED
+                        task.error = error
+                        logger.error(f'Task "{task.name}" failed: {error}')
+                    self._release(task, ready)
+
+        failed = [task for task in self.tasks if task.state == TaskState.FAILED]
+        if failed:
+            skipped = sum(task.state == TaskState.SKIPPED for task in self.tasks)
+            logger.error(f'{len(failed)} task(s) failed and {skipped} task(s) requiring them were skipped.')
+            raise failed[0].error
+
+
+@dataclass
+class ReportProgress:
+    """What the tasks of a report hand to each other."""
+
+    institution: Institutions
+    report: StrEnum
+    # None for a report without a schema, which is only downloaded.
+    schema: BaseSchema | None
+    # Opened by the first transformed file of the report and saved after the last one.
+    report_index: ReportDeduplicationIndex | None = None
+    # The categorical dictionaries as the last transformed file of the report left them.
+    dictionaries: CategoricalDictionaryRegistry | None = None
+    # The transformed files no task is still writing: the ones the run does not rewrite and the ones already loaded.
+    ready_files: list[Path] = field(default_factory=list)
+    loaded_files: int = 0
+
+    @property
+    def table_name(self) -> str:
+        """The name of the silver table of the report."""
+
+        return f'{self.institution.name.lower()}_{self.report.name.lower()}'
+
+    def directory(self, base_directory: Path) -> Path:
+        """Return the directory of the files of the report under the directory of a stage.
+
+        Args:
+            base_directory (Path): The directory of the stage (raw, processed or transformed files).
+
+        Returns:
+            Path: The directory of the report.
+        """
+
+        return build_directory_path(base_directory, self.institution.name.lower(), self.report.name.lower())
+
+
+def report_file_name(data_base: str) -> str:
+    """Return the name the scraper gives the file of a data base ('MM/YYYY' -> 'YYYY-MM.csv').
+
+    Args:
+        data_base (str): The data base, as listed by the IF.data site.
+
+    Returns:
+        str: The name of the file.
+    """
+
+    month, year = data_base.split('/')
+
+    return f'{year}-{month}.csv'
+
+
+def _clean_file(progress: ReportProgress, file_name: str) -> None:
+    """Normalize a downloaded file of a report.
+
+    Args:
+        progress (ReportProgress): The report of the file.
+        file_name (str): The name of the file.
+    """
+
+    raw_file = progress.directory(Cfg.DOWNLOAD_DIRECTORY) / file_name
+    # The IF.data site sometimes saves an empty file; it is removed, so the next run downloads it again.
+    if not raw_file.exists() or raw_file.stat().st_size == 0:
+        logger.warning(
+            f'No rows downloaded for {progress.report.name} ({file_name}) from {progress.institution.name}. Skipping.'
+        )
+        raw_file.unlink(missing_ok=True)
+        return
+
+    ensure_directory(progress.directory(Cfg.PROCESSED_FILES_DIRECTORY))
+    logger.info(f'Normalizing {progress.report.name} ({file_name}) from {progress.institution.name}.')
+    normalize_csv(progress.institution, progress.report, file_name)
+
+
+def _transform_file(
+    transformer_controller: TransformerControllerInterface, progress: ReportProgress, file_name: str
+) -> None:
+    """Transform a processed file of a report and keep a snapshot of the dictionaries it was encoded with.
+
+    Args:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        progress (ReportProgress): The report of the file.
+        file_name (str): The name of the file.
+    """
+
+    processed_file = progress.directory(Cfg.PROCESSED_FILES_DIRECTORY) / file_name
+    if not processed_file.exists():
+        return
+
+    output_directory = progress.directory(Cfg.TRANSFORMED_FILES_DIRECTORY)
+    ensure_directory(output_directory)
+
+    # Rows repeated across files of the report (re-downloads, overlapping quarters) are rejected here.
+    if progress.report_index is None:
+        progress.report_index = build_report_index(progress.institution, progress.report)
+
+    logger.info(f'Transforming {progress.report.name} ({file_name}) from {progress.institution.name}.')
+    transform_report_file(
+        transformer_controller,
+        processed_file,
+        progress.schema,
+        progress.institution,
+        output_directory,
+        progress.report_index,
+    )
+
+    registry = transformer_controller.dictionary_registry
+    progress.dictionaries = registry.snapshot() if registry is not None else None
+
+
+def _save_report_state(transformer_controller: TransformerControllerInterface, progress: ReportProgress) -> None:
+    """Persist the deduplication index and the categorical dictionaries once every file of a report was transformed.
+
+    Args:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        progress (ReportProgress): The report.
+    """
+
+    if progress.report_index is not None:
+        save_report_state(transformer_controller, progress.report_index, progress.institution, progress.report)
+
+
+def _load_file(controller: LoaderController, progress: ReportProgress, file_name: str) -> None:
+    """Load a transformed file of a report, once it was transformed.
+
+    The load is incremental and only sees the files of the report that are ready:
+    the next file may be written by the transform slot meanwhile, and the
+    dictionaries handed to this load do not hold its values yet. The load ledger
+    tells that only this file is new or changed, and only its data_base partitions
+    are replaced.
+
+    Args:
+        controller (LoaderController): The loader controller.
+        progress (ReportProgress): The report of the file.
+        file_name (str): The name of the file.
+    """
+
+    transformed_file = progress.directory(Cfg.TRANSFORMED_FILES_DIRECTORY) / Path(file_name).with_suffix(
+        f'.{Cfg.TRANSFORMED_FILE_FORMAT}'
+    )
+    if not transformed_file.exists():
+        return
+
+    # Loads of different tables run at the same time, each one on its own cursor.
+    worker_controller = controller.cursor()
+    try:
+        # The ENUM types must hold the values the transformer added to the dictionaries since they were saved.
+        if progress.dictionaries is not None:
+            worker_controller.set_dictionary_registry(progress.dictionaries)
+        progress.ready_files = sorted({*progress.ready_files, transformed_file})
+        progress.loaded_files += main_loader(
+            progress.institution,
+            progress.report,
+            worker_controller,
+            incremental=True,
+            finish=False,
+            input_files=progress.ready_files,
+        )
+    finally:
+        worker_controller.close()
+
+
+def _finish_report(controller: LoaderController, progress: ReportProgress) -> None:
+    """Cluster and profile the tables of a report once its last file was loaded.
+
+    Args:
+        controller (LoaderController): The loader controller.
+        progress (ReportProgress): The report.
+    """
+
+    if not progress.loaded_files:
+        return
+
+    worker_controller = controller.cursor()
+    try:
+        finish_report_tables(worker_controller, progress.institution, progress.report, progress.schema)
+    finally:
+        worker_controller.close()
+
+
+def main(
+    session: SessionProtocol,
+    transformer_controller: TransformerControllerInterface,
+    targets: list[tuple[Institutions, StrEnum, list[str]]],
+) -> list[str]:
+    """Main function for the stage scheduler.
+
+    Every (institution, report, data_base) becomes a chain of scrape, clean,
+    transform and load tasks, and each task runs as soon as the previous one is
+    done, while the scraper downloads the next files. One browser session scrapes
+    and one transformer controller transforms, so those stages run one task at a
+    time; the files of a report are transformed oldest first (the first file wins
+    in the deduplication index) and loaded in the same order. Once the last file
+    of a report was loaded, its tables are clustered and profiled.
+
+    Arguments:
+        session (SessionProtocol): The session of the scraper.
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        targets (list[tuple[Institutions, StrEnum, list[str]]]): The (institution, report, data bases) to process.
+
+    Returns:
+        list[str]: The silver tables that changed.
+    """
+
+    start = perf_counter()
+    scheduler = StageScheduler(
+        {
+            Stage.SCRAPE: 1,
+            Stage.CLEAN: Cfg.SCHEDULER_CLEAN_WORKERS,
+            Stage.TRANSFORM: 1,
+            Stage.LOAD: Cfg.SCHEDULER_LOAD_WORKERS,
+        }
+    )
+    controller = build_loader_controller()
+
+    reports: list[ReportProgress] = []
+    for institution, report, data_bases in targets:
+        report_schema = SCHEMA_BY_INSTITUTION_AND_REPORT.get(institution, {}).get(report)
+        if report_schema is None:
+            logger.warning(f'No schema found for report: {report.name} in {institution.name}. Only downloading it.')
+        progress = ReportProgress(institution, report, report_schema)
+        if report_schema is not None:
+            # The files of the report this run does not rewrite are ready to be read by every load.
+            run_files = {
+                Path(report_file_name(data_base)).with_suffix(f'.{Cfg.TRANSFORMED_FILE_FORMAT}').name
+                for data_base in data_bases
+            }
+            progress.ready_files = [
+                file
+                for file in sorted(
+                    progress.directory(Cfg.TRANSFORMED_FILES_DIRECTORY).glob(f'*.{Cfg.TRANSFORMED_FILE_FORMAT}')
+                )
+                if file.name not in run_files
+            ]
+
+        transform_tasks: list[Task] = []
+        load_tasks: list[Task] = []
+        # The data bases are listed newest first; the oldest file is downloaded (and transformed) first.
+        for data_base in sorted(data_bases, key=lambda value: value.split('/')[::-1]):
+            unit = f'{institution.name} {report.name} {data_base}'
+            file_name = report_file_name(data_base)
+
+            scrape = scheduler.add(
+                Stage.SCRAPE, f'scrape {unit}', partial(main_scraper, session, data_base, institution, report)
+            )
+            if report_schema is None:
+                continue
+
+            clean = scheduler.add(Stage.CLEAN, f'clean {unit}', partial(_clean_file, progress, file_name), (scrape,))
+            # A file that failed does not hold back the next ones, but they still go in order.
+            transform_tasks.append(
+                scheduler.add(
+                    Stage.TRANSFORM,
+                    f'transform {unit}',
+                    partial(_transform_file, transformer_controller, progress, file_name),
+                    (clean,),
+                    tuple(transform_tasks[-1:]),
+                )
+            )
+            load_tasks.append(
+                scheduler.add(
+                    Stage.LOAD,
+                    f'load {unit}',
+                    partial(_load_file, controller, progress, file_name),
+                    (transform_tasks[-1],),
+                    tuple(load_tasks[-1:]),
+                )
+            )
+
+        if not transform_tasks:
+            continue
+
+        scheduler.add(
+            Stage.TRANSFORM,
+            f'save {institution.name} {report.name}',
+            partial(_save_report_state, transformer_controller, progress),
+            after=tuple(transform_tasks),
+        )
+        scheduler.add(
+            Stage.LOAD,
+            f'finish {progress.table_name}',
+            partial(_finish_report, controller, progress),
+            after=tuple(load_tasks),
+        )
+        reports.append(progress)
+
+    logger.info(f'Scheduled {len(scheduler.tasks)} task(s) for {len(targets)} report(s).')
+    try:
+        scheduler.run()
+    finally:
+        controller.close()
+
+    changed_tables = [progress.table_name for progress in reports if progress.loaded_files]
+    logger.info(
+        f'Ran {len(scheduler.tasks)} task(s) in {perf_counter() - start:.2f}s; '
+        f'{len(changed_tables)} silver table(s) changed.'
+    )
+
+    return changed_tables
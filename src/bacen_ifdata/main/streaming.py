@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: streaming.py
+#  Version: 0.0.1
+#
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+# ------------------------------------------------------------------------------
+
+"""
+Bacen IF.data AutoScraper & Data Manager
+
+This script is designed to automate the download of reports from the Banco Central do Brasil's
+IF.data tool. It facilitates the integration with automated data analysis and visualization tools,
+ensuring easy and timely access to data.
+
+Author: Alexsander Lopes Camargos
+License: MIT
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from time import perf_counter
+
+import pyarrow as pa
+from loguru import logger
+
+from bacen_ifdata.data_cleaner.processing import normalize_csv
+from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.interfaces.controller import (
+    TransformerControllerInterface,
+)
+from bacen_ifdata.data_transformer.long_format import is_long_format
+from bacen_ifdata.data_transformer.report_index import ReportDeduplicationIndex
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.mapper import (
+    SCHEMA_BY_INSTITUTION_AND_REPORT,
+)
+from bacen_ifdata.data_transformer.storage import to_arrow_table
+from bacen_ifdata.main.loader import build_loader_controller, finish_report_tables
+from bacen_ifdata.main.transformer import (
+    build_report_index,
+    save_report_state,
+    split_report_data,
+    transform_file,
+)
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.storage.processing import build_directory_path, ensure_directory
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+# Seconds a stage waits on a full (or empty) queue before checking whether another stage failed.
+QUEUE_POLL_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """A file of a report flowing through the stages; an item without a file closes its report."""
+
+    institution: Institutions
+    report: StrEnum
+    schema: BaseSchema
+    # The processed CSV file (None at the end of the report).
+    file_path: Path | None = None
+    # The transformed data and, in long format, its long part, once the file was transformed.
+    table: pa.Table | None = None
+    long_table: pa.Table | None = None
+    # The categorical dictionaries the file was encoded with.
+    dictionaries: CategoricalDictionaryRegistry | None = None
+
+
+class StageQueue:
+    """Bounded queue between two stages that stops waiting as soon as any stage failed."""
+
+    def __init__(self, maxsize: int, failed: threading.Event) -> None:
+        """Initialize the queue.
+
+        Args:
+            maxsize (int): The number of items that may wait in the queue; a full queue blocks the producer.
+            failed (threading.Event): Set by the first stage that fails.
+        """
+
+        self._queue: queue.Queue[WorkItem | None] = queue.Queue(maxsize=max(1, maxsize))
+        self._failed = failed
+
+    def put(self, item: WorkItem | None) -> bool:
+        """Put an item (None ends the stream), waiting while the queue is full.
+
+        Args:
+            item (WorkItem | None): The item.
+
+        Returns:
+            bool: False if a stage failed before the item could be put.
+        """
+
+        while not self._failed.is_set():
+            try:
+                self._queue.put(item, timeout=QUEUE_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def get(self) -> WorkItem | None:
+        """Take the next item, waiting while the queue is empty.
+
+        Returns:
+            WorkItem | None: The item, or None at the end of the stream or once a stage failed.
+        """
+
+        while not self._failed.is_set():
+            try:
+                return self._queue.get(timeout=QUEUE_POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+        return None
+
+
+def _normalize_reports(targets: list[tuple[Institutions, StrEnum]], output: StageQueue) -> None:
+    """Normalize the raw files of each report and hand each processed file to the transformer.
+
+    The processed files stay on disk: they are the bronze layer the audits count
+    rows from. A file normalized by an earlier run is handed over as it is, and
+    the files of a report go in name order, as the transformer reads them.
+
+    Args:
+        targets (list[tuple[Institutions, StrEnum]]): The (institution, report) pairs to process.
+        output (StageQueue): The queue of the transformer.
+    """
+
+    for institution, report in targets:
+        report_schema = SCHEMA_BY_INSTITUTION_AND_REPORT.get(institution, {}).get(report)
+        if report_schema is None:
+            logger.warning(f'No schema found for report: {report.name} in {institution.name}. Skipping.')
+            continue
+
+        raw_directory = build_directory_path(Cfg.DOWNLOAD_DIRECTORY, institution.name.lower(), report.name.lower())
+        processed_directory = build_directory_path(
+            Cfg.PROCESSED_FILES_DIRECTORY, institution.name.lower(), report.name.lower()
+        )
+        ensure_directory(processed_directory)
+
+        raw_files = {file.name for file in raw_directory.glob('*.csv')}
+        for file_name in sorted(raw_files | {file.name for file in processed_directory.glob('*.csv')}):
+            if file_name in raw_files:
+                logger.info(f'Normalizing {report.name} ({file_name}) from {institution.name}.')
+                normalize_csv(institution, report, file_name)
+
+            processed_file = processed_directory / file_name
+            if processed_file.exists() and not output.put(
+                WorkItem(institution, report, report_schema, file_path=processed_file)
+            ):
+                return
+
+        if not output.put(WorkItem(institution, report, report_schema)):
+            return
+
+    output.put(None)
+
+
+def _transform_files(
+    transformer_controller: TransformerControllerInterface, source: StageQueue, output: StageQueue
+) -> None:
+    """Transform each processed file as it arrives and hand its Arrow tables to the loader.
+
+    Each file goes with a snapshot of the categorical dictionaries it was encoded
+    with, so the loader builds its ENUM types while the next file extends them.
+
+    Args:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        source (StageQueue): The queue of the processed files.
+        output (StageQueue): The queue of the loader.
+    """
+
+    report_index: ReportDeduplicationIndex | None = None
+    while (item := source.get()) is not None:
+        if item.file_path is None:
+            # The ENUM types of the next runs are built from the dictionaries on disk.
+            if report_index is not None:
+                save_report_state(transformer_controller, report_index, item.institution, item.report)
+                report_index = None
+            if not output.put(item):
+                return
+            continue
+
+        # Rows repeated across files of the report (re-downloads, overlapping quarters) are rejected here.
+        if report_index is None:
+            report_index = build_report_index(item.institution, item.report)
+
+        logger.info(f'Transforming {item.report.name} ({item.file_path.name}) from {item.institution.name}.')
+        transformed_data = transform_file(
+            transformer_controller, item.file_path, item.schema, item.institution, report_index
+        )
+        long_table = None
+        # The sparse amounts of a report stored in long format go to the long table.
+        if is_long_format(item.schema):
+            transformed_data, long_data = split_report_data(transformer_controller, transformed_data, item.schema)
+            long_table = to_arrow_table(long_data)
+
+        registry = transformer_controller.dictionary_registry
+        transformed_item = WorkItem(
+            item.institution,
+            item.report,
+            item.schema,
+            item.file_path,
+            to_arrow_table(transformed_data),
+            long_table,
+            registry.snapshot() if registry is not None else None,
+        )
+        if not output.put(transformed_item):
+            return
+
+    output.put(None)
+
+
+def _load_files(controller: LoaderController, source: StageQueue, start: float) -> int:
+    """Load each transformed file as it arrives, one transaction per file.
+
+    The column types of a report widen as its files arrive: each file is loaded
+    with the narrow types that hold it and every file before it, so an earlier
+    file never has to fit a narrower type.
+
+    Args:
+        controller (LoaderController): The loader controller.
+        source (StageQueue): The queue of the transformed files.
+        start (float): When the pipeline started (``perf_counter``), to log the time to the first rows.
+
+    Returns:
+        int: The number of files loaded.
+    """
+
+    loaded_files = 0
+    # Empty tables with the Arrow schema of each file of the current report, to resolve its column types.
+    report_schemas: list[pa.Table] = []
+    while (item := source.get()) is not None:
+        if item.table is None:
+            if report_schemas:
+                finish_report_tables(controller, item.institution, item.report, item.schema)
+            else:
+                logger.warning(
+                    f'No processed files found for {item.report.name} from {item.institution.name}. Skipping load.'
+                )
+            report_schemas = []
+            continue
+
+        report_schemas.append(item.table.schema.empty_table())
+        column_types = controller.resolve_column_types(report_schemas, item.schema)
+        controller.set_dictionary_registry(item.dictionaries)
+
+        file_name = item.file_path.name
+        # The wide and long rows of the file are loaded in one transaction.
+        with controller.timed_stage(item.institution, item.report, 'load'), controller.transaction():
+            logger.info(f'Loading {item.report.name} ({file_name}) from {item.institution.name}.')
+            controller.load_report(item.institution, item.report, item.table, item.schema, column_types, file_name)
+            if item.long_table is not None:
+                controller.load_long_report(item.institution, item.report, item.long_table, item.schema, file_name)
+
+        loaded_files += 1
+        if loaded_files == 1:
+            logger.info(f'First rows in the silver layer after {perf_counter() - start:.2f}s.')
+
+    return loaded_files
+
+
+def main(transformer_controller: TransformerControllerInterface, targets: list[tuple[Institutions, StrEnum]]) -> None:
+    """Main function for the streaming pipeline.
+
+    Each file flows raw -> normalized -> transformed -> loaded as soon as the
+    previous stage is done with it. The normalizer and the transformer run in
+    threads of their own and the loader in the calling thread, connected by
+    bounded queues (``Config.STREAMING_QUEUE_SIZE``): a stage that gets ahead
+    waits on a full queue, so at most a few transformed files are held in
+    memory. The first stage to fail stops the others, and its error is raised.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        targets (list[tuple[Institutions, StrEnum]]): The (institution, report) pairs to process, whose
+                                                      tables were cleared.
+    """
+
+    start = perf_counter()
+    failed = threading.Event()
+    errors: list[BaseException] = []
+    processed_files = StageQueue(Cfg.STREAMING_QUEUE_SIZE, failed)
+    transformed_files = StageQueue(Cfg.STREAMING_QUEUE_SIZE, failed)
+
+    def run_stage(stage, *args) -> None:
+        try:
+            stage(*args)
+        except BaseException as error:  # pylint: disable=broad-except
+            errors.append(error)
+            failed.set()
+
+    threads = [
+        threading.Thread(
+            target=run_stage, args=(_normalize_reports, targets, processed_files), name='normalizer', daemon=True
+        ),
+        threading.Thread(
+            target=run_stage,
+            args=(_transform_files, transformer_controller, processed_files, transformed_files),
+            name='transformer',
+            daemon=True,
+        ),
+    ]
+    for thread in threads:
+        thread.start()
+
+    controller = build_loader_controller()
+    loaded_files = 0
+    try:
+        loaded_files = _load_files(controller, transformed_files, start)
+    except BaseException as error:  # pylint: disable=broad-except
+        errors.append(error)
+        failed.set()
+    finally:
+        for thread in threads:
+            thread.join()
+        controller.close()
+
+    if errors:
+        logger.error(f'Streaming pipeline failed: {errors[0]}')
+        raise errors[0]
+
+    logger.info(f'Streamed {loaded_files} file(s) of {len(targets)} report(s) in {perf_counter() - start:.2f}s.')
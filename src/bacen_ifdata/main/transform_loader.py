@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# encoding: utf-8
+
+# ------------------------------------------------------------------------------
+#  Name: main.py
+#  Version: 0.0.1
+#
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+
+"""
+Bacen IF.data AutoScraper & Data Manager
+
+This script is designed to automate the download of reports from the Banco Central do Brasil's
+IF.data tool. It facilitates the integration with automated data analysis and visualization tools,
+ensuring easy and timely access to data.
+
+Author: Alexsander Lopes Camargos
+License: MIT
+"""
+
+from enum import StrEnum
+
+import pyarrow as pa
+from loguru import logger
+
+from bacen_ifdata.data_transformer.interfaces.controller import (
+    TransformerControllerInterface,
+)
+from bacen_ifdata.data_transformer.long_format import (
+    has_long_layout,
+    is_long_format,
+)
+from bacen_ifdata.data_transformer.schemas.mapper import (
+    SCHEMA_BY_INSTITUTION_AND_REPORT,
+)
+from bacen_ifdata.data_transformer.storage import to_arrow_table
+from bacen_ifdata.main.loader import build_loader_controller
+from bacen_ifdata.main.transformer import (
+    build_report_index,
+    save_report_state,
+    split_report_data,
+    transform_file,
+)
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.storage.processing import build_directory_path
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+
+def main(transformer_controller: TransformerControllerInterface, institution: Institutions, report: StrEnum) -> None:
+    """Main function for the single-process transform and load.
+
+    Each processed file is transformed exactly as in the transformer stage, but
+    the result is handed to DuckDB as an in-memory Arrow table instead of being
+    written to the transformed files directory and read back by the loader.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        institution (Institutions): The institution type.
+        report (StrEnum): The report type.
+    """
+
+    # Check if we have schemas for this institution.
+    if institution not in SCHEMA_BY_INSTITUTION_AND_REPORT:
+        logger.warning(f'No schema mapping found for institution: {institution.name}. Skipping transform and load.')
+        return
+
+    # Get the schema for the report.
+    report_schema = SCHEMA_BY_INSTITUTION_AND_REPORT[institution].get(report)
+    if report_schema is None:
+        logger.warning(f'No schema found for report: {report.name} in {institution.name}. Skipping.')
+        return
+
+    # Build the path to the input data directory.
+    input_data_path = build_directory_path(Cfg.PROCESSED_FILES_DIRECTORY, institution.name.lower(), report.name.lower())
+
+    # Rows repeated across files of the report (re-downloads, overlapping quarters) are rejected here.
+    report_index = build_report_index(institution, report)
+
+    # List all CSV files in the input data directory, in a stable order so the first file wins.
+    transformed_tables: list[tuple[str, pa.Table]] = []
+    long_tables: list[tuple[str, pa.Table]] = []
+    for file in sorted(input_data_path.glob('*.csv')):
+        logger.info(f'Transforming {report.name} ({file.name}) from {institution.name}.')
+        transformed_data = transform_file(transformer_controller, file, report_schema, institution, report_index)
+        # The sparse amounts of a report stored in long format go to the long table.
+        if is_long_format(report_schema):
+            transformed_data, long_data = split_report_data(transformer_controller, transformed_data, report_schema)
+            long_tables.append((file.name, to_arrow_table(long_data)))
+        transformed_tables.append((file.name, to_arrow_table(transformed_data)))
+
+    # The ENUM types of the table are built from the dictionaries on disk, so they are saved before loading.
+    save_report_state(transformer_controller, report_index, institution, report)
+
+    if not transformed_tables:
+        logger.warning(f'No processed files found for {report.name} from {institution.name}. Skipping load.')
+        return
+
+    controller = build_loader_controller()
+    # The tables are created once, with the narrow types that hold every file of the report.
+    column_types = controller.resolve_column_types([table for _, table in transformed_tables], report_schema)
+
+    with controller.timed_stage(institution, report, 'sync'):
+        controller.sync_report_tables(institution, report, report_schema, column_types)
+
+    # Every table of the report, wide and long, is loaded in one transaction.
+    with controller.timed_stage(institution, report, 'load'), controller.transaction():
+        for file_name, table in transformed_tables:
+            logger.info(f'Loading {report.name} ({file_name}) from {institution.name}.')
+            controller.load_report(institution, report, table, report_schema, column_types, file_name)
+
+        for file_name, table in long_tables:
+            logger.info(f'Loading {report.name} ({file_name}) in long format from {institution.name}.')
+            controller.load_long_report(institution, report, table, report_schema, file_name)
+
+    with controller.timed_stage(institution, report, 'cluster'):
+        controller.cluster_report_tables(institution, report, report_schema)
+
+    if Cfg.SILVER_PROFILING:
+        with controller.timed_stage(institution, report, 'profile'):
+            controller.profile_report_tables(institution, report, report_schema)
+
+    # Without a long table, the wide table is exposed in the same shape through a view.
+    if has_long_layout(report_schema) and not is_long_format(report_schema):
+        controller.create_long_view(institution, report, report_schema)
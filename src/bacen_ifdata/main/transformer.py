@@ -28,18 +28,42 @@ Author: Alexsander Lopes Camargos
 License: MIT
 """
 
+from contextlib import ExitStack
 from enum import StrEnum
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable, TypeVar
 
 import pandas as pd
 from loguru import logger
 
+from bacen_ifdata.data_transformer.downcasting import DowncastStatistics, downcast_dtypes
 from bacen_ifdata.data_transformer.interfaces.controller import (
     TransformerControllerInterface,
 )
+from bacen_ifdata.data_transformer.long_format import (
+    LongFormatWriter,
+    is_long_format,
+    long_file_path,
+    split_long_format,
+)
+from bacen_ifdata.data_transformer.profiling import (
+    PROFILE_REPORT_FILE_NAME,
+    write_profile_report,
+)
+from bacen_ifdata.data_transformer.report_index import ReportDeduplicationIndex
+from bacen_ifdata.data_transformer.schemas.interfaces import SchemaProtocol
 from bacen_ifdata.data_transformer.schemas.mapper import (
     SCHEMA_BY_INSTITUTION_AND_REPORT,
 )
+from bacen_ifdata.data_transformer.storage import (
+    iter_parquet_batches,
+    transformed_file_path,
+    write_parquet_batches,
+    write_transformed_batches,
+    write_transformed_data,
+)
+from bacen_ifdata.data_transformer.transformers.deduplication import ChunkedDeduplicator
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 from bacen_ifdata.scraper.storage.processing import (
     build_directory_path,
@@ -47,24 +71,355 @@ from bacen_ifdata.scraper.storage.processing import (
 )
 from bacen_ifdata.utilities.configurations import Config as Cfg
 
+T = TypeVar('T')
+
 
 def _store_transformed_data(transformed_data: pd.DataFrame, output_directory: Path, file_name: str) -> None:
     """Save the transformed data to the output directory.
 
-    This function saves the transformed data to a CSV file in the specified
-    output directory.
+    This function saves the transformed data in the configured storage
+    format (Parquet by default) in the specified output directory.
 
     Arguments:
         transformed_data (pd.DataFrame): The transformed data to be saved.
         output_directory (Path): The directory where the data should be saved.
-        file_name (str): The name of the file to save the data as.
+        file_name (str): The name of the source file, used to name the output file.
+    """
+
+    output_path = write_transformed_data(transformed_data, output_directory, file_name)
+    logger.info(f'Successfully transformed: {output_path}')
+
+
+def _store_long_data(
+    transformer_controller: TransformerControllerInterface,
+    transformed_data: pd.DataFrame,
+    report_schema: SchemaProtocol,
+    output_directory: Path,
+    file_name: str,
+) -> pd.DataFrame:
+    """Write the long part of the transformed data and return its wide part.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        transformed_data (pd.DataFrame): The transformed data.
+        report_schema (SchemaProtocol): The schema for the report.
+        output_directory (Path): The directory where the data should be saved.
+        file_name (str): The name of the source file, used to name the long file.
+
+    Returns:
+        pd.DataFrame: The wide part, to be stored as the transformed file.
+    """
+
+    wide_data, long_data = split_report_data(transformer_controller, transformed_data, report_schema)
+
+    with LongFormatWriter(long_file_path(output_directory, file_name)) as writer:
+        writer.write(long_data)
+
+    logger.info(f'Stored {writer.rows_written} non-empty amount(s) of {file_name} in long format.')
+
+    return wide_data
+
+
+def _measure(transformer_controller: TransformerControllerInterface, name: str, function: Callable[..., T], *args) -> T:
+    """Run a step in the profile of the file being transformed.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        name (str): The name of the step.
+        function (Callable[..., T]): The step to be run.
+        *args: The arguments of the step.
+
+    Returns:
+        T: The result of the step.
     """
 
-    transformed_data.to_csv(output_directory / file_name, index=False)
-    logger.info(f'Successfully transformed: {output_directory / file_name}')
+    return transformer_controller.profiles[-1].measure(name, function, *args)
+
 
+def build_report_index(institution: Institutions, report: StrEnum) -> ReportDeduplicationIndex:
+    """Open the deduplication index of a report.
+
+    Arguments:
+        institution (Institutions): The institution type.
+        report (StrEnum): The report type.
+
+    Returns:
+        ReportDeduplicationIndex: The index of the rows already transformed from the files of the report.
+    """
+
+    report_index = ReportDeduplicationIndex(
+        build_directory_path(Cfg.DEDUPLICATION_INDEX_DIRECTORY, institution.name.lower())
+        / f'{report.name.lower()}.parquet'
+    )
+
+    # Forget the files removed from the processed directory, so their rows are no longer rejected elsewhere.
+    processed_directory = build_directory_path(
+        Cfg.PROCESSED_FILES_DIRECTORY, institution.name.lower(), report.name.lower()
+    )
+    report_index.retain(file.name for file in processed_directory.glob('*.csv'))
+
+    return report_index
+
+
+def transform_file(
+    transformer_controller: TransformerControllerInterface,
+    file: Path,
+    report_schema: SchemaProtocol,
+    institution: Institutions,
+    report_index: ReportDeduplicationIndex,
+) -> pd.DataFrame:
+    """Transform a whole file, reject the rows already seen in the report and narrow the dtypes.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        file (Path): The processed CSV file to be transformed.
+        report_schema (SchemaProtocol): The schema for the report.
+        institution (Institutions): The institution type.
+        report_index (ReportDeduplicationIndex): The deduplication index of the report.
+
+    Returns:
+        pd.DataFrame: The transformed data, ready to be stored or loaded.
+    """
+
+    # The file replaces its own entries from a previous run.
+    report_index.discard(file.name)
+
+    transformed_data = transformer_controller.transform(file, report_schema, institution)
+    transformed_data = _measure(
+        transformer_controller, 'filter_report_duplicates', report_index.filter_new_rows, transformed_data, file.name
+    )
+    # Narrow the dtypes only after the row hashes were indexed, so they do not depend on the dtypes.
+    if Cfg.DTYPE_DOWNCASTING:
+        transformed_data = _measure(
+            transformer_controller,
+            'downcast_dtypes',
+            downcast_dtypes,
+            transformed_data,
+            transformer_controller.get_schema_plan(report_schema),
+        )
+
+    return transformed_data
+
+
+def split_report_data(
+    transformer_controller: TransformerControllerInterface,
+    transformed_data: pd.DataFrame,
+    report_schema: SchemaProtocol,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split the transformed data of a report stored in long format into its wide and long parts.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        transformed_data (pd.DataFrame): The transformed data (or batch).
+        report_schema (SchemaProtocol): The schema for the report.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The wide part and the long part (one row per non-empty amount).
+    """
 
-def main(transformer_controller: TransformerControllerInterface, institution: Institutions, report: StrEnum) -> None:
+    return _measure(
+        transformer_controller,
+        'split_long_format',
+        split_long_format,
+        transformed_data,
+        transformer_controller.get_schema_plan(report_schema),
+        report_schema,
+    )
+
+
+def save_report_state(
+    transformer_controller: TransformerControllerInterface,
+    report_index: ReportDeduplicationIndex,
+    institution: Institutions,
+    report: StrEnum,
+) -> None:
+    """Persist the deduplication index and the categorical dictionaries after a report was transformed.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        report_index (ReportDeduplicationIndex): The deduplication index of the report.
+        institution (Institutions): The institution type.
+        report (StrEnum): The report type.
+    """
+
+    report_index.save()
+    transformer_controller.save_dictionaries()
+    if report_index.rejected_rows:
+        logger.warning(
+            f'{report_index.rejected_rows} row(s) of {report.name} from {institution.name} '
+            'were repeated across files and rejected.'
+        )
+
+
+def _write_long_part(long_writer: LongFormatWriter, wide_data: pd.DataFrame, long_data: pd.DataFrame) -> pd.DataFrame:
+    """Append the long part of a batch to the long file and return its wide part.
+
+    Arguments:
+        long_writer (LongFormatWriter): The writer of the long file.
+        wide_data (pd.DataFrame): The wide part of the batch.
+        long_data (pd.DataFrame): The long part of the batch.
+
+    Returns:
+        pd.DataFrame: The wide part of the batch.
+    """
+
+    long_writer.write(long_data)
+
+    return wide_data
+
+
+def _transform_in_chunks(
+    transformer_controller: TransformerControllerInterface,
+    file: Path,
+    report_schema: SchemaProtocol,
+    institution: Institutions,
+    output_directory: Path,
+    chunk_size: int,
+    report_index: ReportDeduplicationIndex,
+) -> None:
+    """Transform a file in row batches and write the output incrementally.
+
+    The first pass transforms each batch and drops exact duplicates through a
+    row hash set, spooling the batches to a temporary Parquet file. The second
+    pass reads the spool back and drops redundant empty rows, which can only be
+    decided after every row of the file has been seen, and the rows already
+    transformed from another file of the report. With dtype downcasting, the
+    rows left are spooled once more, so their dtypes are narrowed as if the
+    file had been transformed at once.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        file (Path): The processed CSV file to be transformed.
+        report_schema (SchemaProtocol): The schema for the report.
+        institution (Institutions): The institution type.
+        output_directory (Path): The directory where the data should be saved.
+        chunk_size (int): The number of rows per batch.
+        report_index (ReportDeduplicationIndex): The deduplication index of the report.
+    """
+
+    deduplicator = ChunkedDeduplicator()
+    # The batches are written with the Arrow types compiled in the schema plan.
+    report_plan = transformer_controller.get_schema_plan(report_schema)
+
+    # The spool lives next to the output, in a hidden directory the loader does not scan.
+    with TemporaryDirectory(prefix='.spool-', dir=output_directory) as spool_directory:
+        spool_path = Path(spool_directory) / f'{file.stem}.parquet'
+
+        batches = transformer_controller.transform_in_chunks(file, report_schema, institution, chunk_size)
+        write_parquet_batches(
+            (
+                _measure(transformer_controller, 'drop_exact_duplicates', deduplicator.drop_exact_duplicates, batch)
+                for batch in batches
+            ),
+            spool_path,
+            report_plan,
+        )
+
+        if not spool_path.exists():
+            # Without a single batch there are no columns to write an empty file with, so the output of a
+            # previous run is removed instead of being loaded again.
+            logger.warning(f'No rows found in {file.name}. Removing its previous output.')
+            transformed_file_path(output_directory, file.name).unlink(missing_ok=True)
+            long_file_path(output_directory, file.name).unlink(missing_ok=True)
+            return
+
+        batches = (
+            _measure(
+                transformer_controller,
+                'filter_report_duplicates',
+                report_index.filter_new_rows,
+                _measure(
+                    transformer_controller,
+                    'drop_redundant_empty_rows',
+                    deduplicator.drop_redundant_empty_rows,
+                    batch,
+                ),
+                file.name,
+            )
+            for batch in iter_parquet_batches(spool_path, chunk_size)
+        )
+
+        with ExitStack() as stack:
+            if is_long_format(report_schema):
+                # The long part of each batch is appended to the long file; only the wide part goes to the output.
+                long_writer = stack.enter_context(LongFormatWriter(long_file_path(output_directory, file.name)))
+                batches = (
+                    _write_long_part(long_writer, *split_report_data(transformer_controller, batch, report_schema))
+                    for batch in batches
+                )
+
+            column_types = None
+            if Cfg.DTYPE_DOWNCASTING:
+                # The narrowed dtypes depend on every row of the file, so the final rows are spooled once more
+                # while they are observed, then narrowed as they are written, like a file transformed at once.
+                statistics = DowncastStatistics(report_plan)
+                final_spool_path = spool_path.with_name(f'{file.stem}.final.parquet')
+                write_parquet_batches((statistics.observe(batch) for batch in batches), final_spool_path, report_plan)
+                column_types = statistics.arrow_types()
+                batches = (
+                    _measure(transformer_controller, 'downcast_dtypes', statistics.narrow, batch)
+                    for batch in iter_parquet_batches(final_spool_path, chunk_size)
+                )
+
+            output_path = write_transformed_batches(
+                batches, output_directory, file.name, report_plan, column_types=column_types
+            )
+
+    logger.debug(
+        f'Deduplication of {file.name} removed {deduplicator.stats.exact_duplicates} exact duplicate(s) '
+        f'and {deduplicator.stats.redundant_empty_rows} redundant empty row(s).'
+    )
+    logger.info(f'Successfully transformed in chunks of {chunk_size} rows: {output_path}')
+
+
+def transform_report_file(
+    transformer_controller: TransformerControllerInterface,
+    file: Path,
+    report_schema: SchemaProtocol,
+    institution: Institutions,
+    output_directory: Path,
+    report_index: ReportDeduplicationIndex,
+    chunk_size: int | None = None,
+) -> None:
+    """Transform a processed file of a report and write it (and its long part) to the output directory.
+
+    Arguments:
+        transformer_controller (TransformerControllerInterface): The transformer controller.
+        file (Path): The processed CSV file to be transformed.
+        report_schema (SchemaProtocol): The schema for the report.
+        institution (Institutions): The institution type.
+        output_directory (Path): The directory where the data should be saved.
+        report_index (ReportDeduplicationIndex): The deduplication index of the report.
+        chunk_size (int | None): If set, the file is transformed in batches of this many rows.
+                                 Defaults to None (whole file at once).
+    """
+
+    if chunk_size:
+        # The file replaces its own entries from a previous run.
+        report_index.discard(file.name)
+        # Stream the CSV file through the schema plan in row batches.
+        _transform_in_chunks(
+            transformer_controller, file, report_schema, institution, output_directory, chunk_size, report_index
+        )
+        return
+
+    # Transform the CSV file.
+    transformed_data = transform_file(transformer_controller, file, report_schema, institution, report_index)
+    # The sparse amounts of a report stored in long format go to their own file.
+    if is_long_format(report_schema):
+        transformed_data = _store_long_data(
+            transformer_controller, transformed_data, report_schema, output_directory, file.name
+        )
+    # Save the transformed data to the output directory.
+    _store_transformed_data(transformed_data, output_directory, file.name)
+
+
+def main(
+    transformer_controller: TransformerControllerInterface,
+    institution: Institutions,
+    report: StrEnum,
+    chunk_size: int | None = None,
+) -> None:
     """Main function for the transformer.
 
     This function orchestrates the transformation process for the reports
@@ -74,6 +429,8 @@ def main(transformer_controller: TransformerControllerInterface, institution: In
         transformer_controller (TransformerControllerInterface): The transformer controller.
         institution (Institutions): The institution type.
         report (StrEnum): The report type.
+        chunk_size (int | None): If set, each file is transformed in batches of this many rows,
+                                 bounding memory usage. Defaults to None (whole file at once).
     """
 
     # Check if we have schemas for this institution.
@@ -99,10 +456,21 @@ def main(transformer_controller: TransformerControllerInterface, institution: In
         logger.warning(f'No schema found for report: {report.name} in {institution.name}. Skipping.')
         return
 
-    # List all CSV files in the input data directory.
-    for file in input_data_path.glob('*.csv'):
+    # Rows repeated across files of the report (re-downloads, overlapping quarters) are rejected here.
+    report_index = build_report_index(institution, report)
+
+    # Profiles of the files of this report, written next to the transformed files when profiling is enabled.
+    first_profile = transformer_controller.profile_count
+
+    # List all CSV files in the input data directory, in a stable order so the first file wins.
+    for file in sorted(input_data_path.glob('*.csv')):
         logger.info(f'Transforming {report.name} ({file.name}) from {institution.name}.')
-        # Transform the CSV file.
-        transformed_data = transformer_controller.transform(file, report_schema, institution)
-        # Save the transformed data to the output directory.
-        _store_transformed_data(transformed_data, output_directory, file.name)
+        transform_report_file(
+            transformer_controller, file, report_schema, institution, output_directory, report_index, chunk_size
+        )
+
+    save_report_state(transformer_controller, report_index, institution, report)
+
+    report_profiles = transformer_controller.profiles_since(first_profile)
+    if Cfg.TRANSFORM_PROFILING and report_profiles:
+        write_profile_report(report_profiles, output_directory / PROFILE_REPORT_FILE_NAME)
@@ -18,25 +18,28 @@ import os
 import subprocess
 from enum import StrEnum
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 from loguru import logger
 
-from bacen_ifdata import Pipeline
-from bacen_ifdata.data_loader.storage import DatabaseService
 from bacen_ifdata.scraper.exceptions import IfDataScraperException
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 from bacen_ifdata.scraper.reports import REPORTS
 from bacen_ifdata.scraper.storage.processing import build_directory_path
-from bacen_ifdata.scraper.utils import validate_report_selection
 from bacen_ifdata.utilities.clean import clean_download_base_directory, clean_empty_csv_files
 from bacen_ifdata.utilities.configurations import Config as Cfg
+from bacen_ifdata.utilities.duckdb_settings import DBT_SETTINGS_VARIABLE, dbt_environment
+
+if TYPE_CHECKING:
+    from bacen_ifdata.data_loader.storage import DatabaseService
+    from bacen_ifdata.pipeline import Pipeline
 
 
 class PipelineManager:
     """Manages the IF.data pipeline, including scraping, cleaning, transforming, and loading data."""
 
-    def __init__(self, pipeline: Pipeline, database_service: DatabaseService | None = None) -> None:
+    def __init__(self, pipeline: 'Pipeline', database_service: 'DatabaseService | None' = None) -> None:
         """Initializes the PipelineManager with a pipeline instance.
 
         Args:
@@ -50,7 +53,21 @@ class PipelineManager:
         # including scraping, cleaning, transforming, and loading data.
         self.pipeline = pipeline
         # The DatabaseService is responsible for managing the connection to the DuckDB database.
-        self._database_service = database_service or DatabaseService()
+        # It is only created when the loader needs it, so the other stages never import duckdb.
+        self._database_service_instance = database_service
+
+    @property
+    def _database_service(self) -> 'DatabaseService':
+        """Get the database service, creating it on first use."""
+
+        if self._database_service_instance is None:
+            from bacen_ifdata.data_loader.factory import (  # pylint: disable=import-outside-toplevel
+                get_database_service,
+            )
+
+            self._database_service_instance = get_database_service()
+
+        return self._database_service_instance
 
     def _clean_download_directory(self) -> None:
         """Performs comprehensive cleaning operations on the download directory.
@@ -125,6 +142,8 @@ class PipelineManager:
     def run_scraper(self, institution: str | None = None, report: str | None = None) -> None:
         """Main function for executing the scraper."""
 
+        from bacen_ifdata.scraper.utils import validate_report_selection  # pylint: disable=import-outside-toplevel
+
         if self.pipeline.session is None:
             raise ValueError('Session is not initialized.')
 
@@ -164,31 +183,212 @@ class PipelineManager:
         for process_institution, process_report in targets:
             self.pipeline.cleaner(process_institution, process_report)
 
-    def run_transformer(self, institution: str | None = None, report: str | None = None) -> None:
-        """Main function for executing the transformer."""
+    def run_transformer(
+        self, institution: str | None = None, report: str | None = None, chunk_size: int | None = None
+    ) -> None:
+        """Main function for executing the transformer.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+            chunk_size (int | None): If set, files are transformed in batches of this many rows.
+        """
 
         # Run the transformer for all institutions.
         targets = self._get_execution_targets(institution, report)
+        first_profile = self._count_transform_profiles()
         for process_institution, process_report in targets:
-            self.pipeline.transformer(process_institution, process_report)
+            self.pipeline.transformer(process_institution, process_report, chunk_size)
 
-    def run_loader(self, institution: str | None = None, report: str | None = None) -> None:
-        """Main function for executing the loader."""
+        self._log_transform_profile(first_profile)
+
+    def _prepare_load_targets(
+        self, institution: str | None = None, report: str | None = None
+    ) -> list[tuple[Institutions, StrEnum]]:
+        """Clear the tables about to be reloaded and return the load targets.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+
+        Returns:
+            list[tuple[Institutions, StrEnum]]: The (institution, report) pairs to load.
+        """
 
         targets = self._get_execution_targets(institution, report)
 
         # If no filters are provided, we can safely reset the whole database
         if not institution and not report:
             self._reset_database()
+            return targets
 
-        # Run the loader.
+        # pylint: disable=import-outside-toplevel
+        from bacen_ifdata.data_loader.incremental import LoadLedger
+        from bacen_ifdata.data_transformer.long_format import LONG_TABLE_SUFFIX
+
+        ledger = LoadLedger(self._database_service)
+        # If a filter was applied, we only drop the specific tables we are reloading.
         for loaded_institution, loaded_report in targets:
-            # If a filter was applied, we only drop the specific tables we are reloading.
-            if institution or report:
-                table_name = f"{loaded_institution.name.lower()}_{loaded_report.name.lower()}"
-                self._database_service.drop_table(table_name)
+            table_name = f"{loaded_institution.name.lower()}_{loaded_report.name.lower()}"
+            # The long table (or view) of a wide portfolio report goes with it.
+            self._database_service.drop_table(f'{table_name}{LONG_TABLE_SUFFIX}')
+            self._database_service.drop_table(table_name)
+            # The ledger entries described the dropped rows; the modes without a ledger would leave them stale.
+            ledger.forget_table(table_name)
+
+        return targets
+
+    def _count_transform_profiles(self) -> int:
+        """Return the number of files profiled so far by the transformer controller."""
+
+        controller = self.pipeline.transformer_controller
+
+        return controller.profile_count if controller is not None else 0
+
+    def _log_transform_profile(self, first_profile: int) -> None:
+        """Logs the time spent in each transformation step since a given profile, and the normaliser caches.
+
+        Args:
+            first_profile (int): The ``profile_count`` of the controller before the run.
+        """
+
+        from bacen_ifdata.data_transformer.enrichment import (  # pylint: disable=import-outside-toplevel
+            CITY_NAMES,
+        )
+        from bacen_ifdata.data_transformer.profiling import (  # pylint: disable=import-outside-toplevel
+            format_profile_summary,
+        )
+        from bacen_ifdata.utilities.string_utils import (  # pylint: disable=import-outside-toplevel
+            SLUGS,
+        )
 
-            self.pipeline.loader(loaded_institution, loaded_report)
+        controller = self.pipeline.transformer_controller
+        profiles = controller.profiles_since(first_profile) if controller is not None else []
+        if not profiles:
+            return
+
+        logger.info(format_profile_summary(profiles))
+        if controller.profile_count - first_profile > len(profiles):
+            logger.info(
+                f'Only the last {len(profiles)} of {controller.profile_count - first_profile} transformed files '
+                'are kept in the profile (Config.TRANSFORM_PROFILE_HISTORY).'
+            )
+        # The memoised normalisers are shared by every file of the process.
+        logger.debug(f'Header slug cache: {SLUGS.stats()}.')
+        logger.debug(f'City name cache: {CITY_NAMES.stats()}.')
+
+    def run_loader(
+        self, institution: str | None = None, report: str | None = None, incremental: bool | None = None
+    ) -> None:
+        """Main function for executing the loader.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+            incremental (bool | None): Only load the new or changed files, keeping the rest of each table.
+                                       Defaults to None (Config.INCREMENTAL_LOAD).
+        """
+
+        incremental = Cfg.INCREMENTAL_LOAD if incremental is None else incremental
+
+        # An incremental load keeps the tables; each one replaces only the partitions of its changed files.
+        if incremental:
+            targets = self._get_execution_targets(institution, report)
+        else:
+            targets = self._prepare_load_targets(institution, report)
+
+        # Independent tables are loaded at the same time, each by its own cursor.
+        if Cfg.LOADER_WORKERS > 1 and len(targets) > 1:
+            self.pipeline.parallel_loader(targets, incremental)
+        else:
+            # Run the loader.
+            for loaded_institution, loaded_report in targets:
+                self.pipeline.loader(loaded_institution, loaded_report, incremental)
+
+        self._log_layout_drift()
+
+    def _log_layout_drift(self) -> None:
+        """Logs the new and incompatible header layouts found by the loader in this run, in one report."""
+
+        # pylint: disable=import-outside-toplevel
+        from bacen_ifdata.data_loader.controller import RUN_ID
+        from bacen_ifdata.data_loader.layouts import LayoutRegistry, format_layout_report
+
+        report = format_layout_report(LayoutRegistry(self._database_service).layout_drift(RUN_ID))
+        self._database_service.close()
+        if report:
+            logger.warning(report)
+        else:
+            logger.info('Every transformed file has a known header layout.')
+
+    def run_transform_loader(self, institution: str | None = None, report: str | None = None) -> None:
+        """Main function for transforming and loading in a single process, without transformed files.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+        """
+
+        targets = self._prepare_load_targets(institution, report)
+        first_profile = self._count_transform_profiles()
+        for process_institution, process_report in targets:
+            self.pipeline.transform_loader(process_institution, process_report)
+
+        self._log_transform_profile(first_profile)
+
+    def run_streaming(self, institution: str | None = None, report: str | None = None) -> None:
+        """Main function for the streaming pipeline: each file is normalized, transformed and loaded in turn.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+        """
+
+        targets = self._prepare_load_targets(institution, report)
+        first_profile = self._count_transform_profiles()
+        self.pipeline.streaming(targets)
+
+        self._log_transform_profile(first_profile)
+
+    def run_scheduled(self, institution: str | None = None, report: str | None = None) -> None:
+        """Main function for downloading the reports while the files already downloaded are processed.
+
+        Each downloaded file is cleaned, transformed and loaded (incrementally) by the
+        stage scheduler while the scraper waits on the next one. The analytics (dbt)
+        run once at the end, if some silver table changed.
+
+        Args:
+            institution (str | None): Optional institution filter.
+            report (str | None): Optional report filter.
+        """
+
+        from bacen_ifdata.scraper.utils import validate_report_selection  # pylint: disable=import-outside-toplevel
+
+        if self.pipeline.session is None:
+            raise ValueError('Session is not initialized.')
+
+        # Get the available data bases.
+        data_base: list[str] = self.pipeline.session.get_data_bases()
+        targets = [
+            (inst, rep, validate_report_selection(inst, rep, data_base))
+            for inst, rep in self._get_execution_targets(institution, report)
+        ]
+
+        first_profile = self._count_transform_profiles()
+        try:
+            changed_tables = self.pipeline.scheduled(targets)
+        finally:
+            # The empty files left by the IF.data site are removed, so the next run downloads them again.
+            self._clean_download_directory()
+
+        self._log_transform_profile(first_profile)
+        self._log_layout_drift()
+
+        if not changed_tables:
+            logger.info('No silver table changed. Skipping the analytics.')
+            return
+
+        self.run_analytics()
 
     def run_analytics(self) -> None:
         """Executes the analytics layer (dbt) to transform Bronze data into Gold (Star Schema).
@@ -226,12 +426,16 @@ class PipelineManager:
             {
                 'SILVER_DB_PATH': silver_db_path,
                 'GOLD_DB_PATH': gold_db_path,
+                # The same DuckDB settings as the loader (Config and DUCKDB_* variables).
+                **dbt_environment(),
                 # Ensure subprocess Python uses UTF-8 consistently on Windows.
                 'PYTHONUTF8': '1',
                 'PYTHONIOENCODING': 'utf-8',
             }
         )
 
+        logger.info(f"DuckDB settings of the dbt profile: {env[DBT_SETTINGS_VARIABLE]}")
+
         # Remove existing Gold database to ensure a clean slate for dbt transformations.
         # We use gold_db_path (which may have been overridden by .env) instead of Cfg.GOLD_DATABASE_FILE
         # to ensure consistency between the manager and the dbt model output.
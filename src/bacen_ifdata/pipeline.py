@@ -30,17 +30,22 @@ License: MIT
 
 from collections.abc import Callable
 from enum import StrEnum
+from typing import TYPE_CHECKING
 
-from bacen_ifdata.data_transformer.interfaces.controller import TransformerControllerInterface
 from bacen_ifdata.interfaces import SessionProtocol
-from bacen_ifdata.main.cleaner import main as main_cleaner
-from bacen_ifdata.main.loader import main as main_loader
-from bacen_ifdata.main.scraper import main as main_scraper
-from bacen_ifdata.main.transformer import main as main_transformer
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 
+if TYPE_CHECKING:
+    from bacen_ifdata.data_transformer.interfaces.controller import TransformerControllerInterface
+
 # Type alias for session factory callable.
 SessionFactory = Callable[[], SessionProtocol]
+# Type alias for transformer controller factory callable.
+TransformerControllerFactory = Callable[[], 'TransformerControllerInterface']
+
+# The stage entry points (main/*) are imported inside each stage method, so a run
+# only pays for the dependencies of the stages it executes (selenium for the scraper,
+# pandas/pyarrow for the transformer, duckdb for the loader).
 
 
 class Pipeline:
@@ -49,7 +54,8 @@ class Pipeline:
     This pipeline orchestrates the scraping and cleaning processes
     for the Bacen IF.data tool.
 
-    The session is lazily initialized - only created when the scraper is used.
+    The session and the transformer controller are lazily initialized - only
+    created when the scraper or the transformer is used.
 
     Attributes:
         transformer_controller: The controller for data transformation.
@@ -58,8 +64,9 @@ class Pipeline:
 
     def __init__(
         self,
-        transformer_controller: TransformerControllerInterface,
+        transformer_controller: 'TransformerControllerInterface | None' = None,
         session_factory: SessionFactory | None = None,
+        transformer_controller_factory: TransformerControllerFactory | None = None,
     ) -> None:
         """Initialize the pipeline.
 
@@ -67,12 +74,28 @@ class Pipeline:
             transformer_controller: The transformer controller instance.
             session_factory: Callable that creates a session on demand.
                 Only needed if scraper will be used.
+            transformer_controller_factory: Callable that creates the transformer
+                controller on demand. Used when no controller instance is given.
         """
 
-        self.transformer_controller = transformer_controller
+        self._transformer_controller = transformer_controller
+        self._transformer_controller_factory = transformer_controller_factory
         self._session_factory = session_factory
         self._session: SessionProtocol | None = None
 
+    @property
+    def transformer_controller(self) -> 'TransformerControllerInterface | None':
+        """Get the transformer controller, initializing lazily if needed.
+
+        Returns:
+            The transformer controller, or None if neither an instance nor a factory was provided.
+        """
+
+        if self._transformer_controller is None and self._transformer_controller_factory is not None:
+            self._transformer_controller = self._transformer_controller_factory()
+
+        return self._transformer_controller
+
     @property
     def session(self) -> SessionProtocol | None:
         """Get the session, initializing lazily if needed.
@@ -95,6 +118,8 @@ class Pipeline:
             report (StrEnum): The report to be scraped.
         """
 
+        from bacen_ifdata.main.scraper import main as main_scraper  # pylint: disable=import-outside-toplevel
+
         if self.session is None:
             raise ValueError('Session is required for scraping. Provide a session_factory.')
 
@@ -109,24 +134,118 @@ class Pipeline:
             process_report (StrEnum): The report to be processed.
         """
 
+        from bacen_ifdata.main.cleaner import main as main_cleaner  # pylint: disable=import-outside-toplevel
+
         main_cleaner(process_institution, process_report)
 
-    def transformer(self, transformer_institution: Institutions, transformer_report: StrEnum) -> None:
+    def transformer(
+        self, transformer_institution: Institutions, transformer_report: StrEnum, chunk_size: int | None = None
+    ) -> None:
         """Main process for transforming the data.
 
         Args:
             transformer_institution (Institutions): The institution to be processed.
             transformer_report (StrEnum): The report to be processed.
+            chunk_size (int | None): Rows per batch for chunked transformation. Defaults to None (whole file).
+        """
+
+        from bacen_ifdata.main.transformer import main as main_transformer  # pylint: disable=import-outside-toplevel
+
+        if self.transformer_controller is None:
+            raise ValueError(
+                'Transformer controller is required for transforming. '
+                'Provide a transformer_controller or a transformer_controller_factory.'
+            )
+
+        main_transformer(self.transformer_controller, transformer_institution, transformer_report, chunk_size)
+
+    def transform_loader(self, process_institution: Institutions, process_report: StrEnum) -> None:
+        """Main process for transforming and loading the data in a single pass.
+
+        Args:
+            process_institution (Institutions): The institution to be processed.
+            process_report (StrEnum): The report to be processed.
         """
 
-        main_transformer(self.transformer_controller, transformer_institution, transformer_report)
+        from bacen_ifdata.main.transform_loader import (  # pylint: disable=import-outside-toplevel
+            main as main_transform_loader,
+        )
+
+        if self.transformer_controller is None:
+            raise ValueError(
+                'Transformer controller is required for transforming. '
+                'Provide a transformer_controller or a transformer_controller_factory.'
+            )
+
+        main_transform_loader(self.transformer_controller, process_institution, process_report)
 
-    def loader(self, loaded_institution: Institutions, loaded_report: StrEnum) -> None:
+    def streaming(self, targets: list[tuple[Institutions, StrEnum]]) -> None:
+        """Main process for normalizing, transforming and loading each file as soon as it is available.
+
+        Args:
+            targets (list[tuple[Institutions, StrEnum]]): The (institution, report) pairs to be processed.
+        """
+
+        from bacen_ifdata.main.streaming import main as main_streaming  # pylint: disable=import-outside-toplevel
+
+        if self.transformer_controller is None:
+            raise ValueError(
+                'Transformer controller is required for transforming. '
+                'Provide a transformer_controller or a transformer_controller_factory.'
+            )
+
+        main_streaming(self.transformer_controller, targets)
+
+    def scheduled(self, targets: list[tuple[Institutions, StrEnum, list[str]]]) -> list[str]:
+        """Main process for scraping the reports while the files already downloaded are cleaned, transformed and loaded.
+
+        Args:
+            targets (list[tuple[Institutions, StrEnum, list[str]]]): The (institution, report, data bases) to be
+                                                                     processed.
+
+        Returns:
+            list[str]: The silver tables that changed.
+        """
+
+        from bacen_ifdata.main.scheduler import main as main_scheduler  # pylint: disable=import-outside-toplevel
+
+        if self.session is None:
+            raise ValueError('Session is required for scraping. Provide a session_factory.')
+
+        if self.transformer_controller is None:
+            raise ValueError(
+                'Transformer controller is required for transforming. '
+                'Provide a transformer_controller or a transformer_controller_factory.'
+            )
+
+        return main_scheduler(self.session, self.transformer_controller, targets)
+
+    def loader(self, loaded_institution: Institutions, loaded_report: StrEnum, incremental: bool = False) -> None:
         """Main process for loading the data.
 
         Args:
             loaded_institution (Institutions): The institution to be loaded.
             loaded_report (StrEnum): The report to be loaded.
+            incremental (bool): Only load the new or changed files. Defaults to False.
+        """
+
+        from bacen_ifdata.main.loader import main as main_loader  # pylint: disable=import-outside-toplevel
+
+        main_loader(loaded_institution, loaded_report, incremental=incremental)
+
+    def parallel_loader(
+        self, targets: list[tuple[Institutions, StrEnum]], incremental: bool = False
+    ) -> dict[str, float]:
+        """Load several independent report tables at the same time.
+
+        Args:
+            targets (list[tuple[Institutions, StrEnum]]): The (institution, report) pairs to be loaded.
+            incremental (bool): Only load the new or changed files of each table. Defaults to False.
+
+        Returns:
+            dict[str, float]: The seconds spent loading each table, by table name.
         """
 
-        main_loader(loaded_institution, loaded_report)
+        from bacen_ifdata.main.loader import load_reports  # pylint: disable=import-outside-toplevel
+
+        return load_reports(targets, incremental=incremental)
@@ -45,11 +45,67 @@ class Config:
     DOWNLOAD_FILE_NAME: str = 'dados.csv'
     PROCESSED_FILES_DIRECTORY: Path = BASE_DIRECTORY / 'data' / 'processed'
     TRANSFORMED_FILES_DIRECTORY: Path = BASE_DIRECTORY / 'data' / 'transformed'
+    # Storage format of the transformed files ('parquet' or 'csv') and the Parquet compression codec.
+    TRANSFORMED_FILE_FORMAT: str = 'parquet'
+    PARQUET_COMPRESSION: str = 'zstd'
+    # Confirm row hash matches by comparing values when removing duplicates (slower, guards against collisions).
+    DEDUPLICATION_VERIFY_COLLISIONS: bool = False
+    # Report-level index of the rows already transformed, used to reject rows repeated across files.
+    DEDUPLICATION_INDEX_DIRECTORY: Path = BASE_DIRECTORY / 'data' / 'dedup_index'
+    # Shared dictionaries of the categorical columns (stable codes, schema mapping descriptions, DuckDB ENUMs).
+    CATEGORICAL_DICTIONARY_FILE: Path = BASE_DIRECTORY / 'data' / 'dictionaries' / 'categorical.json'
+    # Compiled schema plans (column order, pandas/Arrow/DuckDB types, header aliases) shared by the stages.
+    SCHEMA_PLAN_DIRECTORY: Path = BASE_DIRECTORY / 'data' / 'schema_plans'
+    # Narrow the transformed dtypes (Int16/Int32, float32, dictionary strings) when it is lossless.
+    DTYPE_DOWNCASTING: bool = True
+    # Decimals a percentage must keep to be stored as float32.
+    DOWNCAST_FLOAT_DECIMALS: int = 6
+    # Text columns with at most this ratio of distinct values to rows are dictionary encoded.
+    DOWNCAST_CATEGORY_MAX_RATIO: float = 0.5
+    # Measure the memory of each transformation step and write the per-file profile next to the transformed files.
+    TRANSFORM_PROFILING: bool = False
+    # Number of file profiles kept in memory; older ones are dropped in the long-running modes (--schedule, --stream).
+    TRANSFORM_PROFILE_HISTORY: int = 1000
+    # Maximum number of values memoised by each text normaliser (header slugs, city names).
+    NORMALIZATION_CACHE_SIZE: int = 16384
+    # Store the wide portfolio reports in long format (one row per non-empty amount); Parquet only.
+    LONG_STORAGE_FORMAT: bool = False
+    # Load all the transformed files of a report with one multi-file scan per compatible header (one transaction).
+    BULK_LOAD: bool = True
+    # Number of report tables loaded at the same time, each by its own DuckDB cursor (1 loads them in sequence).
+    LOADER_WORKERS: int = 4
+    # Load only the new or changed transformed files (load ledger), replacing their data_base partitions.
+    INCREMENTAL_LOAD: bool = False
+    # Keep the silver tables physically ordered by (data_base, codigo), so DuckDB zonemaps prune their scans.
+    SILVER_CLUSTERING: bool = True
+    # Create an ART index on the natural key (codigo, data_base[, nome_coluna]) of each silver table.
+    SILVER_KEY_INDEXES: bool = False
+    # Profile the silver tables after each load (column_statistics, partition_statistics) and ANALYZE them.
+    SILVER_PROFILING: bool = True
+    # Work items waiting between two stages of the streaming pipeline (bounds the transformed files held in memory).
+    STREAMING_QUEUE_SIZE: int = 2
+    # Tasks of each stage the stage scheduler runs at the same time (one browser session scrapes, one transformer
+    # controller transforms); loads of different tables run on their own DuckDB cursors.
+    SCHEDULER_CLEAN_WORKERS: int = 2
+    SCHEDULER_LOAD_WORKERS: int = 1
     DATA_ANALYTICS_DIRECTORY: Path = BASE_DIRECTORY / 'src' / 'bacen_ifdata' / 'data_analytics'
 
     # Database Star Schema Architecture Paths.
     SILVER_DATABASE_FILE: Path = BASE_DIRECTORY / 'data' / 'silver_warehouse.duckdb'
+    # Silver backend: 'duckdb' (tables in SILVER_DATABASE_FILE) or 'parquet' (Hive-partitioned files in
+    # SILVER_LAKE_DIRECTORY, with SILVER_DATABASE_FILE holding only the catalog of views over them).
+    SILVER_BACKEND: str = 'duckdb'
+    SILVER_LAKE_DIRECTORY: Path = BASE_DIRECTORY / 'data' / 'silver_lake'
     GOLD_DATABASE_FILE: Path = BASE_DIRECTORY / 'data' / 'gold_warehouse.duckdb'
 
+    # DuckDB settings of every connection (loader, dbt profile, audit scripts); None keeps the DuckDB default.
+    # An environment variable of the same name overrides each one (e.g. DUCKDB_MEMORY_LIMIT=16GB).
+    DUCKDB_THREADS: int | None = None
+    DUCKDB_MEMORY_LIMIT: str | None = None
+    DUCKDB_TEMP_DIRECTORY: Path | None = None
+    # Without insertion order, bulk inserts and scans run in parallel (queries must ORDER BY to get an order).
+    DUCKDB_PRESERVE_INSERTION_ORDER: bool = False
+    DUCKDB_CHECKPOINT_THRESHOLD: str | None = None
+
 
 __all__ = ['Config']
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: duckdb_settings.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+DuckDB settings shared by every connection of Bacen IF.data
+
+The loader, the dbt profile and the audit scripts open DuckDB with the same
+settings (threads, memory limit, spill directory, insertion order and checkpoint
+threshold). Each one comes from ``Config`` and can be overridden by an
+environment variable of the same name, so a shared host can cap the memory of
+every stage without changing the code.
+"""
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+if TYPE_CHECKING:
+    import duckdb
+
+# Config attribute (and environment variable) of each DuckDB setting.
+DUCKDB_SETTING_VARIABLES: dict[str, str] = {
+    'threads': 'DUCKDB_THREADS',
+    'memory_limit': 'DUCKDB_MEMORY_LIMIT',
+    'temp_directory': 'DUCKDB_TEMP_DIRECTORY',
+    'preserve_insertion_order': 'DUCKDB_PRESERVE_INSERTION_ORDER',
+    'checkpoint_threshold': 'DUCKDB_CHECKPOINT_THRESHOLD',
+}
+
+# Environment variable holding the settings of the dbt profile, as a JSON object.
+DBT_SETTINGS_VARIABLE = 'DUCKDB_SETTINGS'
+
+
+def duckdb_settings() -> dict[str, str]:
+    """Return the configured DuckDB settings, the environment variables taking precedence over Config.
+
+    Returns:
+        dict[str, str]: The value of each setting that is not left to the DuckDB default,
+                        ready for ``duckdb.connect(config=...)``.
+    """
+
+    settings = {}
+    for setting, variable in DUCKDB_SETTING_VARIABLES.items():
+        value = os.getenv(variable) or getattr(Cfg, variable)
+        if value is None:
+            continue
+
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif setting == 'preserve_insertion_order':
+            value = 'false' if str(value).strip().lower() in ('0', 'false', 'no', 'off') else 'true'
+
+        settings[setting] = str(value)
+
+    return settings
+
+
+def dbt_environment() -> dict[str, str]:
+    """Return the environment variables that give the dbt profile the same DuckDB settings.
+
+    Returns:
+        dict[str, str]: The settings as a JSON object, read by ``profiles.yml``.
+    """
+
+    return {DBT_SETTINGS_VARIABLE: json.dumps(duckdb_settings())}
+
+
+def log_duckdb_settings(connection: 'duckdb.DuckDBPyConnection', database_name: str) -> dict[str, str]:
+    """Logs the effective values of the DuckDB settings of a connection.
+
+    Args:
+        connection (duckdb.DuckDBPyConnection): The open connection.
+        database_name (str): The name of the database, used in the log.
+
+    Returns:
+        dict[str, str]: The effective value of each setting, as DuckDB reports it.
+    """
+
+    effective = dict(
+        connection.execute(
+            "SELECT name, value FROM duckdb_settings() WHERE list_contains(?, name) ORDER BY name",
+            [list(DUCKDB_SETTING_VARIABLES)],
+        ).fetchall()
+    )
+    logger.info(
+        f"DuckDB settings of '{database_name}': " + ', '.join(f'{name}={value}' for name, value in effective.items())
+    )
+
+    return effective
+
+
+__all__ = [
+    'DBT_SETTINGS_VARIABLE',
+    'DUCKDB_SETTING_VARIABLES',
+    'dbt_environment',
+    'duckdb_settings',
+    'log_duckdb_settings',
+]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# encoding: utf-8
+#
+#  ------------------------------------------------------------------------------
+#  Name: normalization.py
+#  Version: 0.0.1
+#  Summary: Bacen IF.data AutoScraper & Data Manager
+#           Este sistema foi projetado para automatizar o download dos
+#           relatórios da ferramenta IF.data do Banco Central do Brasil.
+#           Criado para facilitar a integração com ferramentas automatizadas de
+#           análise e visualização de dados, garantido acesso fácil e oportuno
+#           aos dados.
+#
+#  Author: Alexsander Lopes Camargos
+#  Author-email: alcamargos@vivaldi.net
+#
+#  License: MIT
+#  ------------------------------------------------------------------------------
+
+"""
+Memoised text normalisation for Bacen IF.data
+
+The same strings recur across every file and report: the few thousand CSV
+headers and schema aliases that are slugified to match columns, and values
+such as city names. A ``MemoizedNormalizer`` wraps a normalisation function
+with a bounded LRU cache and keeps hit/miss statistics. Its batch API
+normalises a pandas or Arrow column through its distinct values, so the Python
+work is proportional to the number of distinct values, not of rows.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from bacen_ifdata.utilities.configurations import Config as Cfg
+
+
+def map_unique_values(series: pd.Series, function: Callable[[Any], Hashable | None]) -> pd.Series:
+    """Applies a function to each distinct value of a series and broadcasts the results.
+
+    Args:
+        series (pd.Series): The values to be mapped (categorical or not).
+        function (Callable[[Any], Hashable | None]): Maps a value to its result, or None when it has no result.
+
+    Returns:
+        pd.Series: A categorical series with the mapped values; missing values stay missing.
+    """
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+
+    mapped = [function(value) for value in uniques]
+
+    # The mapping may merge values (e.g. several states in one region), so the categories are deduplicated.
+    categories = list(dict.fromkeys(value for value in mapped if value is not None and not pd.isna(value)))
+    position = {value: index for index, value in enumerate(categories)}
+    # The extra trailing entry maps the missing code (-1) to itself.
+    lookup = np.array([position.get(value, -1) for value in mapped] + [-1], dtype=np.int32)
+
+    categorical = pd.Categorical.from_codes(lookup[codes], categories=categories)
+
+    return pd.Series(categorical, index=series.index, name=series.name)
+
+
+@dataclass(frozen=True)
+class NormalizationStats:
+    """Cache statistics of a ``MemoizedNormalizer``."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int | None
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the share of requests answered from the cache."""
+
+        requests = self.hits + self.misses
+
+        return self.hits / requests if requests else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f'{self.hits:,} hit(s), {self.misses:,} miss(es) ({self.hit_ratio:.1%} hit ratio), '
+            f'{self.size:,}/{self.max_size if self.max_size is not None else "unbounded"} cached value(s)'
+        )
+
+
+class MemoizedNormalizer:
+    """Bounded, memoised string normalisation with a batch API."""
+
+    def __init__(self, normalize: Callable[[str], str], max_size: int | None = Cfg.NORMALIZATION_CACHE_SIZE) -> None:
+        """Wraps a normalisation function with an LRU cache.
+
+        Args:
+            normalize (Callable[[str], str]): Normalises one raw value.
+            max_size (int | None): The maximum number of cached values; None means unbounded.
+                                   Defaults to Config.NORMALIZATION_CACHE_SIZE.
+        """
+
+        self._normalize = lru_cache(maxsize=max_size)(normalize)
+
+    def __call__(self, value: str) -> str:
+        """Alias of ``normalize``."""
+
+        return self._normalize(value)
+
+    def __len__(self) -> int:
+        """Return the number of values currently cached."""
+
+        return self._normalize.cache_info().currsize
+
+    def normalize(self, value: str) -> str:
+        """Returns the normalised form of a raw value, computing it only on a cache miss.
+
+        Args:
+            value (str): The raw value.
+
+        Returns:
+            str: The normalised value.
+        """
+
+        return self._normalize(value)
+
+    def normalize_many(self, values: Iterable[str]) -> list[str]:
+        """Normalises a sequence of values (e.g. the header of a CSV file).
+
+        Args:
+            values (Iterable[str]): The raw values.
+
+        Returns:
+            list[str]: The normalised values, in the same order.
+        """
+
+        return [self._normalize(value) for value in values]
+
+    def normalize_series(self, series: pd.Series) -> pd.Series:
+        """Normalises every value of a pandas series through its distinct values.
+
+        Args:
+            series (pd.Series): The raw values (categorical or not).
+
+        Returns:
+            pd.Series: A categorical series with the normalised values; missing values stay missing.
+        """
+
+        return map_unique_values(series, lambda value: self._normalize(str(value)))
+
+    def normalize_arrow(self, array: pa.Array | pa.ChunkedArray) -> pa.DictionaryArray:
+        """Normalises every value of an Arrow string column through its distinct values.
+
+        Args:
+            array (pa.Array | pa.ChunkedArray): The raw values.
+
+        Returns:
+            pa.DictionaryArray: The normalised values, dictionary encoded; nulls stay null.
+        """
+
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks()
+        if not pa.types.is_dictionary(array.type):
+            array = pc.dictionary_encode(array)
+
+        normalized = self.normalize_series(
+            pd.Series(
+                pd.Categorical.from_codes(
+                    array.indices.fill_null(-1).to_numpy(zero_copy_only=False), array.dictionary.to_pylist()
+                )
+            )
+        )
+
+        return pa.array(normalized)
+
+    def stats(self) -> NormalizationStats:
+        """Return the cache statistics."""
+
+        info = self._normalize.cache_info()
+
+        return NormalizationStats(info.hits, info.misses, info.currsize, info.maxsize)
+
+    def clear(self) -> None:
+        """Empties the cache and resets the statistics."""
+
+        self._normalize.cache_clear()
@@ -3,17 +3,14 @@
 import re
 import unicodedata
 
+from bacen_ifdata.utilities.normalization import MemoizedNormalizer
+
 # Pre-compile regex for performance
 _SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
 
 
-def slugify(text: str) -> str:
-    """Normalizes a string to a slug format (lowercase, no accents, snake_case).
-
-    Example:
-        "Patrimônio Líquido" -> "patrimonio_liquido"
-        "Ativo Total" -> "ativo_total"
-        " Disponibilidades (a) " -> "disponibilidades_a"
+def _slugify(text: str) -> str:
+    """Normalizes a string to a slug format, without caching (see ``slugify``).
 
     Args:
         text (str): The input string.
@@ -35,3 +32,27 @@ def slugify(text: str) -> str:
     text = text.strip('_')
 
     return text
+
+
+# CSV headers and schema aliases recur across every file and report, so their slugs are memoised.
+SLUGS = MemoizedNormalizer(_slugify)
+
+
+def slugify(text: str) -> str:
+    """Normalizes a string to a slug format (lowercase, no accents, snake_case).
+
+    Example:
+        "Patrimônio Líquido" -> "patrimonio_liquido"
+        "Ativo Total" -> "ativo_total"
+        " Disponibilidades (a) " -> "disponibilidades_a"
+
+    The result is memoised in ``SLUGS``, which also offers the batch API.
+
+    Args:
+        text (str): The input string.
+
+    Returns:
+        str: The normalized slug string.
+    """
+
+    return SLUGS.normalize(text)
@@ -0,0 +1,26 @@
+"""Tests for the dictionary tables and ENUM types of the silver database."""
+
+from pathlib import Path
+
+from bacen_ifdata.data_loader.dictionaries import create_enum_type
+from bacen_ifdata.data_loader.storage import DatabaseService
+
+
+def test_enum_values_with_quotes_are_escaped(tmp_path: Path):
+    """A value holding an apostrophe becomes an ENUM value, and the type is created only once."""
+
+    database_service = DatabaseService(tmp_path / 'silver.duckdb')
+    try:
+        values = ["d'agua", 'total']
+        assert create_enum_type(database_service, 'enum_test', values) == '"enum_test"'
+        assert create_enum_type(database_service, 'enum_test', ['other']) == '"enum_test"'
+
+        connection = database_service.connection
+        connection.execute('CREATE TABLE test_enum (nome_coluna "enum_test");')
+        connection.execute("INSERT INTO test_enum VALUES (?), (?);", values)
+        assert connection.execute("SELECT CAST(nome_coluna AS VARCHAR) FROM test_enum ORDER BY 1").fetchall() == [
+            ("d'agua",),
+            ('total',),
+        ]
+    finally:
+        database_service.close()
@@ -0,0 +1,163 @@
+"""Tests for the planning of the incremental loads."""
+
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from bacen_ifdata.data_loader.incremental import (
+    LoadedFile,
+    LoadLedger,
+    changed_files,
+    describe_file,
+    file_digest,
+    file_digests,
+    plan_incremental_load,
+)
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.storage import write_parquet
+
+
+def test_only_new_and_changed_files_are_reloaded():
+    """Unchanged files are skipped and a changed file replaces its old and new partitions."""
+
+    input_files = [Path('2024-03.parquet'), Path('2024-06.parquet'), Path('2024-09.parquet')]
+    digests = {'2024-03.parquet': 'a', '2024-06.parquet': 'b2', '2024-09.parquet': 'c'}
+    ledger = {
+        '2024-03.parquet': LoadedFile('2024-03.parquet', 'a', ('2024-03-01',)),
+        '2024-06.parquet': LoadedFile('2024-06.parquet', 'b', ('2024-05-01',)),
+    }
+
+    changed = changed_files(input_files, digests, ledger)
+    assert changed == [Path('2024-06.parquet'), Path('2024-09.parquet')]
+
+    plan = plan_incremental_load(
+        input_files, digests, ledger, {'2024-06.parquet': ('2024-06-01',), '2024-09.parquet': ('2024-09-01',)}
+    )
+
+    assert plan.files == changed
+    assert plan.partitions == ['2024-05-01', '2024-06-01', '2024-09-01']
+    assert plan.entries == [
+        LoadedFile('2024-06.parquet', 'b2', ('2024-06-01',)),
+        LoadedFile('2024-09.parquet', 'c', ('2024-09-01',)),
+    ]
+    assert plan.unchanged == 1
+
+
+def test_files_sharing_a_replaced_partition_are_reloaded_too():
+    """An unchanged file with rows in a replaced partition is loaded again, and gone files are forgotten."""
+
+    input_files = [Path('a.parquet'), Path('b.parquet'), Path('c.parquet')]
+    digests = {'a.parquet': 'a2', 'b.parquet': 'b', 'c.parquet': 'c'}
+    ledger = {
+        'a.parquet': LoadedFile('a.parquet', 'a', ('2024-03-01',)),
+        'b.parquet': LoadedFile('b.parquet', 'b', ('2024-03-01', '2024-06-01')),
+        'c.parquet': LoadedFile('c.parquet', 'c', ('2024-06-01',)),
+        'gone.parquet': LoadedFile('gone.parquet', 'g', ('2024-06-01',)),
+        'old.parquet': LoadedFile('old.parquet', 'o', ('2023-12-01',)),
+    }
+
+    plan = plan_incremental_load(input_files, digests, ledger, {'a.parquet': ('2024-03-01',)})
+
+    assert plan.files == input_files
+    assert plan.partitions == ['2024-03-01', '2024-06-01']
+    assert plan.forgotten == ['gone.parquet']
+    assert plan.unchanged == 0
+
+
+def test_files_left_out_of_a_partial_load_keep_their_ledger_entries():
+    """Only the given files are planned; the others are forgotten only when their partitions are replaced."""
+
+    ledger = {
+        'a.parquet': LoadedFile('a.parquet', 'a', ('2024-03-01',)),
+        'pending.parquet': LoadedFile('pending.parquet', 'p', ('2024-06-01',)),
+        'shared.parquet': LoadedFile('shared.parquet', 's', ('2024-09-01',)),
+    }
+
+    plan = plan_incremental_load(
+        [Path('a.parquet'), Path('b.parquet')],
+        {'a.parquet': 'a', 'b.parquet': 'b'},
+        ledger,
+        {'b.parquet': ('2024-09-01',)},
+        complete=False,
+    )
+
+    assert plan.files == [Path('b.parquet')]
+    assert plan.partitions == ['2024-09-01']
+    assert plan.forgotten == ['shared.parquet']
+    assert plan.unchanged == 1
+
+
+def test_files_recorded_with_their_size_and_time_are_not_hashed(tmp_path: Path):
+    """A file whose size and modification time match its ledger entry keeps the recorded hash."""
+
+    unmodified, rewritten = tmp_path / 'a.parquet', tmp_path / 'b.parquet'
+    unmodified.write_bytes(b'a')
+    rewritten.write_bytes(b'b')
+    ledger = {
+        'a.parquet': describe_file(unmodified, LoadedFile('a.parquet', 'recorded', ())),
+        'b.parquet': describe_file(rewritten, LoadedFile('b.parquet', 'recorded', ())),
+    }
+    rewritten.write_bytes(b'bb')
+
+    assert file_digests([unmodified, rewritten], ledger) == {
+        'a.parquet': 'recorded',
+        'b.parquet': file_digest(rewritten),
+    }
+
+
+def test_ledger_records_file_statistics_and_upgrades_older_ledgers(tmp_path: Path):
+    """Ledgers of older versions get the new columns, and the stage timings survive a reset."""
+
+    database_service = DatabaseService(tmp_path / 'silver.duckdb')
+    try:
+        database_service.connection.execute(
+            "CREATE TABLE load_ledger (table_name VARCHAR, file_name VARCHAR, file_hash VARCHAR, "
+            "partitions VARCHAR[], loaded_at TIMESTAMP DEFAULT current_timestamp);"
+        )
+        database_service.connection.execute(
+            "INSERT INTO load_ledger VALUES ('test_ledger', 'old.parquet', 'h', [], now());"
+        )
+
+        march = tmp_path / "2024-03.parquet"
+        write_parquet(
+            pd.DataFrame({'codigo': [1, 2, 3], 'data_base': pd.to_datetime(['2024-03-01'] * 2 + [None])}), march
+        )
+        assert database_service.read_file_statistics([march]) == {'2024-03.parquet': (('2024-03-01',), 3)}
+
+        ledger = LoadLedger(database_service)
+        entry = LoadedFile('2024-03.parquet', 'hash', ('2024-03-01',), str(march), 100, 7, 3, 0.5, 'v1')
+        ledger.record_loaded_files('test_ledger', [entry])
+
+        entries = ledger.loaded_files('test_ledger')
+        assert entries['2024-03.parquet'] == entry
+        assert entries['old.parquet'] == LoadedFile('old.parquet', 'h', ())
+
+        ledger.record_stage_timing('run', 'test_ledger', 'load', datetime(2024, 1, 1), 1.5)
+        database_service.reset_database()
+        assert not database_service.table_exists('load_ledger')
+        assert database_service.connection.execute("SELECT stage, seconds FROM load_stage_timings").fetchall() == [
+            ('load', 1.5)
+        ]
+        assert ledger.loaded_files('test_ledger') == {}
+    finally:
+        database_service.close()
+
+
+def test_forget_table_removes_only_the_entries_of_the_dropped_table(tmp_path: Path):
+    """A table dropped to be reloaded leaves no entry behind, and the other tables keep theirs."""
+
+    database_service = DatabaseService(tmp_path / 'silver.duckdb')
+    try:
+        ledger = LoadLedger(database_service)
+        ledger.forget_table('test_dropped')
+        assert not database_service.table_exists('load_ledger')
+
+        for table_name in ('test_dropped', 'test_kept'):
+            ledger.record_loaded_files(table_name, [LoadedFile('2024-03.parquet', 'hash', ('2024-03-01',))])
+
+        ledger.forget_table('test_dropped')
+        assert ledger.loaded_files('test_dropped') == {}
+        assert set(ledger.loaded_files('test_kept')) == {'2024-03.parquet'}
+    finally:
+        database_service.close()
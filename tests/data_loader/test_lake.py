@@ -0,0 +1,77 @@
+"""Tests for the Parquet lake backend of the silver layer."""
+
+from pathlib import Path
+
+import pandas as pd
+
+from bacen_ifdata.data_loader.lake import ParquetLakeService, lake_table_directory
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.storage import write_parquet
+
+
+class MockReportSchema(BaseSchema):
+    """Mock report schema with a data_base column."""
+
+    SCHEMA_DEFINITION = {
+        'codigo': {'type': 'numeric', 'description': 'Código'},
+        'data_base': {'type': 'date', 'description': 'Data-base'},
+        'nome': {'type': 'text', 'description': 'Nome'},
+        'total': {'type': 'numeric', 'description': 'Total'},
+    }
+
+
+def test_lake_table_directory_splits_institution_and_report(tmp_path: Path):
+    """The table directory is institution/report, matching the longest institution name."""
+
+    assert lake_table_directory(tmp_path, 'financial_conglomerates_assets') == (
+        tmp_path / 'financial_conglomerates' / 'assets'
+    )
+    assert lake_table_directory(tmp_path, 'financial_conglomerates_scr_portfolio_indexer') == (
+        tmp_path / 'financial_conglomerates_scr' / 'portfolio_indexer'
+    )
+
+
+def test_lake_tables_are_views_over_partitioned_files(tmp_path: Path):
+    """Loads write one directory per data_base, and replacing a partition leaves the others untouched."""
+
+    schema = MockReportSchema()
+    march, june = tmp_path / '2024-03.parquet', tmp_path / '2024-06.parquet'
+    write_parquet(
+        pd.DataFrame({'codigo': [1, 2], 'data_base': pd.to_datetime(['2024-03-01'] * 2), 'total': [1, 2]}), march
+    )
+    write_parquet(pd.DataFrame({'codigo': [1], 'data_base': pd.to_datetime(['2024-06-01']), 'total': [3]}), june)
+
+    lake_directory = tmp_path / 'lake'
+    service = ParquetLakeService(tmp_path / 'catalog.duckdb', lake_directory=lake_directory)
+    try:
+        table_name = 'financial_conglomerates_summary'
+        service.create_table(table_name, schema)
+        assert service.connection.execute(f"SELECT count(*) FROM {table_name}").fetchone() == (0,)
+
+        service.insert_files(table_name, [march, june], schema)
+        table_directory = lake_directory / 'financial_conglomerates' / 'summary'
+        assert sorted(path.name for path in table_directory.iterdir()) == [
+            'data_base=2024-03-01',
+            'data_base=2024-06-01',
+        ]
+
+        write_parquet(
+            pd.DataFrame({'codigo': [1, 2], 'data_base': pd.to_datetime(['2024-06-01'] * 2), 'total': [4, 5]}), june
+        )
+        service.replace_partitions(table_name, [june], ['2024-06-01'], schema)
+
+        rows = service.connection.execute(
+            f"SELECT CAST(data_base AS VARCHAR), codigo, nome, total FROM {table_name} ORDER BY ALL"
+        ).fetchall()
+        assert rows == [
+            ('2024-03-01', 1.0, None, 1.0),
+            ('2024-03-01', 2.0, None, 2.0),
+            ('2024-06-01', 1.0, None, 4.0),
+            ('2024-06-01', 2.0, None, 5.0),
+        ]
+        assert len(list((table_directory / 'data_base=2024-06-01').glob('*.parquet'))) == 1
+
+        service.drop_table(table_name)
+        assert not table_directory.exists()
+    finally:
+        service.close()
@@ -0,0 +1,86 @@
+"""Tests for the header layouts of the transformed files."""
+
+from pathlib import Path
+
+from bacen_ifdata.data_loader.layouts import (
+    LayoutRegistry,
+    LayoutStatus,
+    classify_header,
+    format_layout_report,
+    header_signature,
+    read_file_header,
+)
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+
+
+class MockReportSchema(BaseSchema):
+    """Mock report schema with a data_base column."""
+
+    SCHEMA_DEFINITION = {
+        'codigo': {'type': 'numeric', 'description': 'Código'},
+        'data_base': {'type': 'date', 'description': 'Data-base'},
+        'total': {'type': 'numeric', 'description': 'Total'},
+    }
+
+
+def test_csv_header_is_parsed_as_csv(tmp_path: Path):
+    """Quoted commas stay inside their column and the byte order mark is dropped."""
+
+    csv_file = tmp_path / 'data.csv'
+    csv_file.write_text('\ufeffcodigo,"nome, completo",data_base\n1,"A, B",2024-03-01\n', encoding='utf-8')
+
+    assert read_file_header(csv_file) == ('codigo', 'nome, completo', 'data_base')
+
+
+def test_headers_are_classified_against_the_table_and_the_known_layouts():
+    """The first layouts are the baseline; later ones are new, and broken ones incompatible."""
+
+    table_columns = ['codigo', 'data_base', 'ativo', 'passivo']
+
+    baseline = classify_header('a.csv', ('codigo', 'data_base', 'ativo'), table_columns, set())
+    assert baseline.status == LayoutStatus.KNOWN
+    assert baseline.removed == ('passivo',)
+
+    known = {baseline.signature}
+    assert classify_header('b.csv', ('codigo', 'data_base', 'ativo'), table_columns, known).status == 'known'
+
+    drifted = classify_header('c.csv', ('data_base', 'codigo', 'lucro'), table_columns, known)
+    assert (drifted.status, drifted.added, drifted.removed) == (LayoutStatus.NEW, ('lucro',), ('ativo', 'passivo'))
+    assert drifted.signature == header_signature(('data_base', 'codigo', 'lucro'))
+
+    assert classify_header('d.csv', ('codigo', 'ativo'), table_columns, known).reason == 'no data_base column'
+    assert classify_header('e.csv', ('codigo', 'codigo'), table_columns, known).reason == 'repeated columns'
+    assert classify_header('f.csv', ('x',), ['x', 'y'], set()).status == LayoutStatus.KNOWN
+
+    report = format_layout_report({'assets': [baseline, drifted], 'liabilities': [baseline]})
+    assert report == (
+        "Header drift in 1 table(s):\n" "assets: new layout in 'c.csv' (added: lucro; removed: ativo, passivo)"
+    )
+
+
+def test_registry_remembers_each_layout_of_a_table(tmp_path: Path):
+    """A new layout is reported by the run that found it, and is known from then on."""
+
+    schema = MockReportSchema()
+    march, june = tmp_path / "2024-03.csv", tmp_path / "2024-06.csv"
+    march.write_text("codigo,data_base,total\n1,2024-03-01,10\n", encoding='utf-8')
+    june.write_text('data_base,"nota, livre",codigo,total\n2024-06-01,"a, b",2,20\n', encoding='utf-8')
+
+    database_service = DatabaseService(tmp_path / 'silver.duckdb')
+    try:
+        registry = LayoutRegistry(database_service)
+        assert registry.layout_drift('run-1') == {}
+
+        baseline = registry.classify_files('test_layouts', [march], schema, 'run-1')
+        assert [layout.status for layout in baseline] == ['known']
+        layouts = registry.classify_files('test_layouts', [march, june], schema, 'run-2')
+        assert [layout.status for layout in layouts] == ['known', 'new']
+        assert layouts[1].added == ('nota, livre',)
+        assert set(registry.layout_drift('run-2')) == {'test_layouts'}
+        assert registry.layout_drift('run-1') == {}
+
+        layouts = registry.classify_files('test_layouts', [june], schema, 'run-3')
+        assert [layout.status for layout in layouts] == ['known']
+    finally:
+        database_service.close()
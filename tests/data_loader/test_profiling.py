@@ -0,0 +1,56 @@
+"""Tests for the profiles of the silver tables."""
+
+from pathlib import Path
+
+from bacen_ifdata.data_loader.profiling import TableProfiler
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+
+
+class MockReportSchema(BaseSchema):
+    """Mock report schema with a data_base column."""
+
+    SCHEMA_DEFINITION = {
+        'codigo': {'type': 'numeric', 'description': 'Código'},
+        'data_base': {'type': 'date', 'description': 'Data-base'},
+        'total': {'type': 'numeric', 'description': 'Total'},
+        'construcao': {'type': 'numeric', 'description': 'Construção'},
+    }
+
+
+def test_profile_table_replaces_the_column_and_partition_statistics(tmp_path: Path):
+    """The profile holds the NULLs, bounds and data_base rows of the last load only."""
+
+    schema = MockReportSchema()
+    june, september = tmp_path / "2024-06.csv", tmp_path / "2024-09.csv"
+    june.write_text("codigo,data_base,total\n1,2024-06-01,3\n2,2024-06-01,\n", encoding='utf-8')
+    september.write_text("codigo,data_base,total\n1,2024-09-01,5\n", encoding='utf-8')
+
+    database_service = DatabaseService(tmp_path / 'silver.duckdb')
+    try:
+        profiler = TableProfiler(database_service)
+        assert profiler.profile_table('test_profile') == 0
+
+        database_service.create_table('test_profile', schema)
+        database_service.insert_data('test_profile', june, schema)
+        assert profiler.profile_table('test_profile') == 2
+
+        database_service.insert_data('test_profile', september, schema)
+        assert profiler.profile_table('test_profile') == 3
+
+        connection = database_service.connection
+        columns = connection.execute(
+            "SELECT column_name, row_count, null_count, min_value, max_value FROM column_statistics "
+            "WHERE table_name = 'test_profile' AND column_name IN ('data_base', 'total', 'construcao') ORDER BY 1"
+        ).fetchall()
+        assert columns == [
+            ('construcao', 3, 3, None, None),
+            ('data_base', 3, 0, '2024-06-01', '2024-09-01'),
+            ('total', 3, 1, '3.0', '5.0'),
+        ]
+        partitions = connection.execute(
+            "SELECT CAST(data_base AS VARCHAR), row_count, institution_count FROM partition_statistics ORDER BY 1"
+        ).fetchall()
+        assert partitions == [('2024-06-01', 2, 2), ('2024-09-01', 1, 1)]
+    finally:
+        database_service.close()
@@ -5,14 +5,21 @@
 Unit tests for the DatabaseManager class.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Generator
 
 import duckdb
+import pandas as pd
 import pytest
 
+from bacen_ifdata.data_loader.dictionaries import CategoricalDictionaryTable
+from bacen_ifdata.data_loader.incremental import LoadedFile, LoadLedger
 from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
 from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.storage import to_arrow_table, write_parquet
+from bacen_ifdata.utilities.configurations import Config
 
 
 # Mock Schema for testing
@@ -28,6 +35,19 @@ class MockSchema(BaseSchema):
     }
 
 
+class MockPortfolioSchema(BaseSchema):
+    """Mock wide portfolio schema that can be stored in long format."""
+
+    SCHEMA_DEFINITION = {
+        'codigo': {'type': 'numeric', 'description': 'Código'},
+        'data_base': {'type': 'date', 'description': 'Data-base'},
+        'total': {'type': 'numeric', 'description': 'Total'},
+        'agricultura': {'type': 'numeric', 'description': 'Agricultura'},
+        'construcao': {'type': 'numeric', 'description': 'Construção'},
+    }
+    LONG_FORMAT_WIDE_COLUMNS = ('total',)
+
+
 @pytest.fixture
 def db_path(tmp_path: Path) -> Path:
     """Fixture to provide a temporary database path."""
@@ -127,3 +147,412 @@ def test_create_table_idempotency(database_service: DatabaseService):
         "SELECT count(*) FROM information_schema.tables WHERE table_name = ?", [table_name]
     ).fetchone()
     assert result[0] == 1
+
+
+def test_insert_data_from_parquet(database_service: DatabaseService, tmp_path: Path):
+    """Test data insertion from a typed Parquet file."""
+
+    parquet_file = tmp_path / "data.parquet"
+    data = pd.DataFrame(
+        {
+            'id': pd.array([1, 2], dtype='Int64'),
+            'name': pd.array(['Test Entity', 'Another Entity'], dtype='string'),
+            'value': pd.array([100, 200], dtype='Int64'),
+            'percentage': [0.105, 0.2],
+            'active': [True, False],
+            'extra': ['ignored', 'ignored'],
+        }
+    )
+    write_parquet(data, parquet_file)
+
+    table_name = "test_load_parquet"
+    schema = MockSchema()
+
+    database_service.create_table(table_name, schema)
+    database_service.insert_data(table_name, parquet_file, schema)
+
+    connection = database_service.connection
+    count = connection.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0]
+    assert count == 2
+
+    row = connection.execute(f"SELECT name, value, percentage, active FROM {table_name} WHERE id = 1").fetchone()
+    assert row == ('Test Entity', 100.0, 0.105, True)
+
+
+class MockCategoricalSchema(BaseSchema):
+    """Mock schema with a categorical column."""
+
+    SCHEMA_DEFINITION = {
+        'id': {'type': 'integer', 'description': 'Unique identifier'},
+        'tipo_de_controle': {
+            'type': 'categorical',
+            'description': 'Control type',
+            'mapping': {'1': 'Público', '2': 'Privado Nacional'},
+        },
+    }
+
+
+def test_categorical_columns_use_enum_from_registry(db_path: Path, tmp_path: Path):
+    """Categorical columns are created as ENUMs and the dictionary is written with its descriptions."""
+
+    schema = MockCategoricalSchema()
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    data = registry.encode_columns(
+        pd.DataFrame({'id': pd.array([1, 2], dtype='Int64'), 'tipo_de_controle': ['2', '1']}), schema
+    )
+    parquet_file = tmp_path / 'data.parquet'
+    write_parquet(data, parquet_file)
+
+    service = DatabaseService(db_path, dictionary_registry=registry)
+    try:
+        service.create_table('test_enum', schema)
+        service.insert_data('test_enum', parquet_file, schema)
+
+        column_type = service.connection.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'test_enum' AND column_name = 'tipo_de_controle'"
+        ).fetchone()[0]
+        assert column_type.startswith('ENUM')
+
+        rows = service.connection.execute("SELECT tipo_de_controle FROM test_enum ORDER BY id").fetchall()
+        assert rows == [('2',), ('1',)]
+
+        dictionary = service.connection.execute(
+            f"SELECT code, value, description FROM {CategoricalDictionaryTable.DICTIONARY_TABLE_NAME} ORDER BY code"
+        ).fetchall()
+        assert dictionary == [(0, '1', 'Público'), (1, '2', 'Privado Nacional')]
+
+        service.reset_database()
+        remaining = service.connection.execute(
+            "SELECT count(*) FROM duckdb_types() WHERE logical_type = 'ENUM' AND NOT internal"
+        ).fetchone()[0]
+        assert remaining == 0
+    finally:
+        service.close()
+
+
+def test_narrowed_parquet_columns_use_the_widest_narrow_type(database_service: DatabaseService, tmp_path: Path):
+    """A column narrowed differently in each file is created with the widest narrow type."""
+
+    schema = MockSchema()
+    first_file = tmp_path / 'first.parquet'
+    second_file = tmp_path / 'second.parquet'
+    write_parquet(pd.DataFrame({'id': pd.array([1], dtype='Int16'), 'value': pd.array([1], dtype='Int64')}), first_file)
+    write_parquet(
+        pd.DataFrame({'id': pd.array([70_000], dtype='Int32'), 'value': pd.array([2], dtype='Int16')}), second_file
+    )
+
+    column_types = database_service.resolve_column_types([first_file, second_file], schema)
+    assert column_types == {'id': 'INTEGER'}
+
+    database_service.create_table('test_narrow', schema, column_types)
+    for parquet_file in (first_file, second_file):
+        database_service.insert_data('test_narrow', parquet_file, schema, column_types)
+
+    types = dict(
+        database_service.connection.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'test_narrow'"
+        ).fetchall()
+    )
+    assert types['id'] == 'INTEGER'
+    assert types['value'] == 'DOUBLE'
+    assert database_service.connection.execute("SELECT id FROM test_narrow ORDER BY id").fetchall() == [(1,), (70_000,)]
+
+
+def test_insert_arrow_table_without_intermediate_file(database_service: DatabaseService):
+    """An in-memory Arrow table is inserted directly, with the same casts as a Parquet file."""
+
+    schema = MockSchema()
+    data = pd.DataFrame(
+        {
+            'id': pd.array([1, 2], dtype='Int16'),
+            'name': pd.Series(['A', 'B'], dtype='category'),
+            'value': pd.array([10, None], dtype='Int64'),
+        }
+    )
+    table = to_arrow_table(data)
+
+    column_types = database_service.resolve_column_types([table], schema)
+    database_service.create_table('test_arrow', schema, column_types)
+    database_service.insert_arrow('test_arrow', table, schema, column_types)
+
+    rows = database_service.connection.execute("SELECT id, name, value FROM test_arrow ORDER BY id").fetchall()
+    assert rows == [(1, 'A', 10.0), (2, 'B', None)]
+
+
+def test_long_format_table_and_column_dictionary(database_service: DatabaseService, monkeypatch):
+    """In long format the wide table keeps the totals and the amounts go to the long table."""
+
+    monkeypatch.setattr(Config, 'LONG_STORAGE_FORMAT', True)
+    schema = MockPortfolioSchema()
+    long_data = pd.DataFrame(
+        {
+            'codigo': pd.array([1, 2], dtype='Int64'),
+            'data_base': pd.to_datetime(['2024-09-01', '2024-09-01']),
+            'nome_coluna': pd.Categorical.from_codes([1, 0], categories=['agricultura', 'construcao']),
+            'valor': [20.0, 5.0],
+        }
+    )
+
+    database_service.create_table('test_portfolio', schema)
+    database_service.create_long_table('test_portfolio', schema)
+    database_service.insert_long_data('test_portfolio', to_arrow_table(long_data), schema)
+
+    connection = database_service.connection
+    assert [row[0] for row in connection.execute("DESCRIBE test_portfolio").fetchall()] == [
+        'codigo',
+        'data_base',
+        'total',
+    ]
+    assert connection.execute(
+        "SELECT codigo, nome_coluna, valor FROM test_portfolio_long ORDER BY codigo"
+    ).fetchall() == [(1.0, 'construcao', 20.0), (2.0, 'agricultura', 5.0)]
+    assert connection.execute(
+        "SELECT code, column_name, description FROM column_dictionary WHERE table_name = 'test_portfolio_long'"
+    ).fetchall() == [(0, 'agricultura', 'Agricultura'), (1, 'construcao', 'Construção')]
+
+
+def test_long_view_over_wide_table_is_dropped_with_it(database_service: DatabaseService):
+    """In wide mode the long layout is a view that unpivots the non-empty amounts."""
+
+    schema = MockPortfolioSchema()
+    data = pd.DataFrame(
+        {
+            'codigo': pd.array([1], dtype='Int64'),
+            'data_base': pd.to_datetime(['2024-09-01']),
+            'total': pd.array([20], dtype='Int64'),
+            'agricultura': pd.array([None], dtype='Int64'),
+            'construcao': pd.array([20], dtype='Int16'),
+        }
+    )
+    table = to_arrow_table(data)
+
+    database_service.create_table('test_portfolio', schema)
+    database_service.insert_arrow('test_portfolio', table, schema)
+    database_service.create_long_view('test_portfolio', schema)
+
+    connection = database_service.connection
+    assert connection.execute("SELECT codigo, nome_coluna, valor FROM test_portfolio_long").fetchall() == [
+        (1.0, 'construcao', 20.0)
+    ]
+
+    database_service.drop_table('test_portfolio_long')
+    database_service.create_long_view('test_portfolio', schema)
+    database_service.reset_database()
+
+    assert connection.execute("SELECT count(*) FROM information_schema.tables").fetchone() == (0,)
+
+
+def test_insert_files_scans_compatible_files_together(database_service: DatabaseService, tmp_path: Path):
+    """Files with the same columns are loaded by one scan, even if they narrowed a column differently."""
+
+    schema = MockSchema()
+    first, second, third = tmp_path / "2024-03.parquet", tmp_path / "2024-06.parquet", tmp_path / "2024-09.parquet"
+    write_parquet(pd.DataFrame({'id': pd.array([1], dtype='Int16'), 'value': pd.array([10], dtype='Int16')}), first)
+    write_parquet(pd.DataFrame({'id': pd.array([2], dtype='Int32'), 'value': pd.array([70000], dtype='Int32')}), second)
+    write_parquet(pd.DataFrame({'id': pd.array([3], dtype='Int64'), 'name': ['C']}), third)
+
+    column_types = database_service.resolve_column_types([first, second, third], schema)
+    database_service.create_table('test_bulk', schema, column_types)
+    database_service.insert_files('test_bulk', [first, second, third], schema, column_types)
+
+    rows = database_service.connection.execute("SELECT id, name, value FROM test_bulk ORDER BY id").fetchall()
+    assert rows == [(1, None, 10.0), (2, None, 70000.0), (3, 'C', None)]
+
+
+def test_insert_files_rolls_back_every_group_on_error(database_service: DatabaseService, tmp_path: Path):
+    """A failing group leaves the table as it was before the bulk load."""
+
+    schema = MockSchema()
+    valid_csv, invalid_csv = tmp_path / "valid.csv", tmp_path / "invalid.csv"
+    valid_csv.write_text("id,name\n1,A\n", encoding='utf-8')
+    invalid_csv.write_text("id,value\nnot a number,1\n", encoding='utf-8')
+
+    database_service.create_table('test_bulk_rollback', schema)
+    with pytest.raises(duckdb.Error):
+        database_service.insert_files('test_bulk_rollback', [valid_csv, invalid_csv], schema)
+
+    assert database_service.connection.execute("SELECT count(*) FROM test_bulk_rollback").fetchone() == (0,)
+
+
+def test_files_loaded_in_one_transaction_roll_back_together(database_service: DatabaseService, tmp_path: Path):
+    """A failing file of a table load also undoes the files loaded before it."""
+
+    schema = MockSchema()
+    valid_csv, invalid_csv = tmp_path / "valid.csv", tmp_path / "invalid.csv"
+    valid_csv.write_text("id,name\n1,A\n", encoding='utf-8')
+    invalid_csv.write_text("id,value\nnot a number,1\n", encoding='utf-8')
+
+    database_service.create_table('test_atomic_load', schema)
+    with pytest.raises(duckdb.Error), database_service.transaction():
+        database_service.insert_data('test_atomic_load', valid_csv, schema)
+        database_service.insert_data('test_atomic_load', invalid_csv, schema)
+
+    assert database_service.connection.execute("SELECT count(*) FROM test_atomic_load").fetchone() == (0,)
+
+
+def test_create_table_applies_only_the_schema_differences(db_path: Path):
+    """An existing table gets its missing columns and stale comments back; a synced one is not checked again."""
+
+    schema = MockSchema()
+    service = DatabaseService(db_path)
+    service.create_table('test_schema_sync', schema)
+    service.connection.execute("ALTER TABLE test_schema_sync DROP COLUMN active;")
+    service.connection.execute("COMMENT ON COLUMN test_schema_sync.name IS 'stale';")
+
+    # The same service remembers the table as synced.
+    service.create_table('test_schema_sync', schema)
+    assert 'active' not in service.catalog_columns('test_schema_sync')
+    service.close()
+
+    other_service = DatabaseService(db_path)
+    other_service.create_table('test_schema_sync', schema)
+    columns = other_service.catalog_columns('test_schema_sync')
+    other_service.close()
+
+    assert list(columns) == ['id', 'name', 'value', 'percentage', 'active']
+    assert columns['name'][1] == 'Name of the entity'
+    assert columns['active'][1] == 'Is active?'
+
+
+def test_cursors_load_different_tables_at_the_same_time(db_path: Path, tmp_path: Path):
+    """Worker cursors share one connection and create the shared ENUM type only once."""
+
+    schema = MockCategoricalSchema()
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    data = registry.encode_columns(
+        pd.DataFrame({'id': pd.array([1, 2], dtype='Int64'), 'tipo_de_controle': ['2', '1']}), schema
+    )
+    parquet_file = tmp_path / 'data.parquet'
+    write_parquet(data, parquet_file)
+
+    service = DatabaseService(db_path, dictionary_registry=registry)
+
+    def load_table(table_name: str) -> None:
+        cursor = service.cursor()
+        try:
+            cursor.create_table(table_name, schema)
+            cursor.insert_files(table_name, [parquet_file], schema)
+        finally:
+            cursor.close()
+
+    try:
+        table_names = [f'test_parallel_{index}' for index in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(load_table, table_names))
+
+        counts = [
+            service.connection.execute(f"SELECT count(*) FROM {table_name}").fetchone()[0] for table_name in table_names
+        ]
+        assert counts == [2] * len(table_names)
+        enum_types = service.connection.execute(
+            "SELECT count(*) FROM duckdb_types() WHERE logical_type = 'ENUM' AND NOT internal"
+        ).fetchone()[0]
+        assert enum_types == 1
+    finally:
+        service.close()
+
+
+def test_replace_partitions_keeps_the_other_data_bases(database_service: DatabaseService, tmp_path: Path):
+    """Only the data bases of the reloaded files are replaced, and the ledger records each file."""
+
+    schema = MockPortfolioSchema()
+    march, june = tmp_path / "2024-03.parquet", tmp_path / "2024-06.parquet"
+    write_parquet(
+        pd.DataFrame({'codigo': [1, 2], 'data_base': pd.to_datetime(['2024-03-01'] * 2), 'total': [1, 2]}), march
+    )
+    write_parquet(pd.DataFrame({'codigo': [1], 'data_base': pd.to_datetime(['2024-06-01']), 'total': [3]}), june)
+
+    database_service.create_table('test_upsert', schema)
+    database_service.insert_files('test_upsert', [march, june], schema)
+    statistics = database_service.read_file_statistics([march, june])
+    assert statistics == {'2024-03.parquet': (('2024-03-01',), 2), '2024-06.parquet': (('2024-06-01',), 1)}
+    ledger = LoadLedger(database_service)
+    ledger.record_loaded_files(
+        'test_upsert',
+        [LoadedFile(name, 'hash', partitions, row_count=rows) for name, (partitions, rows) in statistics.items()],
+    )
+
+    write_parquet(
+        pd.DataFrame({'codigo': [1, 2], 'data_base': pd.to_datetime(['2024-06-01'] * 2), 'total': [4, 5]}), june
+    )
+    database_service.replace_partitions('test_upsert', [june], ['2024-06-01'], schema)
+
+    rows = database_service.connection.execute(
+        "SELECT CAST(data_base AS VARCHAR), codigo, total FROM test_upsert ORDER BY ALL"
+    ).fetchall()
+    assert rows == [
+        ('2024-03-01', 1.0, 1.0),
+        ('2024-03-01', 2.0, 2.0),
+        ('2024-06-01', 1.0, 4.0),
+        ('2024-06-01', 2.0, 5.0),
+    ]
+    assert set(ledger.loaded_files('test_upsert')) == {'2024-03.parquet', '2024-06.parquet'}
+
+
+def test_csv_files_with_a_drifted_header_are_loaded_by_column_name(database_service: DatabaseService, tmp_path: Path):
+    """CSV columns are matched by name, and the columns the table lacks are left out."""
+
+    schema = MockPortfolioSchema()
+    march, june = tmp_path / "2024-03.csv", tmp_path / "2024-06.csv"
+    march.write_text("codigo,data_base,total\n1,2024-03-01,10\n", encoding='utf-8')
+    june.write_text('data_base,"nota, livre",codigo,total\n2024-06-01,"a, b",2,20\n', encoding='utf-8')
+
+    database_service.create_table('test_layouts', schema)
+    database_service.insert_files('test_layouts', [march, june], schema)
+
+    rows = database_service.connection.execute(
+        "SELECT codigo, CAST(data_base AS VARCHAR), total FROM test_layouts ORDER BY codigo"
+    ).fetchall()
+    assert rows == [(1.0, '2024-03-01', 10.0), (2.0, '2024-06-01', 20.0)]
+
+
+def test_align_table_moves_enum_columns_to_the_grown_dictionary(db_path: Path, tmp_path: Path):
+    """Tables created before the dictionary grew get the new ENUM type, keeping their rows."""
+
+    schema = MockCategoricalSchema()
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    registry.encode(pd.Series(['1']), 'tipo_de_controle')
+
+    service = DatabaseService(db_path, dictionary_registry=registry)
+    try:
+        service.create_table('test_align', schema)
+        service.connection.execute("INSERT INTO test_align VALUES (1, '1');")
+
+        registry.encode(pd.Series(['2']), 'tipo_de_controle')
+        assert service.align_table('test_align', service.table_column_types(schema))
+        service.connection.execute("INSERT INTO test_align VALUES (2, '2');")
+
+        rows = service.connection.execute("SELECT id, tipo_de_controle FROM test_align ORDER BY id").fetchall()
+        assert rows == [(1, '1'), (2, '2')]
+        assert not service.align_table('test_align', {'id': 'BIGINT'})
+    finally:
+        service.close()
+
+
+def test_cluster_table_rewrites_a_table_only_when_a_load_broke_its_order(
+    database_service: DatabaseService, tmp_path: Path, monkeypatch
+):
+    """An older quarter replaced after a newer one is moved into place; the comments and an index follow."""
+
+    monkeypatch.setattr(Config, 'SILVER_KEY_INDEXES', True)
+    schema = MockPortfolioSchema()
+    newer, older = tmp_path / "2024-09.csv", tmp_path / "2024-06.csv"
+    newer.write_text("codigo,data_base,total\n2,2024-09-01,1\n1,2024-09-01,2\n", encoding='utf-8')
+    older.write_text("codigo,data_base,total\n2,2024-06-01,3\n1,2024-06-01,4\n", encoding='utf-8')
+
+    database_service.create_table('test_cluster', schema)
+    database_service.insert_data('test_cluster', newer, schema)
+    assert database_service.cluster_table('test_cluster') is False
+
+    database_service.insert_data('test_cluster', older, schema)
+    assert database_service.cluster_table('test_cluster') is True
+    assert database_service.cluster_table('test_cluster') is False
+
+    connection = database_service.connection
+    rows = connection.execute("SELECT codigo, CAST(data_base AS VARCHAR) FROM test_cluster ORDER BY rowid").fetchall()
+    assert rows == [(1, '2024-06-01'), (2, '2024-06-01'), (1, '2024-09-01'), (2, '2024-09-01')]
+    assert database_service.catalog_columns('test_cluster')['total'][1] == 'Total'
+    assert connection.execute("SELECT index_name FROM duckdb_indexes() WHERE table_name = 'test_cluster'").fetchall() == [
+        ('test_cluster_key',)
+    ]
@@ -0,0 +1,79 @@
+"""Tests for the compiled schema plans."""
+
+import json
+
+import pyarrow as pa
+
+from bacen_ifdata.data_transformer.schemas import plan as plan_module
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.plan import SchemaPlan, SchemaPlanRegistry, compile_schema_plan
+
+
+class PlanSchema(BaseSchema):
+    """Small schema covering every column type."""
+
+    SCHEMA_DEFINITION = {
+        'instituicao': {'type': 'text', 'description': 'Nome da instituição'},
+        'codigo': {'type': 'numeric'},
+        'uf': {'type': 'categorical'},
+        'regiao': {'type': 'categorical'},
+        'data_base': {'type': 'date', 'raw_csv_header': 'Data'},
+        'indice_basileia': {'type': 'percentage', 'raw_csv_header': ['Índice de Basileia', 'Basileia']},
+        'tcb': {'type': 'categorical', 'mapping': {'b1': 'Bancário'}},
+    }
+
+
+def test_plan_compiles_types_aliases_and_calculated_columns():
+    """The plan holds every stage's type and the slugified header aliases, in schema order."""
+
+    plan = compile_schema_plan(PlanSchema())
+
+    assert plan.column_names == list(PlanSchema.SCHEMA_DEFINITION)
+    assert 'regiao' not in plan.input_column_names
+    assert plan.column('indice_basileia').lookup_keys == ('indice_de_basileia', 'basileia')
+    assert plan.column('codigo').lookup_keys == ('codigo',)
+    assert plan.column('codigo').pandas_dtype == 'Int64'
+    assert plan.get_duckdb_type('data_base') == 'DATE'
+    assert plan.get_mapping('tcb') == {'b1': 'Bancário'}
+    assert plan.columns_by_type['categorical'] == ['uf', 'regiao', 'tcb']
+    assert plan.arrow_schema(['codigo', 'extra']) == pa.schema([('codigo', pa.int64()), ('extra', pa.string())])
+
+
+def test_plan_round_trips_through_json():
+    """A serialised plan rebuilds to the same plan."""
+
+    plan = compile_schema_plan(PlanSchema())
+
+    assert SchemaPlan.from_dict(json.loads(json.dumps(plan.to_dict()))) == plan
+
+
+def test_registry_reuses_the_disk_cache(tmp_path, monkeypatch):
+    """A new registry reads the cached plan instead of walking the schema again."""
+
+    SchemaPlanRegistry(tmp_path).get(PlanSchema())
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    calls = []
+    monkeypatch.setattr(plan_module, 'compile_schema_plan', lambda schema: calls.append(schema))
+
+    registry = SchemaPlanRegistry(tmp_path)
+    plan = registry.get(PlanSchema())
+
+    assert not calls
+    assert plan.get_type('tcb') == 'categorical'
+    assert registry.get(PlanSchema()) is plan
+
+
+def test_registry_recompiles_a_stale_plan(tmp_path):
+    """A plan compiled from a different schema definition is ignored."""
+
+    SchemaPlanRegistry(tmp_path).get(PlanSchema())
+    cache_path = next(tmp_path.glob('*.json'))
+    content = json.loads(cache_path.read_text(encoding='utf-8'))
+    content['fingerprint'] = 'stale'
+    content['columns'] = []
+    cache_path.write_text(json.dumps(content), encoding='utf-8')
+
+    plan = SchemaPlanRegistry(tmp_path).get(PlanSchema())
+
+    assert plan.column_names == list(PlanSchema.SCHEMA_DEFINITION)
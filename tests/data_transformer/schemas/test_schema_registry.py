@@ -0,0 +1,66 @@
+"""Tests for the lazy schema registry and the deferred imports of the CLI path."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import bacen_ifdata
+from bacen_ifdata.data_transformer import schemas
+from bacen_ifdata.data_transformer.schemas import SCHEMA_CLASS_PATHS, load_schema
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.mapper import SCHEMA_BY_INSTITUTION_AND_REPORT, get_schema
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.reports import ReportsIndividualInstitutions
+
+
+@pytest.mark.parametrize('name', sorted(SCHEMA_CLASS_PATHS))
+def test_every_registered_schema_resolves(name):
+    """Every registered path points to a schema class, and each schema is instantiated once."""
+
+    schema = load_schema(name)
+
+    assert isinstance(schema, BaseSchema)
+    assert getattr(schemas, name) is schema
+
+
+def test_mapper_resolves_the_same_instances():
+    """The lazy mapping behaves like the former dict and shares the registry instances."""
+
+    schema = get_schema(Institutions.INDIVIDUAL_INSTITUTIONS, ReportsIndividualInstitutions.ASSETS)
+    schema_by_report = SCHEMA_BY_INSTITUTION_AND_REPORT[Institutions.INDIVIDUAL_INSTITUTIONS]
+
+    assert schema is schemas.INDIVIDUAL_INSTITUTION_ASSETS_SCHEMA
+    assert ReportsIndividualInstitutions.ASSETS in schema_by_report
+    assert schema_by_report.get(ReportsIndividualInstitutions.ASSETS) is schema
+
+
+def test_unknown_schema_name_raises_attribute_error():
+    """Unknown names keep the usual module attribute error."""
+
+    with pytest.raises(AttributeError):
+        getattr(schemas, 'UNKNOWN_SCHEMA')
+
+
+def test_cli_path_does_not_import_heavy_packages():
+    """Importing the application and the mapper defers selenium, pandas and duckdb to the stages."""
+
+    probe = (
+        'import sys\n'
+        'import bacen_ifdata.application\n'
+        'import bacen_ifdata.data_transformer.schemas.mapper\n'
+        "print(','.join(name for name in ('selenium', 'pandas', 'duckdb') if name in sys.modules))\n"
+        "print(sum(name.startswith('bacen_ifdata.data_transformer.schemas.') for name in sys.modules))\n"
+    )
+
+    source_directory = str(Path(bacen_ifdata.__file__).resolve().parent.parent)
+    environment = {**os.environ, 'PYTHONPATH': source_directory}
+
+    result = subprocess.run([sys.executable, '-c', probe], env=environment, capture_output=True, text=True, check=True)
+    heavy_packages, schema_modules = result.stdout.split('\n')[:2]
+
+    assert heavy_packages == ''
+    # Only the interfaces and the mapper, no schema definitions.
+    assert int(schema_modules) == 2
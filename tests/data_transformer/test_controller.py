@@ -1,15 +1,21 @@
 """Testes unitários para a classe TransformerController."""
 
+import pandas as pd
 import pytest
 from pandas import DataFrame
 
 from bacen_ifdata.data_transformer.controller import TransformationType, TransformerController
+from bacen_ifdata.data_transformer.schemas.prudential_conglomerate.summary import PrudentialConglomerateSummarySchema
+from bacen_ifdata.data_transformer.transformers.base import BaseTransformer, DeduplicationStats
+from bacen_ifdata.data_transformer.transformers.deduplication import ChunkedDeduplicator
 from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
 
 
 class MockTransformer:
     """Mock para a classe Transformer."""
 
+    deduplication_stats = DeduplicationStats()
+
     def transform_numeric_columns(self, df: DataFrame, columns: list[str]) -> DataFrame:
         return df
 
@@ -103,3 +109,82 @@ def test_transform_pipeline(transformer_controller: TransformerController, mocke
 
     assert isinstance(result, DataFrame)
     assert "regiao" in result.columns
+
+
+def test_transform_in_chunks_matches_transform(tmp_path):
+    """O modo em lotes deve produzir o mesmo resultado do modo em memória."""
+
+    csv_file = tmp_path / "2024-09.csv"
+    csv_file.write_text(
+        "Instituição;Código;Cidade;UF;Data;Ativo Total;Lucro Líquido\n"
+        "BANCO A;1;BRASILIA;DF;09/2024;1.000,00;10,00\n"
+        "BANCO A;1;BRASILIA;DF;09/2024;1.000,00;10,00\n"
+        "BANCO B;2;SAO PAULO;SP;09/2024;;\n"
+        "BANCO B;2;SAO PAULO;SP;09/2024;2.000,00;20,00\n"
+        "BANCO C;3;RIO BRANCO;AC;09/2024;;\n",
+        encoding="utf-8",
+    )
+
+    schema = PrudentialConglomerateSummarySchema()
+    controller = TransformerController(lambda institution: BaseTransformer())
+
+    expected = controller.transform(csv_file, schema, Institutions.PRUDENTIAL_CONGLOMERATES)
+
+    deduplicator = ChunkedDeduplicator()
+    batches = [
+        deduplicator.drop_exact_duplicates(batch)
+        for batch in controller.transform_in_chunks(csv_file, schema, Institutions.PRUDENTIAL_CONGLOMERATES, 2)
+    ]
+    result = pd.concat([deduplicator.drop_redundant_empty_rows(batch) for batch in batches])
+
+    assert result["codigo"].tolist() == expected["codigo"].tolist() == [1, 2, 3]
+    assert result["ativo_total"].tolist() == expected["ativo_total"].tolist()
+    assert list(result.columns) == list(expected.columns)
+
+
+def test_transform_records_step_profile(tmp_path):
+    """Deve registrar tempo e linhas de cada etapa da transformação, por arquivo."""
+
+    csv_file = tmp_path / "2024-09.csv"
+    csv_file.write_text(
+        "Instituição;Código;Cidade;UF;Data;Ativo Total;Lucro Líquido\n"
+        "BANCO A;1;BRASILIA;DF;09/2024;1.000,00;10,00\n"
+        "BANCO A;1;BRASILIA;DF;09/2024;1.000,00;10,00\n"
+        "BANCO B;2;SAO PAULO;SP;09/2024;2.000,00;20,00\n",
+        encoding="utf-8",
+    )
+
+    controller = TransformerController(lambda institution: BaseTransformer(), profile_memory=True)
+    controller.transform(csv_file, PrudentialConglomerateSummarySchema(), Institutions.PRUDENTIAL_CONGLOMERATES)
+
+    (profile,) = controller.profiles
+    steps = profile.steps
+
+    assert profile.file_name == "2024-09.csv"
+    assert list(steps)[:3] == ["load", "rename_columns", "apply_business_rules"]
+    assert {"transform_numeric_columns", "create_region_column", "deduplicate_dataset"} <= set(steps)
+    assert steps["load"].rows_out == 3
+    assert (steps["deduplicate_dataset"].rows_in, steps["deduplicate_dataset"].rows_out) == (3, 2)
+    assert steps["transform_numeric_columns"].memory_delta < 0
+
+
+def test_profiles_are_bounded(monkeypatch):
+    """Deve manter apenas os perfis mais recentes e contar todos os arquivos perfilados."""
+
+    monkeypatch.setattr("bacen_ifdata.utilities.configurations.Config.TRANSFORM_PROFILE_HISTORY", 2)
+    controller = TransformerController(lambda institution: BaseTransformer())
+
+    for quarter in ("2024-03", "2024-06"):
+        controller._start_profile(f"{quarter}.csv")
+    first_profile = controller.profile_count
+    for quarter in ("2024-09", "2024-12", "2025-03"):
+        controller._start_profile(f"{quarter}.csv")
+
+    assert controller.profile_count == 5
+    assert [profile.file_name for profile in controller.profiles] == ["2024-12.csv", "2025-03.csv"]
+    assert [profile.file_name for profile in controller.profiles_since(first_profile)] == [
+        "2024-12.csv",
+        "2025-03.csv",
+    ]
+    assert [profile.file_name for profile in controller.profiles_since(4)] == ["2025-03.csv"]
+    assert not controller.profiles_since(5)
@@ -0,0 +1,84 @@
+"""Tests for the categorical dictionary registry."""
+
+import pandas as pd
+import pytest
+
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+
+
+class MockSchema(BaseSchema):
+    """Schema with one categorical column with a mapping and one text column."""
+
+    SCHEMA_DEFINITION = {
+        'consolidado_bancario': {
+            'type': 'categorical',
+            'description': 'Tipo de Consolidado Bancário.',
+            'mapping': {'b1': 'Banco Comercial.', 'b2': 'Banco Múltiplo.'},
+        },
+        'cidade': {'type': 'text', 'description': 'Cidade.'},
+    }
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    """Provides the path of the persisted registry."""
+
+    return tmp_path / 'dictionaries' / 'categorical.json'
+
+
+def test_codes_are_stable_across_files(registry_path):
+    """A value keeps its code in every file, even when it is missing or appears later."""
+
+    registry = CategoricalDictionaryRegistry(registry_path)
+
+    first = registry.encode(pd.Series(['b2', 'b1', None]), 'consolidado_bancario')
+    second = registry.encode(pd.Series(['n1', 'b2']), 'consolidado_bancario')
+
+    assert first.cat.categories.tolist() == ['b1', 'b2']
+    assert second.cat.categories.tolist() == ['b1', 'b2', 'n1']
+    assert first.cat.codes.tolist() == [1, 0, -1]
+    assert second.cat.codes.tolist() == [2, 1]
+
+
+def test_registry_is_persisted_with_mapping_descriptions(registry_path):
+    """Saved dictionaries keep their codes and the schema mapping descriptions."""
+
+    registry = CategoricalDictionaryRegistry(registry_path)
+    data = pd.DataFrame({'consolidado_bancario': ['b2', 'b1'], 'cidade': ['Brasília', 'São Paulo']})
+    encoded = registry.encode_columns(data, MockSchema())
+    registry.save()
+
+    reloaded = CategoricalDictionaryRegistry(registry_path)
+
+    assert isinstance(encoded['consolidado_bancario'].dtype, pd.CategoricalDtype)
+    assert encoded['cidade'].dtype == object
+    assert reloaded.categories('consolidado_bancario') == ['b1', 'b2']
+    assert reloaded.description('consolidado_bancario', 'B1') == 'Banco Comercial.'
+    assert reloaded.enum_type_name('consolidado_bancario') == registry.enum_type_name('consolidado_bancario')
+
+
+def test_enum_type_name_changes_when_dictionary_grows(registry_path):
+    """A grown dictionary gets a new ENUM type name."""
+
+    registry = CategoricalDictionaryRegistry(registry_path)
+    registry.encode(pd.Series(['SP']), 'uf')
+    before = registry.enum_type_name('uf')
+    registry.encode(pd.Series(['RJ']), 'uf')
+
+    assert registry.enum_type_name('uf') != before
+
+
+def test_categorical_input_is_encoded_like_text(registry_path):
+    """A categorical series gets the same codes as the equivalent text series."""
+
+    registry = CategoricalDictionaryRegistry(registry_path)
+    registry.encode(pd.Series(['b1']), 'consolidado_bancario')
+
+    text = registry.encode(pd.Series(['b2', None, 'b1']), 'consolidado_bancario')
+    categorical = registry.encode(
+        pd.Series(pd.Categorical(['b2', None, 'b1'], categories=['n1', 'b2', 'b1'])), 'consolidado_bancario'
+    )
+
+    assert categorical.cat.categories.tolist() == text.cat.categories.tolist() == ['b1', 'b2']
+    assert categorical.cat.codes.tolist() == text.cat.codes.tolist() == [1, -1, 0]
@@ -0,0 +1,78 @@
+"""Tests for the dtype downcasting of the transformed layer."""
+
+import pandas as pd
+
+from bacen_ifdata.data_transformer.downcasting import DowncastStatistics, downcast_dtypes
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.plan import compile_schema_plan
+
+
+class MockSchema(BaseSchema):
+    """Schema with numeric, percentage and text columns, one of them opted out."""
+
+    SCHEMA_DEFINITION = {
+        'agencias': {'type': 'numeric', 'description': 'Número de agências.'},
+        'ativo_total': {'type': 'numeric', 'description': 'Ativo total.'},
+        'saldo': {'type': 'numeric', 'description': 'Saldo.', 'downcast': False},
+        'indice': {'type': 'percentage', 'description': 'Índice.'},
+        'cidade': {'type': 'text', 'description': 'Cidade.'},
+        'instituicao': {'type': 'text', 'description': 'Instituição.'},
+    }
+
+
+def build_frame(indice: list[float]) -> pd.DataFrame:
+    """Builds a transformed DataFrame with the wide dtypes of the transformer."""
+
+    return pd.DataFrame(
+        {
+            'agencias': pd.array([1, 250, None, 300], dtype='Int64'),
+            'ativo_total': pd.array([70_000, -5, 1, 2], dtype='Int64'),
+            'saldo': pd.array([1, 2, 3, 4], dtype='Int64'),
+            'indice': pd.array(indice, dtype='float64'),
+            'cidade': pd.array(['São Paulo', 'São Paulo', 'Recife', 'Recife'], dtype='string'),
+            'instituicao': pd.array(['A', 'B', 'C', 'D'], dtype='string'),
+        }
+    )
+
+
+def test_columns_are_narrowed_to_the_smallest_type():
+    """Integers, percentages and repetitive text get the narrowest lossless dtype."""
+
+    data = downcast_dtypes(build_frame([0.1234, 0.5, None, 1.0]), compile_schema_plan(MockSchema()))
+
+    assert data['agencias'].dtype == 'Int16'
+    assert data['agencias'].isna().tolist() == [False, False, True, False]
+    assert data['ativo_total'].dtype == 'Int32'
+    assert data['indice'].dtype == 'float32'
+    assert data['cidade'].dtype == 'category'
+    assert data['instituicao'].dtype == 'string'
+
+
+def test_opted_out_and_lossy_columns_keep_their_type():
+    """A column opted out in the schema, or a float that loses precision, is left untouched."""
+
+    data = downcast_dtypes(build_frame([123456.789, 0.5, 0.25, 1.0]), compile_schema_plan(MockSchema()))
+
+    assert data['saldo'].dtype == 'Int64'
+    assert data['indice'].dtype == 'float64'
+
+
+def test_statistics_of_batches_narrow_like_the_whole_frame():
+    """Observing a frame batch by batch picks the dtypes chosen for the whole frame."""
+
+    plan = compile_schema_plan(MockSchema())
+    whole_frame = downcast_dtypes(build_frame([0.1234, 0.5, None, 1.0]), plan)
+
+    statistics = DowncastStatistics(plan)
+    batches = [
+        statistics.observe(batch) for batch in (build_frame([0.1234, 0.5, None, 1.0]).iloc[i : i + 1] for i in range(4))
+    ]
+    narrowed = pd.concat([statistics.narrow(batch.copy()) for batch in batches])
+
+    assert statistics.narrowed_dtypes() == {
+        'agencias': 'Int16',
+        'ativo_total': 'Int32',
+        'indice': 'float32',
+        'cidade': 'category',
+    }
+    assert narrowed.dtypes.drop('cidade').to_dict() == whole_frame.dtypes.drop('cidade').to_dict()
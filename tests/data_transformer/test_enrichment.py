@@ -0,0 +1,50 @@
+"""Tests for the categorical-aware enrichment of the transformed columns."""
+
+import pandas as pd
+
+from bacen_ifdata.data_transformer.enrichment import normalize_city_name, state_region
+from bacen_ifdata.utilities.normalization import MemoizedNormalizer, map_unique_values
+
+
+def test_map_unique_values_broadcasts_through_codes():
+    """Each distinct value is mapped once; merged and missing results become shared categories and NA."""
+
+    calls = []
+
+    def region(state):
+        calls.append(state)
+        return state_region(state)
+
+    states = pd.Series(['SP', 'AC', 'SP', None, 'RJ', 'XX'], index=[10, 11, 12, 13, 14, 15])
+    result = map_unique_values(states, region)
+
+    assert sorted(calls) == ['AC', 'RJ', 'SP', 'XX']
+    assert result.cat.categories.tolist() == ['Sudeste', 'Norte']
+    assert result.astype(object).where(result.notna(), None).tolist() == [
+        'Sudeste',
+        'Norte',
+        'Sudeste',
+        None,
+        'Sudeste',
+        None,
+    ]
+    assert result.index.tolist() == states.index.tolist()
+
+
+def test_city_dictionary_normalizes_each_city_once_across_files():
+    """A city seen in an earlier file reuses its normalised name."""
+
+    calls = []
+
+    def normalize(value):
+        calls.append(value)
+        return normalize_city_name(value)
+
+    cities = MemoizedNormalizer(normalize)
+    first = cities.normalize_series(pd.Series(['SAO PAULO', ' rio branco ', 'SAO PAULO']))
+    second = cities.normalize_series(pd.Series(['SAO PAULO', 'recife']))
+
+    assert first.tolist() == ['Sao Paulo', 'Rio Branco', 'Sao Paulo']
+    assert second.tolist() == ['Sao Paulo', 'Recife']
+    assert calls == ['SAO PAULO', ' rio branco ', 'recife']
+    assert len(cities) == 3
@@ -0,0 +1,103 @@
+"""Tests for the long (tidy) storage format of the wide portfolio reports."""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from bacen_ifdata.data_transformer.long_format import (
+    LongFormatWriter,
+    long_value_columns,
+    split_long_format,
+)
+from bacen_ifdata.data_transformer.schemas.base_schema import BaseSchema
+from bacen_ifdata.data_transformer.schemas.plan import compile_schema_plan
+
+
+class WidePortfolioSchema(BaseSchema):
+    """Wide report with identifiers, a total and sparse amounts."""
+
+    SCHEMA_DEFINITION = {
+        'instituicao': {'type': 'text'},
+        'codigo': {'type': 'numeric'},
+        'data_base': {'type': 'date'},
+        'total_carteira': {'type': 'numeric'},
+        'agricultura_total': {'type': 'numeric'},
+        'construcao_total': {'type': 'numeric'},
+        'participacao': {'type': 'percentage'},
+    }
+    LONG_FORMAT_WIDE_COLUMNS = ('total_carteira',)
+
+
+def _wide_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            'instituicao': ['A', 'B'],
+            'codigo': pd.array([1, 2], dtype='Int64'),
+            'data_base': pd.to_datetime(['2024-09-01', '2024-09-01']),
+            'total_carteira': pd.array([30, 5], dtype='Int64'),
+            'agricultura_total': pd.array([10, None], dtype='Int64'),
+            'construcao_total': pd.array([20, 5], dtype='Int64'),
+            'participacao': [None, 0.25],
+        }
+    )
+
+
+def test_split_keeps_totals_wide_and_drops_empty_cells():
+    """The declared totals stay wide; every other non-empty amount becomes a long row with a stable code."""
+
+    schema = WidePortfolioSchema()
+    plan = compile_schema_plan(schema)
+
+    wide_data, long_data = split_long_format(_wide_data(), plan, schema)
+
+    assert long_value_columns(plan, schema) == ['agricultura_total', 'construcao_total', 'participacao']
+    assert wide_data.columns.tolist() == ['instituicao', 'codigo', 'data_base', 'total_carteira']
+    assert long_data.columns.tolist() == ['codigo', 'data_base', 'nome_coluna', 'valor']
+    assert long_data['nome_coluna'].cat.categories.tolist() == long_value_columns(plan, schema)
+    assert list(zip(long_data['codigo'], long_data['nome_coluna'].astype(str), long_data['valor'])) == [
+        (1, 'agricultura_total', 10.0),
+        (1, 'construcao_total', 20.0),
+        (2, 'construcao_total', 5.0),
+        (2, 'participacao', 0.25),
+    ]
+
+
+def test_writer_appends_batches_and_replaces_previous_run(tmp_path):
+    """Each batch becomes a row group of a single file; a run without amounts removes the stale file."""
+
+    schema = WidePortfolioSchema()
+    plan = compile_schema_plan(schema)
+    file_path = tmp_path / 'long' / '2024-09.parquet'
+
+    with LongFormatWriter(file_path) as writer:
+        for batch in (_wide_data().iloc[:1], _wide_data().iloc[1:]):
+            writer.write(split_long_format(batch, plan, schema)[1])
+
+    assert writer.rows_written == 4
+    assert pq.ParquetFile(file_path).num_row_groups == 2
+    assert pq.read_table(file_path).column('nome_coluna').to_pylist()[-1] == 'participacao'
+
+    with LongFormatWriter(file_path) as writer:
+        writer.write(split_long_format(_wide_data().iloc[:0], plan, schema)[1])
+
+    assert not file_path.exists()
+
+
+def test_writer_keeps_the_previous_file_until_it_is_closed(tmp_path):
+    """The parts go to a hidden file that replaces the previous one on close; a failed run keeps it."""
+
+    schema = WidePortfolioSchema()
+    plan = compile_schema_plan(schema)
+    file_path = tmp_path / 'long' / '2024-09.parquet'
+
+    with LongFormatWriter(file_path) as writer:
+        writer.write(split_long_format(_wide_data().iloc[:1], plan, schema)[1])
+    previous_rows = pq.read_table(file_path).num_rows
+
+    with pytest.raises(ValueError, match='broken batch'), LongFormatWriter(file_path) as writer:
+        writer.write(split_long_format(_wide_data(), plan, schema)[1])
+        assert pq.read_table(file_path).num_rows == previous_rows
+        raise ValueError('broken batch')
+
+    assert pq.read_table(file_path).num_rows == previous_rows
+    assert list(file_path.parent.iterdir()) == [file_path]
@@ -0,0 +1,43 @@
+"""Tests for the per-step profiling of the transformation."""
+
+import json
+
+import pandas as pd
+
+from bacen_ifdata.data_transformer.profiling import (
+    TransformProfile,
+    format_profile_summary,
+    summarize_profiles,
+    write_profile_report,
+)
+
+
+def test_repeated_steps_are_accumulated():
+    """A step run once per batch is accumulated in a single entry of the file profile."""
+
+    profile = TransformProfile('2024-09.csv')
+    for batch in (pd.DataFrame({'a': [1, 1, 2]}), pd.DataFrame({'a': [3]})):
+        profile.measure('drop_duplicates', pd.DataFrame.drop_duplicates, batch)
+
+    step = profile.steps['drop_duplicates']
+    assert (step.calls, step.rows_in, step.rows_out) == (2, 4, 3)
+    assert step.memory_delta == 0
+
+
+def test_report_and_summary_cover_every_file(tmp_path):
+    """The report lists each file, and the summary adds the steps of all files."""
+
+    profiles = [TransformProfile('2024-06.csv'), TransformProfile('2024-09.csv')]
+    for profile in profiles:
+        profile.measure('load', lambda: pd.DataFrame({'a': [1, 2]}))
+
+    (load,) = summarize_profiles(profiles)
+    assert (load.calls, load.rows_out) == (2, 4)
+    assert 'load' in format_profile_summary(profiles)
+
+    report_file = tmp_path / 'transform_profile.json'
+    write_profile_report(profiles, report_file)
+    report = json.loads(report_file.read_text(encoding='utf-8'))
+
+    assert [file['file_name'] for file in report['files']] == ['2024-06.csv', '2024-09.csv']
+    assert report['summary'][0]['rows_out'] == 4
@@ -0,0 +1,102 @@
+"""Tests for the report-level deduplication index."""
+
+import pandas as pd
+import pytest
+
+from bacen_ifdata.data_transformer.report_index import ReportDeduplicationIndex
+
+
+def _quarter(codes: list[int], date: str, assets: list[int]) -> pd.DataFrame:
+    """Builds a transformed quarter with one row per institution."""
+
+    return pd.DataFrame(
+        {
+            'codigo': pd.array(codes, dtype='Int64'),
+            'instituicao': pd.array([f'INSTITUICAO {code}' for code in codes], dtype='string'),
+            'data_base': pd.to_datetime([date] * len(codes)),
+            'ativo_total': pd.array(assets, dtype='Int64'),
+        }
+    )
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Provides the path of the persisted index."""
+
+    return tmp_path / 'index' / 'summary.parquet'
+
+
+def test_rows_repeated_in_another_file_are_rejected(index_path):
+    """A re-downloaded quarter only contributes the rows not seen before."""
+
+    report_index = ReportDeduplicationIndex(index_path)
+
+    first = report_index.filter_new_rows(_quarter([1, 2], '2023-06-01', [10, 20]), '202306.csv')
+    overlap = report_index.filter_new_rows(_quarter([2, 3], '2023-06-01', [20, 30]), '202306_copy.csv')
+
+    assert len(first) == 2
+    assert overlap['codigo'].tolist() == [3]
+    assert report_index.rejected_rows == 1
+
+
+def test_same_key_with_different_values_is_kept(index_path):
+    """Rows are only rejected when the whole row matches, not just (codigo, data_base)."""
+
+    report_index = ReportDeduplicationIndex(index_path)
+
+    report_index.filter_new_rows(_quarter([1], '2023-06-01', [10]), 'a.csv')
+    result = report_index.filter_new_rows(_quarter([1], '2023-06-01', [11]), 'b.csv')
+
+    assert len(result) == 1
+    assert report_index.rejected_rows == 0
+
+
+def test_index_is_incremental_across_runs(index_path):
+    """A saved index rejects repeated rows without the previous files, and a file never rejects itself."""
+
+    report_index = ReportDeduplicationIndex(index_path)
+    report_index.filter_new_rows(_quarter([1, 2], '2023-06-01', [10, 20]), 'a.csv')
+    report_index.save()
+
+    reloaded = ReportDeduplicationIndex(index_path)
+    reloaded.discard('a.csv')
+    same_file = reloaded.filter_new_rows(_quarter([1, 2], '2023-06-01', [10, 20]), 'a.csv')
+    other_file = reloaded.filter_new_rows(_quarter([1, 2], '2023-06-01', [10, 20]), 'b.csv')
+
+    assert len(same_file) == 2
+    assert other_file.empty
+    assert reloaded.rejected_rows == 2
+
+
+def test_entries_of_removed_files_are_pruned(index_path):
+    """Rows of a file that left the report are no longer rejected in the other files."""
+
+    report_index = ReportDeduplicationIndex(index_path)
+    report_index.filter_new_rows(_quarter([1, 2], '2023-06-01', [10, 20]), 'a.csv')
+    report_index.filter_new_rows(_quarter([3], '2023-09-01', [30]), 'b.csv')
+    report_index.save()
+
+    reloaded = ReportDeduplicationIndex(index_path)
+    removed = reloaded.retain(['b.csv', 'c.csv'])
+    result = reloaded.filter_new_rows(_quarter([1, 2, 3], '2023-06-01', [10, 20, 30]), 'c.csv')
+
+    assert removed == 2
+    assert len(result) == 3
+    assert reloaded.rejected_rows == 0
+
+
+def test_batches_are_checked_against_the_earlier_batches(index_path):
+    """Entries indexed batch by batch reject repeated rows and are all persisted."""
+
+    report_index = ReportDeduplicationIndex(index_path)
+    for code in range(1, 9):
+        report_index.filter_new_rows(_quarter([code], '2023-06-01', [code * 10]), 'a.csv')
+
+    repeated = report_index.filter_new_rows(
+        _quarter(list(range(1, 11)), '2023-06-01', [code * 10 for code in range(1, 11)]), 'b.csv'
+    )
+    report_index.save()
+
+    assert repeated['codigo'].tolist() == [9, 10]
+    assert report_index.rejected_rows == 8
+    assert len(pd.read_parquet(index_path)) == 10
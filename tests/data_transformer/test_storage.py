@@ -0,0 +1,109 @@
+"""Tests for the transformed layer storage."""
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from bacen_ifdata.data_transformer.storage import (
+    atomic_write,
+    read_transformed_data,
+    write_parquet,
+    write_transformed_data,
+)
+
+
+@pytest.fixture
+def transformed_data() -> pd.DataFrame:
+    """Provides a DataFrame with the dtypes produced by the transformer."""
+
+    return pd.DataFrame(
+        {
+            'codigo': pd.array([10, 20, None], dtype='Int64'),
+            'instituicao': pd.array(['BANCO A', 'BANCO B', 'BANCO A'], dtype='string'),
+            'uf': pd.Series(['SP', 'RJ', 'SP'], dtype='category'),
+            'data_base': pd.to_datetime(['2023-06-01', '2023-06-01', '2023-06-01']),
+            'indice_de_basileia': [0.12, 0.15, None],
+        }
+    )
+
+
+def test_write_parquet_preserves_dtypes(tmp_path, transformed_data):
+    """Parquet output must round-trip the transformer dtypes."""
+
+    file_path = tmp_path / '2023-06.parquet'
+    write_parquet(transformed_data, file_path)
+
+    result = pd.read_parquet(file_path)
+
+    assert str(result['codigo'].dtype) == 'Int64'
+    assert isinstance(result['uf'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(result['data_base'])
+    assert result['codigo'].isna().sum() == 1
+
+
+def test_write_parquet_uses_zstd_and_dictionary(tmp_path, transformed_data):
+    """Text and categorical columns are dictionary encoded and compressed with zstd."""
+
+    file_path = tmp_path / '2023-06.parquet'
+    write_parquet(transformed_data, file_path)
+
+    metadata = pq.ParquetFile(file_path).metadata.row_group(0)
+    columns = {metadata.column(index).path_in_schema: metadata.column(index) for index in range(metadata.num_columns)}
+
+    assert columns['instituicao'].compression == 'ZSTD'
+    assert 'RLE_DICTIONARY' in columns['instituicao'].encodings
+    assert 'RLE_DICTIONARY' in columns['uf'].encodings
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'csv'])
+def test_write_transformed_data_replaces_suffix(tmp_path, transformed_data, file_format):
+    """The output file keeps the source name with the suffix of the storage format."""
+
+    output_path = write_transformed_data(transformed_data, tmp_path, '2023-06.csv', file_format)
+
+    assert output_path == tmp_path / f'2023-06.{file_format}'
+    assert output_path.exists()
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'csv'])
+def test_read_transformed_data_reads_the_written_format(tmp_path, transformed_data, file_format):
+    """Transformed files are read back in the format of their suffix."""
+
+    output_path = write_transformed_data(transformed_data, tmp_path, '2023-06.csv', file_format)
+
+    result = read_transformed_data(output_path, columns=['codigo', 'data_base'])
+
+    assert list(result.columns) == ['codigo', 'data_base']
+    assert result['codigo'].tolist()[:2] == [10, 20]
+
+
+def test_read_transformed_data_rejects_unknown_formats(tmp_path):
+    """Only the formats written by the transformer can be read back."""
+
+    with pytest.raises(ValueError, match='Unsupported transformed file format'):
+        read_transformed_data(tmp_path / '2023-06.json')
+
+
+def test_write_transformed_data_rejects_unknown_format(tmp_path, transformed_data):
+    """Unsupported formats raise a ValueError."""
+
+    with pytest.raises(ValueError):
+        write_transformed_data(transformed_data, tmp_path, '2023-06.csv', 'xlsx')
+
+
+def test_atomic_write_replaces_the_file_only_once_written(tmp_path, transformed_data):
+    """The previous file is kept while the new one is written, and after a failed write."""
+
+    file_path = tmp_path / '2023-06.parquet'
+    write_parquet(transformed_data.iloc[:1], file_path)
+
+    with pytest.raises(ValueError, match='failed'), atomic_write(file_path) as temporary_path:
+        temporary_path.write_bytes(b'PAR1')
+        raise ValueError('failed')
+
+    assert len(pd.read_parquet(file_path)) == 1
+
+    write_parquet(transformed_data, file_path)
+
+    assert len(pd.read_parquet(file_path)) == 3
+    assert list(tmp_path.iterdir()) == [file_path]
@@ -1,5 +1,8 @@
 """Tests for BaseTransformer deduplication logic."""
 
+import warnings
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -90,3 +93,68 @@ def test_deduplicate_dataset(base_transformer, input_data, expected_len, dedupli
             assert pd.isna(actual_val)
         else:
             assert actual_val == expected_value
+
+
+@pytest.fixture
+def mixed_data() -> pd.DataFrame:
+    """Provides a dataset hit by both deduplication rules."""
+
+    return pd.DataFrame(
+        {
+            'codigo': pd.array([1, 1, 2, 2, 3, 1, None], dtype='Int64'),
+            'instituicao': ['A', 'A', 'B', 'B', 'C', 'A', 'E'],
+            'data_base': pd.to_datetime(['2023-06-01'] * 7),
+            'ativo_total': pd.array([10, 10, None, 20, None, 10, None], dtype='Int64'),
+            'lucro_liquido': pd.array([1, 1, None, 2, None, 1, None], dtype='Int64'),
+        }
+    )
+
+
+def test_deduplicate_dataset_counts_removed_rows(base_transformer, mixed_data):
+    """The counters report the rows removed by each rule."""
+
+    result = base_transformer.deduplicate_dataset(mixed_data)
+
+    assert result.index.tolist() == [0, 3, 4, 6]
+    assert base_transformer.deduplication_stats.exact_duplicates == 2
+    assert base_transformer.deduplication_stats.redundant_empty_rows == 1
+    assert base_transformer.deduplication_stats.hash_collisions == 0
+
+
+def test_deduplicate_dataset_matches_drop_duplicates(base_transformer, mixed_data):
+    """Hash based removal keeps the same rows as a value based drop_duplicates."""
+
+    expected = mixed_data.drop_duplicates(keep='first')
+    result = base_transformer._remove_exact_duplicates(mixed_data, verify_collisions=True)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_verify_collisions_keeps_distinct_rows(base_transformer, mixed_data, monkeypatch):
+    """With verification enabled, rows sharing a hash but not their values are kept."""
+
+    # Force every row to collide.
+    monkeypatch.setattr(
+        'bacen_ifdata.data_transformer.transformers.base.hash_rows',
+        lambda data_frame: np.zeros(len(data_frame), dtype='uint64'),
+    )
+
+    result = base_transformer.deduplicate_dataset(mixed_data, verify_collisions=True)
+
+    assert base_transformer.deduplication_stats.exact_duplicates == 2
+    assert base_transformer.deduplication_stats.hash_collisions == 4
+    assert 2 in result['codigo'].tolist()
+
+
+def test_remove_exact_duplicates_does_not_copy_a_frame_without_duplicates(base_transformer, mixed_data):
+    """A frame without duplicates is returned as is, and a deduplicated one can be changed without warnings."""
+
+    unique_data = mixed_data.drop_duplicates()
+    assert base_transformer._remove_exact_duplicates(unique_data) is unique_data
+
+    result = base_transformer._remove_exact_duplicates(mixed_data)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result['ativo_total'] = result['ativo_total'] * 2
+
+    assert mixed_data['ativo_total'].tolist()[:2] == [10, 10]
@@ -0,0 +1,83 @@
+"""Tests for the chunked deduplication engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bacen_ifdata.data_transformer.transformers.base import BaseTransformer
+from bacen_ifdata.data_transformer.transformers.deduplication import ChunkedDeduplicator, hash_rows
+
+
+@pytest.fixture
+def duplicated_data() -> pd.DataFrame:
+    """Provides a dataset with exact duplicates and redundant empty rows spread over the file."""
+
+    return pd.DataFrame(
+        {
+            'codigo': pd.array([1, 1, 2, 2, 3, 1, 4, 4], dtype='Int64'),
+            'instituicao': ['A', 'A', 'B', 'B', 'C', 'A', 'D', 'D'],
+            'data_base': pd.to_datetime(['2023-06-01'] * 8),
+            'ativo_total': pd.array([10, 10, None, 20, None, 10, 40, 41], dtype='Int64'),
+            'lucro_liquido': pd.array([1, 1, None, 2, None, 1, 4, 5], dtype='Int64'),
+        }
+    )
+
+
+def _run_in_batches(data_frame: pd.DataFrame, batch_size: int) -> pd.DataFrame:
+    """Runs both deduplication passes over the DataFrame split in batches."""
+
+    deduplicator = ChunkedDeduplicator()
+    batches = [data_frame.iloc[start : start + batch_size] for start in range(0, len(data_frame), batch_size)]
+
+    first_pass = [deduplicator.drop_exact_duplicates(batch) for batch in batches]
+    second_pass = [deduplicator.drop_redundant_empty_rows(batch) for batch in first_pass]
+
+    return pd.concat(second_pass)
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, 8])
+def test_chunked_deduplication_matches_deduplicate_dataset(duplicated_data, batch_size):
+    """Chunked deduplication must produce the same rows as the in-memory rules."""
+
+    expected = BaseTransformer().deduplicate_dataset(duplicated_data.copy())
+    result = _run_in_batches(duplicated_data, batch_size)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_unique_empty_row_is_kept(duplicated_data):
+    """An empty row without a populated counterpart must be kept."""
+
+    result = _run_in_batches(duplicated_data, 2)
+
+    assert 3 in result['codigo'].tolist()
+    assert 2 in result['codigo'].tolist()
+    assert result.loc[result['codigo'] == 2, 'ativo_total'].tolist() == [20]
+
+
+def test_verify_collisions_only_covers_the_batch(duplicated_data, monkeypatch):
+    """Colliding rows of a batch are kept, while rows matching an earlier batch are dropped on the hash."""
+
+    # Force every row to collide.
+    monkeypatch.setattr(
+        'bacen_ifdata.data_transformer.transformers.deduplication.hash_rows',
+        lambda data_frame: np.zeros(len(data_frame), dtype='uint64'),
+    )
+
+    deduplicator = ChunkedDeduplicator(verify_collisions=True)
+    first = deduplicator.drop_exact_duplicates(duplicated_data)
+    second = deduplicator.drop_exact_duplicates(duplicated_data)
+
+    assert len(first) == 6
+    assert second.empty
+    assert deduplicator.stats.hash_collisions == 5
+    assert deduplicator.stats.exact_duplicates == 2 + len(duplicated_data)
+
+
+def test_hash_rows_ignores_category_codes():
+    """Equal rows hash equally even if their categories are encoded differently."""
+
+    first = pd.DataFrame({'uf': pd.Categorical(['SP'], categories=['RJ', 'SP'])})
+    second = pd.DataFrame({'uf': pd.Categorical(['SP'], categories=['SP'])})
+
+    assert hash_rows(first)[0] == hash_rows(second)[0]
@@ -41,7 +41,7 @@ def test_name_mapping_exact_match(mocker):
     df = pd.DataFrame(columns=['Ativo Total', 'Patrimônio Líquido'])
 
     # Action
-    mapping = controller._build_column_rename_map(df, schema)
+    mapping = controller._build_column_rename_map(df, controller.get_schema_plan(schema))
 
     # Assert
     assert mapping['Ativo Total'] == 'ativo_total'
@@ -62,7 +62,7 @@ def test_name_mapping_with_extra_columns_in_csv(mocker):
     # CSV has: ['Ativo Total', 'Coluna Fantasma']
     df = pd.DataFrame(columns=['Ativo Total', 'Coluna Fantasma'])
 
-    mapping = controller._build_column_rename_map(df, schema)
+    mapping = controller._build_column_rename_map(df, controller.get_schema_plan(schema))
 
     # Should map 'Ativo Total'. Should IGNORE 'Coluna Fantasma'
     assert mapping['Ativo Total'] == 'ativo_total'
@@ -83,7 +83,7 @@ def test_name_mapping_with_missing_columns_in_csv(mocker):
     # CSV has ONLY: ['Ativo Total'] (Patrimonio vanished)
     df = pd.DataFrame(columns=['Ativo Total'])
 
-    mapping = controller._build_column_rename_map(df, schema)
+    mapping = controller._build_column_rename_map(df, controller.get_schema_plan(schema))
 
     assert mapping['Ativo Total'] == 'ativo_total'
     # 'patrimonio_liquido' is not in mapping because source col doesn't exist
@@ -0,0 +1,199 @@
+"""
+Unit tests for the stage scheduler.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.controller import TransformerController
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.transformer_factory import get_transformer
+from bacen_ifdata.main import scheduler
+from bacen_ifdata.main.scheduler import Stage, StageScheduler, TaskState
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.reports import ReportsFinancialConglomerates as Reports
+from bacen_ifdata.utilities.configurations import Config
+from tests.fixtures.transformer.mock_data_financial_conglomerates import (
+    MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV,
+)
+
+
+def test_tasks_run_after_their_dependencies_within_the_stage_limits():
+    """Each task starts after the tasks it waits for, and no stage runs more tasks than its limit."""
+
+    lock = threading.Lock()
+    events: list[str] = []
+    running = {stage: 0 for stage in Stage}
+    peaks = {stage: 0 for stage in Stage}
+
+    def work(stage: Stage, name: str) -> None:
+        with lock:
+            running[stage] += 1
+            peaks[stage] = max(peaks[stage], running[stage])
+        time.sleep(0.01)
+        with lock:
+            running[stage] -= 1
+            events.append(name)
+
+    stage_scheduler = StageScheduler({Stage.SCRAPE: 1, Stage.CLEAN: 2})
+    previous_transform = ()
+    for index in range(4):
+        scrape = stage_scheduler.add(Stage.SCRAPE, f'scrape {index}', lambda i=index: work(Stage.SCRAPE, f'scrape {i}'))
+        clean = stage_scheduler.add(
+            Stage.CLEAN, f'clean {index}', lambda i=index: work(Stage.CLEAN, f'clean {i}'), (scrape,)
+        )
+        previous_transform = (
+            stage_scheduler.add(
+                Stage.TRANSFORM,
+                f'transform {index}',
+                lambda i=index: work(Stage.TRANSFORM, f'transform {i}'),
+                (clean,),
+                previous_transform,
+            ),
+        )
+    stage_scheduler.run()
+
+    assert all(task.state == TaskState.DONE for task in stage_scheduler.tasks)
+    for index in range(4):
+        assert events.index(f'scrape {index}') < events.index(f'clean {index}') < events.index(f'transform {index}')
+    assert [event for event in events if event.startswith('transform')] == [f'transform {i}' for i in range(4)]
+    assert peaks[Stage.SCRAPE] == 1 and peaks[Stage.CLEAN] <= 2 and peaks[Stage.TRANSFORM] == 1
+
+
+def test_a_failed_task_skips_the_tasks_requiring_it_and_its_error_is_raised():
+    """The tasks ordered after a failed task still run; the ones requiring it (directly or not) are skipped."""
+
+    def fail() -> None:
+        raise ValueError('download failed')
+
+    stage_scheduler = StageScheduler({})
+    scrape = stage_scheduler.add(Stage.SCRAPE, 'scrape', fail)
+    clean = stage_scheduler.add(Stage.CLEAN, 'clean', lambda: None, (scrape,))
+    transform = stage_scheduler.add(Stage.TRANSFORM, 'transform', lambda: None, (clean,))
+    next_scrape = stage_scheduler.add(Stage.SCRAPE, 'next scrape', lambda: None, after=(scrape,))
+    save = stage_scheduler.add(Stage.TRANSFORM, 'save', lambda: None, after=(transform,))
+
+    with pytest.raises(ValueError, match='download failed'):
+        stage_scheduler.run()
+
+    assert [scrape.state, clean.state, transform.state] == [TaskState.FAILED, TaskState.SKIPPED, TaskState.SKIPPED]
+    assert next_scrape.state == save.state == TaskState.DONE
+
+
+def test_each_downloaded_file_is_cleaned_transformed_and_loaded(tmp_path: Path, monkeypatch):
+    """Files already downloaded are not scraped again; a second run finds every table up to date."""
+
+    for name in (
+        'DOWNLOAD_DIRECTORY',
+        'PROCESSED_FILES_DIRECTORY',
+        'TRANSFORMED_FILES_DIRECTORY',
+        'DEDUPLICATION_INDEX_DIRECTORY',
+    ):
+        monkeypatch.setattr(Config, name, tmp_path / name.lower())
+
+    raw_directory = Config.DOWNLOAD_DIRECTORY / 'financial_conglomerates' / 'assets'
+    raw_directory.mkdir(parents=True)
+    for quarter in ('06/2024', '09/2024'):
+        file_name = scheduler.report_file_name(quarter)
+        content = MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV.strip().replace('09/2024', quarter)
+        (raw_directory / file_name).write_text(content + '\n', encoding='utf-8')
+    # An empty download of the IF.data site is removed instead of processed.
+    (raw_directory / '2024-12.csv').touch()
+
+    database_path = tmp_path / 'silver.duckdb'
+    monkeypatch.setattr(scheduler, 'build_loader_controller', lambda: LoaderController(DatabaseService(database_path)))
+
+    class DownloadedSession:
+        """Session of a run whose files were all downloaded before."""
+
+        def download_reports(self, report_date, institution, report):
+            raise AssertionError(f'{report_date} was already downloaded.')
+
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    targets = [(Institutions.FINANCIAL_CONGLOMERATES, Reports.ASSETS, ['12/2024', '09/2024', '06/2024'])]
+    changed_tables = scheduler.main(DownloadedSession(), TransformerController(get_transformer, registry), targets)
+
+    assert changed_tables == ['financial_conglomerates_assets']
+    assert not (raw_directory / '2024-12.csv').exists()
+    with duckdb.connect(str(database_path), read_only=True) as connection:
+        partitions = connection.execute(
+            "SELECT CAST(data_base AS VARCHAR), row_count FROM partition_statistics ORDER BY 1"
+        ).fetchall()
+    assert partitions == [('2024-06-01', 2), ('2024-09-01', 2)]
+
+    targets = [(Institutions.FINANCIAL_CONGLOMERATES, Reports.ASSETS, ['09/2024', '06/2024'])]
+    assert scheduler.main(DownloadedSession(), TransformerController(get_transformer, registry), targets) == []
+
+
+def test_a_load_only_reads_the_files_no_transform_is_writing(tmp_path: Path, monkeypatch):
+    """The load of a file runs while the next file is transformed, without reading it."""
+
+    for name in (
+        'DOWNLOAD_DIRECTORY',
+        'PROCESSED_FILES_DIRECTORY',
+        'TRANSFORMED_FILES_DIRECTORY',
+        'DEDUPLICATION_INDEX_DIRECTORY',
+    ):
+        monkeypatch.setattr(Config, name, tmp_path / name.lower())
+
+    raw_directory = Config.DOWNLOAD_DIRECTORY / 'financial_conglomerates' / 'assets'
+    raw_directory.mkdir(parents=True)
+    for quarter in ('06/2024', '09/2024'):
+        content = MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV.strip().replace('09/2024', quarter)
+        (raw_directory / scheduler.report_file_name(quarter)).write_text(content + '\n', encoding='utf-8')
+    # A transformed file of the newer quarter, cut short by an earlier run, is rewritten by this one.
+    transformed_directory = Config.TRANSFORMED_FILES_DIRECTORY / 'financial_conglomerates' / 'assets'
+    transformed_directory.mkdir(parents=True)
+    (transformed_directory / '2024-09.parquet').write_bytes(b'PAR1')
+
+    database_path = tmp_path / 'silver.duckdb'
+    monkeypatch.setattr(scheduler, 'build_loader_controller', lambda: LoaderController(DatabaseService(database_path)))
+
+    # The newer file is written, but only moved into place once the older file was loaded.
+    first_loaded = threading.Event()
+    overlapped = []
+    replace = os.replace
+
+    def replace_after_first_load(source, destination):
+        if Path(destination) == transformed_directory / '2024-09.parquet':
+            overlapped.append(first_loaded.wait(timeout=10))
+        replace(source, destination)
+
+    monkeypatch.setattr(os, 'replace', replace_after_first_load)
+
+    loaded_files = []
+    main_loader = scheduler.main_loader
+
+    def record_load(*args, **kwargs):
+        loaded_files.append([file.name for file in kwargs['input_files']])
+        try:
+            return main_loader(*args, **kwargs)
+        finally:
+            first_loaded.set()
+
+    monkeypatch.setattr(scheduler, 'main_loader', record_load)
+
+    class DownloadedSession:
+        """Session of a run whose files were all downloaded before."""
+
+        def download_reports(self, report_date, institution, report):
+            raise AssertionError(f'{report_date} was already downloaded.')
+
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    targets = [(Institutions.FINANCIAL_CONGLOMERATES, Reports.ASSETS, ['09/2024', '06/2024'])]
+    scheduler.main(DownloadedSession(), TransformerController(get_transformer, registry), targets)
+
+    assert overlapped == [True]
+    assert loaded_files == [['2024-06.parquet'], ['2024-06.parquet', '2024-09.parquet']]
+    with duckdb.connect(str(database_path), read_only=True) as connection:
+        partitions = connection.execute(
+            "SELECT CAST(data_base AS VARCHAR), count(*) FROM financial_conglomerates_assets GROUP BY 1 ORDER BY 1"
+        ).fetchall()
+    assert partitions == [('2024-06-01', 2), ('2024-09-01', 2)]
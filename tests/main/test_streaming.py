@@ -0,0 +1,95 @@
+"""
+Unit tests for the streaming pipeline.
+"""
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.controller import TransformerController
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.transformer_factory import get_transformer
+from bacen_ifdata.main import streaming
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.reports import ReportsFinancialConglomerates as Reports
+from bacen_ifdata.utilities.configurations import Config
+from tests.fixtures.transformer.mock_data_financial_conglomerates import (
+    MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV,
+    MOCK_FINANCIAL_CONGLOMERATES_LIABILITIES_CSV,
+)
+
+TARGETS = [
+    (Institutions.FINANCIAL_CONGLOMERATES, Reports.ASSETS),
+    (Institutions.FINANCIAL_CONGLOMERATES, Reports.LIABILITIES),
+]
+
+
+@pytest.fixture
+def silver_database(tmp_path: Path, monkeypatch) -> Path:
+    """Fixture writing two quarters of two reports (one still raw) and pointing the stages to a temporary tree."""
+
+    for name in ('DOWNLOAD_DIRECTORY', 'PROCESSED_FILES_DIRECTORY', 'DEDUPLICATION_INDEX_DIRECTORY'):
+        monkeypatch.setattr(Config, name, tmp_path / name.lower())
+    monkeypatch.setattr(Config, 'STREAMING_QUEUE_SIZE', 1)
+
+    for report, content in (
+        (Reports.ASSETS, MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV),
+        (Reports.LIABILITIES, MOCK_FINANCIAL_CONGLOMERATES_LIABILITIES_CSV),
+    ):
+        for quarter, base_directory in (
+            ('06/2024', Config.PROCESSED_FILES_DIRECTORY),
+            ('09/2024', Config.DOWNLOAD_DIRECTORY),
+        ):
+            directory = base_directory / 'financial_conglomerates' / report.name.lower()
+            directory.mkdir(parents=True, exist_ok=True)
+            file_name = f"{quarter[3:]}-{quarter[:2]}.csv"
+            (directory / file_name).write_text(content.strip().replace('09/2024', quarter) + '\n', encoding='utf-8')
+
+    database_path = tmp_path / 'silver.duckdb'
+    monkeypatch.setattr(streaming, 'build_loader_controller', lambda: LoaderController(DatabaseService(database_path)))
+
+    return database_path
+
+
+def test_every_file_flows_from_raw_to_the_silver_tables(silver_database: Path, tmp_path: Path):
+    """The raw file is normalized on the way, and each table holds the rows of both quarters."""
+
+    registry = CategoricalDictionaryRegistry(tmp_path / 'categorical.json')
+    streaming.main(TransformerController(get_transformer, registry), TARGETS)
+
+    assert (Config.PROCESSED_FILES_DIRECTORY / 'financial_conglomerates' / 'assets' / '2024-09.csv').exists()
+    with duckdb.connect(str(silver_database), read_only=True) as connection:
+        partitions = connection.execute(
+            "SELECT table_name, CAST(data_base AS VARCHAR), row_count FROM partition_statistics ORDER BY 1, 2"
+        ).fetchall()
+        uf_type = connection.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_name = 'financial_conglomerates_liabilities' AND column_name = 'uf'"
+        ).fetchone()[0]
+
+    assert partitions == [
+        ('financial_conglomerates_assets', '2024-06-01', 2),
+        ('financial_conglomerates_assets', '2024-09-01', 2),
+        ('financial_conglomerates_liabilities', '2024-06-01', 2),
+        ('financial_conglomerates_liabilities', '2024-09-01', 2),
+    ]
+    assert uf_type.startswith('ENUM')
+
+
+def test_a_failing_stage_stops_the_stream_and_raises_its_error(silver_database: Path):
+    """The normalizer waiting on a full queue gives up, and the error of the transformer is raised."""
+
+    class FailingTransformerController:
+        """Transformer controller that cannot transform any file."""
+
+        profiles: list = []
+        dictionary_registry = None
+
+        def transform(self, file_path, schema, institution):
+            raise ValueError(f'broken file: {file_path.name}')
+
+    with pytest.raises(ValueError, match='broken file: 2024-06.csv'):
+        streaming.main(FailingTransformerController(), TARGETS)
@@ -0,0 +1,105 @@
+"""
+Unit tests for the transformer stage.
+"""
+
+from pathlib import Path
+
+import duckdb
+import pyarrow.parquet as pq
+import pytest
+
+from bacen_ifdata.data_loader.controller import LoaderController
+from bacen_ifdata.data_loader.storage import DatabaseService
+from bacen_ifdata.data_transformer.controller import TransformerController
+from bacen_ifdata.data_transformer.dictionaries import CategoricalDictionaryRegistry
+from bacen_ifdata.data_transformer.report_index import ReportDeduplicationIndex
+from bacen_ifdata.data_transformer.schemas.mapper import SCHEMA_BY_INSTITUTION_AND_REPORT
+from bacen_ifdata.data_transformer.transformer_factory import get_transformer
+from bacen_ifdata.main.loader import main as main_loader
+from bacen_ifdata.main.transformer import transform_report_file
+from bacen_ifdata.scraper.institutions import InstitutionType as Institutions
+from bacen_ifdata.scraper.reports import ReportsFinancialConglomerates as Reports
+from bacen_ifdata.utilities.configurations import Config
+from tests.fixtures.transformer.mock_data_financial_conglomerates import (
+    MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV,
+)
+
+
+@pytest.fixture
+def processed_file(tmp_path: Path) -> Path:
+    """Fixture writing a processed file of the assets report."""
+
+    file = tmp_path / 'processed' / '2024-09.csv'
+    file.parent.mkdir(parents=True)
+    file.write_text(MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV.strip() + '\n', encoding='utf-8')
+
+    return file
+
+
+def load_column_types(
+    tmp_path: Path, processed_file: Path, chunk_size: int | None, monkeypatch
+) -> list[tuple[str, str]]:
+    """Transforms the file (whole or in chunks), loads it into a new database and returns its column types."""
+
+    run_directory = tmp_path / f'chunks-{chunk_size}'
+    monkeypatch.setattr(Config, 'TRANSFORMED_FILES_DIRECTORY', run_directory / 'transformed')
+    output_directory = Config.TRANSFORMED_FILES_DIRECTORY / 'financial_conglomerates' / 'assets'
+    output_directory.mkdir(parents=True)
+
+    transform_report_file(
+        TransformerController(get_transformer, CategoricalDictionaryRegistry(run_directory / 'categorical.json')),
+        processed_file,
+        SCHEMA_BY_INSTITUTION_AND_REPORT[Institutions.FINANCIAL_CONGLOMERATES][Reports.ASSETS],
+        Institutions.FINANCIAL_CONGLOMERATES,
+        output_directory,
+        ReportDeduplicationIndex(run_directory / 'assets.parquet'),
+        chunk_size,
+    )
+
+    database_path = run_directory / 'silver.duckdb'
+    main_loader(Institutions.FINANCIAL_CONGLOMERATES, Reports.ASSETS, LoaderController(DatabaseService(database_path)))
+    with duckdb.connect(str(database_path), read_only=True) as connection:
+        return connection.execute(
+            "SELECT column_name, data_type FROM information_schema.columns "
+            "WHERE table_name = 'financial_conglomerates_assets' ORDER BY ordinal_position"
+        ).fetchall()
+
+
+def test_chunked_and_whole_file_transformations_load_the_same_column_types(
+    tmp_path: Path, processed_file: Path, monkeypatch
+):
+    """A file transformed in chunks gets the same narrowed column types as the file transformed at once."""
+
+    monkeypatch.setattr(Config, 'DTYPE_DOWNCASTING', True)
+
+    whole_file_types = load_column_types(tmp_path, processed_file, None, monkeypatch)
+    chunked_types = load_column_types(tmp_path, processed_file, 1, monkeypatch)
+
+    assert chunked_types == whole_file_types
+    assert {'SMALLINT', 'INTEGER'} & {data_type for _, data_type in whole_file_types}
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1])
+def test_a_file_without_rows_replaces_the_previous_output(tmp_path: Path, processed_file: Path, chunk_size):
+    """Whole or in chunks, a file emptied since the last run leaves an empty transformed file, not the old rows."""
+
+    output_directory = tmp_path / 'transformed'
+    output_directory.mkdir()
+
+    header = MOCK_FINANCIAL_CONGLOMERATES_ASSETS_CSV.strip().split('\n')[0]
+    for content in (processed_file.read_text(encoding='utf-8'), f'{header}\n'):
+        processed_file.write_text(content, encoding='utf-8')
+        transform_report_file(
+            TransformerController(get_transformer),
+            processed_file,
+            SCHEMA_BY_INSTITUTION_AND_REPORT[Institutions.FINANCIAL_CONGLOMERATES][Reports.ASSETS],
+            Institutions.FINANCIAL_CONGLOMERATES,
+            output_directory,
+            ReportDeduplicationIndex(tmp_path / 'assets.parquet'),
+            chunk_size,
+        )
+
+    transformed_file = pq.ParquetFile(output_directory / '2024-09.parquet')
+
+    assert transformed_file.metadata.num_rows == 0
+    assert 'codigo' in transformed_file.schema_arrow.names
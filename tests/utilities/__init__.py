@@ -0,0 +1 @@
+# Utilities tests package initialization
@@ -0,0 +1,41 @@
+"""Tests for the DuckDB settings shared by the loader, dbt and the audit scripts."""
+
+import json
+
+import duckdb
+
+from bacen_ifdata.utilities.configurations import Config
+from bacen_ifdata.utilities.duckdb_settings import dbt_environment, duckdb_settings, log_duckdb_settings
+
+
+def test_environment_variables_override_the_configured_settings(monkeypatch, tmp_path):
+    """Config gives the defaults, DUCKDB_* variables win, and unset settings keep the DuckDB default."""
+
+    monkeypatch.setattr(Config, 'DUCKDB_THREADS', 2)
+    monkeypatch.setattr(Config, 'DUCKDB_MEMORY_LIMIT', '2GB')
+    monkeypatch.setattr(Config, 'DUCKDB_TEMP_DIRECTORY', None)
+    monkeypatch.setattr(Config, 'DUCKDB_PRESERVE_INSERTION_ORDER', True)
+    monkeypatch.setattr(Config, 'DUCKDB_CHECKPOINT_THRESHOLD', None)
+    monkeypatch.setenv('DUCKDB_MEMORY_LIMIT', '1GB')
+    monkeypatch.setenv('DUCKDB_PRESERVE_INSERTION_ORDER', 'off')
+    monkeypatch.delenv('DUCKDB_THREADS', raising=False)
+    monkeypatch.delenv('DUCKDB_TEMP_DIRECTORY', raising=False)
+    monkeypatch.delenv('DUCKDB_CHECKPOINT_THRESHOLD', raising=False)
+
+    settings = duckdb_settings()
+    assert settings == {'threads': '2', 'memory_limit': '1GB', 'preserve_insertion_order': 'false'}
+    assert json.loads(dbt_environment()['DUCKDB_SETTINGS']) == settings
+
+    connection = duckdb.connect(str(tmp_path / 'settings.duckdb'), config=settings)
+    effective = log_duckdb_settings(connection, 'settings.duckdb')
+    connection.close()
+
+    assert effective['threads'] == '2'
+    assert effective['preserve_insertion_order'] == 'false'
+    assert set(effective) == {
+        'checkpoint_threshold',
+        'memory_limit',
+        'preserve_insertion_order',
+        'temp_directory',
+        'threads',
+    }
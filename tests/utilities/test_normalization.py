@@ -0,0 +1,43 @@
+"""Tests for the memoised text normalisation layer."""
+
+import pyarrow as pa
+
+from bacen_ifdata.utilities.normalization import MemoizedNormalizer
+from bacen_ifdata.utilities.string_utils import _slugify
+
+
+def test_cache_is_bounded_and_counts_hits_and_misses():
+    """Repeated headers are answered from the cache; the least recently used value is evicted."""
+
+    slugs = MemoizedNormalizer(_slugify, max_size=2)
+
+    assert slugs.normalize_many(['Ativo Total', 'Patrimônio Líquido', 'Ativo Total']) == [
+        'ativo_total',
+        'patrimonio_liquido',
+        'ativo_total',
+    ]
+    slugs('Lucro/Prejuízo')
+
+    stats = slugs.stats()
+    assert (stats.hits, stats.misses, stats.size, stats.max_size) == (1, 3, 2, 2)
+    assert round(stats.hit_ratio, 2) == 0.25
+
+    slugs.clear()
+    assert len(slugs) == 0
+
+
+def test_arrow_column_is_normalised_through_its_distinct_values():
+    """An Arrow column is normalised once per distinct value and returned dictionary encoded."""
+
+    calls = []
+
+    def normalize(value):
+        calls.append(value)
+        return value.strip().title()
+
+    cities = MemoizedNormalizer(normalize)
+    result = cities.normalize_arrow(pa.chunked_array([['SAO PAULO', None], [' recife', 'SAO PAULO']]))
+
+    assert pa.types.is_dictionary(result.type)
+    assert result.to_pylist() == ['Sao Paulo', None, 'Recife', 'Sao Paulo']
+    assert sorted(calls) == [' recife', 'SAO PAULO']